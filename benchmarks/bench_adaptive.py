@@ -0,0 +1,71 @@
+# adaptive Mach / Mach x altitude refinement against uniform grids: evaluations needed for the
+# same accuracy, where accuracy is the worst relative thrust/TSFC error of piecewise-linear
+# interpolation against a dense reference sweep
+# (tests/test_adaptive.py checks that both refinements meet their tolerance)
+# run from the repo root:  python benchmarks/bench_adaptive.py [tolerance]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.adaptive import refineEnvelope, refineFields, refineMach
+from turbojet.cycle import runEngineBatch
+
+
+def interpolationError(mach, res, dense, reference):
+    return max(np.nanmax(np.abs(np.interp(dense, mach, res[name]) / reference[name] - 1)) for name in refineFields)
+
+
+def machSweep(tol, mode):
+    start, stop = 0.05, 2.25
+    dense = np.linspace(start, stop, 200001)
+    reference = runEngineBatch(dense, mode=mode)
+
+    t0 = time.perf_counter()
+    res, stats = refineMach(start, stop, tol=tol, mode=mode)
+    elapsed = time.perf_counter() - t0
+    achieved = interpolationError(res["Mach"], res, dense, reference)
+
+    # smallest uniform grid (searched by bisection on the point count) that does as well
+    lo, hi = 2, 2
+    while interpolationError(np.linspace(start, stop, hi), runEngineBatch(np.linspace(start, stop, hi), mode=mode),
+                             dense, reference) > achieved:
+        lo, hi = hi, hi * 2
+    while hi - lo > 1:
+        n = (lo + hi) // 2
+        m = np.linspace(start, stop, n)
+        if interpolationError(m, runEngineBatch(m, mode=mode), dense, reference) > achieved:
+            lo = n
+        else:
+            hi = n
+    print(f"Mach {start}-{stop} {mode}: tol {tol:g}, {stats['evaluations']} adaptive evaluations "
+          f"({stats['passes']} passes, {elapsed * 1e3:.1f} ms) reach max error {achieved:.2e}; "
+          f"a uniform grid needs {hi} points for that ({hi / stats['evaluations']:.1f}x more)")
+
+
+def envelope(tol):
+    t0 = time.perf_counter()
+    env = refineEnvelope(tol=tol)
+    elapsed = time.perf_counter() - t0
+    rng = np.random.default_rng(0)
+    mach = rng.uniform(0.05, 2.25, 50000)
+    altitude = rng.uniform(0, 18000, 50000)
+    reference = runEngineBatch(mach, altitude=altitude)
+    errors = np.max([np.abs(env.query(mach, altitude, name) / reference[name] - 1) for name in refineFields], axis=0)
+    s = env.stats
+    print(f"Mach x altitude quadtree: tol {tol:g}, {s['evaluations']:,} evaluations, {s['leaves']:,} leaves "
+          f"({elapsed * 1e3:.0f} ms); error at random points max {errors.max():.2e}, 99th pct "
+          f"{np.percentile(errors, 99):.2e}; uniform grid at the finest cell: {s['uniformEvaluations']:,} "
+          f"evaluations ({s['saved']:,} saved); {s['unresolvedLeaves']} leaves still over tol at maxDepth")
+
+
+def main(tol=1e-3):
+    for mode in ("dry", "wet"):
+        machSweep(tol, mode)
+    envelope(2 * tol)
+
+
+if __name__ == "__main__":
+    main(*(float(a) for a in sys.argv[1:]))
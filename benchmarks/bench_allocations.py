@@ -0,0 +1,119 @@
+# memory and time per cycle evaluation: StationState hot path (engineCycle) against the
+# old dict-returning compute() chain, which is kept as an adapter (tests/test_compute.py checks
+# that the two agree)
+# counts the component objects / dicts each path builds, the peak traced memory of one call and
+# the time per call (best of 15 alternating rounds)
+# exits non-zero unless the StationState path is at least 1.2x faster at 10k points; peak memory
+# is reported only: it is the NumPy temporaries, the same on both paths
+# run from the repo root:  python benchmarks/bench_allocations.py [min 10k-point speedup]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.classes import *
+from turbojet.cycle import currentCycle
+
+
+def dictCycle(mach, P0, T0, P_ambient):
+    # the pre-StationState flowpath: fresh component objects and a result dict per stage
+    i = inlet(mach, P0, T0).compute()
+    f = fan(i["Stagnation Press (Pt0)"], i["Stagnation Temp (Tt0)"], i["Mass Flow"]).compute()
+    b = bypassSplit(f["Stagnation Press (out)"], i["Mass Flow"], f["Stagnation Temp (out)"]).compute()
+    h = highPressureCompressor(f["Stagnation Press (out)"], f["Stagnation Temp (out)"], b["Core Mass Flow"]).compute()
+    c = combustor(h["Stagnation Press (out)"], h["Stagnation Temp (out)"], b["Core Mass Flow"]).compute()
+    hpt = highPressureTurbine(c["Stagnation Temp (out)"], c["Stagnation Press (out)"], c["Total Mass Flow"], h["HPC Work (W)"]).compute()
+    lpt = lowPressureTurbine(hpt["Stagnation Temp (out)"], hpt["Stagnation Press (out)"], c["Total Mass Flow"], f["Fan Work (W)"]).compute()
+    m = mixer(c["Total Mass Flow"], lpt["Stagnation Temp (out)"], lpt["Stagnation Press (out)"],
+              b["Bypass Mass Flow"], f["Stagnation Temp (out)"], f["Stagnation Press (out)"]).compute()
+    a = afterBurner(m["Stagnation Temp (out)"], m["Stagnation Press (out)"], m["Mixed Mass Flow"]).compute()
+    fuel = a["Mass flow of fuel"] + c["Mass flow of fuel"]
+    n = nozzle(a["Stagnation Temp (out)"], a["Stagnation Press (out)"], P_ambient, a["Total Mass flow"], mach).compute()
+    e = exhaust(n["Nozzle Exit Velocity"], a["Total Mass flow"], fuel, n["Nozzle Exit Size"],
+                n["Static Press (out)"], P_ambient, 0).compute()
+    return e["Net Thrust"]
+
+
+def stateCycle(mach, P0, T0, P_ambient, wet=np.True_):
+    cycle = currentCycle()
+    cycle.run(mach, P0, T0, P_ambient, wet)
+    return cycle.exhaust.thrust
+
+
+def countConstructions(fn, args):
+    # component objects and result dicts built during one evaluation
+    counts = {"objects": 0, "dicts": 0}
+    originals = {}
+    for cls in (inlet, fan, bypassSplit, highPressureCompressor, combustor, highPressureTurbine,
+                lowPressureTurbine, mixer, afterBurner, nozzle, exhaust):
+        originals[cls] = (cls.__init__, cls.compute)
+
+        def init(self, *a, _init=cls.__init__):
+            counts["objects"] += 1
+            _init(self, *a)
+
+        def compute(self, _compute=cls.compute):
+            counts["dicts"] += 1
+            return _compute(self)
+
+        cls.__init__ = init
+        cls.compute = compute
+    try:
+        fn(*args)
+    finally:
+        for cls, (init, compute) in originals.items():
+            cls.__init__ = init
+            cls.compute = compute
+    return counts
+
+
+def footprint(fn, args):
+    # (constructions, peak traced bytes) of one evaluation
+    fn(*args)  # warm up (builds the per-thread cycle)
+    counts = countConstructions(fn, args)
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return counts, peak
+
+
+def timings(fns, args, repeats, rounds=15):
+    # seconds per evaluation of each fn, best of rounds; the rounds alternate between the paths so
+    # a noisy stretch on the machine doesn't land on only one of them
+    best = {name: float("inf") for name in fns}
+    for _ in range(rounds):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fn(*args)
+            best[name] = min(best[name], (time.perf_counter() - start) / repeats)
+    return best
+
+
+def main(minSpeedup=1.2):
+    # peak memory is the NumPy temporaries of the component math, the same on both paths; what
+    # the StationState path saves is the objects, dicts and the extra array work of compute()
+    fns = {"dict adapter": dictCycle, "StationState": stateCycle}
+    speedups = {}
+    for points, repeats in ((1, 2000), (10000, 30)):
+        mach = np.linspace(0.1, 2.25, points)
+        args = (mach, np.full(points, 101325.0), np.full(points, 298.0), np.full(points, 101325.0))
+        seconds = timings(fns, args, repeats)
+        for name, fn in fns.items():
+            counts, peak = footprint(fn, args)
+            print(f"{points:6d} pts  {name:13s}  objects {counts['objects']:3d}  dicts {counts['dicts']:3d}  "
+                  f"peak {peak:11,d} B  {seconds[name] * 1e6:9.1f} us/eval")
+        speedups[points] = seconds["dict adapter"] / seconds["StationState"]
+        print(f"{points:6d} pts  StationState speedup {speedups[points]:.2f}x")
+    ok = speedups[10000] >= minSpeedup
+    if not ok:
+        print(f"10k-point speedup below {minSpeedup:g}x")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(float(a) for a in sys.argv[1:])))
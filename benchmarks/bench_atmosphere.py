@@ -0,0 +1,28 @@
+# standard atmosphere: accuracy of the precomputed table against the closed form, and lookup
+# speed on a million-point altitude sweep (tests/test_atmosphere.py gates the accuracy)
+# run from the repo root:  python benchmarks/bench_atmosphere.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.atmosphere import isaClosedForm, isaTable
+
+
+def main(points=1000000):
+    table = isaTable()
+    tempError, pressError = table.maxError()
+    print(f"max relative error vs closed form: temperature {tempError:.2e}, pressure {pressError:.2e}")
+
+    rng = np.random.default_rng(0)
+    for name, h in (("random", rng.uniform(0, 20000, points)), ("sorted", np.linspace(0, 20000, points))):
+        closed = min(timeit.repeat(lambda: isaClosedForm(h), number=5, repeat=5)) / 5
+        lookup = min(timeit.repeat(lambda: table.lookup(h), number=5, repeat=5)) / 5
+        print(f"{name:6s} {points:,} pts: closed form {points / closed:14,.0f} pts/s   "
+              f"table {points / lookup:14,.0f} pts/s   speedup {closed / lookup:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# points-per-second of runEngineBatch against the per-point runEngine loop main.py uses
+# (tests/test_batch.py checks that the two agree bit for bit)
+# run from the repo root:  python benchmarks/bench_batch.py [number of points]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngine, runEngineBatch
+
+
+def timeLoop(mach, mode):
+    start = time.perf_counter()
+    for M in mach:
+        runEngine(M, mode=mode)
+    return time.perf_counter() - start
+
+
+def timeBatch(mach, mode):
+    start = time.perf_counter()
+    runEngineBatch(mach, mode=mode)
+    return time.perf_counter() - start
+
+
+def main(points=20000):
+    mach = np.linspace(0.05, 2.25, points)
+    for mode in ("dry", "wet"):
+        loopTime = timeLoop(mach, mode)
+        batchTime = timeBatch(mach, mode)
+        print(f"{mode}: loop {points / loopTime:12,.0f} pts/s   batch {points / batchTime:14,.0f} pts/s   "
+              f"speedup {loopTime / batchTime:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
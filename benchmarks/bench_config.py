@@ -0,0 +1,52 @@
+# design-space study: many engine configurations at one flight condition, as one runEngineBatch
+# call over a configBatch against one runEngineBatch call per engineConfig
+# (tests/test_config.py checks that the two agree to 1e-14)
+# run from the repo root:  python benchmarks/bench_config.py [designs]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.config import configBatch, engineConfig
+from turbojet.cycle import runEngineBatch
+
+
+def main(designs=100000):
+    rng = np.random.default_rng(0)
+    values = {
+        "fan.pressure_ratioFan": rng.uniform(3.5, 4.5, designs),
+        "split.bypaRatio": rng.uniform(0.3, 0.6, designs),
+        "hpc.hpcPressRatio": rng.uniform(8.0, 9.5, designs),
+        "combustor.titemp": rng.uniform(1850, 1990, designs),
+        "hpt.efficiency": rng.uniform(0.90, 0.95, designs),
+        "nozzle.nozzleThroat": rng.uniform(0.43, 0.49, designs),
+    }
+    conditions = {"altitude": 10000.0, "throttle": 1.6}
+
+    start = time.perf_counter()
+    batch = configBatch(values)
+    res = runEngineBatch(0.9, config=batch, **conditions)
+    batchTime = time.perf_counter() - start
+
+    # one call per design is slow, so time a subset and scale
+    sample = max(1, designs // 100)
+    start = time.perf_counter()
+    for i in range(sample):
+        runEngineBatch(0.9, config=batch[i], **conditions)
+    loopTime = (time.perf_counter() - start) * designs / sample
+
+    print(f"{designs:,} designs x {len(values)} varied parameters at Mach 0.9, 10 km, throttle 1.6")
+    print(f"  per-config loop  {loopTime * 1e3:10.1f} ms  ({designs / loopTime:12,.0f} designs/s, extrapolated)")
+    print(f"  configBatch      {batchTime * 1e3:10.1f} ms  ({designs / batchTime:12,.0f} designs/s)")
+    print(f"  speedup {loopTime / batchTime:.0f}x")
+
+    best = np.nanargmin(res["TSFC"])
+    print(f"\nlowest TSFC {res['TSFC'][best] * 3.6e6:.1f} kg/(kN h) at thrust {res['Net Thrust'][best] / 1e3:.1f} kN:")
+    for name, value in batch[best].overrides().items():
+        print(f"  {name:24s} {value:10.4g}   (default {engineConfig()[name]:g})")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,50 @@
+# performance deck: build time, stored error bounds, and query throughput against direct
+# runEngineBatch evaluation (tests/test_deck.py checks the nodes and that several processes can
+# map one deck file)
+# run from the repo root:  python benchmarks/bench_deck.py [query points]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.deck import buildDeck, performanceDeck
+from turbojet.cycle import runEngineBatch
+
+
+def main(points=1000000):
+    path = os.path.join(tempfile.mkdtemp(), "f119.deck")
+    start = time.perf_counter()
+    deck = buildDeck(path)
+    print(f"built {' x '.join(map(str, deck.table.shape))} deck in {time.perf_counter() - start:.2f} s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+    start = time.perf_counter()
+    performanceDeck(path)
+    print(f"open (memmap): {(time.perf_counter() - start) * 1e3:.2f} ms\n")
+
+    print(f"{'field':22s} {'linear max':>11s} {'p99':>10s}   {'cubic max':>10s} {'p99':>10s}")
+    for name in deck.fields:
+        lin, cub = deck.errors["linear"][name], deck.errors["cubic"][name]
+        print(f"{name:22s} {lin['maxRel']:11.2e} {lin['p99Rel']:10.2e}   {cub['maxRel']:10.2e} {cub['p99Rel']:10.2e}")
+
+    rng = np.random.default_rng(1)
+    mach = rng.uniform(0.05, 2.25, points)
+    altitude = rng.uniform(0, 18000, points)
+    throttle = rng.uniform(0, 2, points)
+    start = time.perf_counter()
+    runEngineBatch(mach, altitude=altitude, throttle=throttle)
+    direct = time.perf_counter() - start
+    print(f"\n{points:,} random points")
+    print(f"  runEngineBatch                 {points / direct:12,.0f} pts/s")
+    for label, kwargs in (("linear, all fields", {}), ("linear, thrust + TSFC", {"fields": ["Net Thrust", "TSFC"]}),
+                          ("cubic, all fields", {"method": "cubic"})):
+        start = time.perf_counter()
+        deck.query(mach, altitude, throttle, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"  deck {label:25s} {points / elapsed:12,.0f} pts/s  ({direct / elapsed:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,93 @@
+# variable gas properties: cost of the real-gas cycle against the constant-property one, table
+# accuracy against the NASA polynomials, inverse round trips, and what changes in the hot section
+# exits non-zero unless the real-gas cycle costs at most maxRatio times the constant-property one
+# on batches of 100,000 points or more (tests/test_gas.py gates the accuracy); about 2x is expected there
+# (2.0-2.4x measured on a noisy machine, so the gate leaves room). Smaller batches are printed but
+# not gated: there the per-call overhead of NumPy, not the table work, sets the cost (about 3.3x at
+# 1,000 points)
+# run from the repo root:  python benchmarks/bench_gas.py [largest batch]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.gas import _mixtureCp, variableGas
+from turbojet.cycle import runEngineBatch
+
+
+def best(fns, rounds=9):
+    # seconds per call of each fn, best of rounds; the rounds alternate between the fns so a noisy
+    # stretch on the machine doesn't land on only one of them
+    times = [float("inf")] * len(fns)
+    for fn in fns:
+        fn()
+    for _ in range(rounds):
+        for k, fn in enumerate(fns):
+            t = time.perf_counter()
+            fn()
+            times[k] = min(times[k], time.perf_counter() - t)
+    return times
+
+
+def main(largest=100000, maxRatio=2.5):
+    gas = variableGas()
+    rng = np.random.default_rng(0)
+
+    # cp between the 1 K nodes against the polynomials themselves, and the inverses round trip
+    T = rng.uniform(200.0, 2900.0, 200000)
+    far = rng.uniform(0.0, 0.07, T.size)
+    cpAir, cpFuel = _mixtureCp(T)
+    cpError = np.abs(gas.specificHeat(T, far) / ((cpAir + far * cpFuel) / (1 + far)) - 1).max()
+    hError = np.abs(gas.temperature(gas.enthalpyAt(T, far), far) - T).max()
+    phiError = np.abs(gas.isentropicTemperature(T, 1.0, far) - T).max()
+    # compressor range: the exit temperature stays inside the table
+    inlet = T < 2000.0
+    Tout, deltaH = gas.compress(T[inlet], 3.0, 1.0, far[inlet])
+    compressError = np.abs(gas.pressureRatio(T[inlet], Tout, far[inlet]) - 3.0).max()
+    # nozzle range: the static temperature stays inside the table
+    nozzle = T[T > 600.0]
+    far, mach = far[T > 600.0], rng.uniform(0.1, 2.5, nozzle.size)
+    static, _, velocity = gas.staticState(nozzle, mach, far)
+    cp = gas.specificHeat(static, far)
+    R = gas.gasConstant(far)
+    machError = np.abs(velocity / np.sqrt(cp / (cp - R) * R * static) - mach).max()
+    print("table accuracy, 200-2900 K, far 0-0.07:")
+    print(f"  cp against the NASA polynomials      {cpError:9.1e} (relative)")
+    print(f"  T -> h -> T                          {hError:9.1e} K")
+    print(f"  T -> phi -> T                        {phiError:9.1e} K")
+    print(f"  isentropic compression, ratio 3       {compressError:8.1e}")
+    print(f"  static state, Tt > 600 K, Mach 0.1-2.5 {machError:7.1e} (Mach)")
+
+    print("\ncycle cost (best of 9, Mach 0.05-2.25 at 5000 m):")
+    print("    points   mode   ideal [ms]   real [ms]   real / ideal")
+    ratios = []
+    n = 1000
+    while n <= largest:
+        m = np.linspace(0.05, 2.25, n)
+        for mode in ("dry", "wet"):
+            ideal, real = best([lambda: runEngineBatch(m, altitude=5000.0, mode=mode),
+                                lambda: runEngineBatch(m, altitude=5000.0, mode=mode, gas="real")])
+            ratios.append((n, real / ideal))
+            print(f"  {n:8,d}   {mode:4s}   {ideal * 1e3:10.2f}   {real * 1e3:9.2f}   {real / ideal:12.2f}")
+        n *= 10
+
+    print("\nreal gas against constant cp/gamma, Mach 0.9, 10000 m:")
+    print("  mode   Tt4 [K]   Tt45 [K]   Tt5 [K]   T9 [K]    thrust    TSFC")
+    for mode in ("dry", "wet"):
+        ideal = runEngineBatch(0.9, altitude=10000.0, mode=mode)
+        real = runEngineBatch(0.9, altitude=10000.0, mode=mode, gas="real")
+        temps = "  ".join(f"{float(real[f]):8.1f}" for f in ("Tt4", "Tt45", "Tt5", "T9"))
+        print(f"  {mode:4s} {temps}   {float(real['Net Thrust'] / ideal['Net Thrust'] - 1):+7.1%}"
+              f"  {float(real['TSFC'] / ideal['TSFC'] - 1):+7.1%}")
+    large = [ratio for size, ratio in ratios if size >= 100000]
+    print(f"\nreal gas costs {min(r for _, r in ratios):.1f}-{max(r for _, r in ratios):.1f}x the "
+          f"constant-property cycle" + (f", at most {max(large):.2f}x from 100,000 points (gate {maxRatio:.1f}x)"
+                                        if large else ""))
+
+    return 0 if all(ratio <= maxRatio for ratio in large) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,53 @@
+# cold-import cost of the engine core, measured with `python -X importtime` in fresh interpreters
+# exits non-zero if the import regresses past the thresholds (tests/test_import.py checks that it
+# pulls in no heavy optional module)
+# run from the repo root:  python benchmarks/bench_import.py [--total-ms 400] [--overhead-ms 40] [--runs 7]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+repoRoot = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def importTimes(module):
+    # {top-level module: cumulative microseconds} for one cold `import module`
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=repoRoot, capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="turbojet.cycle")
+    parser.add_argument("--total-ms", type=float, default=400.0, help="max median cold import, numpy included")
+    parser.add_argument("--overhead-ms", type=float, default=40.0, help="max median cost on top of numpy")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    totals, overheads = [], []
+    for _ in range(args.runs):
+        times = importTimes(args.module)
+        totals.append(times[args.module] / 1e3)
+        overheads.append((times[args.module] - times.get("numpy", 0)) / 1e3)
+
+    total = statistics.median(totals)
+    overhead = statistics.median(overheads)
+    print(f"import {args.module}: {total:.1f} ms median cold import, {overhead:.1f} ms on top of numpy "
+          f"(limits {args.total_ms:.0f} / {args.overhead_ms:.0f} ms, {args.runs} runs)")
+
+    if total > args.total_ms or overhead > args.overhead_ms:
+        print("FAIL: import time regressed past threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
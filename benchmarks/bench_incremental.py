@@ -0,0 +1,79 @@
+# incremental re-evaluation: cost per evaluation of sweeping one design constant or flight input
+# with incremental.incrementalCycle against a full runEngineBatch per step, the share of component
+# evaluations that still ran, with the fixed design constants and with component maps (where a
+# constant upstream of the mixer rescales them); tests/test_incremental.py checks the results
+# exits non-zero if a sweep from the afterburner on doesn't at least halve the cost
+# run from the repo root:  python benchmarks/bench_incremental.py [points per evaluation] [sweep steps]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.config import engineConfig
+from turbojet.cycle import runEngineBatch
+from turbojet.incremental import cycleGraph, incrementalCycle
+
+
+def sweep(parameter, values, conditions, inc=None, repeat=3, maps=None):
+    # (seconds per evaluation, best of repeat, and results per step) of stepping one design constant
+    # or flight input, incrementally on inc or, without one, with a full runEngineBatch each step
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        results = [step(parameter, value, conditions, inc, maps) for value in values]
+        times.append((time.perf_counter() - t) / len(values))
+    return min(times), results
+
+
+def step(parameter, value, conditions, inc, maps=None):
+    if parameter in conditions:
+        kwargs, config = dict(conditions, **{parameter: value}), None
+    else:
+        kwargs, config = conditions, engineConfig({parameter: value})
+    if inc is None:
+        return runEngineBatch(**kwargs, config=config, maps=maps)
+    if config is not None:
+        inc.set(parameter, value)
+    return inc.evaluate(**kwargs)
+
+
+def main(points=20000, steps=40):
+    mach, altitude = np.meshgrid(np.linspace(0.05, 2.25, 100), np.linspace(0.0, 15000.0, max(1, points // 100)))
+    conditions = {"mach": mach, "P0": 80000.0, "T0": 270.0, "P_ambient": 80000.0, "mode": "wet"}
+    cases = [
+        ("afterburner.afterburnertemp", np.linspace(1800.0, 2200.0, steps)),
+        ("nozzle.nozzleThroat", np.linspace(0.40, 0.50, steps)),
+        ("P_ambient", np.linspace(40000.0, 80000.0, steps)),
+        ("mixer.p_drop", np.linspace(0.02, 0.06, steps)),
+        ("combustor.titemp", np.linspace(1700.0, 2000.0, steps)),
+        ("fan.pressure_ratioFan", np.linspace(3.5, 4.5, steps)),
+        ("afterburner.afterburnertemp", np.linspace(1800.0, 2200.0, steps), "default"),
+        ("fan.pressure_ratioFan", np.linspace(3.5, 4.5, steps), "default"),
+    ]
+
+    print(f"{mach.size:,d} points per evaluation, {steps} sweep steps; ms per evaluation (best of 3 sweeps)")
+    print("  parameter                      maps      full   incremental   speedup   components run")
+    ok = True
+    for parameter, values, *maps in cases:
+        maps = maps[0] if maps else None
+        full, _ = sweep(parameter, values, conditions, maps=maps)
+        inc = incrementalCycle(maps=maps)
+        inc.evaluate(**conditions)
+        fast, _ = sweep(parameter, values, conditions, inc, maps=maps)
+        fraction = sum(s["runs"] - 1 for s in inc.stats.values()) / (len(cycleGraph) * (inc.evaluations - 1))
+        if parameter in ("afterburner.afterburnertemp", "nozzle.nozzleThroat", "P_ambient"):
+            ok &= fast < 0.5 * full
+        print(f"  {parameter:28s} {maps or '-':7s} {full * 1e3:7.2f}   {fast * 1e3:11.2f}   {full / fast:6.2f}x"
+              f"   {fraction:14.0%}")
+
+    print("\nhit pattern after the afterburner temperature sweep:")
+    inc = incrementalCycle()
+    sweep("afterburner.afterburnertemp", np.linspace(1800.0, 2200.0, steps), conditions, inc, repeat=1)
+    print(inc.report())
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,91 @@
+# component maps: lookup and beta/speed-line inversion throughput against query count, bicubic
+# and bilinear accuracy against the analytic map they were tabulated from, and what running the
+# cycle on maps costs and changes
+# exits non-zero if lookups fall below a million queries per second (tests/test_maps.py gates the
+# accuracy and the design point)
+# run from the repo root:  python benchmarks/bench_maps.py [largest query count]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.maps import compressorMap
+from turbojet.cycle import runEngineBatch
+
+
+def best(fn, repeat=5):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def exact(speed, beta):
+    # the generating functions of maps.compressorMap(8.75, 0.9)
+    flowShape = (1.06 - 0.12 * beta ** 1.5) / (1.06 - 0.12 * 0.5 ** 1.5)
+    return (speed ** 1.1 * flowShape * (1 + 0.03 * (1 - speed) * (beta - 0.5)),
+            1 + 7.75 * speed ** 2.2 * (0.8 + 0.4 * beta),
+            0.9 * (1 - 0.45 * (speed - 1) ** 2 - 0.3 * (beta - 0.55) ** 2) / (1 - 0.3 * 0.05 ** 2))
+
+
+def main(largest=10000000):
+    rng = np.random.default_rng(0)
+    maps = {order: compressorMap(8.75, 0.9, order=order) for order in ("cubic", "linear")}
+
+    # between the nodes of the 13 x 21 table
+    speed, beta = rng.uniform(0.5, 1.1, 200000), rng.uniform(0.0, 1.0, 200000)
+    truth = exact(speed, beta)
+    print("interpolation error against the analytic map, 13 speed x 21 beta lines (max relative):")
+    print("  order    flow       PR         efficiency   beta round trip   speed round trip")
+    errors = {}
+    for order, m in maps.items():
+        values = m.lookup(speed, beta)
+        errors[order] = [float(np.abs(v / t - 1).max()) for v, t in zip(values, truth)]
+        betaError = np.abs(m.solveBeta(speed, values[0]) - beta).max()
+        speedError = np.abs(m.solveSpeed(beta, values[0]) - speed).max()
+        print(f"  {order:6s} " + " ".join(f"{e:10.2e}" for e in errors[order])
+              + f"   {betaError:14.2e}   {speedError:15.2e}")
+        errors[order] += [betaError, speedError]
+
+    print("\nthroughput (best of 5), flow + PR + efficiency per query:")
+    print("     queries   order    lookup [ms]   M queries/s   solveBeta [ms]   M queries/s")
+    rates = []
+    n = 1000
+    while n <= largest:
+        s, b = rng.uniform(0.5, 1.1, n), rng.uniform(0.0, 1.0, n)
+        for order, m in maps.items():
+            flow = m.lookup(s, b, ("flow",))[0]
+            lookup = best(lambda: m.lookup(s, b), repeat=5 if n < largest else 2)
+            solve = best(lambda: m.solveBeta(s, flow), repeat=5 if n < largest else 2)
+            rates.append(n / lookup)
+            print(f"  {n:10,d}   {order:6s} {lookup * 1e3:12.2f}   {n / lookup / 1e6:11.1f}"
+                  f"   {solve * 1e3:14.2f}   {n / solve / 1e6:11.1f}")
+        n *= 10
+
+    print("\ncycle on maps against fixed pressure ratios / efficiencies, Mach 0.05-2.25 at 10000 m:")
+    print("    points   mode   fixed [ms]   maps [ms]   maps / fixed")
+    for n in (1000, 100000):
+        mach = np.linspace(0.05, 2.25, n)
+        for mode in ("dry", "wet"):
+            fixed = best(lambda: runEngineBatch(mach, altitude=10000.0, mode=mode))
+            mapped = best(lambda: runEngineBatch(mach, altitude=10000.0, mode=mode, maps="default"))
+            print(f"  {n:8,d}   {mode:4s}   {fixed * 1e3:10.2f}   {mapped * 1e3:9.2f}   {mapped / fixed:12.2f}")
+
+    print("\noff-design on the default maps (dry, 10000 m):")
+    print("   Mach   fan PR   HPC PR   thrust against fixed")
+    mach = np.array([0.5, 0.9, 1.2, 1.6, 2.0])
+    fixed = runEngineBatch(mach, altitude=10000.0, mode="dry")
+    mapped = runEngineBatch(mach, altitude=10000.0, mode="dry", maps="default")
+    for i, m in enumerate(mach):
+        print(f"  {m:5.2f}   {mapped['Pt13'][i] / mapped['Pt0'][i]:6.2f}   {mapped['Pt3'][i] / mapped['Pt13'][i]:6.2f}"
+              f"   {mapped['Net Thrust'][i] / fixed['Net Thrust'][i] - 1:+8.1%}")
+    return 0 if min(rates) > 1e6 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,34 @@
+# off-design matching: Newton iterations and time for a Mach line, warm-started coarse-to-fine
+# against a cold start at every point, with the exit area free and pinned at nozzleExitMax
+# run from the repo root:  python benchmarks/bench_matching.py [points]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.config import engineConfig
+from turbojet.matching import matchOffDesign
+
+
+def main(points=2000):
+    mach = np.linspace(0.2, 2.0, points)
+    cases = (("wet, sea level", {"mode": "wet"}),
+             ("dry, 10000 m", {"mode": "dry", "altitude": 10000.0}),
+             ("wet, 10000 m, exit max 0.8 m^2", {"mode": "wet", "altitude": 10000.0,
+                                                 "config": engineConfig({"nozzle.nozzleExitMax": 0.8})}))
+    print(f"  {f'{points:,}-point Mach line':32} start   iterations/pt   max   pinned      time")
+    for label, kwargs in cases:
+        exitMax = kwargs.get("config", engineConfig())["nozzle.nozzleExitMax"]
+        for warmStart in (True, False):
+            start = time.perf_counter()
+            res = matchOffDesign(mach, warmStart=warmStart, **kwargs)
+            elapsed = time.perf_counter() - start
+            pinned = np.isclose(res["Nozzle Exit Size"], exitMax).sum()
+            print(f"  {label:32} {'warm' if warmStart else 'cold'}   {res['Iterations'].mean():13.2f}   "
+                  f"{res['Iterations'].max():3d}   {pinned:6d}   {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,104 @@
+# mission fuel burn: missions per minute for a fleet of randomized strike missions flown by
+# mission.flyMissions in one batch, against flying them one flyMission call at a time and against
+# a throttle bisection per sample with scalar runEngine calls, and how the fuel burned converges
+# with the number of steps per segment (tests/test_mission.py checks the solved thrust and that the
+# fleet batch agrees with single missions)
+# exits non-zero unless the fleet runs at least 1000 missions per minute
+# run from the repo root:  python benchmarks/bench_mission.py [missions] [steps per segment]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngine
+from turbojet.mission import flyMission, flyMissions, missionSegment
+
+
+def strikeMission(rng, steps):
+    # climb, supercruise out, afterburning combat, subsonic cruise back; thrust for two engines,
+    # scaled by a random drag factor, and random leg lengths
+    drag = rng.uniform(0.97, 1.03)
+    return [
+        missionSegment(240, mach=(0.5, 0.9), altitude=(1000, 10000), thrust=(drag * 340e3, drag * 160e3),
+                       steps=steps, name="climb"),
+        missionSegment(rng.uniform(900, 2400), mach=1.5, altitude=12000, thrust=drag * 200e3, steps=steps,
+                       name="supercruise"),
+        missionSegment(rng.uniform(60, 180), mach=1.2, altitude=9000, thrust=drag * 340e3, mode="wet", steps=steps,
+                       name="combat"),
+        missionSegment(rng.uniform(1200, 2400), mach=0.9, altitude=10000, thrust=drag * 160e3, steps=steps,
+                       name="return"),
+    ]
+
+
+def scalarMission(segments, weight, engines=2, rtol=1e-6):
+    # the loop the batch replaces: bisect each sample's throttle with runEngine, then integrate
+    fuelFlow, times, offset = [], [], 0.0
+    for segment in segments:
+        lo, hi = (1.0 + 1e-12, 2.0) if segment.wet[0] else (0.0, 1.0)
+        for t, mach, altitude, thrust in zip(segment.times, segment.mach, segment.altitude, segment.thrust):
+            a, b = lo, hi
+            for _ in range(60):
+                mid = 0.5 * (a + b)
+                res = runEngine(mach, altitude=altitude, throttle=mid)
+                if abs(res["Net Thrust"] * engines - thrust) <= rtol * thrust:
+                    break
+                a, b = (mid, b) if not res["Net Thrust"] * engines > thrust else (a, mid)
+            fuelFlow.append(res["TSFC"] * res["Net Thrust"] * engines)
+            times.append(offset + t)
+        offset += segment.duration
+    fuelFlow, times = np.array(fuelFlow), np.array(times)
+    return weight - np.sum(0.5 * (fuelFlow[1:] + fuelFlow[:-1]) * np.diff(times))
+
+
+def main(missions=2000, steps=20):
+    rng = np.random.default_rng(0)
+    fleet = [strikeMission(rng, steps) for _ in range(missions)]
+    weights = rng.uniform(26000, 31000, missions)
+    samples = sum(len(segment) for mission in fleet for segment in mission)
+
+    flyMissions(fleet[:10], weights[:10], engines=2)
+    t = time.perf_counter()
+    result = flyMissions(fleet, weights, engines=2)
+    batched = time.perf_counter() - t
+    few = min(missions, 50)
+    t = time.perf_counter()
+    for mission, weight in zip(fleet[:few], weights[:few]):
+        flyMission(mission, weight, engines=2)
+    oneByOne = (time.perf_counter() - t) / few
+    t = time.perf_counter()
+    scalarWeights = [scalarMission(mission, weight) for mission, weight in zip(fleet[:2], weights[:2])]
+    scalar = (time.perf_counter() - t) / 2
+
+    print(f"{missions:,d} missions, 4 segments of {steps} steps each ({samples:,d} samples)")
+    print("  route                                 missions/min   ms per mission")
+    for label, seconds in (("flyMissions, whole fleet in one batch", batched / missions),
+                           ("flyMission, one mission at a time", oneByOne),
+                           ("bisection per sample with runEngine", scalar)):
+        print(f"  {label:38s} {60 / seconds:12,.0f}   {seconds * 1e3:14.3f}")
+    print(f"  fleet: {result['evaluations']} runEngineBatch calls in total")
+
+    fleetFuel = np.array([m["fuelBurned"] for m in result["missions"][:2]])
+    scalarFuel = weights[:2] - np.array(scalarWeights)
+    print(f"\nfuel burned, fleet batch against the scalar bisection: max relative difference "
+          f"{np.abs(fleetFuel[:2] / scalarFuel - 1).max():.1e}")
+
+    # integration error: the first missions again with 4x and 16x the steps
+    print("\nfuel burned against steps per segment (first 20 missions):")
+    reference = None
+    for k in (16, 4, 1):
+        rng = np.random.default_rng(0)
+        refined = [strikeMission(rng, steps * k) for _ in range(20)]
+        fuel = np.array([m["fuelBurned"] for m in flyMissions(refined, weights[:20], engines=2)["missions"]])
+        if reference is None:
+            reference = fuel
+            continue
+        print(f"  {steps * k:4d} steps   max relative difference from {steps * 16} steps "
+              f"{np.abs(fuel / reference - 1).max():.1e}")
+
+    return 0 if missions / batched * 60 >= 1000 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,109 @@
+# nozzle area-Mach inversion: accuracy of the table + Newton inverse on both branches, cost against
+# a scalar bracketing root solve per point, and the choked / over- / underexpanded split of the
+# cycle's nozzle over the flight envelope
+# exits non-zero unless the table inverse is over 100x faster than the root solve at every batch
+# size (tests/test_nozzle.py gates the accuracy)
+# run from the repo root:  python benchmarks/bench_nozzle.py [largest batch]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.classes import areaMachRatio, machFromAreaRatio, nozzle
+from turbojet.cycle import runEngineBatch
+
+
+def best(fn, repeat=5):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def scalarMach(ratio, supersonic, gamma=1.4, tol=1e-13):
+    # one point the way a per-point root finder does it: bracket the branch, then safeguarded
+    # Newton/bisection on A/A*(M) - ratio in plain Python floats
+    e = (gamma + 1) / (2 * (gamma - 1))
+    f = lambda M: (1 / M) * ((2 / (gamma + 1)) * (1 + (gamma - 1) / 2 * M * M)) ** e - ratio
+    lo, hi = (1.0, 2.0) if supersonic else (1e-12, 1.0)
+    while supersonic and f(hi) < 0:
+        lo, hi = hi, 2 * hi
+    M = 0.5 * (lo + hi)
+    for _ in range(200):
+        value = f(M)
+        if abs(value) < tol * ratio or hi - lo < tol * M:
+            break
+        if (value > 0) == supersonic:
+            hi = M
+        else:
+            lo = M
+        slope = (value + ratio) * (M * M - 1) / (M * (1 + (gamma - 1) / 2 * M * M))
+        step = M - value / slope if slope != 0 else lo - 1
+        M = step if lo < step < hi else 0.5 * (lo + hi)
+    return M
+
+
+def main(largest=1000000):
+    rng = np.random.default_rng(0)
+
+    # away from Mach 1, where the Mach is only as well determined as sqrt of the area ratio's round-off
+    print("accuracy (max relative error; Mach over |M - 1| > 1e-3, area ratio everywhere):")
+    print("  branch       Mach range     Mach error   area ratio error")
+    errors = []
+    for label, supersonic, mach in (("subsonic", False, np.concatenate([rng.uniform(1e-4, 1, 10**6),
+                                                                         10 ** rng.uniform(-6, 0, 10**5)])),
+                                    ("supersonic", True, np.concatenate([rng.uniform(1, 5, 10**6),
+                                                                         10 ** rng.uniform(0, 3, 10**5)]))):
+        ratio = areaMachRatio(mach)
+        found = machFromAreaRatio(ratio, supersonic=supersonic)
+        away = np.abs(mach - 1) > 1e-3
+        errors += [np.abs(found / mach - 1)[away].max(), np.abs(areaMachRatio(found) / ratio - 1).max()]
+        print(f"  {label:10s}   {mach.min():.0e}-{mach.max():<7.3g} {errors[-2]:11.1e}   {errors[-1]:16.1e}")
+    for polish in (0, 1, 2):
+        mach = rng.uniform(1.0, 4.0, 100000)
+        found = machFromAreaRatio(areaMachRatio(mach), supersonic=True, polish=polish)
+        print(f"  supersonic, {polish} Newton step(s): {np.abs(found / mach - 1).max():.1e}")
+
+    # reference solve on a sample, per point
+    sample = 2000
+    ratio = areaMachRatio(rng.uniform(1.05, 3.0, sample))
+    t = time.perf_counter()
+    reference = np.array([scalarMach(r, True) for r in ratio])
+    perPoint = (time.perf_counter() - t) / sample
+    agreement = np.abs(machFromAreaRatio(ratio, supersonic=True) / reference - 1).max()
+    print(f"\nscalar root solve: {perPoint * 1e6:.1f} us per point (agrees to {agreement:.1e})")
+    print("    points   vectorized [ms]   M points/s   scalar solve, est. [ms]   speedup")
+    speedups = []
+    n = 1000
+    while n <= largest:
+        ratio = areaMachRatio(rng.uniform(1.05, 3.0, n))
+        vectorized = best(lambda: machFromAreaRatio(ratio, supersonic=True))
+        speedups.append(perPoint * n / vectorized)
+        print(f"  {n:8,d}   {vectorized * 1e3:15.2f}   {n / vectorized / 1e6:10.1f}   {perPoint * n * 1e3:23.1f}"
+              f"   {speedups[-1]:7.0f}x")
+        n *= 10
+
+    # the cycle's nozzle (throat nozzleThroat, exit sized for the flight Mach within nozzleExitMax)
+    mach, altitude = np.meshgrid(np.linspace(0.05, 2.25, 45), np.linspace(0.0, 18000.0, 19))
+    print("\ncycle nozzle over Mach 0.05-2.25 x 0-18000 m (points per regime):")
+    print("  mode   unchoked   shock inside   overexpanded   ideal   underexpanded")
+    for mode in ("dry", "wet"):
+        res = runEngineBatch(mach, altitude=altitude, mode=mode)
+        noz = nozzle(res["Tt7"], res["Pt7"], res["P_ambient"], None, res["Mach"])
+        noz.nozzleExitSize()
+        regime = noz.flowRegime(rtol=1e-3)
+        counts = [(~regime["Choked"]).sum(), regime["Shock In Nozzle"].sum(),
+                  (regime["Overexpanded"] & ~regime["Shock In Nozzle"]).sum(), regime["Ideally Expanded"].sum(),
+                  regime["Underexpanded"].sum()]
+        print(f"  {mode:4s}   {counts[0]:8d}   {counts[1]:12d}   {counts[2]:12d}   {counts[3]:5d}   {counts[4]:13d}")
+
+    return 0 if min(speedups) > 100 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,45 @@
+# design-space optimization: minimum TSFC over fan/HPC pressure ratio, bypass ratio and TIT at a
+# required thrust, by the gradient and evolution solvers against grid searches of growing size
+# (tests/test_optimize.py checks that the solvers agree and end feasible)
+# run from the repo root:  python benchmarks/bench_optimize.py [finest grid points per axis]
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from turbojet import sensitivity  # loaded up front so its import time isn't charged to the first solve
+from turbojet.optimize import gridSearch, optimizationReport, optimizeDesign
+
+
+def main(finestGrid=33):
+    problem = {"requiredThrust": 100e3, "mach": 0.9, "altitude": 10000.0, "mode": "dry"}
+    print(f"minimum TSFC at Mach {problem['mach']}, {problem['altitude']:.0f} m ({problem['mode']}), "
+          f"net thrust >= {problem['requiredThrust'] / 1e3:.0f} kN\n")
+
+    gradient = optimizeDesign(method="gradient", **problem)
+    evolution = optimizeDesign(method="evolution", **problem)
+    print(optimizationReport(gradient))
+    print(optimizationReport(evolution))
+    best = min(gradient["objective"], evolution["objective"])
+
+    print("\ngrid search (relative TSFC above the solvers' optimum):")
+    print("  points/axis   evaluations      time [s]   TSFC excess")
+    grid = None
+    points = 5
+    while points <= finestGrid:
+        grid = gridSearch(points, **problem)
+        print(f"  {points:11d}   {grid['evaluations']:11,d}   {grid['seconds']:11.2f}   "
+              f"{(grid['objective'] - best) / best:11.2e}")
+        points = 2 * points - 1
+
+    solverCost = gradient["evaluations"] + gradient["gradientEvaluations"]
+    # a grid of equal accuracy is finer than the finest one run, so these factors are lower bounds
+    print(f"\nthe finest grid is still {(grid['objective'] - best) / best:.1e} short of the optimum after "
+          f"{grid['evaluations']:,} evaluations / {grid['seconds']:.2f} s;")
+    print(f"the gradient solver reaches it with {solverCost:,} evaluations / {gradient['seconds']:.2f} s: "
+          f"more than {grid['evaluations'] / solverCost:,.0f}x fewer evaluations and "
+          f"{grid['seconds'] / gradient['seconds']:.0f}x less time than a grid of equal accuracy")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
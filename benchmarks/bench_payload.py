@@ -0,0 +1,103 @@
+# worker payloads: bytes and encode + decode time per 10k operating points for api payloads against
+# pickling what a pool worker would otherwise be sent and return (per-point argument tuples and
+# runEngine dicts, or the structured arrays), and a process-pool round trip of each
+# exits non-zero unless payloads are smaller than pickling the points and smaller and faster than
+# pickling runEngine dicts; tests/test_payload.py checks that they round-trip exactly
+# run from the repo root:  python benchmarks/bench_payload.py [points]
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.api import decodePoints, decodeResults, encodePoints, encodeResults, evaluate, evaluatePayload, makePoints
+from turbojet.cycle import runEngineBatch
+
+
+def best(fn, repeat=5):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def pickledPoints(payload):
+    # worker side of the pickled-array route
+    points = pickle.loads(payload)
+    return pickle.dumps(evaluate(points)[["Net Thrust", "TSFC"]], protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def main(points=10000):
+    scale = 10000 / points
+    mach = np.linspace(0.05, 2.25, points)
+    fields = ("Net Thrust", "TSFC")
+    results = runEngineBatch(mach, altitude=10000.0, mode="wet")
+    cases = [
+        # Mach sweep at one altitude: only Mach varies
+        ("Mach sweep", makePoints(mach, altitude=10000.0, mode="wet")),
+        # scattered flight conditions: Mach, altitude and throttle all vary
+        ("scattered", makePoints(np.random.default_rng(0).uniform(0.05, 2.25, points),
+                                 altitude=np.random.default_rng(1).uniform(0, 15000, points),
+                                 throttle=np.random.default_rng(2).uniform(0.2, 2.0, points))),
+    ]
+
+    print(f"requests, per 10k points ({points:,d} encoded):")
+    print("  batch        format                        bytes    encode + decode [ms]")
+    smaller = []
+    for label, pts in cases:
+        rows = [(float(p["Mach"]), float(p["Altitude"]), float(p["Throttle"]), bool(p["Wet"])) for p in pts]
+        formats = [
+            ("pickled per-point tuples", lambda: pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+            ("pickled pointDtype array", lambda: pickle.dumps(pts, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+            ("api payload", lambda: encodePoints(pts, fields=fields), decodePoints),
+        ]
+        sizes = []
+        for name, encode, decode in formats:
+            blob = encode()
+            cost = best(lambda: decode(encode()))
+            sizes.append(len(blob))
+            print(f"  {label:11s}  {name:26s} {len(blob) * scale:9,.0f}   {cost * scale * 1e3:20.3f}")
+        smaller.append(sizes[2] < min(sizes[:2]))
+
+    print("\nreplies, per 10k points (all stations, or net thrust + TSFC only):")
+    print("  format                          bytes    encode + decode [ms]")
+    dicts = [{name: float(results[name][i]) for name in results.dtype.names} for i in range(points)]
+    subset = results[list(fields)]
+    formats = [
+        ("pickled runEngine dicts", lambda: pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ("pickled stationDtype array", lambda: pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ("api payload", lambda: encodeResults(results), decodeResults),
+        ("api payload, 2 fields", lambda: encodeResults(subset), decodeResults),
+    ]
+    replies = []
+    for name, encode, decode in formats:
+        blob = encode()
+        cost = best(lambda: decode(encode()), repeat=3)
+        replies.append((len(blob), cost))
+        print(f"  {name:28s} {len(blob) * scale:9,.0f}   {cost * scale * 1e3:20.3f}")
+
+    # the same Mach sweep through a one-worker pool, against evaluating in this process
+    pts = cases[0][1]
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(evaluatePayload, encodePoints(pts[:10], fields=fields)).result()
+        local = best(lambda: evaluate(pts), repeat=3)
+        viaPickle = best(lambda: pickle.loads(pool.submit(
+            pickledPoints, pickle.dumps(pts, protocol=pickle.HIGHEST_PROTOCOL)).result()), repeat=3)
+        viaPayload = best(lambda: decodeResults(pool.submit(
+            evaluatePayload, encodePoints(pts, fields=fields)).result()), repeat=3)
+    print(f"\nprocess pool round trip, Mach sweep of {points:,d} points (net thrust + TSFC back):")
+    print(f"  in process {local * 1e3:.2f} ms   pickled arrays {viaPickle * 1e3:.2f} ms"
+          f"   api payloads {viaPayload * 1e3:.2f} ms")
+
+    ok = all(smaller) and replies[2][0] < replies[0][0] and replies[2][1] < replies[0][1]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
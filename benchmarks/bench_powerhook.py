@@ -0,0 +1,47 @@
+# power hooks (thrust vs fuel flow over a throttle sweep at each flight condition): one batched
+# powerHook call against looping runEngine over every (condition, throttle) pair
+# (tests/test_powerhook.py checks that the two give the same thrust)
+# run from the repo root:  python benchmarks/bench_powerhook.py [conditions] [throttle points]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngine
+from turbojet.throttle import powerHook
+
+
+def main(conditions=50, throttlePoints=200):
+    mach = np.linspace(0.3, 1.6, conditions)
+    altitude = np.linspace(2000, 15000, conditions)
+    throttle = np.linspace(0, 2, throttlePoints)
+
+    start = time.perf_counter()
+    hook = powerHook(mach, throttle, altitude=altitude)
+    batchTime = time.perf_counter() - start
+
+    # the loop is slow, so time it on a subset of conditions and scale
+    sample = max(1, conditions // 10)
+    start = time.perf_counter()
+    for M, h in zip(mach[:sample], altitude[:sample]):
+        for t in throttle:
+            runEngine(M, altitude=h, throttle=t)
+    loopTime = (time.perf_counter() - start) * conditions / sample
+
+    points = conditions * throttlePoints
+    print(f"{conditions} conditions x {throttlePoints} throttle settings = {points:,} points")
+    print(f"  runEngine loop  {loopTime * 1e3:10.1f} ms  ({points / loopTime:12,.0f} pts/s, extrapolated)")
+    print(f"  powerHook       {batchTime * 1e3:10.1f} ms  ({points / batchTime:12,.0f} pts/s)")
+    print(f"  speedup {loopTime / batchTime:.0f}x")
+
+    i = conditions // 2
+    print(f"\nhook at Mach {mach[i]:.2f}, {altitude[i]:.0f} m:")
+    print("  throttle   thrust [kN]   fuel [kg/s]")
+    for j in np.linspace(0, throttlePoints - 1, 9).astype(int):
+        print(f"  {throttle[j]:8.2f}   {hook['Net Thrust'][i, j] / 1e3:11.1f}   {hook['Total Fuel Flow'][i, j]:11.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,51 @@
+# overhead of the profiling surface: runEngineBatch / runEngine before a profiler was ever
+# enabled, while one is enabled, and after it was disabled again (should match "before";
+# tests/test_profiling.py checks that disabling puts the original functions back)
+# run from the repo root:  python benchmarks/bench_profiling.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet import cycle
+from turbojet.profiling import cycleProfiler
+
+
+def best(stmt, number, repeat=7):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def measure():
+    mach = np.linspace(0.1, 2.25, 1000)
+    return (best(lambda: cycle.runEngine(0.8), 2000),
+            best(lambda: cycle.runEngineBatch(mach), 500))
+
+
+def bestOf(runs):
+    return [min(r[i] for r in runs) for i in range(2)]
+
+
+def main(rounds=5):
+    # several rounds, best of each, so machine noise doesn't read as overhead
+    before = bestOf([measure() for _ in range(rounds)])
+    prof = cycleProfiler()
+    enabledRuns, afterRuns = [], []
+    for _ in range(rounds):
+        prof.enable()
+        enabledRuns.append(measure())
+        prof.disable()
+        afterRuns.append(measure())
+    enabled = bestOf(enabledRuns)
+    after = bestOf(afterRuns)
+
+    for name, i in (("runEngine (1 pt)", 0), ("runEngineBatch (1k pts)", 1)):
+        print(f"{name:24s} before {before[i] * 1e6:9.1f} us   enabled {enabled[i] * 1e6:9.1f} us   "
+              f"disabled {after[i] * 1e6:9.1f} us   disabled overhead {100 * (after[i] / before[i] - 1):+6.1f} %")
+    print()
+    print(prof.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Jacobian of thrust / TSFC / specific thrust with respect to every component constant: forward
+# mode (dual numbers) and complex step against central finite differences, agreement and time
+# on a large sweep; disagreement is measured against each output / parameter pair's largest
+# derivative over the sweep
+# (tests/test_sensitivity.py gates the agreement)
+# run from the repo root:  python benchmarks/bench_sensitivity.py [points]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.sensitivity import columnDisagreement, finiteDifferences, sensitivities
+
+
+def main(points=20000):
+    rng = np.random.default_rng(0)
+    mach = rng.uniform(0.1, 2.2, points)
+    altitude = rng.uniform(0, 15000, points)
+    mode = np.where(rng.random(points) < 0.5, "wet", "dry")
+
+    start = time.perf_counter()
+    values, jacobian, parameters = sensitivities(mach, mode=mode, altitude=altitude)
+    dualTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, complexJacobian, _ = sensitivities(mach, mode=mode, altitude=altitude, method="complex")
+    complexTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, fdJacobian, _ = finiteDifferences(mach, mode=mode, altitude=altitude)
+    fdTime = time.perf_counter() - start
+
+    # disagreement relative to each (output, parameter) column's largest derivative over the points
+    worst = columnDisagreement(jacobian, fdJacobian).max(axis=(0, 1))
+    dualVsComplex = columnDisagreement(jacobian, complexJacobian).max()
+
+    print(f"{points:,} points x {len(parameters)} parameters x {jacobian.shape[1]} outputs")
+    print(f"  forward mode (dual) {dualTime:8.3f} s  (one pass)     {fdTime / dualTime:5.1f}x faster than differences")
+    print(f"  complex step        {complexTime:8.3f} s  ({points * len(parameters):,} complex points)  "
+          f"{fdTime / complexTime:5.1f}x")
+    print(f"  finite differences  {fdTime:8.3f} s  ({2 * len(parameters)} extra runEngineBatch sweeps)")
+    print(f"  dual vs complex step: worst disagreement {dualVsComplex:.1e} (of the column's largest derivative)\n")
+    print(f"  worst disagreement per parameter, forward mode vs central differences:")
+    for name, w in sorted(zip(parameters, worst), key=lambda item: -item[1])[:10]:
+        print(f"    {name:36s} {w:.1e}")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
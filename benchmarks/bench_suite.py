@@ -0,0 +1,145 @@
+# benchmark suite: times scalar runEngine, runEngineBatch sweeps and every classes.py component's
+# advance() at 1, 1k and 1M points and appends the run to a JSON history (benchmarks/history.json)
+# so timings can be compared between commits; the numerics are the tests' job (tests/test_golden.py
+# checks thrust / TSFC / specific thrust against benchmarks/golden.json), so an optimization should
+# pass python -m pytest and show a speedup here
+# exits non-zero if --max-slowdown / --min-speedup against the baseline entry aren't met
+# run from the repo root:  python benchmarks/bench_suite.py [--sizes 1,1000,1000000] [--baseline REV]
+#                                                          [--max-slowdown 1.25] [--min-speedup 1.1]
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngine, runEngineBatch
+from turbojet.profiling import cycleProfiler
+
+here = os.path.dirname(os.path.abspath(__file__))
+repoRoot = os.path.join(here, "..")
+
+
+def best(fn, repeat=5, budget=0.05):
+    # seconds per call: best of repeat, each averaging enough calls to fill about budget seconds
+    t = time.perf_counter()
+    fn()
+    calls = max(1, int(budget / max(time.perf_counter() - t, 1e-9)))
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        times.append((time.perf_counter() - t) / calls)
+    return min(times)
+
+
+def timings(sizes):
+    # {label: seconds per call}
+    out = {}
+    for mode in ("dry", "wet"):
+        out[f"runEngine {mode}"] = best(lambda: runEngine(0.9, mode=mode, altitude=10000.0))
+    for n in sizes:
+        mach = np.linspace(0.05, 2.25, n)
+        repeat = 3 if n >= 100000 else 7
+        for mode in ("dry", "wet"):
+            out[f"runEngineBatch {mode} {n}"] = best(lambda: runEngineBatch(mach, mode=mode, altitude=10000.0), repeat)
+        # components: self time of each advance() in a wet sweep, best of the repeats
+        perComponent = {}
+        for _ in range(repeat if n >= 1000 else 20):
+            with cycleProfiler() as prof:
+                runEngineBatch(mach, mode="wet", altitude=10000.0)
+            for label, rec in prof.stats().items():
+                if label.endswith(".advance") or label == "recordStations":
+                    seconds = rec["selfSeconds"] / rec["calls"]
+                    perComponent[label] = min(perComponent.get(label, seconds), seconds)
+        for label, seconds in perComponent.items():
+            out[f"{label} {n}"] = seconds
+    return out
+
+
+def gitState():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=repoRoot, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    commit = git("rev-parse", "HEAD")
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return commit, bool(status)
+
+
+def findBaseline(history, rev, commit):
+    # latest entry whose commit starts with rev; by default the latest from another commit
+    for entry in reversed(history):
+        if rev is not None and (entry.get("commit") or "").startswith(rev):
+            return entry
+        if rev is None and entry.get("commit") != commit:
+            return entry
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1,1000,1000000", help="comma-separated batch sizes")
+    parser.add_argument("--history", default=os.path.join(here, "history.json"))
+    parser.add_argument("--baseline", default=None,
+                        help="commit (prefix) to compare with (default: the latest entry from another commit)")
+    parser.add_argument("--max-slowdown", type=float, default=None, help="fail if any timing is this much slower")
+    parser.add_argument("--min-speedup", type=float, default=None,
+                        help="fail unless the geometric mean speedup over the baseline reaches this")
+    parser.add_argument("--no-save", action="store_true", help="don't append this run to the history")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = timings(sizes)
+    commit, dirty = gitState()
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    baseline = findBaseline(history, args.baseline, commit)
+
+    label = "this run" if baseline is None else f"baseline {(baseline.get('commit') or '?')[:10]}"
+    print(f"\n{'timing':36s} {'ms per call':>14s} {label:>20s} {'speedup':>9s}")
+    ratios = []
+    for name, seconds in results.items():
+        before = None if baseline is None else baseline["timings"].get(name)
+        if before is None:
+            print(f"{name:36s} {seconds * 1e3:14.4f}")
+            continue
+        ratios.append(before / seconds)
+        print(f"{name:36s} {seconds * 1e3:14.4f} {before * 1e3:20.4f} {before / seconds:8.2f}x")
+    ok = True
+    if ratios:
+        mean = math.exp(sum(math.log(r) for r in ratios) / len(ratios))
+        print(f"geometric mean speedup over the baseline: {mean:.2f}x (slowest {min(ratios):.2f}x)")
+        if args.max_slowdown is not None and 1 / min(ratios) > args.max_slowdown:
+            print(f"SLOWDOWN beyond {args.max_slowdown:g}x")
+            ok = False
+        if args.min_speedup is not None and mean < args.min_speedup:
+            print(f"speedup below the required {args.min_speedup:g}x")
+            ok = False
+    elif args.min_speedup is not None:
+        print("no baseline to measure a speedup against")
+        ok = False
+
+    if not args.no_save:
+        history.append({"commit": commit, "dirty": dirty, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                                    "platform": platform.platform(), "cpus": os.cpu_count()},
+                        "timings": results})
+        with open(args.history, "w") as f:
+            json.dump(history, f, indent=1)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# multi-process sweep scaling: points/s and parallel efficiency against worker count for runSweep
+# with shared-memory result buffers, against the same sweep sending every chunk's arrays back
+# through the pool's pipes and against workers returning per-point result dicts
+# exits non-zero if (on 4+ cores) the shared-memory sweep's efficiency at the full core count drops
+# below 70%; that every route returns the in-process sweep's results is tests/test_sweep.py's job
+# run from the repo root:  python benchmarks/bench_sweep_scaling.py [points] [chunk size]
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngineBatch, stationDtype
+from turbojet.sweep import gridPoints, gridShape, runSweep
+
+
+def dictChunk(grid, start, stop):
+    # worker side of the per-point route: the same batch evaluation, returned as runEngine dicts
+    res = runEngineBatch(**gridPoints(grid, start, stop))
+    return start, [{name: float(res[name][i]) for name in stationDtype.names} for i in range(stop - start)]
+
+
+def dictSweep(grid, workers, chunkSize):
+    total = int(np.prod(gridShape(grid)))
+    results = np.empty(total, dtype=stationDtype)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(dictChunk, grid, start, min(start + chunkSize, total))
+                   for start in range(0, total, chunkSize)]
+        for future in futures:
+            start, rows = future.result()
+            for i, row in enumerate(rows):
+                results[start + i] = tuple(row[name] for name in stationDtype.names)
+    return results.reshape(gridShape(grid))
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+
+def main(points=1000000, chunkSize=20000):
+    cores = os.cpu_count() or 1
+    altitudes = max(1, points // 1000)
+    grid = {"altitude": np.linspace(0.0, 15000.0, altitudes), "mach": np.linspace(0.05, 2.25, points // altitudes),
+            "mode": ["wet"]}
+    total = int(np.prod(gridShape(grid)))
+    counts = sorted({1, cores} | {2 ** k for k in range(1, 7) if 2 ** k < cores})
+
+    print(f"{total:,d} points in chunks of {chunkSize:,d}, {cores} cores; points/s (parallel efficiency)")
+    print("  workers        shared memory              pipes, arrays          pipes, per-point dicts")
+    base = {}
+    efficiency = {}
+    for workers in counts:
+        row = []
+        for route, fn in (("shared", lambda: runSweep(grid, workers=workers, chunkSize=chunkSize)[0]),
+                          ("arrays", lambda: runSweep(grid, workers=workers, chunkSize=chunkSize,
+                                                      sharedMemory=False)[0]),
+                          ("dicts", lambda: dictSweep(grid, workers, chunkSize))):
+            seconds, _ = timed(fn)
+            rate = total / seconds
+            base.setdefault(route, rate)
+            efficiency[route] = rate / (base[route] * workers)
+            row.append(f"{rate:12,.0f} ({efficiency[route]:4.0%})")
+        print(f"  {workers:7d}   " + "   ".join(f"{cell:22s}" for cell in row))
+
+    return 0 if cores < 4 or efficiency["shared"] >= 0.7 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,73 @@
+# transient spool dynamics: real-time factor of an idle -> max afterburner slam for one engine,
+# accuracy of both integrators against a fine-step reference, a stiff (small HP inertia) case,
+# and cost against batch size
+# exits non-zero unless both integrators run the single engine over 100x faster than real time
+# (tests/test_transient.py gates their accuracy)
+# run from the repo root:  python benchmarks/bench_transient.py [largest batch]
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.cycle import runEngineBatch
+from turbojet.transient import simulateTransient, spoolInertia
+
+
+def speedError(result, reference):
+    s, r = result["stations"], reference["stations"]
+    return max(np.abs(s[f] - r[f]).max() for f in ("LP Spool Speed", "HP Spool Speed"))
+
+
+def main(largest=10000):
+    times = np.linspace(0.0, 10.0, 201)
+    slam = ([0.0, 1.0, 1.0], [0.0, 0.0, 2.0])
+    flight = {"mach": 0.9, "altitude": 10000.0}
+    print(f"idle -> max afterburner at t = 1 s, Mach {flight['mach']}, {flight['altitude']:.0f} m, "
+          f"{times[-1]:.0f} s simulated, {len(times)} output times\n")
+
+    runs = {}
+    print("single engine:")
+    print("  method   steps   rejected   time [ms]   real-time factor   speed error")
+    for label, inertia in (("", spoolInertia), (" (HP inertia / 100)", (spoolInertia[0], spoolInertia[1] / 100))):
+        reference = simulateTransient(slam, times, method="rk4", step=2e-4, inertia=inertia, **flight)
+        for method in ("rk4", "ros2"):
+            simulateTransient(slam, times, method=method, inertia=inertia, **flight)
+            r = runs[method + label] = min((simulateTransient(slam, times, method=method, inertia=inertia, **flight)
+                                            for _ in range(5)), key=lambda r: r["seconds"])
+            r["error"] = speedError(r, reference)
+            print(f"  {method + label:24s} {int(r['steps']):5d}   {int(r['rejected']):8d}   "
+                  f"{r['seconds'] * 1e3:9.1f}   {r['realTime']:16.0f}   {r['error']:11.1e}")
+
+    s = runs["ros2"]["stations"]
+    steady = runEngineBatch(flight["mach"], altitude=flight["altitude"], mode="wet")
+    settled = abs(s["Net Thrust"][-1] / steady["Net Thrust"] - 1)
+    print(f"\nthrust {s['Net Thrust'][0] / 1e3:.1f} -> {s['Net Thrust'][-1] / 1e3:.1f} kN, "
+          f"HP spool {s['HP Spool Speed'][0]:.3f} -> {s['HP Spool Speed'][-1]:.3f}; settled thrust is "
+          f"{float(settled):.1e} from the steady wet cycle")
+    for t in (1.0, 1.2, 1.5, 2.0, 3.0):
+        k = np.searchsorted(times, t)
+        print(f"  t = {t:3.1f} s   LP {s['LP Spool Speed'][k]:.4f}   HP {s['HP Spool Speed'][k]:.4f}   "
+              f"thrust {s['Net Thrust'][k] / 1e3:6.1f} kN   fuel {s['Total Fuel Flow'][k]:.3f} kg/s")
+
+    # independent engines over the envelope, each with its own throttle history
+    print("\nbatches (random flight conditions and throttle steps):")
+    print("   engines   method   time [s]   per engine [ms]   engine-seconds per second")
+    rng = np.random.default_rng(0)
+    n = 1
+    while n <= largest:
+        mach, altitude = rng.uniform(0.3, 1.8, n), rng.uniform(0.0, 15000.0, n)
+        steps = ([0.0, 1.0, 1.0, 5.0, 5.0],
+                 np.stack([rng.uniform(0, 1, n), rng.uniform(0, 1, n), rng.uniform(1, 2, n), rng.uniform(1, 2, n),
+                           rng.uniform(0, 1, n)]))
+        for method in ("rk4", "ros2"):
+            r = simulateTransient(steps, times, mach, altitude=altitude, method=method)
+            print(f"  {n:8,d}   {method:6s}   {r['seconds']:8.3f}   {r['seconds'] / n * 1e3:15.3f}   "
+                  f"{r['realTime'] * n:25,.0f}")
+        n *= 10
+
+    return 0 if runs["rk4"]["realTime"] > 100 and runs["ros2"]["realTime"] > 100 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,64 @@
+# uncertainty propagation: convergence of the Sobol, Latin hypercube and plain random samplers
+# against a large Sobol reference, memory against sample count, and throughput against workers
+# (tests/test_uncertainty.py checks the percentiles, the memory bound and that worker counts agree)
+# run from the repo root:  python benchmarks/bench_uncertainty.py [reference samples] [workers]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from turbojet.uncertainty import propagateUncertainty, uncertaintyReport
+
+
+def main(referenceSamples=1000000, workers=os.cpu_count() or 1):
+    flight = {"altitude": 10000.0, "mode": "wet"}
+    start = time.perf_counter()
+    reference = propagateUncertainty(0.9, samples=referenceSamples, workers=workers, **flight)
+    print(uncertaintyReport(reference))
+    print(f"\n{referenceSamples:,} samples ({reference['evaluations']:,} evaluations) on {workers} worker(s): "
+          f"{time.perf_counter() - start:.2f} s, {reference['evaluations'] / reference['seconds']:,.0f} evaluations/s")
+
+    # error of the mean, P95 and the largest total index against the reference, over 8 seeds
+    field = "Net Thrust"
+    top = max(reference["sobol"][field]["total"], key=reference["sobol"][field]["total"].get)
+    print(f"\n{field}: rms error over 8 seeds (relative to the reference's std; total index of {top})")
+    print("  samples   method        mean        P95   total index")
+    for samples in (1000, 10000, 100000):
+        for method in ("random", "lhs", "sobol"):
+            errors = []
+            for seed in range(8):
+                r = propagateUncertainty(0.9, samples=samples, method=method, seed=seed + 1, **flight)
+                errors.append(((r["mean"][field] - reference["mean"][field]) / reference["std"][field],
+                               (r["percentiles"][field][95] - reference["percentiles"][field][95])
+                               / reference["std"][field],
+                               r["sobol"][field]["total"][top] - reference["sobol"][field]["total"][top]))
+            rms = np.sqrt(np.mean(np.square(errors), axis=0))
+            print(f"  {samples:7,d}   {method:8s} {rms[0]:10.2e} {rms[1]:10.2e} {rms[2]:13.2e}")
+
+    # memory follows the batch size, not the sample count
+    print("\npeak traced memory, batches of 4,096 samples x 15 evaluations:")
+    print("    samples   peak [MB]")
+    peaks = []
+    for samples in (25000, 100000, 400000):
+        tracemalloc.start()
+        propagateUncertainty(0.9, samples=samples, **flight)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+        tracemalloc.stop()
+        print(f"  {samples:9,d}   {peaks[-1]:9.1f}")
+
+    small = {"samples": 20000, "batchSize": 2048, **flight}
+    timings = {}
+    for count in sorted({1, workers}):
+        t = time.perf_counter()
+        timings[count] = propagateUncertainty(0.9, workers=count, **small)
+        timings[count]["wall"] = time.perf_counter() - t
+    print("\nworkers   wall [s]")
+    for count, r in timings.items():
+        print(f"  {count:5d}   {r['wall']:8.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,51 @@
+# adaptive sampling: the reported evaluations are every point the refinement sent through the
+# cycle, and interpolating the refined samples stays within tol of the cycle between them
+
+import numpy as np
+import pytest
+from turbojet import adaptive
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    # points passed to runEngineBatch by adaptive.py
+    calls = []
+    runEngineBatch = adaptive.runEngineBatch
+
+    def counting(mach, *args, **kwargs):
+        calls.append(np.size(mach))
+        return runEngineBatch(mach, *args, **kwargs)
+
+    monkeypatch.setattr(adaptive, "runEngineBatch", counting)
+    return calls
+
+
+def testRefineMachCountsEvaluations(counted):
+    _, stats = adaptive.refineMach(0.05, 2.25, tol=1e-3, mode="dry")
+    assert stats["evaluations"] == sum(counted)
+
+
+def testRefineEnvelopeCountsEvaluations(counted):
+    env = adaptive.refineEnvelope(tol=2e-2)
+    assert env.stats["evaluations"] == sum(counted) == len(env.points)
+
+
+@pytest.mark.parametrize("mode", ["dry", "wet"])
+def testRefineMachMeetsTol(mode):
+    # piecewise-linear interpolation of the refined samples against a dense sweep
+    res, stats = adaptive.refineMach(0.05, 2.25, tol=1e-3, mode=mode)
+    assert stats["converged"]
+    dense = np.linspace(0.05, 2.25, 20001)
+    reference = adaptive.runEngineBatch(dense, mode=mode)
+    for name in adaptive.refineFields:
+        assert np.nanmax(np.abs(np.interp(dense, res["Mach"], res[name]) / reference[name] - 1)) <= 1e-3, name
+
+
+def testRefineEnvelopeMeetsTol():
+    # bilinear lookup over the leaves against the cycle at random points inside the rectangle
+    env = adaptive.refineEnvelope(tol=2e-3)
+    rng = np.random.default_rng(0)
+    mach, altitude = rng.uniform(0.05, 2.25, 20000), rng.uniform(0, 18000, 20000)
+    reference = adaptive.runEngineBatch(mach, altitude=altitude)
+    for name in adaptive.refineFields:
+        assert np.abs(env.query(mach, altitude, name) / reference[name] - 1).max() <= 2e-3, name
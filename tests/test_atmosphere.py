@@ -0,0 +1,52 @@
+# standard atmosphere: the precomputed table against the closed-form ISA model, the published
+# anchor values, and runEngine driven by altitude against the same conditions given by hand
+
+import numpy as np
+import pytest
+from turbojet.atmosphere import bottom, isa, isaClosedForm, isaTable, top
+from turbojet.cycle import runEngine
+
+tolerance = 1e-8
+
+
+def testTableMatchesClosedForm():
+    tempError, pressError = isaTable().maxError()
+    assert tempError < tolerance
+    assert pressError < tolerance
+
+
+def testLookupAtRandomAltitudes():
+    h = np.random.default_rng(0).uniform(bottom, top, 100000)
+    T, P = isa(h)
+    Tc, Pc = isaClosedForm(h)
+    np.testing.assert_allclose(T, Tc, rtol=tolerance, atol=0)
+    np.testing.assert_allclose(P, Pc, rtol=tolerance, atol=0)
+
+
+@pytest.mark.parametrize("altitude, T, P", ((0.0, 288.15, 101325.0), (11000.0, 216.65, 22632.06),
+                                            (20000.0, 216.65, 5474.89)))
+def testAnchorValues(altitude, T, P):
+    Tt, Pt = isa(altitude)
+    assert float(Tt) == pytest.approx(T, abs=0.01)
+    assert float(Pt) == pytest.approx(P, rel=1e-5)
+
+
+def testShapeFollowsAltitude():
+    assert np.shape(isa(5000.0)[0]) == ()
+    assert isa(np.zeros((3, 4)))[1].shape == (3, 4)
+
+
+def testOutOfRange():
+    with pytest.raises(ValueError):
+        isa(top + 1.0)
+
+
+@pytest.mark.parametrize("mode", ("dry", "wet"))
+@pytest.mark.parametrize("altitude", (0.0, 6000.0, 15000.0))
+def testRunEngineAltitude(altitude, mode):
+    # the table's conditions are within its 1e-8 of the closed form, and so is the engine
+    T, P = isaClosedForm(altitude)
+    byAltitude = runEngine(0.9, mode=mode, altitude=altitude)
+    byHand = runEngine(0.9, mode=mode, initialPress=float(P), initialTemp=float(T), P_ambient=float(P))
+    for name in ("Net Thrust", "TSFC", "Specific Thrust"):
+        assert float(byAltitude[name]) == pytest.approx(float(byHand[name]), rel=1e-7)
@@ -0,0 +1,16 @@
+# batched evaluation: runEngineBatch gives the per-point runEngine loop's results bit for bit, dry
+# and wet, from sea level into the stratosphere
+import numpy as np
+import pytest
+from turbojet.cycle import runEngine, runEngineBatch
+
+
+@pytest.mark.parametrize("mode", ["dry", "wet"])
+@pytest.mark.parametrize("altitude", [None, 10000.0, 15000.0])
+def testLoopMatchesBatch(mode, altitude):
+    mach = np.linspace(0.05, 2.25, 60)
+    batch = runEngineBatch(mach, mode=mode, altitude=altitude)
+    for i, M in enumerate(mach):
+        point = runEngine(M, mode=mode, altitude=altitude)
+        for name, value in point.items():
+            assert np.array_equal(value, batch[name][i], equal_nan=True), f"Mach {M}, {name}"
@@ -0,0 +1,60 @@
+# operatingPointCache: hits return exactly what runEngine computes, the SQLite store round-trips
+# (nan included) between cache objects, and a changed component constant invalidates both the
+# cached points and the per-thread cycles the recompute runs on
+import math
+
+from turbojet import classes
+from turbojet.cache import operatingPointCache, resultKeys
+from turbojet.config import designConstants
+from turbojet.cycle import currentCycle, runEngine
+
+
+def same(a, b):
+    return all(a[k] == b[k] or (math.isnan(a[k]) and math.isnan(b[k])) for k in resultKeys)
+
+
+def testHitsMatchRunEngine():
+    cache = operatingPointCache()
+    for mach in (0.0, 0.8, 1.6):
+        first = cache.runEngine(mach, "dry", altitude=5000.0)
+        again = cache.runEngine(mach, "dry", altitude=5000.0)
+        point = runEngine(mach, "dry", altitude=5000.0)
+        assert same(first, again)
+        assert same(first, {k: float(point[k]) for k in resultKeys})
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 3
+
+
+def testSqliteStoreIsShared(tmp_path):
+    path = str(tmp_path / "points.sqlite")
+    writer = operatingPointCache(path=path)
+    computed = [writer.runEngine(mach, "wet") for mach in (0.0, 0.9)]
+    writer.close()
+    reader = operatingPointCache(path=path)
+    loaded = [reader.runEngine(mach, "wet") for mach in (0.0, 0.9)]
+    assert reader.stats()["diskHits"] == 2 and reader.stats()["misses"] == 0
+    assert all(same(a, b) for a, b in zip(computed, loaded))
+    reader.close()
+
+
+def testChangedConstantInvalidates(tmp_path, monkeypatch):
+    cache = operatingPointCache(path=str(tmp_path / "points.sqlite"))
+    before = cache.runEngine(0.9, "dry")["Net Thrust"]
+
+    original = classes.fan.__init__
+
+    def patched(self, *args):
+        original(self, *args)
+        self.pressure_ratioFan = 3
+
+    monkeypatch.setattr(classes.fan, "__init__", patched)
+    after = cache.runEngine(0.9, "dry")["Net Thrust"]
+    assert cache.stats()["invalidations"] == 1
+    assert after != before
+    assert currentCycle().fan.pressure_ratioFan == 3
+    assert dict(designConstants())["fan.pressure_ratioFan"] == 3
+    assert after == float(runEngine(0.9, "dry")["Net Thrust"])
+
+    # and back: the original constants give the original thrust, not the patched one
+    monkeypatch.undo()
+    assert cache.runEngine(0.9, "dry")["Net Thrust"] == before
+    cache.close()
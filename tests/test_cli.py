@@ -0,0 +1,51 @@
+# command line: a sweep written to csv or npz holds exactly what runEngineBatch computes over the
+# same grid, --fields keeps only the named columns, and the deck command writes a deck that
+# reproduces direct evaluation at its nodes
+import numpy as np
+from turbojet.cli import main
+from turbojet.cycle import runEngineBatch, stationDtype
+from turbojet.deck import performanceDeck
+
+
+def sweepGrid():
+    M, h = np.meshgrid(np.linspace(0, 2.25, 10), np.linspace(0, 15000, 4), indexing="ij")
+    return runEngineBatch(M, altitude=h, mode="wet")
+
+
+def testSweepCsv(tmp_path):
+    path = str(tmp_path / "sweep.csv")
+    assert main(["sweep", "--mach", "0:2.25:10", "--altitude", "0:15000:4", "--chunk-size", "7", "-o", path,
+                 "-q"]) == 0
+    with open(path) as f:
+        header = f.readline().strip().split(",")
+    assert tuple(header) == stationDtype.names
+    written = np.loadtxt(path, delimiter=",", skiprows=1)
+    expected = sweepGrid().ravel()
+    for k, name in enumerate(header):
+        np.testing.assert_array_equal(written[:, k], expected[name].astype(float), err_msg=name)
+
+
+def testSweepNpz(tmp_path):
+    path = str(tmp_path / "sweep.npz")
+    assert main(["sweep", "--mach", "0:2.25:10", "--altitude", "0:15000:4", "--fields", "Net Thrust,TSFC",
+                 "--workers", "2", "--chunk-size", "7", "-o", path, "-q"]) == 0
+    with np.load(path) as f:
+        results = f["results"]
+        np.testing.assert_array_equal(f["axis_mach"], np.linspace(0, 2.25, 10))
+        np.testing.assert_array_equal(f["axis_altitude"], np.linspace(0, 15000, 4))
+    expected = sweepGrid()[..., None]  # the --mode axis, wet only
+    assert results.dtype.names == ("Net Thrust", "TSFC") and results.shape == expected.shape
+    for name in results.dtype.names:
+        np.testing.assert_array_equal(results[name], expected[name])
+
+
+def testDeck(tmp_path):
+    path = str(tmp_path / "f119.deck")
+    assert main(["deck", "--mach", "0.2:1.8:5", "--altitude", "0:15000:4", "--throttle", "0:1:3",
+                 "--validate", "0", "-o", path, "-q"]) == 0
+    deck = performanceDeck(path)
+    M, h = np.meshgrid(np.linspace(0.2, 1.8, 5), np.linspace(0, 15000, 4), indexing="ij")
+    direct = runEngineBatch(M, altitude=h, mode="dry")
+    approx = deck.query(M, h, 1.0)
+    for name in deck.fields:
+        np.testing.assert_allclose(approx[name], direct[name], rtol=1e-12, err_msg=name)
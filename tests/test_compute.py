@@ -0,0 +1,35 @@
+# component adapters: the dict-returning compute() chain, fresh component objects per stage as the
+# cycle was run before StationState, still gives the engineCycle hot path's thrust bit for bit
+import numpy as np
+from turbojet.classes import (afterBurner, bypassSplit, combustor, exhaust, fan, highPressureCompressor,
+                              highPressureTurbine, inlet, lowPressureTurbine, mixer, nozzle)
+from turbojet.cycle import currentCycle
+
+
+def dictCycle(mach, P0, T0, P_ambient):
+    i = inlet(mach, P0, T0).compute()
+    f = fan(i["Stagnation Press (Pt0)"], i["Stagnation Temp (Tt0)"], i["Mass Flow"]).compute()
+    b = bypassSplit(f["Stagnation Press (out)"], i["Mass Flow"], f["Stagnation Temp (out)"]).compute()
+    h = highPressureCompressor(f["Stagnation Press (out)"], f["Stagnation Temp (out)"], b["Core Mass Flow"]).compute()
+    c = combustor(h["Stagnation Press (out)"], h["Stagnation Temp (out)"], b["Core Mass Flow"]).compute()
+    hpt = highPressureTurbine(c["Stagnation Temp (out)"], c["Stagnation Press (out)"], c["Total Mass Flow"],
+                              h["HPC Work (W)"]).compute()
+    lpt = lowPressureTurbine(hpt["Stagnation Temp (out)"], hpt["Stagnation Press (out)"], c["Total Mass Flow"],
+                             f["Fan Work (W)"]).compute()
+    m = mixer(c["Total Mass Flow"], lpt["Stagnation Temp (out)"], lpt["Stagnation Press (out)"],
+              b["Bypass Mass Flow"], f["Stagnation Temp (out)"], f["Stagnation Press (out)"]).compute()
+    a = afterBurner(m["Stagnation Temp (out)"], m["Stagnation Press (out)"], m["Mixed Mass Flow"]).compute()
+    fuel = a["Mass flow of fuel"] + c["Mass flow of fuel"]
+    n = nozzle(a["Stagnation Temp (out)"], a["Stagnation Press (out)"], P_ambient, a["Total Mass flow"], mach).compute()
+    e = exhaust(n["Nozzle Exit Velocity"], a["Total Mass flow"], fuel, n["Nozzle Exit Size"],
+                n["Static Press (out)"], P_ambient, 0).compute()
+    return e["Net Thrust"]
+
+
+def testDictChainMatchesCycle():
+    for points in (1, 1000):
+        mach = np.linspace(0.1, 2.25, points)
+        args = (mach, np.full(points, 101325.0), np.full(points, 298.0), np.full(points, 101325.0))
+        cycle = currentCycle()
+        cycle.run(*args, np.True_)
+        np.testing.assert_array_equal(dictCycle(*args), cycle.exhaust.thrust)
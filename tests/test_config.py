@@ -0,0 +1,55 @@
+# engine configurations: a configBatch gives what one runEngineBatch call per engineConfig gives, to
+# rounding (array design constants go through NumPy's vectorized pow, a float one through the C
+# library's) and with the same nan points; configs survive a TOML / JSON round trip and can't be
+# changed in place
+import numpy as np
+import pytest
+from turbojet.config import configBatch, engineConfig
+from turbojet.cycle import runEngineBatch
+
+
+def testBatchMatchesPerConfig():
+    rng = np.random.default_rng(0)
+    designs = 200
+    batch = configBatch({
+        "fan.pressure_ratioFan": rng.uniform(3.5, 4.5, designs),
+        "split.bypaRatio": rng.uniform(0.3, 0.6, designs),
+        "hpc.hpcPressRatio": rng.uniform(8.0, 9.5, designs),
+        "combustor.titemp": rng.uniform(1850, 1990, designs),
+        "hpt.efficiency": rng.uniform(0.90, 0.95, designs),
+        "nozzle.nozzleThroat": rng.uniform(0.43, 0.49, designs),
+    })
+    conditions = {"altitude": 10000.0, "throttle": 1.6}
+    batchThrust = runEngineBatch(0.9, config=batch, **conditions)["Net Thrust"]
+    loopThrust = np.array([runEngineBatch(0.9, config=batch[i], **conditions)["Net Thrust"] for i in range(designs)])
+    np.testing.assert_array_equal(np.isnan(batchThrust), np.isnan(loopThrust))
+    np.testing.assert_allclose(batchThrust, loopThrust, rtol=1e-14)
+
+
+def testDefaultConfigIsClassesDesign():
+    mach = np.linspace(0, 2.25, 10)
+    np.testing.assert_array_equal(runEngineBatch(mach, config=engineConfig())["Net Thrust"],
+                                  runEngineBatch(mach)["Net Thrust"])
+
+
+@pytest.mark.parametrize("suffix", [".toml", ".json"])
+@pytest.mark.parametrize("full", [False, True])
+def testSaveLoadRoundTrip(tmp_path, suffix, full):
+    config = engineConfig({"fan.pressure_ratioFan": 4.2, "combustor": {"titemp": 1950.0}}, hpt__efficiency=0.93)
+    path = str(tmp_path / ("variant" + suffix))
+    config.save(path, full=full)
+    loaded = engineConfig.load(path)
+    assert loaded == config and hash(loaded) == hash(config) and loaded.digest() == config.digest()
+
+
+def testImmutable():
+    config = engineConfig(fan__pressure_ratioFan=4.2)
+    with pytest.raises(AttributeError):
+        config._values = ()
+    with pytest.raises(AttributeError):
+        del config._hash
+    changed = config.replace(split__bypaRatio=0.4)
+    assert config["split.bypaRatio"] != 0.4 and changed["split.bypaRatio"] == 0.4
+    assert changed["fan.pressure_ratioFan"] == 4.2
+    with pytest.raises(KeyError):
+        engineConfig({"fan.noSuchConstant": 1.0})
@@ -0,0 +1,67 @@
+# performance decks: node values equal direct evaluation, the stored error bounds hold, the
+# header round-trips the engine config and throttle schedule (breakpoint tables included), and
+# several processes mapping one deck file read the same values
+
+import numpy as np
+import pytest
+from turbojet.config import engineConfig
+from turbojet.cycle import runEngineBatch
+from turbojet.deck import buildDeck, performanceDeck
+from turbojet.throttle import throttleSchedule
+
+mach = np.linspace(0.2, 1.8, 9)
+altitude = np.linspace(0, 15000, 7)
+throttle = np.linspace(0, 1, 5)
+
+
+@pytest.fixture(scope="module")
+def custom(tmp_path_factory):
+    schedule = throttleSchedule(tit=((0.0, 1300.0), (0.5, 1600.0), (1.0, 1950.0)),
+                                afterburner=((1.0, 1400.0), (2.0, 2300.0)))
+    config = engineConfig({"fan.pressure_ratioFan": 4.2})
+    path = str(tmp_path_factory.mktemp("deck") / "custom.deck")
+    buildDeck(path, mach, altitude, throttle, schedule=schedule, config=config, validate=500)
+    return path, schedule, config
+
+
+def testHeaderRoundTrip(custom):
+    path, schedule, config = custom
+    deck = performanceDeck(path)
+    assert deck.config == config
+    np.testing.assert_array_equal(deck.schedule.tit, schedule.tit)
+    np.testing.assert_array_equal(deck.schedule.afterburner, schedule.afterburner)
+    assert (deck.schedule.idleTIT, deck.schedule.litTemp) == (schedule.idleTIT, schedule.litTemp)
+
+
+def testNodesMatchDirect(custom):
+    path, schedule, config = custom
+    deck = performanceDeck(path)
+    M, h, t = np.meshgrid(mach, altitude, throttle + 1, indexing="ij")
+    t[..., 0] = np.nextafter(1.0, 2.0)
+    direct = runEngineBatch(M, altitude=h, throttle=t, schedule=schedule, config=config)
+    for method in ("linear", "cubic"):
+        approx = deck.query(M, h, t, method=method)
+        for name in deck.fields:
+            np.testing.assert_allclose(approx[name], direct[name], rtol=1e-12, err_msg=f"{method}, {name}")
+
+
+def testErrorBoundsUseStoredSchedule(custom):
+    # re-measured on the reopened deck without passing the schedule: same bounds as at build time
+    path, _, _ = custom
+    deck = performanceDeck(path)
+    again = deck.errorBounds(500, method="linear")
+    assert again == deck.errors["linear"]
+
+
+def _workerQuery(path):
+    return float(performanceDeck(path).query(0.9, 10000, 1.5, fields=["Net Thrust"])["Net Thrust"])
+
+
+def testProcessesShareOneDeck(custom):
+    # every worker maps the same file and reads the same value the parent does
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = custom[0]
+    with ProcessPoolExecutor(2) as pool:
+        answers = list(pool.map(_workerQuery, [path] * 4))
+    assert answers == [_workerQuery(path)] * 4
@@ -0,0 +1,45 @@
+# variable gas properties: cp between the table nodes against the NASA polynomials, the enthalpy
+# and entropy-function inverses, isentropic compression and the static state, over 200-2900 K and
+# fuel-air ratios 0-0.07
+import numpy as np
+import pytest
+from turbojet.gas import _mixtureCp, variableGas
+
+
+@pytest.fixture(scope="module")
+def states():
+    rng = np.random.default_rng(0)
+    T = rng.uniform(200.0, 2900.0, 200000)
+    far = rng.uniform(0.0, 0.07, T.size)
+    return variableGas(), rng, T, far
+
+
+def testSpecificHeat(states):
+    gas, _, T, far = states
+    cpAir, cpFuel = _mixtureCp(T)
+    assert np.abs(gas.specificHeat(T, far) / ((cpAir + far * cpFuel) / (1 + far)) - 1).max() < 1e-5
+
+
+def testInverses(states):
+    gas, _, T, far = states
+    assert np.abs(gas.temperature(gas.enthalpyAt(T, far), far) - T).max() < 1e-6
+    assert np.abs(gas.isentropicTemperature(T, 1.0, far) - T).max() < 1e-6
+
+
+def testCompress(states):
+    # compressor range: the exit temperature stays inside the table
+    gas, _, T, far = states
+    inlet = T < 2000.0
+    Tout, _ = gas.compress(T[inlet], 3.0, 1.0, far[inlet])
+    assert np.abs(gas.pressureRatio(T[inlet], Tout, far[inlet]) - 3.0).max() < 1e-9
+
+
+def testStaticState(states):
+    # nozzle range: the static temperature stays inside the table
+    gas, rng, T, far = states
+    hot = T > 600.0
+    mach = rng.uniform(0.1, 2.5, hot.sum())
+    static, _, velocity = gas.staticState(T[hot], mach, far[hot])
+    cp = gas.specificHeat(static, far[hot])
+    R = gas.gasConstant(far[hot])
+    assert np.abs(velocity / np.sqrt(cp / (cp - R) * R * static) - mach).max() < 1e-6
@@ -0,0 +1,77 @@
+# golden values: net thrust, TSFC and specific thrust over Mach 0-2.25, dry and wet, at sea level
+# and 10000 m, against benchmarks/golden.json; an optimization has to leave them unchanged
+# after an intended change to the physics, rewrite them from the repo root with
+#     PYTHONPATH=. python tests/test_golden.py --update
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+from turbojet.cycle import runEngine, runEngineBatch
+
+goldenPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "golden.json")
+goldenFields = ("Net Thrust", "TSFC", "Specific Thrust")
+goldenMach = np.round(np.linspace(0.0, 2.25, 46), 12)
+# flight conditions the golden values cover: main.py's defaults and the design altitude
+goldenCases = {"sea level": {}, "10000 m": {"altitude": 10000.0}}
+# a length-1 batch or another NumPy build may round differently in the last bits
+rtol = 1e-12
+
+
+def goldenValues():
+    # {case: {mode: {field: list}}}, nan as None so the file stays plain JSON
+    values = {}
+    for case, conditions in goldenCases.items():
+        values[case] = {}
+        for mode in ("dry", "wet"):
+            res = runEngineBatch(goldenMach, mode=mode, **conditions)
+            values[case][mode] = {name: [None if math.isnan(v) else float(v) for v in res[name]]
+                                  for name in goldenFields}
+    return values
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(goldenPath) as f:
+        return json.load(f)
+
+
+def expected(golden, case, mode, name):
+    return np.array([np.nan if v is None else v for v in golden["values"][case][mode][name]])
+
+
+def testGoldenMach(golden):
+    assert np.array_equal(golden["mach"], goldenMach)
+
+
+@pytest.mark.parametrize("mode", ("dry", "wet"))
+@pytest.mark.parametrize("case", tuple(goldenCases))
+def testBatchMatchesGolden(golden, case, mode):
+    res = runEngineBatch(goldenMach, mode=mode, **goldenCases[case])
+    for name in goldenFields:
+        # nan (Mach 0, no inlet flow) exactly where the golden values have it
+        np.testing.assert_allclose(res[name], expected(golden, case, mode, name), rtol=rtol, atol=0,
+                                   err_msg=f"{case}, {mode}, {name}")
+
+
+@pytest.mark.parametrize("mode", ("dry", "wet"))
+@pytest.mark.parametrize("case", tuple(goldenCases))
+def testRunEngineMatchesGolden(golden, case, mode):
+    for i in (5, 20, 45):
+        point = runEngine(goldenMach[i], mode=mode, **goldenCases[case])
+        for name in goldenFields:
+            assert float(point[name]) == pytest.approx(expected(golden, case, mode, name)[i], rel=rtol, abs=0), \
+                f"{case}, {mode}, {name} at Mach {goldenMach[i]}"
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["--update"]:
+        sys.exit("usage: PYTHONPATH=. python tests/test_golden.py --update   (rewrites benchmarks/golden.json from this tree)")
+    with open(goldenPath, "w") as f:
+        json.dump({"description": "runEngineBatch thrust [N], TSFC [kg/(N s)] and specific thrust [N s/kg] "
+                                  "over Mach 0-2.25; None where undefined (Mach 0 has no inlet flow)",
+                   "fields": list(goldenFields), "mach": goldenMach.tolist(),
+                   "conditions": goldenCases, "values": goldenValues()}, f, indent=1)
+    print(f"golden values written to {os.path.normpath(goldenPath)}")
@@ -0,0 +1,19 @@
+# import surface: loading the engine core in a fresh interpreter pulls in none of the heavy
+# optional modules (their import time is measured in benchmarks/bench_import.py)
+import os
+import subprocess
+import sys
+
+import pytest
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+forbidden = ("sympy", "matplotlib", "scipy", "pandas", "pyarrow")
+
+
+@pytest.mark.parametrize("module", ["turbojet.cycle", "turbojet"])
+def testNoHeavyImports(module):
+    child = f"import sys, {module}\nprint(' '.join(sorted(sys.modules)))\n"
+    out = subprocess.run([sys.executable, "-c", child], cwd=root, capture_output=True, text=True, check=True)
+    pulled = {name for name in out.stdout.split() if name.split(".")[0] in forbidden}
+    assert not pulled, f"importing {module} pulled in {', '.join(sorted(pulled))}"
@@ -0,0 +1,46 @@
+# incremental re-evaluation: stepping a design constant or flight input through incrementalCycle
+# gives runEngineBatch's results bit for bit, with the fixed design constants and with component
+# maps (where a constant upstream of the mixer rescales them), and a change from the afterburner on
+# reruns only the components downstream of it
+import numpy as np
+import pytest
+from turbojet.config import engineConfig
+from turbojet.cycle import runEngineBatch
+from turbojet.incremental import incrementalCycle
+
+mach, altitude = np.meshgrid(np.linspace(0.05, 2.25, 25), np.linspace(0.0, 15000.0, 4))
+conditions = {"mach": mach, "P0": 80000.0, "T0": 270.0, "P_ambient": 80000.0, "mode": "wet"}
+cases = [
+    ("afterburner.afterburnertemp", np.linspace(1800.0, 2200.0, 5), None),
+    ("nozzle.nozzleThroat", np.linspace(0.40, 0.50, 5), None),
+    ("P_ambient", np.linspace(40000.0, 80000.0, 5), None),
+    ("mixer.p_drop", np.linspace(0.02, 0.06, 5), None),
+    ("combustor.titemp", np.linspace(1700.0, 2000.0, 5), None),
+    ("fan.pressure_ratioFan", np.linspace(3.5, 4.5, 5), None),
+    ("afterburner.afterburnertemp", np.linspace(1800.0, 2200.0, 5), "default"),
+    ("fan.pressure_ratioFan", np.linspace(3.5, 4.5, 5), "default"),
+]
+
+
+@pytest.mark.parametrize("parameter, values, maps", cases)
+def testMatchesRunEngineBatch(parameter, values, maps):
+    inc = incrementalCycle(maps=maps)
+    inc.evaluate(**conditions)
+    for value in values:
+        if parameter in conditions:
+            kwargs, config = dict(conditions, **{parameter: value}), None
+        else:
+            kwargs, config = conditions, engineConfig({parameter: value})
+            inc.set(parameter, value)
+        res = inc.evaluate(**kwargs)
+        ref = runEngineBatch(**kwargs, config=config, maps=maps)
+        for name in ref.dtype.names:
+            np.testing.assert_array_equal(res[name], ref[name], err_msg=f"{parameter} = {value}, {name}")
+
+
+def testUpstreamComponentsSkipped():
+    inc = incrementalCycle()
+    inc.evaluate(**conditions)
+    inc.set("afterburner.afterburnertemp", 2000.0)
+    inc.evaluate(**conditions)
+    assert inc.stats["fan"]["runs"] == 1 and inc.stats["afterburner"]["runs"] == 2
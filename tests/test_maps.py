@@ -0,0 +1,41 @@
+# component maps: bicubic lookups against the analytic map they were tabulated from, the beta and
+# speed-line inversions round trip, and the default maps reproduce the fixed cycle at their design
+# point (Mach 0.9, 10000 m)
+import numpy as np
+import pytest
+from turbojet.cycle import runEngineBatch
+from turbojet.maps import compressorMap
+
+
+def exact(speed, beta):
+    # the generating functions of maps.compressorMap(8.75, 0.9)
+    flowShape = (1.06 - 0.12 * beta ** 1.5) / (1.06 - 0.12 * 0.5 ** 1.5)
+    return (speed ** 1.1 * flowShape * (1 + 0.03 * (1 - speed) * (beta - 0.5)),
+            1 + 7.75 * speed ** 2.2 * (0.8 + 0.4 * beta),
+            0.9 * (1 - 0.45 * (speed - 1) ** 2 - 0.3 * (beta - 0.55) ** 2) / (1 - 0.3 * 0.05 ** 2))
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(0)
+    speed, beta = rng.uniform(0.5, 1.1, 200000), rng.uniform(0.0, 1.0, 200000)
+    m = compressorMap(8.75, 0.9, order="cubic")
+    return m, speed, beta, m.lookup(speed, beta)
+
+
+def testCubicAgainstAnalytic(queries):
+    _, speed, beta, values = queries
+    for name, v, t in zip(("flow", "PR", "efficiency"), values, exact(speed, beta)):
+        assert np.abs(v / t - 1).max() < 2e-3, name
+
+
+def testInversionsRoundTrip(queries):
+    m, speed, beta, values = queries
+    assert np.abs(m.solveBeta(speed, values[0]) - beta).max() < 1e-6
+    assert np.abs(m.solveSpeed(beta, values[0]) - speed).max() < 1e-6
+
+
+def testDesignPointMatchesFixedCycle():
+    mapped = runEngineBatch(0.9, altitude=10000.0, mode="dry", maps="default")
+    fixed = runEngineBatch(0.9, altitude=10000.0, mode="dry")
+    assert abs(float(mapped["Net Thrust"] / fixed["Net Thrust"]) - 1) < 1e-12
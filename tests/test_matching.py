@@ -0,0 +1,40 @@
+# off-design matching: every point closes its residuals, the cold guess already is the solution
+# while the exit area is free, and where nozzleExitMax pins it the warm-started sweep needs fewer
+# Newton iterations than cold starts for the same converged points
+
+import numpy as np
+import pytest
+from turbojet.config import engineConfig
+from turbojet.matching import matchOffDesign
+
+tol = 1e-9
+
+
+def testFreeExitAreaNeedsNoIterations():
+    res = matchOffDesign(np.linspace(0.2, 2.0, 200), mode="wet")
+    assert res["Converged"].all()
+    assert (res["Residual"] < tol).all()
+    assert (res["Iterations"] == 0).all()
+
+
+@pytest.mark.parametrize("mode, exitMax", (("wet", 0.8), ("dry", 0.6)))
+def testPinnedExitAreaWarmStart(mode, exitMax):
+    mach = np.linspace(0.2, 2.0, 400)
+    config = engineConfig({"nozzle.nozzleExitMax": exitMax})
+    warm = matchOffDesign(mach, mode=mode, altitude=10000.0, config=config, tol=tol)
+    cold = matchOffDesign(mach, mode=mode, altitude=10000.0, config=config, tol=tol, warmStart=False)
+    for res in (warm, cold):
+        assert res["Converged"].all()
+        assert (res["Residual"] < tol).all()
+    pinned = np.isclose(warm["Nozzle Exit Size"], exitMax)
+    assert pinned.sum() > 100
+    # the pinned points are the ones Newton has to work on
+    assert (cold["Iterations"][pinned] > 0).all()
+    assert warm["Iterations"].sum() < 0.6 * cold["Iterations"].sum()
+    np.testing.assert_allclose(warm["Net Thrust"], cold["Net Thrust"], rtol=1e-7)
+
+
+def testMachZeroCaptureRatio():
+    res = matchOffDesign(np.array([0.0, 0.5]), mode="dry")
+    assert np.isnan(res["Inlet Capture Ratio"][0])
+    assert np.isfinite(res["Inlet Capture Ratio"][1])
@@ -0,0 +1,53 @@
+# mission fuel burn: every sample of a fleet of randomized strike missions is solved, solved samples
+# meet their required thrust, a single flyMission reaches status "met" throughout, and flying the
+# fleet in one batch agrees with flying its missions one at a time
+import numpy as np
+import pytest
+from turbojet.mission import flyMission, flyMissions, missionSegment, statusNames
+
+
+def strikeMission(rng, steps=10):
+    # climb, supercruise out, afterburning combat, subsonic cruise back; thrust for two engines,
+    # scaled by a random drag factor, and random leg lengths
+    drag = rng.uniform(0.97, 1.03)
+    return [
+        missionSegment(240, mach=(0.5, 0.9), altitude=(1000, 10000), thrust=(drag * 340e3, drag * 160e3),
+                       steps=steps, name="climb"),
+        missionSegment(rng.uniform(900, 2400), mach=1.5, altitude=12000, thrust=drag * 200e3, steps=steps,
+                       name="supercruise"),
+        missionSegment(rng.uniform(60, 180), mach=1.2, altitude=9000, thrust=drag * 340e3, mode="wet", steps=steps,
+                       name="combat"),
+        missionSegment(rng.uniform(1200, 2400), mach=0.9, altitude=10000, thrust=drag * 160e3, steps=steps,
+                       name="return"),
+    ]
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    rng = np.random.default_rng(0)
+    missions = [strikeMission(rng) for _ in range(20)]
+    weights = rng.uniform(26000, 31000, len(missions))
+    return missions, weights, flyMissions(missions, weights, engines=2)
+
+
+def testFleetSolved(fleet):
+    _, _, result = fleet
+    stations = np.concatenate([m["stations"] for m in result["missions"]])
+    assert not np.any(stations["Status"] == statusNames.index("failed"))
+    met = stations[stations["Status"] == statusNames.index("met")]
+    assert np.abs(met["Net Thrust"] * 2 / met["Required Thrust"] - 1).max() <= 1e-6
+
+
+def testSingleMissionMet(fleet):
+    missions, weights, _ = fleet
+    result = flyMission(missions[0], weights[0], engines=2)
+    assert np.all(result["stations"]["Status"] == statusNames.index("met"))
+    assert result["short"] == result["idle"] == result["failed"] == 0
+    assert result["finalWeight"] == pytest.approx(weights[0] - result["fuelBurned"], rel=1e-12)
+
+
+def testFleetAgreesWithSingle(fleet):
+    missions, weights, result = fleet
+    fleetFuel = np.array([m["fuelBurned"] for m in result["missions"][:5]])
+    singleFuel = np.array([flyMission(m, w, engines=2)["fuelBurned"] for m, w in zip(missions[:5], weights[:5])])
+    np.testing.assert_allclose(fleetFuel, singleFuel, rtol=1e-5)
@@ -0,0 +1,20 @@
+# nozzle area-Mach inversion: machFromAreaRatio recovers the Mach on both branches, from 1e-6 up to
+# Mach 1000, and its answer reproduces the area ratio; near Mach 1 the Mach is only as well
+# determined as the square root of the area ratio's round-off, so it's checked away from there
+import numpy as np
+import pytest
+from turbojet.classes import areaMachRatio, machFromAreaRatio
+
+rng = np.random.default_rng(0)
+branches = {"subsonic": (False, np.concatenate([rng.uniform(1e-4, 1, 10**5), 10 ** rng.uniform(-6, 0, 10**4)])),
+            "supersonic": (True, np.concatenate([rng.uniform(1, 5, 10**5), 10 ** rng.uniform(0, 3, 10**4)]))}
+
+
+@pytest.mark.parametrize("branch", sorted(branches))
+def testInversion(branch):
+    supersonic, mach = branches[branch]
+    ratio = areaMachRatio(mach)
+    found = machFromAreaRatio(ratio, supersonic=supersonic)
+    away = np.abs(mach - 1) > 1e-3
+    assert np.abs(found / mach - 1)[away].max() < 1e-10
+    assert np.abs(areaMachRatio(found) / ratio - 1).max() < 1e-10
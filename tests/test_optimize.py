@@ -0,0 +1,33 @@
+# design optimization: the gradient and evolution solvers agree on the minimum TSFC at a required
+# thrust, both end feasible, no grid search point beats them, and the returned config reproduces
+# the reported outputs through runEngineBatch
+import numpy as np
+import pytest
+from turbojet.cycle import runEngineBatch
+from turbojet.optimize import gridSearch, optimizeDesign
+
+problem = {"requiredThrust": 100e3, "mach": 0.9, "altitude": 10000.0, "mode": "dry"}
+
+
+@pytest.fixture(scope="module")
+def solved():
+    return {method: optimizeDesign(method=method, **problem) for method in ("gradient", "evolution")}
+
+
+def testSolversAgree(solved):
+    gradient, evolution = solved["gradient"], solved["evolution"]
+    assert gradient["feasible"] and evolution["feasible"]
+    best = min(gradient["objective"], evolution["objective"])
+    assert abs(gradient["objective"] - evolution["objective"]) <= 1e-6 * best
+
+
+def testGridNoBetter(solved):
+    best = min(r["objective"] for r in solved.values())
+    assert gridSearch(9, **problem)["objective"] >= best
+
+
+def testConfigReproducesOutputs(solved):
+    result = solved["gradient"]
+    res = runEngineBatch(problem["mach"], altitude=problem["altitude"], mode=problem["mode"], config=result["config"])
+    for name, value in result["outputs"].items():
+        np.testing.assert_allclose(res[name], value, rtol=1e-12, err_msg=name)
@@ -0,0 +1,54 @@
+# worker payloads: points and results survive encode / decode bit for bit (config batches included),
+# evaluatePayload returns exactly what runEngineBatch computes, and a payload is smaller than
+# pickling the same points
+import pickle
+
+import numpy as np
+from turbojet.api import decodePoints, decodeResults, encodePoints, encodeResults, evaluatePayload, makePoints
+from turbojet.config import configBatch, engineConfig
+from turbojet.cycle import runEngineBatch
+
+rng = np.random.default_rng(0)
+mach = rng.uniform(0.05, 2.25, 1000)
+altitude = rng.uniform(0, 15000, 1000)
+throttle = rng.uniform(0.2, 2.0, 1000)
+
+
+def same(a, b):
+    return a.dtype.names == b.dtype.names and all(np.array_equal(a[name], b[name], equal_nan=True) for name in a.dtype.names)
+
+
+def testPointsRoundTrip():
+    points = makePoints(mach, altitude=altitude, throttle=throttle)
+    config = engineConfig(fan__pressure_ratioFan=4.2)
+    decoded, options = decodePoints(encodePoints(points, config=config, gas="real", fields=["TSFC"]))
+    assert same(decoded, points)
+    assert options == {"config": config, "gas": "real", "maps": None, "fields": ["TSFC"]}
+
+
+def testConfigBatchRoundTrip():
+    points = makePoints(mach, altitude=10000.0)
+    batch = configBatch({"combustor.titemp": np.linspace(1850, 1990, len(mach))}, base=engineConfig(split__bypaRatio=0.4))
+    decoded, options = decodePoints(encodePoints(points, config=batch))
+    assert same(decoded, points)
+    assert options["config"].digest() == batch.digest()
+
+
+def testResultsRoundTrip():
+    results = runEngineBatch(mach, altitude=altitude, throttle=throttle)
+    assert same(decodeResults(encodeResults(results)), results)
+    assert same(decodeResults(encodeResults(results, fields=["Net Thrust", "TSFC"])), results[["Net Thrust", "TSFC"]])
+
+
+def testEvaluatePayloadMatchesRunEngineBatch():
+    fields = ["Net Thrust", "TSFC"]
+    reply = decodeResults(evaluatePayload(encodePoints(makePoints(mach, altitude=altitude, throttle=throttle),
+                                                       fields=fields)))
+    expected = runEngineBatch(mach, altitude=altitude, throttle=throttle)
+    for name in fields:
+        np.testing.assert_array_equal(reply[name], expected[name])
+
+
+def testSmallerThanPickle():
+    points = makePoints(mach, altitude=10000.0, mode="wet")
+    assert len(encodePoints(points)) < len(pickle.dumps(points, protocol=pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,36 @@
+# power hooks: one batched powerHook call gives exactly the thrust of runEngine per (condition,
+# throttle) pair, and a pass that raises leaves the scheduled temperatures off the cached cycle
+
+import numpy as np
+import pytest
+from turbojet import classes
+from turbojet.cycle import currentCycle, runEngine, runEngineBatch
+from turbojet.throttle import powerHook
+
+
+def testHookMatchesRunEngine():
+    mach = np.linspace(0.3, 1.6, 4)
+    altitude = np.linspace(2000, 15000, 4)
+    throttle = np.linspace(0, 2, 21)
+    hook = powerHook(mach, throttle, altitude=altitude)
+    assert hook.shape == (4, 21)
+    loop = np.array([[runEngine(M, altitude=h, throttle=t)["Net Thrust"] for t in throttle]
+                     for M, h in zip(mach, altitude)])
+    np.testing.assert_array_equal(loop, hook["Net Thrust"])
+
+
+@pytest.mark.parametrize("name, cls, method, attr, throttle", (
+        ("combustor", classes.combustor, "stagnationPressureCombust", "titemp", 0.5),
+        ("afterburner", classes.afterBurner, "stagnationPressureAfterburner", "afterburnertemp", 1.5)))
+def testScheduleRestoredWhenPassRaises(monkeypatch, name, cls, method, attr, throttle):
+    component = getattr(currentCycle(), name)
+    design = getattr(component, attr)
+
+    def fail(self):
+        raise FloatingPointError("forced")
+
+    monkeypatch.setattr(cls, method, fail)
+    with pytest.raises(FloatingPointError):
+        runEngineBatch(np.linspace(0.2, 1.2, 5), throttle=throttle)
+    # the design scalar, not the per-point schedule array
+    assert np.ndim(getattr(component, attr)) == 0 and getattr(component, attr) == design
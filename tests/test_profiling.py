@@ -0,0 +1,42 @@
+# profiling: an enabled profiler times every stage without changing results, and disable() (or
+# leaving the with block, on an exception too) puts back the very functions it swapped out, in
+# cycle and in the modules that imported them
+import numpy as np
+import pytest
+from turbojet import cycle, sweep
+from turbojet.profiling import _targets, cycleProfiler
+
+
+def originals():
+    return {label: owner.__dict__[attr] for owner, attr, label in _targets()}
+
+
+def testResultsUnchangedAndCounted():
+    mach = np.linspace(0.1, 2.25, 100)
+    expected = cycle.runEngineBatch(mach)
+    with cycleProfiler() as prof:
+        res = cycle.runEngineBatch(mach)
+    for name in expected.dtype.names:
+        np.testing.assert_array_equal(res[name], expected[name], err_msg=name)
+    stats = prof.stats()
+    assert stats["runEngineBatch"]["calls"] == 1 and stats["fan.advance"]["calls"] >= 1
+
+
+def testDisableRestoresOriginals():
+    before = originals()
+    batch = cycle.runEngineBatch
+    prof = cycleProfiler()
+    prof.enable()
+    assert cycle.runEngineBatch is not batch and sweep.runEngineBatch is not batch
+    prof.disable()
+    after = originals()
+    assert all(after[label] is fn for label, fn in before.items())
+    assert cycle.runEngineBatch is batch and sweep.runEngineBatch is batch
+
+
+def testExceptionRestoresOriginals():
+    before = originals()
+    with pytest.raises(ZeroDivisionError):
+        with cycleProfiler():
+            1 / 0
+    assert all(originals()[label] is fn for label, fn in before.items())
@@ -0,0 +1,50 @@
+# Jacobians of thrust / TSFC / specific thrust: forward mode (dual numbers) and complex step against
+# central finite differences, disagreement measured against each (output, parameter) column's
+# largest derivative over the points (sensitivity.columnDisagreement)
+
+import numpy as np
+import pytest
+from turbojet.config import configBatch, engineConfig
+from turbojet.sensitivity import columnDisagreement, designParameters, finiteDifferences, sensitivities
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    rng = np.random.default_rng(0)
+    points = 500
+    return {"mach": rng.uniform(0.1, 2.2, points), "altitude": rng.uniform(0, 15000, points),
+            "mode": np.where(rng.random(points) < 0.5, "wet", "dry")}
+
+
+@pytest.fixture(scope="module")
+def dual(sweep):
+    return sensitivities(**sweep)
+
+
+def testDualMatchesFiniteDifferences(sweep, dual):
+    values, jacobian, parameters = dual
+    fdValues, fdJacobian, fdParameters = finiteDifferences(**sweep)
+    assert parameters == fdParameters == designParameters()
+    for name in values.dtype.names:
+        np.testing.assert_array_equal(values[name], fdValues[name])
+    # central differences are good to ~1e-7 of the column scale here
+    worst = columnDisagreement(jacobian, fdJacobian).max(axis=(0, 1))
+    assert worst.max() < 1e-5, [name for name, w in zip(parameters, worst) if w >= 1e-5]
+
+
+def testComplexStepMatchesDual(sweep, dual):
+    # both carry exact derivatives, so they agree to rounding
+    _, complexJacobian, _ = sensitivities(**sweep, method="complex")
+    assert columnDisagreement(dual[1], complexJacobian).max() < 1e-10
+
+
+def testConfigBatch(sweep):
+    # one design per point: the same derivatives as each design alone
+    mach = sweep["mach"][:4]
+    ratios = np.array([3.6, 4.0, 4.2, 4.4])
+    _, batched, _ = sensitivities(mach, altitude=5000.0, config=configBatch({"fan.pressure_ratioFan": ratios}))
+    _, fdBatched, _ = finiteDifferences(mach, altitude=5000.0, config=configBatch({"fan.pressure_ratioFan": ratios}))
+    for k, ratio in enumerate(ratios):
+        _, single, _ = sensitivities(mach[k], altitude=5000.0, config=engineConfig({"fan.pressure_ratioFan": ratio}))
+        np.testing.assert_allclose(batched[k], single, rtol=1e-12, atol=0)
+    assert columnDisagreement(batched, fdBatched).max() < 1e-5
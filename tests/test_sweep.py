@@ -0,0 +1,99 @@
+# envelope sweeps: every route (in process, shared memory, pipes, streamed) returns the same bits as
+# runEngineBatch on the whole grid, a checkpointed sweep resumes only the chunks it hadn't
+# finished, and the grid signature a checkpoint is resumed by is the same in every process for the
+# same sweep, whatever model objects it carries, and differs when the model does
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+from turbojet.config import configBatch, engineConfig
+from turbojet.cycle import runEngineBatch, stationDtype
+from turbojet.gas import gasTables
+from turbojet.maps import engineMaps
+from turbojet.sweep import gridPoints, gridShape, gridSignature, iterSweep, runSweep
+from turbojet.throttle import throttleSchedule
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+grid = {"mach": np.linspace(0, 2, 5), "altitude": [0.0, 10000.0]}
+envelope = {"altitude": np.linspace(0.0, 15000.0, 7), "mach": np.linspace(0.05, 2.25, 60), "mode": ["dry", "wet"]}
+
+
+def identical(a, b):
+    return all(np.array_equal(a[name], b[name], equal_nan=True) for name in stationDtype.names)
+
+
+def direct():
+    total = int(np.prod(gridShape(envelope)))
+    return runEngineBatch(**gridPoints(envelope, 0, total)).reshape(gridShape(envelope))
+
+
+def testRoutesMatchRunEngineBatch():
+    reference = direct()
+    assert identical(runSweep(envelope, workers=1, chunkSize=100)[0], reference)
+    shared, stats = runSweep(envelope, workers=2, chunkSize=100)
+    assert stats["sharedMemory"] and identical(shared, reference)
+    piped, stats = runSweep(envelope, workers=2, chunkSize=100, sharedMemory=False)
+    assert not stats["sharedMemory"] and identical(piped, reference)
+
+
+def testIterSweepInGridOrder():
+    reference = direct().ravel()
+    for workers in (1, 2):
+        chunks = list(iterSweep(envelope, workers=workers, chunkSize=100))
+        assert [start for start, _, _ in chunks] == list(range(0, len(reference), 100))
+        assert identical(np.concatenate([res for _, _, res in chunks]), reference)
+
+
+def testCheckpointResumesUnfinishedChunks(tmp_path):
+    path = str(tmp_path / "sweep")
+    first, stats = runSweep(envelope, workers=1, chunkSize=100, checkpoint=path)
+    assert stats["evaluated"] == stats["points"]
+    reference = np.array(first)
+
+    # forget two chunks and scribble over their rows, as if the sweep had stopped before them
+    with open(path + ".json") as f:
+        state = json.load(f)
+    state["done"] = [start for start in state["done"] if start not in (200, 500)]
+    with open(path + ".json", "w") as f:
+        json.dump(state, f)
+    stored = np.load(path + ".npy", mmap_mode="r+")
+    stored[200:300] = stored[0]
+    stored.flush()
+    del stored
+
+    resumed, stats = runSweep(envelope, workers=1, chunkSize=100, checkpoint=path)
+    assert stats["evaluated"] == 200 and stats["resumed"] == stats["points"] - 200
+    assert identical(resumed, reference)
+    # a different sweep under the same path starts over
+    _, stats = runSweep(envelope, workers=1, chunkSize=50, checkpoint=path)
+    assert stats["evaluated"] == stats["points"]
+
+
+def fixedModels():
+    # built alike in every process; before digests their repr (and so the signature) carried id()
+    return {"gas": gasTables(step=2.0), "maps": engineMaps(designMach=0.8),
+            "config": engineConfig({"fan.pressure_ratioFan": 4.2}),
+            "schedule": throttleSchedule(tit=((0.0, 1300.0), (1.0, 1950.0)))}
+
+
+def testSignatureStableAcrossProcesses():
+    child = ("import sys; sys.path.insert(0, 'tests')\n"
+             "from test_sweep import fixedModels, grid, gridSignature\n"
+             "print(gridSignature(grid, fixedModels(), 100))\n")
+    out = subprocess.run([sys.executable, "-c", child], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == gridSignature(grid, fixedModels(), 100)
+
+
+def testSignatureFollowsModelContent():
+    base = gridSignature(grid, fixedModels(), 100)
+    assert gridSignature(grid, fixedModels(), 100) == base
+    changed = dict(fixedModels(), schedule=throttleSchedule(tit=((0.0, 1350.0), (1.0, 1950.0))))
+    assert gridSignature(grid, changed, 100) != base
+    batch = configBatch({"fan.pressure_ratioFan": [3.8, 4.2]})
+    assert gridSignature(grid, {"config": batch}, 100) == \
+        gridSignature(grid, {"config": configBatch({"fan.pressure_ratioFan": [3.8, 4.2]})}, 100)
+    assert gridSignature(grid, {"config": batch}, 100) != \
+        gridSignature(grid, {"config": configBatch({"fan.pressure_ratioFan": [3.8, 4.4]})}, 100)
@@ -0,0 +1,43 @@
+# spool transients: an idle -> max afterburner slam integrated by rk4 and ros2 against a fine-step
+# rk4 reference, also with a stiff (HP inertia / 100) spool, and the thrust it settles at against
+# the steady wet cycle
+import numpy as np
+import pytest
+from turbojet.cycle import runEngineBatch
+from turbojet.transient import simulateTransient, spoolInertia
+
+times = np.linspace(0.0, 10.0, 201)
+slam = ([0.0, 1.0, 1.0], [0.0, 0.0, 2.0])
+flight = {"mach": 0.9, "altitude": 10000.0}
+inertias = {"nominal": spoolInertia, "stiff": (spoolInertia[0], spoolInertia[1] / 100)}
+
+
+def speedError(result, reference):
+    s, r = result["stations"], reference["stations"]
+    return max(np.abs(s[f] - r[f]).max() for f in ("LP Spool Speed", "HP Spool Speed"))
+
+
+@pytest.fixture(scope="module")
+def references():
+    # fine-step rk4 runs, computed once per inertia the cases below ask for
+    cache = {}
+
+    def reference(name):
+        if name not in cache:
+            cache[name] = simulateTransient(slam, times, method="rk4", step=2e-4, inertia=inertias[name], **flight)
+        return cache[name]
+    return reference
+
+
+@pytest.mark.parametrize("inertia, method, tol", [("nominal", "rk4", 1e-6), ("nominal", "ros2", 1e-3),
+                                                  ("stiff", "ros2", 1e-3)])
+def testAgainstFineStep(references, inertia, method, tol):
+    result = simulateTransient(slam, times, method=method, inertia=inertias[inertia], **flight)
+    assert speedError(result, references(inertia)) < tol
+
+
+def testSettlesOnSteadyCycle():
+    s = simulateTransient(slam, times, method="ros2", **flight)["stations"]
+    steady = runEngineBatch(flight["mach"], altitude=flight["altitude"], mode="wet")
+    assert abs(s["Net Thrust"][-1] / steady["Net Thrust"] - 1) < 1e-6
+    assert s["Net Thrust"][0] < s["Net Thrust"][-1]
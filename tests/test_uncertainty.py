@@ -0,0 +1,37 @@
+# uncertainty propagation: streamed percentiles against np.percentile, results independent of
+# the worker count, and peak memory that follows the batch size rather than the sample count
+import tracemalloc
+
+import numpy as np
+from turbojet.uncertainty import _quantileHistogram, defaultPercentiles, propagateUncertainty
+
+flight = {"altitude": 10000.0, "mode": "wet"}
+
+
+def testHistogramPercentiles():
+    # a narrow first batch, so later batches make the range grow both ways
+    rng = np.random.default_rng(0)
+    batches = [rng.normal(0, 0.1, 1000)] + [rng.normal(0, 1, 10000) for _ in range(20)]
+    histogram = _quantileHistogram()
+    for values in batches:
+        histogram.add(values)
+    values = np.concatenate(batches)
+    error = histogram.percentiles(defaultPercentiles) - np.percentile(values, defaultPercentiles)
+    assert np.abs(error).max() < 1e-3 * values.std()
+
+
+def testWorkersGiveSameResult():
+    one = propagateUncertainty(0.9, samples=6000, batchSize=1000, **flight)
+    two = propagateUncertainty(0.9, samples=6000, batchSize=1000, workers=2, **flight)
+    for key in ("mean", "std", "percentiles", "sobol", "failed"):
+        assert one[key] == two[key], key
+
+
+def testMemoryBoundedBySamples():
+    peaks = []
+    for samples in (4000, 32000):
+        tracemalloc.start()
+        propagateUncertainty(0.9, samples=samples, batchSize=1000, **flight)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 1.2 * peaks[0]
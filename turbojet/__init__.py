@@ -0,0 +1,46 @@
+"""
+F119 turbofan cycle model.
+
+    import turbojet
+    res = turbojet.runEngineBatch(np.linspace(0, 2.25, 100), altitude=10000, mode="wet")
+
+turbojet.api is the stable batch interface (NumPy arrays in and out, compact byte payloads for
+worker processes); the components are in turbojet.classes and the cycle in turbojet.cycle.
+Submodules load on first use, so a worker that only needs turbojet.api doesn't import the deck,
+optimizer or uncertainty code.
+"""
+from importlib import import_module
+
+__version__ = "0.1.0"
+
+# name -> submodule it lives in
+_exports = {
+    "runEngine": "cycle",
+    "runEngineBatch": "cycle",
+    "stationDtype": "cycle",
+    "engineConfig": "config",
+    "configBatch": "config",
+    "pointDtype": "api",
+    "makePoints": "api",
+    "evaluate": "api",
+    "encodePoints": "api",
+    "decodePoints": "api",
+    "encodeResults": "api",
+    "decodeResults": "api",
+    "evaluatePayload": "api",
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
@@ -0,0 +1,6 @@
+# python -m turbojet: the command-line interface (see cli.py)
+import sys
+
+from .cli import main
+
+sys.exit(main())
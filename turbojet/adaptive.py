@@ -0,0 +1,195 @@
+"""
+Adaptive sampling of the operating envelope.
+
+Uniform Mach sweeps spend most of their points where thrust and TSFC are nearly linear and
+too few where they bend (transonic, and near the nozzle's topMach). refineMach starts from a
+coarse grid and bisects every interval whose midpoint differs from the straight line between
+its ends by more than tol (relative, per field), or whose samples show a sharper bend than
+that tolerance allows (second differences, which catch kinks off an interval's middle);
+refineEnvelope does the same over Mach x
+altitude with a quadtree, splitting a cell when its centre or edge midpoints disagree with
+bilinear interpolation of its corners by more than tol / 2, down to maxDepth levels (a
+RuntimeWarning says so if that isn't enough). Every refinement pass is one runEngineBatch call over
+all new points, and the stats report how many evaluations a uniform grid at the finest
+spacing reached would have needed.
+"""
+import warnings
+
+import numpy as np
+
+from .cycle import runEngineBatch, stationDtype
+
+
+refineFields = ("Net Thrust", "TSFC")
+
+
+def _relativeError(exact, approx, fields):
+    # largest relative miss over the fields; a field that is nan at the probe and in the guess alike
+    # (TSFC at Mach 0) doesn't count, one that is finite in only one of them is a miss (inf) so
+    # the edge of a nan region gets resolved too
+    err = np.zeros(len(exact))
+    for name in fields:
+        e, a = exact[name], approx[name]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel = np.abs(a - e) / np.abs(e)
+        rel = np.where(np.isfinite(e) == np.isfinite(a), np.nan_to_num(rel, nan=0.0), np.inf)
+        err = np.fmax(err, rel)
+    return err
+
+
+def refineMach(start=0.0, stop=2.25, tol=1e-3, fields=refineFields, initialPoints=9, maxPasses=12, **conditions):
+    # (results sorted by Mach as a stationDtype array, stats)
+    # conditions: anything else runEngineBatch takes (mode, throttle, altitude, P0, ...), scalars
+    mach = np.linspace(start, stop, initialPoints)
+    results = runEngineBatch(mach, **conditions)
+    evaluations = len(mach)
+
+    # intervals still open for refinement, as indices into the sorted sample list
+    pending = np.arange(len(mach) - 1)
+    passes = 0
+    while len(pending) and passes < maxPasses:
+        lo, hi = results[pending], results[pending + 1]
+        mid = runEngineBatch(0.5 * (lo["Mach"] + hi["Mach"]), **conditions)
+        evaluations += len(mid)
+        passes += 1
+
+        guess = {name: 0.5 * (lo[name] + hi[name]) for name in fields}
+        split = _relativeError(mid, guess, fields) > tol
+
+        # merge midpoints in; an interval that failed the check leaves two open halves behind
+        position = np.searchsorted(results["Mach"], mid["Mach"])
+        results = np.insert(results, position, mid)
+        newIndex = position + np.arange(len(position))  # where each midpoint landed
+        pending = np.concatenate([newIndex[split] - 1, newIndex[split]])
+
+        # curvature: a kink off the middle of an interval can slip past the midpoint test, but it
+        # bends the chord between the neighbours of a nearby sample (a quarter of that deviation
+        # is what each half-width interval would show on a smooth curve)
+        x = results["Mach"]
+        w = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+        chord = {name: (1 - w) * results[name][:-2] + w * results[name][2:] for name in fields}
+        bent = np.flatnonzero(_relativeError(results[1:-1], chord, fields) > 4 * tol)
+        pending = np.unique(np.concatenate([pending, bent, bent + 1]))
+
+    spacing = np.diff(results["Mach"]).min()
+    uniform = int(np.ceil((stop - start) / spacing)) + 1
+    stats = {"evaluations": evaluations, "points": len(results), "passes": passes,
+             "converged": len(pending) == 0, "finestSpacing": float(spacing),
+             "uniformEvaluations": uniform, "saved": uniform - evaluations}
+    return results, stats
+
+
+class adaptiveEnvelope:
+    # result of refineEnvelope: every evaluated point plus the leaf cells of the quadtree, with a
+    # bilinear lookup over the leaves
+    def __init__(self, points, cells, cornerRows, machRange, altitudeRange, leafOf, stats):
+        self.points = points  # stationDtype array of every evaluated point
+        self.cells = cells  # (n, 4) leaf bounds: mach0, mach1, altitude0, altitude1
+        self.cornerRows = cornerRows  # (n, 4) rows of `points` at each leaf's corners
+        self.machRange = machRange
+        self.altitudeRange = altitudeRange
+        self.leafOf = leafOf  # finest-level lattice cell -> leaf index
+        self.stats = stats
+
+    def query(self, mach, altitude, field="Net Thrust"):
+        # bilinear interpolation inside the leaf cell holding each point
+        mach, altitude = np.broadcast_arrays(np.asarray(mach, dtype=float), np.asarray(altitude, dtype=float))
+        (m0, m1), (a0, a1) = self.machRange, self.altitudeRange
+        nm, na = self.leafOf.shape
+        i = np.clip(((mach - m0) / (m1 - m0) * nm).astype(np.intp), 0, nm - 1)
+        j = np.clip(((altitude - a0) / (a1 - a0) * na).astype(np.intp), 0, na - 1)
+        leaf = self.leafOf[i, j]
+        c = self.cells[leaf]
+        corners = self.points[field][self.cornerRows[leaf]]
+        u = (mach - c[..., 0]) / (c[..., 1] - c[..., 0])
+        v = (altitude - c[..., 2]) / (c[..., 3] - c[..., 2])
+        return ((1 - u) * (1 - v) * corners[..., 0] + u * (1 - v) * corners[..., 1]
+                + (1 - u) * v * corners[..., 2] + u * v * corners[..., 3])
+
+
+def refineEnvelope(mach=(0.05, 2.25), altitude=(0.0, 18000.0), tol=1e-3, fields=refineFields, initialCells=(4, 4),
+                   maxDepth=10, **conditions):
+    # quadtree refinement of a Mach x altitude rectangle; conditions as for refineMach
+    # cells split until they meet tol, at most maxDepth times; leaves still over tol at that depth
+    # (a jump rather than a bend, or a cap set too low) raise a RuntimeWarning
+    # points live on the integer lattice of the finest possible level, so shared corners and edge
+    # midpoints of neighbouring cells are evaluated once
+    (m0, m1), (a0, a1) = mach, altitude
+    scale = 1 << maxDepth
+    nm, na = initialCells[0] * scale, initialCells[1] * scale
+    toMach = lambda i: m0 + (m1 - m0) * np.asarray(i) / nm
+    toAltitude = lambda j: a0 + (a1 - a0) * np.asarray(j) / na
+
+    known = {}  # (i, j) lattice point -> row in `points`
+    points = np.empty(0, dtype=stationDtype)
+    evaluations = 0
+
+    def evaluate(lattice):
+        # evaluate the lattice points not seen yet, in one batch
+        nonlocal points, evaluations
+        new = sorted({p for p in lattice if p not in known})
+        if new:
+            ij = np.array(new)
+            res = runEngineBatch(toMach(ij[:, 0]), altitude=toAltitude(ij[:, 1]), **conditions)
+            for p in new:
+                known[p] = len(known)
+            points = np.concatenate([points, res])
+            evaluations += len(new)
+        return points[[known[p] for p in lattice]]
+
+    # cells as (i0, j0, size) on the lattice
+    cells = [(ci * scale, cj * scale, scale) for ci in range(initialCells[0]) for cj in range(initialCells[1])]
+    leaves = []
+    unresolved = 0  # leaves still over tol when maxDepth stopped them
+    worst = 0.0
+    passes = 0
+    while cells:
+        passes += 1
+        corners = [((i, j), (i + s, j), (i, j + s), (i + s, j + s)) for i, j, s in cells]
+        probes = [((i + s // 2, j + s // 2), (i + s // 2, j), (i + s // 2, j + s), (i, j + s // 2), (i + s, j + s // 2))
+                  for i, j, s in cells]
+        cornerRes = evaluate([p for c in corners for p in c]).reshape(len(cells), 4)
+        probeRes = evaluate([p for c in probes for p in c]).reshape(len(cells), 5)
+
+        # bilinear guesses at centre, bottom, top, left and right midpoints
+        weights = np.array([[0.25, 0.25, 0.25, 0.25], [0.5, 0.5, 0, 0], [0, 0, 0.5, 0.5],
+                            [0.5, 0, 0.5, 0], [0, 0.5, 0, 0.5]])
+        guess = {name: cornerRes[name] @ weights.T for name in fields}
+        err = np.zeros(len(cells))
+        for k in range(5):
+            err = np.fmax(err, _relativeError(probeRes[:, k], {name: guess[name][:, k] for name in fields}, fields))
+
+        # a probe sees as little as half the miss at a kink elsewhere in the cell (the tropopause),
+        # so cells are held to tol / 2 at the probes to stay within tol everywhere inside
+        nextCells = []
+        for (i, j, s), e in zip(cells, err):
+            if e > 0.5 * tol and s > 1:
+                h = s // 2
+                nextCells += [(i, j, h), (i + h, j, h), (i, j + h, h), (i + h, j + h, h)]
+            else:
+                leaves.append((i, j, s))
+                if e > 0.5 * tol:
+                    unresolved += 1
+                    worst = max(worst, float(e))
+        cells = nextCells
+    if unresolved:
+        warnings.warn(f"refineEnvelope: {unresolved} leaves still miss tol={tol:g} at maxDepth={maxDepth} "
+                      f"(worst probe error {worst:.2e})", RuntimeWarning, stacklevel=2)
+
+    # the lookup grid only needs the finest level actually reached, not maxDepth's
+    ij = np.array(leaves)
+    finest = int(ij[:, 2].min())
+    leafOf = np.empty((nm // finest, na // finest), dtype=np.intp)
+    for n, (i, j, s) in enumerate(leaves):
+        leafOf[i // finest:(i + s) // finest, j // finest:(j + s) // finest] = n
+    cellBounds = np.column_stack([toMach(ij[:, 0]), toMach(ij[:, 0] + ij[:, 2]),
+                                  toAltitude(ij[:, 1]), toAltitude(ij[:, 1] + ij[:, 2])])
+
+    uniform = (nm // finest + 1) * (na // finest + 1)
+    stats = {"evaluations": evaluations, "leaves": len(leaves), "passes": passes,
+             "converged": unresolved == 0, "unresolvedLeaves": int(unresolved), "worstUnresolved": worst,
+             "finestCell": (float((m1 - m0) * finest / nm), float((a1 - a0) * finest / na)),
+             "uniformEvaluations": uniform, "saved": uniform - evaluations}
+    cornerRows = np.array([[known[p] for p in ((i, j), (i + s, j), (i, j + s), (i + s, j + s))]
+                           for i, j, s in leaves])
+    return adaptiveEnvelope(points, cellBounds, cornerRows, mach, altitude, leafOf, stats)
@@ -0,0 +1,196 @@
+"""
+Stable batch-evaluation API.
+
+Inputs and outputs are plain NumPy arrays, so a batch of operating points goes to a process pool
+or a remote worker as one compact buffer rather than pickled component objects and dicts:
+
+    points = makePoints(np.linspace(0.1, 2.25, 10000), altitude=10000.0, mode="wet")
+    results = evaluate(points)                        # cycle.stationDtype array, same shape
+
+    payload = encodePoints(points, config=cfg, fields=("Net Thrust", "TSFC"))    # bytes
+    reply = evaluatePayload(payload)                  # on the worker: bytes in, bytes out
+    results = decodeResults(reply)
+
+pointDtype is one operating point: Mach, Altitude (nan: P0 / T0 / P_ambient are given directly),
+P0, T0, P_ambient, Throttle (nan: Wet picks dry or wet at the design temperatures) and Wet.
+evaluate makes one runEngineBatch call per kind of point (altitude or pressures, throttle or mode)
+present in the batch and gives bit-for-bit what that call gives for those points.
+
+A payload is a short header (format version, shape, record layout, which columns follow, the
+value of every column that is the same for all points, and the options: config overrides, gas
+and maps model, the result fields wanted back) followed by the raw little-endian bytes of each
+varying column, so a Mach sweep at one altitude carries 8 bytes per point and nothing in it is
+pickled. Results travel the same way, with only the requested fields. pointDtype, stationDtype
+and the functions here are the stable interface; the modules underneath may change.
+"""
+import json
+import struct
+
+import numpy as np
+
+from .config import configBatch, engineConfig
+from .cycle import runEngineBatch, stationDtype
+
+
+pointDtype = np.dtype([
+    ("Mach", "<f8"),
+    ("Altitude", "<f8"),
+    ("P0", "<f8"),
+    ("T0", "<f8"),
+    ("P_ambient", "<f8"),
+    ("Throttle", "<f8"),
+    ("Wet", "?"),
+])
+
+payloadMagic = b"TJB"
+payloadVersion = 1
+
+# prefix of the columns a configBatch's per-point design values travel in
+_configColumn = "config:"
+
+
+def makePoints(mach, altitude=None, P0=101325, T0=298, P_ambient=101325, mode="wet", throttle=None):
+    # pointDtype array from runEngineBatch-style arguments, broadcast together
+    mach, altitude, P0, T0, P_ambient, throttle, mode = np.broadcast_arrays(
+        np.asarray(mach, dtype=float), np.asarray(np.nan if altitude is None else altitude, dtype=float),
+        np.asarray(P0, dtype=float), np.asarray(T0, dtype=float), np.asarray(P_ambient, dtype=float),
+        np.asarray(np.nan if throttle is None else throttle, dtype=float), np.asarray(mode))
+    points = np.empty(mach.shape, dtype=pointDtype)
+    points["Mach"] = mach
+    points["Altitude"] = altitude
+    points["P0"] = P0
+    points["T0"] = T0
+    points["P_ambient"] = P_ambient
+    points["Throttle"] = throttle
+    points["Wet"] = mode == "wet"
+    return points
+
+
+def evaluate(points, config=None, gas=None, maps=None):
+    # stationDtype results for a pointDtype array (any shape); config: engineConfig, or a
+    # configBatch broadcasting against points; gas / maps as for runEngineBatch
+    points = np.asarray(points)
+    flat = points.reshape(-1)
+    out = np.empty(flat.shape, dtype=stationDtype)
+    byAltitude = np.isfinite(flat["Altitude"])
+    byThrottle = np.isfinite(flat["Throttle"])
+    designs = None
+    if isinstance(config, configBatch):
+        designs = {name: np.broadcast_to(values, points.shape).reshape(-1) for name, values in config.values.items()}
+    for altitude in (True, False):
+        for throttle in (True, False):
+            group = (byAltitude == altitude) & (byThrottle == throttle)
+            if not group.any():
+                continue
+            # the whole batch usually is one group: no copies then
+            select = slice(None) if group.all() else group
+            part = flat[select]
+            if designs is not None:
+                config = configBatch({name: values[select] for name, values in designs.items()}, base=config.base)
+            out[select] = runEngineBatch(
+                part["Mach"], part["P0"], part["T0"], P_ambient=part["P_ambient"],
+                altitude=part["Altitude"] if altitude else None,
+                mode=np.where(part["Wet"], "wet", "dry"), throttle=part["Throttle"] if throttle else None,
+                config=config, gas=gas, maps=maps)
+    return out.reshape(points.shape)
+
+
+def _pack(kind, array, options):
+    # header + raw bytes of the columns that aren't constant over the batch
+    flat = array.reshape(-1)
+    columns, constant = [], {}
+    for name in array.dtype.names:
+        values = flat[name]
+        if len(values) and np.array_equal(values, np.full_like(values, values[0]), equal_nan=values.dtype.kind == "f"):
+            constant[name] = values[0].item()
+        else:
+            columns.append(name)
+    header = {"kind": kind, "version": payloadVersion, "shape": list(array.shape),
+              "dtype": [[name, array.dtype[name].newbyteorder("<").str] for name in array.dtype.names],
+              "columns": columns, "constant": constant, "options": options}
+    encoded = json.dumps(header).encode()
+    body = [flat[name].astype(array.dtype[name].newbyteorder("<"), copy=False).tobytes() for name in columns]
+    return b"".join([payloadMagic, struct.pack("<BI", payloadVersion, len(encoded)), encoded, *body])
+
+
+def _unpack(payload, kind):
+    payload = memoryview(payload)
+    if bytes(payload[:3]) != payloadMagic:
+        raise ValueError("not a turbojet batch payload")
+    version, length = struct.unpack_from("<BI", payload, 3)
+    if version != payloadVersion:
+        raise ValueError(f"payload format version {version}, this build reads {payloadVersion}")
+    start = 3 + struct.calcsize("<BI")
+    header = json.loads(bytes(payload[start:start + length]))
+    if header["kind"] != kind:
+        raise ValueError(f"expected a {kind} payload, got {header['kind']}")
+    dtype = np.dtype([(name, code) for name, code in header["dtype"]])
+    shape = tuple(header["shape"])
+    count = int(np.prod(shape))
+    array = np.empty(count, dtype=dtype)
+    for name, value in header["constant"].items():
+        array[name] = value
+    offset = start + length
+    for name in header["columns"]:
+        size = count * dtype[name].itemsize
+        array[name] = np.frombuffer(payload, dtype=dtype[name], count=count, offset=offset)
+        offset += size
+    return array.reshape(shape), header["options"]
+
+
+def encodePoints(points, config=None, gas=None, maps=None, fields=None):
+    # payload for evaluatePayload: points (pointDtype) and how to evaluate them; only named gas /
+    # maps models ("real", "default") travel, and fields (None: all) limits what comes back
+    points = np.asarray(points)
+    for label, model in (("gas", gas), ("maps", maps)):
+        if model is not None and not isinstance(model, str):
+            raise ValueError(f"only a named {label} model can go in a payload, not {type(model).__name__}")
+    if fields is not None:
+        unknown = [name for name in fields if name not in stationDtype.names]
+        if unknown:
+            raise KeyError(f"unknown result fields: {', '.join(unknown)}")
+    options = {"gas": gas, "maps": maps, "fields": None if fields is None else list(fields), "config": None}
+    if isinstance(config, configBatch):
+        # per-point designs become columns of the point array
+        names = list(config.values)
+        extended = np.empty(points.shape, dtype=pointDtype.descr + [(_configColumn + name, "<f8") for name in names])
+        for name in pointDtype.names:
+            extended[name] = points[name]
+        for name in names:
+            extended[_configColumn + name] = np.broadcast_to(config.values[name], points.shape)
+        points = extended
+        config = config.base
+    if config is not None:
+        options["config"] = config.overrides()
+    return _pack("points", points, options)
+
+
+def decodePoints(payload):
+    # (pointDtype array, {"config", "gas", "maps", "fields"}) from encodePoints' bytes
+    points, options = _unpack(payload, "points")
+    config = None if options["config"] is None else engineConfig(options["config"])
+    designs = [name for name in points.dtype.names if name.startswith(_configColumn)]
+    if designs:
+        config = configBatch({name[len(_configColumn):]: points[name] for name in designs}, base=config)
+        points = points[list(pointDtype.names)].astype(pointDtype)
+    return points, dict(options, config=config)
+
+
+def encodeResults(results, fields=None):
+    # payload of a stationDtype array, only fields (None: all) included
+    results = np.asarray(results)
+    if fields is not None:
+        results = results[list(fields)]
+    return _pack("results", results, {})
+
+
+def decodeResults(payload):
+    # structured array of the fields encodeResults was given
+    return _unpack(payload, "results")[0]
+
+
+def evaluatePayload(payload):
+    # worker side: encodePoints bytes in, encodeResults bytes out
+    points, options = decodePoints(payload)
+    results = evaluate(points, options["config"], options["gas"], options["maps"])
+    return encodeResults(results, options["fields"])
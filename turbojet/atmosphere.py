@@ -0,0 +1,86 @@
+"""
+International Standard Atmosphere, troposphere and lower stratosphere (-1 km to 20 km geopotential).
+
+isaClosedForm is the textbook model. isa() answers from a table precomputed once on a 1 m
+uniform altitude grid: pressure is interpolated linearly between nodes (within 1e-8 relative
+of the closed form) and temperature, which is piecewise linear anyway, is evaluated directly.
+A lookup is a truncation, two gathers and a handful of in-place multiply-adds per point, so
+million-point altitude sweeps don't pay the pow/exp of the closed form.
+"""
+import numpy as np
+
+
+seaLevelTemp = 288.15  # K
+seaLevelPress = 101325.0  # Pa
+lapseRate = -0.0065  # K/m, troposphere
+tropopause = 11000.0  # m
+g0 = 9.80665
+R = 287.05287  # J/kg K, ISA value (the components use 287)
+bottom = -1000.0  # m
+top = 20000.0  # m, top of the isothermal layer
+
+tropopauseTemp = seaLevelTemp + lapseRate * tropopause
+tropopausePress = seaLevelPress * (tropopauseTemp / seaLevelTemp) ** (-g0 / (lapseRate * R))
+
+
+def _checkRange(altitude):
+    if altitude.size and (altitude.min() < bottom or altitude.max() > top):
+        raise ValueError(f"altitude outside the ISA model range [{bottom:g}, {top:g}] m")
+
+
+def isaClosedForm(altitude):
+    # (static temperature [K], static pressure [Pa]) at geopotential altitude [m]
+    h = np.asarray(altitude, dtype=float)
+    _checkRange(h)
+    T = np.where(h < tropopause, seaLevelTemp + lapseRate * h, tropopauseTemp)
+    P = np.where(h < tropopause,
+                 seaLevelPress * (T / seaLevelTemp) ** (-g0 / (lapseRate * R)),
+                 tropopausePress * np.exp(-g0 * (h - tropopause) / (R * tropopauseTemp)))
+    return T, P
+
+
+class isaTable:
+    def __init__(self, step=1.0):
+        self.step = step
+        self.altitudes = np.arange(bottom, top + step / 2, step)
+        self.press = isaClosedForm(self.altitudes)[1]
+        # per-interval slopes, so a lookup is value + slope * fraction
+        self.pressSlope = np.append(np.diff(self.press), 0.0)
+
+    def lookup(self, altitude):
+        # (static temperature [K], static pressure [Pa]), same shape as altitude
+        shape = np.shape(altitude)
+        h = np.atleast_1d(np.asarray(altitude, dtype=float))
+        _checkRange(h)
+        x = h - bottom
+        if self.step != 1.0:
+            x /= self.step
+        i = np.minimum(x.astype(np.intp), len(self.altitudes) - 1)
+        x -= i
+        P = self.press.take(i)
+        slope = self.pressSlope.take(i)
+        slope *= x
+        P += slope
+
+        T = lapseRate * h
+        T += seaLevelTemp
+        np.maximum(T, tropopauseTemp, out=T)
+        return T.reshape(shape), P.reshape(shape)
+
+    def maxError(self, samples=1000001):
+        # largest relative error against isaClosedForm over the whole range
+        h = np.linspace(bottom, top, samples)
+        T, P = self.lookup(h)
+        Tref, Pref = isaClosedForm(h)
+        return float(np.max(np.abs(T / Tref - 1))), float(np.max(np.abs(P / Pref - 1)))
+
+
+_table = None
+
+
+def isa(altitude):
+    # (static temperature [K], static pressure [Pa]) from the shared precomputed table
+    global _table
+    if _table is None:
+        _table = isaTable()
+    return _table.lookup(altitude)
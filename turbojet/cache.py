@@ -0,0 +1,176 @@
+"""
+Memoized runEngine operating points.
+
+operatingPointCache keys every call on the quantized inputs (mach, mode, initialPress,
+initialTemp, P_ambient, or altitude; throttle; engine config; gas model; component maps) plus a hash of every component
+constant in classes.py, keeps an in-memory LRU of recent points and can back it with an SQLite
+file that several processes share. Entries computed with different component constants never
+match: the constants hash is part of the key, it is re-derived whenever a component __init__
+changes (which also drops the per-thread cycles built with the old constants, see
+cycle.invalidateCycles), and stale rows are purged from the on-disk store when it is opened.
+"""
+import hashlib
+import os
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+
+from . import classes, cycle
+
+
+resultKeys = ("Net Thrust", "TSFC", "Specific Thrust", "Air Mass Flow")
+
+componentClasses = (classes.inlet, classes.fan, classes.bypassSplit, classes.highPressureCompressor,
+                    classes.combustor, classes.highPressureTurbine, classes.lowPressureTurbine,
+                    classes.mixer, classes.afterBurner, classes.nozzle, classes.exhaust)
+
+
+def constantsHash():
+    return hashlib.sha1(repr(cycle.engineConstants()).encode()).hexdigest()
+
+
+def quantize(value, digits):
+    # canonical form of a float input: rounded to `digits` significant figures, -0.0 folded into 0.0
+    return float(f"{float(value):.{digits}g}") + 0.0
+
+
+class operatingPointCache:
+    def __init__(self, maxSize=4096, path=None, digits=12):
+        # maxSize: in-memory LRU capacity (points), 0 disables the memory layer
+        # path: SQLite file shared between processes, None keeps the cache in memory only
+        # digits: significant figures inputs are quantized to before lookup
+        self.maxSize = maxSize
+        self.digits = digits
+        self.memory = OrderedDict()
+        self.counters = {"hits": 0, "diskHits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._inits = None
+        self._refreshConstants()
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS points "
+                            "(constants TEXT, key TEXT, result BLOB, PRIMARY KEY (constants, key))")
+            self.db.execute("DELETE FROM points WHERE constants != ?", (self.constants,))
+
+    def _refreshConstants(self):
+        # component constants live in each class's __init__, so only re-hash when one of those changed
+        inits = tuple(cls.__init__ for cls in componentClasses)
+        if self._inits is not None and all(a is b for a, b in zip(inits, self._inits)):
+            return
+        # the per-thread cycles runEngine reuses may have been built with other constants (also on
+        # the first call: classes.py could have been patched before this cache existed)
+        cycle.invalidateCycles()
+        constants = constantsHash()
+        if self._inits is not None and constants != self.constants:
+            self.counters["invalidations"] += len(self.memory)
+            self.memory.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM points WHERE constants != ?", (constants,))
+        self._inits = inits
+        self.constants = constants
+
+    def key(self, mach, mode, initialPress, initialTemp, P_ambient, altitude=None, throttle=None, config=None,
+            gas=None, maps=None):
+        d = self.digits
+        if throttle is not None:
+            # throttle replaces mode (default schedule)
+            mode = ("throttle", quantize(throttle, d))
+        if config is not None and config.overrides():
+            # an engineConfig is part of the point; one equal to the defaults shares their entries
+            mode = (mode, "config", config.digest())
+        if gas is not None and gas != "ideal":
+            # custom gas.gasTables / maps.engineMaps by a hash of their tables, not by identity: the key
+            # also goes to the shared SQLite store, and a later object may reuse an address
+            mode = (mode, "gas", gas if isinstance(gas, str) else gas.digest())
+        if maps is not None:
+            mode = (mode, "maps", maps if isinstance(maps, str) else maps.digest())
+        if altitude is not None:
+            # the standard atmosphere replaces the raw pressures/temperature
+            return (quantize(mach, d), mode, "altitude", quantize(altitude, d))
+        return (quantize(mach, d), mode, quantize(initialPress, d), quantize(initialTemp, d), quantize(P_ambient, d))
+
+    def runEngine(self, mach, mode="wet", initialPress=101325, initialTemp=298, P_ambient=101325, altitude=None,
+                  throttle=None, config=None, gas=None, maps=None):
+        # same signature and result as cycle.runEngine
+        self._refreshConstants()
+        key = self.key(mach, mode, initialPress, initialTemp, P_ambient, altitude, throttle, config, gas, maps)
+
+        values = self.memory.get(key)
+        if values is not None:
+            self.memory.move_to_end(key)
+            self.counters["hits"] += 1
+        else:
+            values = self._load(key)
+            if values is not None:
+                self.counters["diskHits"] += 1
+            else:
+                self.counters["misses"] += 1
+                res = cycle.runEngine(mach, mode, initialPress, initialTemp, P_ambient, altitude, throttle, config, gas,
+                                      maps)
+                values = tuple(float(res[k]) for k in resultKeys)
+                self._store(key, values)
+            self._remember(key, values)
+
+        result = {"Mach": mach}
+        result.update(zip(resultKeys, values))
+        return result
+
+    def _remember(self, key, values):
+        if self.maxSize <= 0:
+            return
+        self.memory[key] = values
+        if len(self.memory) > self.maxSize:
+            self.memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _load(self, key):
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT result FROM points WHERE constants = ? AND key = ?",
+                              (self.constants, repr(key))).fetchone()
+        if row is None:
+            return None
+        return tuple(np.frombuffer(row[0], dtype=np.float64).tolist())
+
+    def _store(self, key, values):
+        if self.db is None:
+            return
+        # float64 bytes rather than REAL columns so nan (Mach 0) survives the round trip
+        self.db.execute("INSERT OR REPLACE INTO points VALUES (?, ?, ?)",
+                        (self.constants, repr(key), np.array(values, dtype=np.float64).tobytes()))
+
+    def stats(self):
+        stats = dict(self.counters)
+        lookups = stats["hits"] + stats["diskHits"] + stats["misses"]
+        stats["size"] = len(self.memory)
+        stats["hitRate"] = (stats["hits"] + stats["diskHits"]) / lookups if lookups else 0.0
+        if self.db is not None:
+            stats["diskSize"] = self.db.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+        return stats
+
+    def clear(self):
+        self.memory.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM points")
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+_default = None
+
+
+def cachedRunEngine(mach, mode="wet", initialPress=101325, initialTemp=298, P_ambient=101325, altitude=None,
+                    throttle=None, config=None, gas=None, maps=None):
+    # drop-in for cycle.runEngine backed by a process-wide cache; set TURBOJET_CACHE to an
+    # SQLite path to share it between scripts
+    global _default
+    if _default is None:
+        _default = operatingPointCache(path=os.environ.get("TURBOJET_CACHE"))
+    return _default.runEngine(mach, mode, initialPress, initialTemp, P_ambient, altitude, throttle, config, gas,
+                              maps)
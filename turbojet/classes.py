@@ -0,0 +1,1040 @@
+""" Sources:
+
+***This is to simulate a F119 Turbofan Engine used in the F22-Raptor
+***Not all of the data is available (obviously), so a lot of guesses and approximations are used
+***Justifications will be given for them
+
+ - John D. Anderson, Modern Compressible Flow: With Historical Perspective, 
+3rd ed., McGraw-Hill, 2002. (1)
+- https://www.forecastinternational.com/archive/disp_pdf.cfm?DACH_RECNO=901 (2)
+- https://easychair.org/publications/preprint/CnsW/download? (3)
+- https://soaneemrana.com/onewebmedia/MECHANICS%20AND%20THERMODYNAMICS1.pdf (4)
+- https://www.sciencedirect.com/science/article/pii/S2666790825000424? (5)
+https://www.researchgate.net/publication/352295971_Efficiencies_and_losses_comparison_of_various_turbofan_engines_for_aircraft_propulsion (6)
+https://www.grc.nasa.gov/www/k-12/VirtualAero/BottleRocket/airplane/thrsteq.html(7)
+
+***Every component works on plain floats or on NumPy arrays of operating points
+***(elementwise), so cycle.runEngineBatch can push a whole sweep through each class once
+"""
+import numpy as np
+
+from .atmosphere import isa
+from .maps import correctedFlow
+
+
+class StationState:
+    # compact record of the stream leaving a component, handed from one component to the next
+    # Tt [K], Pt [Pa], massFlow [kg/s] (air + fuel so far), fuelFlow [kg/s] burned upstream,
+    # work [W] shaft power the component absorbs (fan/hpc) or delivers (turbines)
+    # fields hold floats or arrays, so one record covers a whole batch of operating points
+    __slots__ = ("Tt", "Pt", "massFlow", "fuelFlow", "work")
+
+    def __init__(self, Tt=0.0, Pt=0.0, massFlow=0.0, fuelFlow=0.0, work=0.0):
+        self.Tt = Tt
+        self.Pt = Pt
+        self.massFlow = massFlow
+        self.fuelFlow = fuelFlow
+        self.work = work
+
+
+def fuelAirRatio(state):
+    # kg fuel per kg air of the stream a StationState describes
+    if np.ndim(state.fuelFlow) == 0 and state.fuelFlow == 0:
+        return 0.0
+    return state.fuelFlow / (state.massFlow - state.fuelFlow)
+
+
+class inlet:
+    __slots__ = ("mach", "press", "temp", "gamma", "R", "p_drop", "inletArea",
+                 "stagTempInlet", "stagPressInlet", "mass_flow")
+
+    def __init__(self, mach, press, temp):
+        self.mach = mach
+        self.press = press
+        self.temp = temp
+        self.gamma = 1.4
+        self.R = 287
+        self.p_drop = 0.02
+
+        # inlet info comes from http://wikiwand.com/en/articles/Pratt_&_Whitney_F119
+        # an approximation of a 100cm diameter at inlet
+        # 120cm general diameter, 130cm largest (no clue how to use these ones ngl)
+        self.inletArea = 0.7854 # m^2
+
+    @classmethod
+    def atAltitude(cls, mach, altitude):
+        # freestream static press/temp from the standard atmosphere instead of raw values
+        temp, press = isa(altitude)
+        return cls(mach, press, temp)
+
+        # Defining stagnation temp and pressure (ref: ae312 module 1 notes)
+    def stagnationTemperatureInlet(self):
+        self.stagTempInlet = self.temp * (1 + (self.gamma - 1)/2 * self.mach**2)
+        return self.stagTempInlet
+
+    def stagnationPressureInlet(self):
+        self.stagPressInlet = self.press * (1 + (self.gamma - 1)/2 * self.mach**2)**(self.gamma / (self.gamma - 1))
+        return self.stagPressInlet * (1 - self.p_drop)
+    
+    def massFlowCalc(self):
+
+        factor = self.stagPressInlet * self.inletArea / np.sqrt(self.R * self.stagTempInlet)
+        mach_term = self.mach * np.sqrt(self.gamma)
+        temp_term = (1 + ((self.gamma - 1) / 2) * self.mach**2) ** (-((self.gamma + 1) / (2 * (self.gamma - 1))))
+        self.mass_flow = factor * mach_term * temp_term
+        return self.mass_flow  # [kg/s]
+    
+    def advance(self, mach, press, temp, out):
+        # hot path: same math as compute(), result goes into a StationState instead of a dict
+        self.mach = mach
+        self.press = press
+        self.temp = temp
+        self.stagnationTemperatureInlet()
+        self.stagnationPressureInlet()
+        self.massFlowCalc()
+        out.Tt = self.stagTempInlet
+        out.Pt = self.stagPressInlet
+        out.massFlow = self.mass_flow
+        out.fuelFlow = 0.0
+        out.work = 0.0
+
+    def compute(self):
+        self.stagnationTemperatureInlet()
+        self.stagnationPressureInlet()
+        self.massFlowCalc()
+        return {
+        "Stagnation Temp (Tt0)": self.stagTempInlet,
+        "Stagnation Press (Pt0)": self.stagPressInlet,
+        "Mass Flow": self.mass_flow,
+    }
+
+
+
+class fan:
+    __slots__ = ("stagpress", "stagtemp", "pressure_ratioFan", "efficiencyFan", "massflow", "gamma", "specificheat",
+                 "stagtempFan", "stagPressFan", "deltaH_fan", "powerReq_fan", "gas", "map", "mapTemp", "spoolSpeed")
+
+    # three-stage axial flow fan
+    def __init__(self, stagpress, stagtemp, massflow):
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.pressure_ratioFan = 4  # (2) page 2
+        self.efficiencyFan = 0.91 # (3) table 3, isentropic flow
+        self.massflow = massflow
+        self.gamma = 1.4
+        self.specificheat = 1004.5
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+        self.map = None # maps.componentMap the pressure ratio/efficiency come from (engineCycle sets it), None: constants
+        self.mapTemp = None # inlet Tt [K] at the map's design point, refers corrected speed to mechanical speed
+        self.spoolSpeed = None # mechanical speed relative to design, set by each pass on the map
+
+        # stagtemp change equation from (4) page 184, equation 5.49
+    def stagnationTemperatureFan(self):
+        gammaexpo = (self.gamma -1) / self.gamma
+        self.stagtempFan = self.stagtemp * (1 + (1/self.efficiencyFan) * (self.pressure_ratioFan**gammaexpo - 1))
+        return self.stagtempFan
+
+    def stagnationPressureFan(self):
+        self.stagPressFan = self.stagpress * self.pressure_ratioFan
+        return self.stagPressFan
+    
+    def enthalpyRiseFan(self):
+        Tt_out = self.stagnationTemperatureFan()
+        self.deltaH_fan = self.specificheat * (Tt_out - self.stagtemp)
+        return self.deltaH_fan # [J/kg]
+    
+    def workRequiredFan(self):
+        deltaH = self.enthalpyRiseFan()
+        self.powerReq_fan = self.massflow * deltaH 
+        return self.powerReq_fan
+    
+    def variableGasFan(self):
+        # same compression with cp and gamma following the temperature (self.gas, see gas.py):
+        # isentropic exit state from the entropy function, efficiency applied to the enthalpy rise
+        self.stagtempFan, self.deltaH_fan = self.gas.compress(self.stagtemp, self.pressure_ratioFan, self.efficiencyFan)
+        self.powerReq_fan = self.massflow * self.deltaH_fan
+        return self.stagtempFan
+
+    def mapPointFan(self):
+        # (pressure ratio, efficiency) off self.map (see maps.py): on the design beta line, at the
+        # corrected speed that passes the corrected flow the inlet delivers; the spool speed follows
+        beta = self.map.design[1]
+        speed = self.map.solveSpeed(beta, correctedFlow(self.massflow, self.stagtemp, self.stagpress))
+        self.spoolSpeed = speed * np.sqrt(self.stagtemp / self.mapTemp)
+        return self.map.lookup(speed, beta, ("pressureRatio", "efficiency"))
+
+    def advance(self, inState, out):
+        self.stagpress = inState.Pt
+        self.stagtemp = inState.Tt
+        self.massflow = inState.massFlow
+        design = self.pressure_ratioFan, self.efficiencyFan
+        try:
+            if self.map is not None:
+                # the map's operating point stands in for the design constants for this pass
+                self.pressure_ratioFan, self.efficiencyFan = self.mapPointFan()
+            if self.gas is None:
+                self.stagnationTemperatureFan()
+                self.stagnationPressureFan()
+                self.enthalpyRiseFan()
+                self.workRequiredFan()
+            else:
+                self.stagnationPressureFan()
+                self.variableGasFan()
+        finally:
+            # back to the design constants even if the pass raises, so no map arrays stay behind
+            self.pressure_ratioFan, self.efficiencyFan = design
+        out.Tt = self.stagtempFan
+        out.Pt = self.stagPressFan
+        out.massFlow = self.massflow
+        out.fuelFlow = inState.fuelFlow
+        out.work = self.powerReq_fan
+
+    def compute(self):
+        self.stagnationTemperatureFan()
+        self.stagnationPressureFan()
+        self.enthalpyRiseFan()
+        self.workRequiredFan()
+        return {
+            "Stagnation Temp (out)": self.stagtempFan,
+            "Stagnation Press (out)": self.stagPressFan,
+            "Enthalpy Rise": self.deltaH_fan,
+            "Fan Work (W)": self.powerReq_fan,
+        }
+
+
+class bypassSplit:
+    __slots__ = ("bypaRatio", "stagpress", "stagtemp", "massflow", "coreMF", "bypaMF")
+
+    def __init__(self, stagpress, massflow, stagtemp):
+        self.bypaRatio = 0.45 # (3) table 3
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.massflow = massflow
+
+    # stag temp and pressure dont change across
+    def massflowCore(self):
+        self.coreMF = self.massflow / (1 + self.bypaRatio)
+        return self.coreMF
+    
+    def massflowBypass(self):
+        self.bypaMF = self.massflow - self.coreMF
+        return self.bypaMF
+    
+    def advance(self, inState, core, bypass):
+        # one stream in, two out; Tt and Pt carry straight through to both
+        self.stagpress = inState.Pt
+        self.stagtemp = inState.Tt
+        self.massflow = inState.massFlow
+        self.massflowCore()
+        self.massflowBypass()
+        core.Tt = bypass.Tt = self.stagtemp
+        core.Pt = bypass.Pt = self.stagpress
+        core.massFlow = self.coreMF
+        bypass.massFlow = self.bypaMF
+        core.fuelFlow = bypass.fuelFlow = inState.fuelFlow
+        core.work = bypass.work = 0.0
+
+    def compute(self):
+        self.massflowCore()
+        self.massflowBypass()
+        return {
+            "Core Mass Flow": self.coreMF,
+            "Bypass Mass Flow": self.bypaMF,
+            "Bypass Ratio": self.bypaRatio,
+        }
+
+
+class highPressureCompressor:
+    __slots__ = ("stagpress", "stagtemp", "hpcPressRatio", "hpcEfficiency", "massflow", "gamma", "specificheat",
+                 "stagtempHPC", "stagPressHPC", "deltaH_HPC", "powerReq_HPC", "gas", "map", "mapTemp", "spoolSpeed")
+
+# six stage axial flow compressor
+    def __init__(self, stagpress, stagtemp, massflow):
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.hpcPressRatio = 8.75 # (1) total pressure ratio / fan pressure ratio = hpc ratio
+        self.hpcEfficiency = 0.91 # (3) table 3, isentropic flow
+        self.massflow = massflow
+        self.gamma = 1.4
+        self.specificheat = 1004.5
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+        self.map = None # maps.componentMap the pressure ratio/efficiency come from (engineCycle sets it), None: constants
+        self.mapTemp = None # inlet Tt [K] at the map's design point, refers corrected speed to mechanical speed
+        self.spoolSpeed = None # mechanical speed relative to design, set by each pass on the map
+        # work generated by turbine equals work required for compressor/fan
+
+    # stagtemp change equation from (4) page 184, equation 5.49
+    def stagnationTemperatureHPC(self):
+        gammaexpo = (self.gamma -1) / self.gamma
+        self.stagtempHPC = self.stagtemp * (1 + (1/self.hpcEfficiency) * (self.hpcPressRatio**gammaexpo - 1))
+        return self.stagtempHPC
+
+    def stagnationPressureHPC(self):
+        self.stagPressHPC = self.stagpress * self.hpcPressRatio
+        return self.stagPressHPC
+    
+    def enthalpyRiseHPC(self):
+        Tt_out = self.stagnationTemperatureHPC()
+        self.deltaH_HPC = self.specificheat * (Tt_out - self.stagtemp)
+        return self.deltaH_HPC  
+    
+    def workRequiredHPC(self):
+        deltaH = self.enthalpyRiseHPC()
+        self.powerReq_HPC = self.massflow * deltaH 
+        return self.powerReq_HPC
+    
+    def variableGasHPC(self):
+        # as fan.variableGasFan
+        self.stagtempHPC, self.deltaH_HPC = self.gas.compress(self.stagtemp, self.hpcPressRatio, self.hpcEfficiency)
+        self.powerReq_HPC = self.massflow * self.deltaH_HPC
+        return self.stagtempHPC
+
+    def mapPointHPC(self):
+        # as fan.mapPointFan
+        beta = self.map.design[1]
+        speed = self.map.solveSpeed(beta, correctedFlow(self.massflow, self.stagtemp, self.stagpress))
+        self.spoolSpeed = speed * np.sqrt(self.stagtemp / self.mapTemp)
+        return self.map.lookup(speed, beta, ("pressureRatio", "efficiency"))
+
+    def advance(self, inState, out):
+        self.stagpress = inState.Pt
+        self.stagtemp = inState.Tt
+        self.massflow = inState.massFlow
+        design = self.hpcPressRatio, self.hpcEfficiency
+        try:
+            if self.map is not None:
+                # as fan.advance
+                self.hpcPressRatio, self.hpcEfficiency = self.mapPointHPC()
+            if self.gas is None:
+                self.stagnationTemperatureHPC()
+                self.stagnationPressureHPC()
+                self.enthalpyRiseHPC()
+                self.workRequiredHPC()
+            else:
+                self.stagnationPressureHPC()
+                self.variableGasHPC()
+        finally:
+            self.hpcPressRatio, self.hpcEfficiency = design
+        out.Tt = self.stagtempHPC
+        out.Pt = self.stagPressHPC
+        out.massFlow = self.massflow
+        out.fuelFlow = inState.fuelFlow
+        out.work = self.powerReq_HPC
+
+    def compute(self):
+        self.stagnationTemperatureHPC()
+        self.stagnationPressureHPC()
+        self.enthalpyRiseHPC()
+        self.workRequiredHPC()
+        return {
+            "Stagnation Temp (out)": self.stagtempHPC,
+            "Stagnation Press (out)": self.stagPressHPC,
+            "Enthalpy Rise": self.deltaH_HPC,
+            "HPC Work (W)": self.powerReq_HPC,
+        }
+
+
+class combustor:
+    __slots__ = ("stagpress", "stagtemp", "titemp", "massflow", "combustFHV", "combEfficiency", "p_drop", "specificheat",
+                 "Q", "mfuel", "stagTempComb", "stagPressComb", "massFlowTotal", "gas")
+
+# annual combustion chamber
+    def __init__(self, stagpress, stagtemp, massflow):
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.titemp = 1922 # Kelvin (5) table 3
+        self.massflow = massflow
+        self.combustFHV = 43e6 # (3) table 4, only given JP4 and JP10, so roughly guess 43MJ/kg
+        self.combEfficiency = 0.95 # (6) Figure 4, for Engine 4
+        # Engine 4 layout: fan -> hpc -> cc -> hpt -> lpt -> nozzle
+        self.p_drop = 0.05 # common design ratio used, hangs around 0.04-0.07
+        self.specificheat = 1004.5
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+
+    def heatAdded_combustor(self):
+        self.Q = self.massflow * self.specificheat * (self.titemp - self.stagtemp)
+        return self.Q
+    
+    def combustorfuel_flowrate(self): # (4) page 243
+        self.mfuel = self.heatAdded_combustor() / (self.combustFHV * self.combEfficiency) 
+        return self.mfuel
+    
+    def variableGasCombustor(self, farIn, airflow):
+        # fuel from the enthalpy balance of air in and products out (self.gas, see gas.py)
+        heat = self.combustFHV * self.combEfficiency
+        self.mfuel = self.gas.burnerFuelAirRatio(self.stagtemp, self.titemp, farIn, heat) * airflow
+        self.Q = self.mfuel * heat
+        return self.mfuel
+
+    def stagnationTemperatureCombust(self):
+        self.stagTempComb = self.titemp # exit stag temp is turbine inlet temperature
+        return self.stagTempComb
+
+    def stagnationPressureCombust(self):
+        self.stagPressComb = self.stagpress * (1 - self.p_drop)
+        return self.stagPressComb
+
+    
+    def advance(self, inState, out, titemp=None):
+        # titemp: part-power turbine inlet temperature from a throttle schedule, None = design value
+        self.stagpress = inState.Pt
+        self.stagtemp = inState.Tt
+        self.massflow = inState.massFlow
+        design = self.titemp
+        try:
+            if titemp is not None:
+                self.titemp = titemp
+            if self.gas is None:
+                self.heatAdded_combustor()
+                self.combustorfuel_flowrate()
+            else:
+                self.variableGasCombustor(fuelAirRatio(inState), self.massflow - inState.fuelFlow)
+            self.stagnationTemperatureCombust()
+            self.stagnationPressureCombust()
+        finally:
+            # as fan.advance: no schedule arrays stay on the component if the pass raises
+            self.titemp = design
+        self.massFlowTotal = self.mfuel + self.massflow
+        out.Tt = self.stagTempComb
+        out.Pt = self.stagPressComb
+        out.massFlow = self.massFlowTotal
+        out.fuelFlow = self.mfuel
+        out.work = 0.0
+
+    def compute(self):
+        self.heatAdded_combustor()
+        self.combustorfuel_flowrate()
+        self.stagnationTemperatureCombust()
+        self.stagnationPressureCombust()
+        self.massFlowTotal = self.mfuel + self.massflow
+        return {
+            "Stagnation Temp (out)": self.stagTempComb,
+            "Stagnation Press (out)": self.stagPressComb,
+            "Heat Added": self.Q,
+            "Mass flow of fuel": self.mfuel,
+            "Total Mass Flow": self.massFlowTotal
+        }
+
+
+
+class highPressureTurbine:
+    __slots__ = ("stagtemp", "stagpress", "massflow", "HPCrequiredWork", "efficiency", "specificheat", "gamma",
+                 "stagTempHPT", "stagPressHPT", "gas", "map", "mapTemp", "shaft")
+
+# one stage high pressure turbine
+    def __init__(self, stagtemp, stagpress, massflow, HPCrequiredWork):
+        self.stagtemp = stagtemp
+        self.stagpress = stagpress
+        self.massflow = massflow
+        self.HPCrequiredWork = HPCrequiredWork
+        self.efficiency = 0.9291 # (6) Figure 4, for Engine 4
+        # Engine 4 layout: fan -> hpc -> cc -> hpt -> lpt -> nozzle
+        # doesnt include afterburner but we can work around that
+        self.specificheat = 1004.5
+        self.gamma = 1.4
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+        self.map = None # maps.componentMap the efficiency comes from (engineCycle sets it), None: the constant
+        self.mapTemp = None # inlet Tt [K] at the map's design point, refers corrected speed to mechanical speed
+        self.shaft = None # compressor on the same spool, whose spoolSpeed the turbine turns at (None: design speed)
+        # work generated by HPturbine equals work required for HPC
+
+    def stagnationTemperatureHPT(self):
+        delta_h = self.HPCrequiredWork / (self.massflow * self.efficiency)
+        self.stagTempHPT = self.stagtemp - (delta_h / self.specificheat)
+        return self.stagTempHPT
+
+    def stagnationPressureHPT(self):
+        T_ratio = self.stagTempHPT / self.stagtemp
+        exponent = self.gamma / (self.gamma - 1)
+        self.stagPressHPT = self.stagpress * (T_ratio ** exponent)
+        return self.stagPressHPT
+    
+    def variableGasHPT(self, far):
+        # same work extraction with cp and gamma following temperature and fuel-air ratio
+        # (self.gas, see gas.py): exit temperature from the enthalpy drop, pressure from the entropy function
+        delta_h = self.HPCrequiredWork / (self.massflow * self.efficiency)
+        self.stagTempHPT, ratio = self.gas.expand(self.stagtemp, delta_h, far)
+        self.stagPressHPT = self.stagpress * ratio
+        return self.stagTempHPT
+
+    def mapPointHPT(self, far):
+        # efficiency off self.map (see maps.py) at the corrected speed of the spool and the
+        # expansion ratio: a pass at the design efficiency places the point on the map, a second
+        # pass extracts the same work at the map's efficiency
+        design = self.efficiency
+        speed = (1.0 if self.shaft is None else self.shaft.spoolSpeed) * np.sqrt(self.mapTemp / self.stagtemp)
+        try:
+            for _ in range(2):
+                if self.gas is None:
+                    self.stagnationTemperatureHPT()
+                    self.stagnationPressureHPT()
+                else:
+                    self.variableGasHPT(far)
+                beta = self.map.solveBeta(speed, self.stagpress / self.stagPressHPT, "pressureRatio")
+                (self.efficiency,) = self.map.lookup(speed, beta, ("efficiency",))
+            if self.gas is None:
+                self.stagnationTemperatureHPT()
+                self.stagnationPressureHPT()
+            else:
+                self.variableGasHPT(far)
+        finally:
+            # the design efficiency comes back even if a pass raises
+            self.efficiency = design
+        return self.stagTempHPT
+
+    def advance(self, inState, HPCrequiredWork, out):
+        self.stagtemp = inState.Tt
+        self.stagpress = inState.Pt
+        self.massflow = inState.massFlow
+        self.HPCrequiredWork = HPCrequiredWork
+        if self.map is not None:
+            self.mapPointHPT(fuelAirRatio(inState))
+        elif self.gas is None:
+            self.stagnationTemperatureHPT()
+            self.stagnationPressureHPT()
+        else:
+            self.variableGasHPT(fuelAirRatio(inState))
+        out.Tt = self.stagTempHPT
+        out.Pt = self.stagPressHPT
+        out.massFlow = self.massflow
+        out.fuelFlow = inState.fuelFlow
+        out.work = self.HPCrequiredWork
+
+    def compute(self):
+        self.stagnationTemperatureHPT()
+        self.stagnationPressureHPT()
+        return {
+            "Stagnation Temp (out)": self.stagTempHPT,
+            "Stagnation Press (out)": self.stagPressHPT,
+            "Work Generated (equal to HPC required)": self.HPCrequiredWork
+        }
+
+class lowPressureTurbine:
+    __slots__ = ("stagtemp", "stagpress", "massflow", "fanRequiredWork", "efficiency", "specificheat", "gamma",
+                 "stagTempLPT", "stagPressLPT", "gas", "map", "mapTemp", "shaft")
+
+# one stage low pressure turbine
+    def __init__(self, stagtemp, stagpress, massflow, fanRequiredWork):
+        self.stagtemp = stagtemp
+        self.stagpress = stagpress
+        self.massflow = massflow
+        self.fanRequiredWork = fanRequiredWork
+        self.efficiency =  0.9035 # (6) Figure 4, Engine 3
+        self.specificheat = 1004.5
+        self.gamma = 1.4
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+        self.map = None # maps.componentMap the efficiency comes from (engineCycle sets it), None: the constant
+        self.mapTemp = None # inlet Tt [K] at the map's design point, refers corrected speed to mechanical speed
+        self.shaft = None # compressor on the same spool, whose spoolSpeed the turbine turns at (None: design speed)
+        # work generated by LPturbine equals work required for fan
+
+    def stagnationTemperatureLPT(self):
+        delta_h = self.fanRequiredWork / (self.massflow * self.efficiency)
+        self.stagTempLPT = self.stagtemp - (delta_h / self.specificheat)
+        return self.stagTempLPT
+
+    def stagnationPressureLPT(self):
+        T_ratio = self.stagTempLPT / self.stagtemp
+        exponent = self.gamma / (self.gamma - 1)
+        self.stagPressLPT = self.stagpress * (T_ratio ** exponent)
+        return self.stagPressLPT
+
+    def variableGasLPT(self, far):
+        # same work extraction with cp and gamma following temperature and fuel-air ratio
+        # (self.gas, see gas.py): exit temperature from the enthalpy drop, pressure from the entropy function
+        delta_h = self.fanRequiredWork / (self.massflow * self.efficiency)
+        self.stagTempLPT, ratio = self.gas.expand(self.stagtemp, delta_h, far)
+        self.stagPressLPT = self.stagpress * ratio
+        return self.stagTempLPT
+
+    def mapPointLPT(self, far):
+        # as highPressureTurbine.mapPointHPT
+        design = self.efficiency
+        speed = (1.0 if self.shaft is None else self.shaft.spoolSpeed) * np.sqrt(self.mapTemp / self.stagtemp)
+        try:
+            for _ in range(2):
+                if self.gas is None:
+                    self.stagnationTemperatureLPT()
+                    self.stagnationPressureLPT()
+                else:
+                    self.variableGasLPT(far)
+                beta = self.map.solveBeta(speed, self.stagpress / self.stagPressLPT, "pressureRatio")
+                (self.efficiency,) = self.map.lookup(speed, beta, ("efficiency",))
+            if self.gas is None:
+                self.stagnationTemperatureLPT()
+                self.stagnationPressureLPT()
+            else:
+                self.variableGasLPT(far)
+        finally:
+            # as in mapPointHPT
+            self.efficiency = design
+        return self.stagTempLPT
+
+    def advance(self, inState, fanRequiredWork, out):
+        self.stagtemp = inState.Tt
+        self.stagpress = inState.Pt
+        self.massflow = inState.massFlow
+        self.fanRequiredWork = fanRequiredWork
+        if self.map is not None:
+            self.mapPointLPT(fuelAirRatio(inState))
+        elif self.gas is None:
+            self.stagnationTemperatureLPT()
+            self.stagnationPressureLPT()
+        else:
+            self.variableGasLPT(fuelAirRatio(inState))
+        out.Tt = self.stagTempLPT
+        out.Pt = self.stagPressLPT
+        out.massFlow = self.massflow
+        out.fuelFlow = inState.fuelFlow
+        out.work = self.fanRequiredWork
+
+    def compute(self):
+        self.stagnationTemperatureLPT()
+        self.stagnationPressureLPT()
+        return {
+            "Stagnation Temp (out)": self.stagTempLPT,
+            "Stagnation Press (out)": self.stagPressLPT,
+            "Work Generated (equal to fan required)": self.fanRequiredWork
+        }
+    
+class mixer:
+    __slots__ = ("coremassflow", "lptstagtemp", "lptstagpress", "bypassmassflow", "fanstagtemp", "fanstagpress",
+                 "specificheat", "gamma", "p_drop", "mixedMF", "stagTempMixed", "stagPressMixed", "gas")
+
+    def __init__(self, coremassflow, lptstagtemp, lptstagpress, bypassmassflow, fanstagtemp, fanstagpress):
+        self.coremassflow = coremassflow
+        self.lptstagtemp = lptstagtemp
+        self.lptstagpress = lptstagpress
+        self.bypassmassflow = bypassmassflow
+        self.fanstagtemp = fanstagtemp
+        self.fanstagpress = fanstagpress
+        self.specificheat = 1004.5
+        self.gamma = 1.4
+        self.p_drop = 0.01 # (7) page 9 on mixer performance, between 0.9-1.2 mach 8 and 0.8-1.1 mach 1.4
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+
+    def mixedMassFlow(self):
+        self.mixedMF = self.coremassflow + self.bypassmassflow
+        return self.mixedMF
+    
+    def mixedStagnationTemperature(self):
+        self.stagTempMixed = (self.coremassflow * self.lptstagtemp + \
+            self.bypassmassflow * self.fanstagtemp) / self.mixedMF
+        return self.stagTempMixed
+
+    def variableGasMixer(self, coreFar, mixedFar):
+        # with cp varying it's the enthalpy flows that add up, not mass flow * temperature (self.gas, see gas.py)
+        total = (self.coremassflow * self.gas.enthalpyAt(self.lptstagtemp, coreFar)
+                 + self.bypassmassflow * self.gas.enthalpyAt(self.fanstagtemp))
+        self.stagTempMixed = self.gas.temperature(total / self.mixedMF, mixedFar)
+        return self.stagTempMixed
+
+    def mixedStagnationPressure(self): # simplification, assuming lower stagpress to not risk having higher pressure
+        # np.minimum so a whole batch of operating points can go through at once
+        self.stagPressMixed = np.minimum(self.fanstagpress, self.lptstagpress) * (1 - self.p_drop)
+        return self.stagPressMixed
+    
+    def advance(self, coreState, bypassState, out):
+        self.coremassflow = coreState.massFlow
+        self.lptstagtemp = coreState.Tt
+        self.lptstagpress = coreState.Pt
+        self.bypassmassflow = bypassState.massFlow
+        self.fanstagtemp = bypassState.Tt
+        self.fanstagpress = bypassState.Pt
+        self.mixedMassFlow()
+        if self.gas is None:
+            self.mixedStagnationTemperature()
+        else:
+            self.variableGasMixer(fuelAirRatio(coreState),
+                                  coreState.fuelFlow / (self.mixedMF - coreState.fuelFlow))
+        self.mixedStagnationPressure()
+        out.Tt = self.stagTempMixed
+        out.Pt = self.stagPressMixed
+        out.massFlow = self.mixedMF
+        out.fuelFlow = coreState.fuelFlow
+        out.work = 0.0
+
+    def compute(self):
+        self.mixedMassFlow()
+        self.mixedStagnationTemperature()
+        self.mixedStagnationPressure()
+        return {
+            "Mixed Mass Flow": self.mixedMF,
+            "Stagnation Temp (out)": self.stagTempMixed,
+            "Stagnation Press (out)": self.stagPressMixed
+        }
+
+class afterBurner:
+    __slots__ = ("stagpress", "stagtemp", "massflow", "afterburnertemp", "p_drop", "afterburnerEfficiency",
+                 "afterburnerFHV", "specificheat", "Q", "mfuel", "afMassFlow", "stagTempAF", "stagPressAF", "gas")
+
+    def __init__(self, stagtemp, stagpress, massflow):
+    # military information, so a lot of these are ballpark estimations i made
+    # not complete guess tho, just based on what i saw online
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.massflow = massflow
+        self.afterburnertemp = 2450 # K
+        self.p_drop = 0.05
+        self.afterburnerEfficiency = 0.95 
+        self.afterburnerFHV = 43e6
+        self.specificheat = 1004.5
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+
+    def heatAdded_afterburner(self):
+        self.Q = self.massflow * self.specificheat * (self.afterburnertemp - self.stagtemp)
+        return self.Q
+    
+    def afterburnerfuel_flowrate(self): # (4) page 243
+        self.mfuel = self.heatAdded_afterburner() / (self.afterburnerFHV * self.afterburnerEfficiency) 
+        return self.mfuel
+    
+    def variableGasAfterburner(self, farIn, airflow):
+        # as combustor.variableGasCombustor, the incoming stream already carries combustion products
+        heat = self.afterburnerFHV * self.afterburnerEfficiency
+        self.mfuel = self.gas.burnerFuelAirRatio(self.stagtemp, self.afterburnertemp, farIn, heat) * airflow
+        self.Q = self.mfuel * heat
+        return self.mfuel
+
+    def totalExitMassFlow(self):
+        # Air+core flow already in self.massflow; add afterburner fuel
+        self.afMassFlow = self.massflow + self.mfuel
+        return self.afMassFlow
+    
+    def stagnationTemperatureAfterburner(self):
+        self.stagTempAF = self.afterburnertemp # exit stag temp is turbine inlet temperature
+        return self.stagTempAF
+
+    def stagnationPressureAfterburner(self):
+        self.stagPressAF = self.stagpress * (1 - self.p_drop)
+        return self.stagPressAF
+    
+    def advance(self, inState, out, afterburnertemp=None):
+        # afterburnertemp: scheduled exit temperature for partial afterburner, None = design value
+        self.stagtemp = inState.Tt
+        self.stagpress = inState.Pt
+        self.massflow = inState.massFlow
+        design = self.afterburnertemp
+        try:
+            if afterburnertemp is not None:
+                self.afterburnertemp = afterburnertemp
+            self.stagnationTemperatureAfterburner()
+            self.stagnationPressureAfterburner()
+            if self.gas is None:
+                self.heatAdded_afterburner()
+                self.afterburnerfuel_flowrate()
+            else:
+                self.variableGasAfterburner(fuelAirRatio(inState), self.massflow - inState.fuelFlow)
+            self.totalExitMassFlow()
+        finally:
+            self.afterburnertemp = design
+        out.Tt = self.stagTempAF
+        out.Pt = self.stagPressAF
+        out.massFlow = self.afMassFlow
+        out.fuelFlow = self.mfuel + inState.fuelFlow
+        out.work = 0.0
+
+    def compute(self):
+        self.stagnationTemperatureAfterburner()
+        self.stagnationPressureAfterburner()
+        self.heatAdded_afterburner()
+        self.afterburnerfuel_flowrate()
+        self.totalExitMassFlow()
+        return {
+            "Stagnation Temp (out)": self.stagTempAF,
+            "Stagnation Press (out)": self.stagPressAF,
+            "Heat Added": self.Q,
+            "Mass flow of fuel": self.mfuel,
+            "Total Mass flow":self.afMassFlow
+        }
+    
+
+# isentropic area-Mach relation, A/A* = (1/M) ((2/(gamma+1)) (1 + (gamma-1)/2 M^2))^((gamma+1)/(2(gamma-1))),
+# and its inverse. Inverting is a root solve on either branch, so machFromAreaRatio starts from a table
+# and polishes with Newton. The table coordinate t = sqrt(1 - (A*/A)^((gamma-1)/(gamma+1))) covers every
+# area ratio on [0, 1], and both M (subsonic) and 1/M (supersonic) are smooth in it, through the sonic
+# point (t ~ |M - 1|) and out to A/A* -> infinity
+areaMachNodes = 1025
+_areaMachTables = {}
+
+
+def _sonicFraction(mach, gamma):
+    # (A*/A)^((gamma-1)/(gamma+1)) in closed form, no overflow for large Mach
+    return mach ** ((gamma - 1) / (gamma + 1)) / np.sqrt(2 / (gamma + 1) * (1 + (gamma - 1) / 2 * mach * mach))
+
+
+def _areaMachTable(gamma):
+    # (subsonic M, supersonic 1/M) at areaMachNodes uniform t nodes for this gamma, by bisection in
+    # log M (built once per gamma)
+    table = _areaMachTables.get(gamma)
+    if table is None:
+        target = 1 - np.linspace(0.0, 1.0, areaMachNodes) ** 2
+        table = []
+        for low, high, rising in ((-300.0, 0.0, True), (0.0, 300.0, False)):
+            lo, hi = np.full(areaMachNodes, low), np.full(areaMachNodes, high)
+            for _ in range(64):
+                mid = 0.5 * (lo + hi)
+                fraction = _sonicFraction(np.exp(mid), gamma)
+                up = fraction < target if rising else fraction > target
+                lo, hi = np.where(up, mid, lo), np.where(up, hi, mid)
+            table.append(np.exp(0.5 * (lo + hi)))
+        subsonic, supersonic = table
+        subsonic[0] = supersonic[0] = 1.0
+        subsonic[-1] = 0.0
+        table = _areaMachTables[gamma] = (subsonic, 1 / supersonic)
+        table[1][-1] = 0.0
+    return table
+
+
+def areaMachRatio(mach, gamma=1.4):
+    # A / A* of isentropic flow at this Mach (nozzle.nozzleExitSize's relation)
+    return (1 / mach) * ((2 / (gamma + 1)) * (1 + (gamma - 1)/2 * mach**2)) ** ((gamma + 1) / (2 * (gamma - 1)))
+
+
+def machFromAreaRatio(areaRatio, gamma=1.4, supersonic=False, polish=2):
+    # Mach at area ratio A / A* on the subsonic or supersonic branch (supersonic may be an array),
+    # elementwise: table start plus polish Newton steps in t, which leave the area ratio exact to
+    # round-off and the Mach to ~1e-12 (near Mach 1 the Mach itself is only as well determined as
+    # sqrt of the area ratio's round-off). Area ratios below 1 have no isentropic solution: nan
+    areaRatio, supersonic = np.broadcast_arrays(np.asarray(areaRatio, dtype=float), np.asarray(supersonic))
+    if np.ndim(gamma) > 0:
+        # one table per distinct gamma (config batches)
+        gamma = np.broadcast_to(gamma, areaRatio.shape)
+        mach = np.empty(areaRatio.shape)
+        for g in np.unique(gamma):
+            here = gamma == g
+            mach[here] = machFromAreaRatio(areaRatio[here], float(g), supersonic[here], polish)
+        return mach
+    gamma = float(gamma)
+    exponent = (gamma - 1) / (gamma + 1)
+    subsonic, inverseSupersonic = _areaMachTable(gamma)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        t = np.sqrt(1 - areaRatio ** -exponent)
+        x = t * (areaMachNodes - 1)
+        cell = np.clip(np.nan_to_num(x).astype(np.intp), 0, areaMachNodes - 2)
+        w = x - cell
+        mach = np.where(supersonic,
+                        1 / (inverseSupersonic[cell] + w * (inverseSupersonic[cell + 1] - inverseSupersonic[cell])),
+                        subsonic[cell] + w * (subsonic[cell + 1] - subsonic[cell]))
+        for _ in range(polish):
+            fraction = _sonicFraction(mach, gamma)
+            current = np.sqrt(np.maximum(1 - fraction, 0.0))
+            # dt/dM; zero at Mach 1, where the table is exact and the step is dropped
+            slope = -fraction * exponent * (1 - mach * mach) / (2 * current * mach * (1 + (gamma - 1) / 2 * mach * mach))
+            step = (current - t) / slope
+            mach = mach - np.where(np.isfinite(step), step, 0.0)
+    return mach
+
+
+class nozzle:
+    __slots__ = ("stagpress", "stagtemp", "ambpress", "massflow", "nozzleEff", "specificheat", "gamma", "R",
+                 "nozzleExitMax", "topMach", "nozzleThroat", "desiredMach",
+                 "nozzleExit", "tempNozzle", "pressNozzle", "nozzleVelocity", "gas")
+
+    def __init__(self, stagtemp, stagpress, ambpress, massflow, desiredMach):
+        self.stagpress = stagpress
+        self.stagtemp = stagtemp
+        self.ambpress = ambpress
+        self.massflow = massflow
+        self.nozzleEff = 0.97 # approximation
+        self.specificheat = 1004.5
+        self.gamma = 1.4
+        self.R = 287
+
+        # max mach of 2.25, using 130cm max diameter, calculating nozzle throat area
+        # finding throat, i can change nozzle exit area using isentropic relations and desired mach number
+        self.nozzleExitMax = 1.327 # m^2
+        self.topMach = 2.25
+        self.nozzleThroat = 0.463 # m^2
+        self.desiredMach = desiredMach
+        self.gas = None # gas.gasTables for temperature-dependent cp/gamma (engineCycle sets it), None: constants
+
+    @classmethod
+    def atAltitude(cls, stagtemp, stagpress, altitude, massflow, desiredMach):
+        # exhausting to the standard-atmosphere static pressure at altitude
+        return cls(stagtemp, stagpress, isa(altitude)[1], massflow, desiredMach)
+
+    def nozzleExitSize(self):
+        M = self.desiredMach
+        gamma = self.gamma
+        area_ratio = (1 / M) * ((2 / (gamma + 1)) * (1 + (gamma - 1)/2 * M**2)) ** ((gamma + 1) / (2 * (gamma - 1)))
+        self.nozzleExit = self.nozzleThroat * area_ratio
+        return self.nozzleExit
+    
+    def staticTemperatureNozzle(self):
+        self.tempNozzle = self.stagtemp / (1 + (self.gamma - 1)/2 * self.desiredMach**2)
+        return self.tempNozzle
+
+    def staticPressureNozzle(self):
+        self.pressNozzle = self.stagpress / (1 + (self.gamma - 1)/2 * self.desiredMach**2)**(self.gamma / (self.gamma - 1))
+        return self.pressNozzle
+
+    def nozzleExitVelocity(self):
+        a = np.sqrt(self.gamma * self.R * self.tempNozzle)
+        self.nozzleVelocity = a * self.desiredMach
+        return self.nozzleVelocity
+
+    def variableGasNozzle(self, far):
+        # exit state from h(Tt) = h(T) + V^2 / 2 with cp, gamma and R of the exhaust (self.gas, see gas.py);
+        # exit area from continuity between the throat (Mach 1) and the exit, A / A* = rho* V* / (rho V)
+        self.tempNozzle, ratio, self.nozzleVelocity = self.gas.staticState(self.stagtemp, self.desiredMach, far)
+        self.pressNozzle = self.stagpress * ratio
+        self.nozzleExit = self.nozzleThroat * self.gas.throatFlow(self.stagtemp, far) / \
+            (ratio * self.nozzleVelocity / self.tempNozzle)
+        return self.nozzleVelocity
+
+    def exitMachFromArea(self, exitArea=None):
+        # (subsonic, supersonic) isentropic exit Mach for an exit area over the choked throat;
+        # exitArea defaults to the geometric one, nozzleExit held between nozzleThroat and nozzleExitMax
+        if exitArea is None:
+            exitArea = np.clip(self.nozzleExit, self.nozzleThroat, self.nozzleExitMax)
+        ratio = exitArea / self.nozzleThroat
+        return machFromAreaRatio(ratio, self.gamma), machFromAreaRatio(ratio, self.gamma, supersonic=True)
+
+    def flowRegime(self, exitArea=None, rtol=1e-6):
+        # what the nozzle (throat nozzleThroat, exit exitArea as in exitMachFromArea) does at
+        # stagpress against ambpress, elementwise:
+        #   back pressure above the subsonic-exit pressure: unchoked, subsonic throughout
+        #   between that and the normal-shock-at-exit pressure: choked, shock inside the divergent part
+        #   above the design (supersonic-exit) pressure: overexpanded, below it: underexpanded
+        # with the exit Mach / static pressure each case gives
+        subsonic, supersonic = self.exitMachFromArea(exitArea)
+        gamma = self.gamma
+        if exitArea is None:
+            exitArea = np.clip(self.nozzleExit, self.nozzleThroat, self.nozzleExitMax)
+        ratio = exitArea / self.nozzleThroat
+        staticRatio = lambda M: (1 + (gamma - 1)/2 * M**2) ** (-gamma / (gamma - 1))
+        chokingPress = self.stagpress * staticRatio(subsonic)
+        designPress = self.stagpress * staticRatio(supersonic)
+        shockAtExitPress = designPress * (1 + 2 * gamma / (gamma + 1) * (supersonic**2 - 1))
+        back = self.ambpress
+        choked = back <= chokingPress
+        shock = choked & (back > shockAtExitPress)
+        ideal = choked & (np.abs(back - designPress) <= rtol * designPress)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # unchoked: exit at back pressure, Mach from Pt / p
+            unchokedMach = np.sqrt(np.maximum(2 / (gamma - 1) * ((self.stagpress / back) ** ((gamma - 1) / gamma) - 1), 0))
+            # shock inside: exit at back pressure carrying the choked flow, p A M sqrt(1 + (gamma-1)/2 M^2)
+            # = Pt A* (2/(gamma+1))^((gamma+1)/(2(gamma-1))), a quadratic in M^2
+            choke = (2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1))) * self.stagpress / (back * ratio)
+            shockMach = np.sqrt((np.sqrt(1 + 2 * (gamma - 1) * choke**2) - 1) / (gamma - 1))
+        return {
+            "Choked": choked,
+            "Shock In Nozzle": shock,
+            "Overexpanded": choked & ~ideal & (back > designPress),
+            "Underexpanded": choked & ~ideal & (back < designPress),
+            "Ideally Expanded": ideal,
+            "Exit Mach": np.where(choked, np.where(shock, shockMach, supersonic), unchokedMach),
+            "Exit Press": np.where(choked & ~shock, designPress, back),
+            "Subsonic Exit Mach": subsonic,
+            "Supersonic Exit Mach": supersonic,
+            "Choking Press": chokingPress,
+            "Shock At Exit Press": shockAtExitPress,
+            "Design Press": designPress,
+        }
+
+    def exitMassFlow(self, exitArea):
+        # continuity at the exit plane at desiredMach, same mass flow parameter as inlet.massFlowCalc
+        factor = self.stagpress * exitArea / np.sqrt(self.R * self.stagtemp)
+        mach_term = self.desiredMach * np.sqrt(self.gamma)
+        temp_term = (1 + ((self.gamma - 1) / 2) * self.desiredMach**2) ** (-((self.gamma + 1) / (2 * (self.gamma - 1))))
+        return factor * mach_term * temp_term
+    
+    def advance(self, inState, ambpress, desiredMach):
+        # nozzle exit is static, so results stay on the object (nozzleExit, nozzleVelocity, ...)
+        self.stagtemp = inState.Tt
+        self.stagpress = inState.Pt
+        self.massflow = inState.massFlow
+        self.ambpress = ambpress
+        self.desiredMach = desiredMach
+        if self.gas is None:
+            self.nozzleExitSize()
+            self.staticTemperatureNozzle()
+            self.staticPressureNozzle()
+            self.nozzleExitVelocity()
+        else:
+            self.variableGasNozzle(fuelAirRatio(inState))
+
+    def compute(self):
+        self.nozzleExitSize()
+        self.staticTemperatureNozzle()
+        self.staticPressureNozzle()
+        self.nozzleExitVelocity()
+
+        return {
+            "Nozzle Exit Size": self.nozzleExit,
+            "Nozzle Exit Velocity": self.nozzleVelocity,
+            "Static Temp (out)": self.tempNozzle,
+            "Static Press (out)": self.pressNozzle,
+        }
+    
+
+class exhaust:
+    __slots__ = ("noz_exitV", "massflow", "fuel_flow", "fuel_heatingval", "noz_area", "noz_press", "ambpress", "fsV",
+                 "airflow", "thrust", "tSFC", "specThrust", "thermEfficiency")
+
+    def __init__(self, noz_exitV, massflow, fuel_flow, noz_area, noz_press, ambpress, fsV):
+        self.noz_exitV = noz_exitV
+        self.massflow = massflow
+        self.fuel_flow = fuel_flow
+        self.fuel_heatingval = 43e6
+        self.noz_area = noz_area
+        self.noz_press = noz_press
+        self.ambpress = ambpress # kpa
+        self.fsV = fsV
+        self.airflow = self.massflow - self.fuel_flow
+
+    @classmethod
+    def atAltitude(cls, noz_exitV, massflow, fuel_flow, noz_area, noz_press, altitude, fsV):
+        return cls(noz_exitV, massflow, fuel_flow, noz_area, noz_press, isa(altitude)[1], fsV)
+
+    def netThrust(self):
+        # from (7), continuity equation of momentum, thrust is 
+        # mdot(ve - vo) + (pe - po)Ae
+        # assume freestream velocity is zero
+        self.thrust = self.massflow * (self.noz_exitV - self.fsV) + (self.noz_press - self.ambpress)*self.noz_area
+        return self.thrust
+
+    def thrustSpecificFuelConsump(self):
+        self.tSFC = self.fuel_flow / self.thrust
+        return self.tSFC
+    
+    def specificThrust(self):
+        self.specThrust = self.thrust / self.airflow
+        return self.specThrust
+    
+    def thermalEfficiency(self):
+        top = 0.5 * self.massflow * self.noz_exitV**2
+        bottom = self.fuel_flow * self.fuel_heatingval
+        self.thermEfficiency = top / bottom
+        return self.thermEfficiency
+
+    def advance(self, inState, noz, fsV):
+        self.noz_exitV = noz.nozzleVelocity
+        self.massflow = inState.massFlow
+        self.fuel_flow = inState.fuelFlow
+        self.noz_area = noz.nozzleExit
+        self.noz_press = noz.pressNozzle
+        self.ambpress = noz.ambpress
+        self.fsV = fsV
+        self.airflow = self.massflow - self.fuel_flow
+        self.netThrust()
+        self.thrustSpecificFuelConsump()
+        self.specificThrust()
+        self.thermalEfficiency()
+
+    def compute(self):
+        self.netThrust()
+        self.thrustSpecificFuelConsump()
+        self.specificThrust()
+        self.thermalEfficiency()
+        return{
+            "Air Mass Flow" : self.airflow,
+            "Net Thrust": self.thrust,
+            "Thrust Specific Fuel Consumption": self.tSFC,
+            "Specific Thrust":self.specThrust,
+            "Thermal Efficiency":self.thermEfficiency
+        }
+
+
+
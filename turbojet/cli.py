@@ -0,0 +1,241 @@
+"""
+Command-line entry point.
+
+    python -m turbojet sweep --mach 0:2.25:40 --mode dry,wet --output sweep.csv
+    python -m turbojet sweep --mach 0.1:2.25:1000 --altitude 0:15000:1000 --output big.parquet --workers 8
+    python -m turbojet sweep --mach 0.9 --altitude 10000 --throttle 0:2:201 --output hook.csv
+    python -m turbojet deck --mach 0.05:2.25:45 --altitude 0:18000:37 --throttle 0:1:11 --output f119.deck
+    python -m turbojet sweep --mach 0:2.25:40 --config variant.toml --output variant.csv
+    python -m turbojet sweep --mach 0:2.25:40 --mode dry,wet --gas real --output real.csv
+    python -m turbojet sweep --mach 0.3:2.25:40 --altitude 0:15000:16 --maps default --output mapped.csv
+
+Every grid axis (--mach, --altitude or --P0/--T0/--P-ambient, --mode or --throttle) takes a single value, a comma list,
+or START:STOP:NUM (np.linspace). The sweep is the cartesian product of the axes (last axis
+fastest), evaluated chunk by chunk and written out as each chunk finishes, so memory stays
+bounded whatever the grid size. Output format follows the file extension (.csv, .parquet, .npz)
+unless --format is given; progress and throughput go to stderr. --config swaps in an engine
+parameter file (TOML or JSON, see config.py) for the design constants in classes.py; --gas real
+uses temperature-dependent cp and gamma (see gas.py) instead of the constant-property cycle;
+--maps default takes fan, HPC and turbine performance from component maps (see maps.py).
+"""
+import argparse
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+
+def parseAxis(text, cast=float):
+    # "0.8" -> [0.8], "0.5,0.9" -> [0.5, 0.9], "0:2.25:40" -> np.linspace(0, 2.25, 40)
+    if cast is float and text.count(":") == 2:
+        start, stop, num = text.split(":")
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([cast(v) for v in text.split(",")])
+
+
+def loadConfig(path):
+    # --config file -> config.engineConfig, None keeps the classes.py design
+    if path is None:
+        return None
+    from .config import engineConfig
+    return engineConfig.load(path)
+
+
+# ------------------------------------------------------------------------------------------------
+# streaming writers: open(), write(chunk) per row group, close()
+
+class csvWriter:
+    def __init__(self, path, dtype, shape):
+        self.file = open(path, "w")
+        self.names = dtype.names
+        self.file.write(",".join(self.names) + "\n")
+
+    def write(self, chunk):
+        columns = np.column_stack([chunk[name].astype(float) for name in self.names])
+        np.savetxt(self.file, columns, delimiter=",", fmt="%.17g")
+
+    def close(self):
+        self.file.close()
+
+
+class parquetWriter:
+    def __init__(self, path, dtype, shape):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("parquet output needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.names = dtype.names
+        self.schema = pa.schema([(name, pa.from_numpy_dtype(dtype[name])) for name in self.names])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, chunk):
+        # one parquet row group per chunk
+        table = self.pa.Table.from_arrays([self.pa.array(chunk[name]) for name in self.names], schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+class npzWriter:
+    # a single "results" member holding the structured array, shaped like the grid; the .npy
+    # header is written up front from the known grid size and the data appended chunk by chunk
+    def __init__(self, path, dtype, shape):
+        self.zip = zipfile.ZipFile(path, "w", allowZip64=True)
+        self.member = self.zip.open("results.npy", "w", force_zip64=True)
+        header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": tuple(shape)}
+        np.lib.format.write_array_header_2_0(self.member, header)
+        self.axes = {}
+
+    def write(self, chunk):
+        self.member.write(np.ascontiguousarray(chunk).tobytes())
+
+    def close(self):
+        self.member.close()
+        for name, values in self.axes.items():
+            with self.zip.open(f"{name}.npy", "w") as f:
+                np.lib.format.write_array(f, np.asarray(values))
+        self.zip.close()
+
+
+writers = {"csv": csvWriter, "parquet": parquetWriter, "npz": npzWriter}
+
+
+# ------------------------------------------------------------------------------------------------
+# sweep command
+
+def sweepCommand(args):
+    from .cycle import stationDtype
+    from .sweep import gridShape, iterSweep
+
+    grid = {"mach": parseAxis(args.mach)}
+    if args.altitude is not None:
+        # standard atmosphere sets freestream and back pressure
+        grid["altitude"] = parseAxis(args.altitude)
+    else:
+        grid["P0"] = parseAxis(args.P0)
+        grid["T0"] = parseAxis(args.T0)
+        grid["P_ambient"] = parseAxis(args.P_ambient)
+    if args.throttle is not None:
+        grid["throttle"] = parseAxis(args.throttle)
+    else:
+        grid["mode"] = parseAxis(args.mode, str)
+    shape = gridShape(grid)
+    total = int(np.prod(shape))
+    config = loadConfig(args.config)
+
+    fmt = args.format or args.output.rsplit(".", 1)[-1].lower()
+    if fmt not in writers:
+        raise SystemExit(f"unknown output format {fmt!r} (use one of {', '.join(writers)})")
+
+    names = args.fields.split(",") if args.fields else list(stationDtype.names)
+    missing = [name for name in names if name not in stationDtype.names]
+    if missing:
+        raise SystemExit(f"unknown fields: {', '.join(missing)}")
+    dtype = np.dtype([(name, stationDtype[name]) for name in names])
+
+    writer = writers[fmt](args.output, dtype, shape)
+    if fmt == "npz":
+        writer.axes = {f"axis_{name}": values for name, values in grid.items()}
+
+    done = 0
+    t0 = lastReport = time.perf_counter()
+    try:
+        for start, stop, res in iterSweep(grid, workers=args.workers, chunkSize=args.chunk_size, config=config,
+                                          gas=args.gas, maps=None if args.maps == "none" else args.maps):
+            chunk = np.empty(stop - start, dtype=dtype)
+            for name in names:
+                chunk[name] = res[name]
+            writer.write(chunk)
+            done = stop
+
+            now = time.perf_counter()
+            if not args.quiet and (now - lastReport > 1.0 or done == total):
+                rate = done / (now - t0)
+                eta = (total - done) / rate if rate > 0 else 0.0
+                print(f"\r{done:,}/{total:,} points  {100 * done / total:5.1f}%  {rate:,.0f} pts/s  "
+                      f"eta {eta:6.1f} s", end="", file=sys.stderr, flush=True)
+                lastReport = now
+    finally:
+        writer.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - t0
+        print(f"\nwrote {done:,} points to {args.output} in {elapsed:.2f} s "
+              f"({done / elapsed if elapsed > 0 else 0:,.0f} pts/s)", file=sys.stderr)
+    return 0
+
+
+# ------------------------------------------------------------------------------------------------
+# deck command
+
+def deckCommand(args):
+    from .deck import buildDeck, deckFields
+
+    t0 = time.perf_counter()
+    deck = buildDeck(args.output, mach=parseAxis(args.mach), altitude=parseAxis(args.altitude),
+                     throttle=parseAxis(args.throttle), fields=args.fields.split(",") if args.fields else deckFields,
+                     dtype=args.dtype, workers=args.workers, validate=args.validate,
+                     config=loadConfig(args.config))
+    if not args.quiet:
+        print(f"wrote {args.output}: {' x '.join(map(str, deck.table.shape))} table "
+              f"in {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+        for method, bounds in (deck.errors or {}).items():
+            print(f"{method} interpolation error over {args.validate} random points (max / 99th pct relative):",
+                  file=sys.stderr)
+            for name, b in bounds.items():
+                print(f"  {name:22s} {b['maxRel']:10.2e} {b['p99Rel']:10.2e}", file=sys.stderr)
+    return 0
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="python -m turbojet", description="F119 turbofan cycle model")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep = commands.add_parser("sweep", help="evaluate the cycle over a grid and stream results to a file")
+    sweep.add_argument("--mach", default="0:2.25:40", help="flight Mach (value, list or START:STOP:NUM)")
+    sweep.add_argument("--altitude", help="altitude [m], standard atmosphere (replaces --P0/--T0/--P-ambient)")
+    sweep.add_argument("--P0", default="101325", help="freestream static pressure [Pa]")
+    sweep.add_argument("--T0", default="298", help="freestream static temperature [K]")
+    sweep.add_argument("--P-ambient", dest="P_ambient", default="101325", help="nozzle back pressure [Pa]")
+    sweep.add_argument("--mode", default="wet", help="dry, wet or dry,wet")
+    sweep.add_argument("--throttle", help="0 idle, 1 military, 2 max afterburner (replaces --mode)")
+    sweep.add_argument("--config", help="engine parameter file (.toml or .json, see config.py)")
+    sweep.add_argument("--gas", choices=("ideal", "real"), default="ideal",
+                       help="constant cp/gamma (ideal) or temperature-dependent properties (real, see gas.py)")
+    sweep.add_argument("--maps", choices=("none", "default"), default="none",
+                       help="fixed pressure ratios/efficiencies (none) or component maps (default, see maps.py)")
+    sweep.add_argument("--output", "-o", required=True, help="output file (.csv, .parquet, .npz)")
+    sweep.add_argument("--format", choices=sorted(writers), help="override the format implied by --output")
+    sweep.add_argument("--fields", help="comma list of result fields to keep (default: all)")
+    sweep.add_argument("--chunk-size", type=int, default=50000, help="points per batch / row group")
+    sweep.add_argument("--workers", type=int, default=1, help="worker processes (default 1 = in process)")
+    sweep.add_argument("--quiet", "-q", action="store_true", help="no progress output")
+    sweep.set_defaults(func=sweepCommand)
+
+    deck = commands.add_parser("deck", help="precompute a memory-mappable performance deck for fast interpolation")
+    deck.add_argument("--mach", default="0.05:2.25:45", help="Mach axis (list or START:STOP:NUM)")
+    deck.add_argument("--altitude", default="0:18000:37", help="altitude axis [m]")
+    deck.add_argument("--throttle", default="0:1:11",
+                      help="throttle positions in [0, 1], used for both the dry and the afterburning range")
+    deck.add_argument("--fields", help="comma list of result fields to store (default: deck.deckFields)")
+    deck.add_argument("--dtype", choices=("f8", "f4"), default="f8", help="table precision")
+    deck.add_argument("--validate", type=int, default=2000, help="random points for the stored error bounds (0: none)")
+    deck.add_argument("--config", help="engine parameter file (.toml or .json, see config.py)")
+    deck.add_argument("--output", "-o", required=True, help="deck file")
+    deck.add_argument("--workers", type=int, default=1, help="worker processes (default 1 = in process)")
+    deck.add_argument("--quiet", "-q", action="store_true", help="no summary output")
+    deck.set_defaults(func=deckCommand)
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
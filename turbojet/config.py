@@ -0,0 +1,226 @@
+"""
+Engine parameter sets.
+
+The design constants (fan pressure ratio, bypass ratio, TIT, efficiencies, nozzle throat, ...)
+default to the values the components set in classes.py. An engineConfig overrides any of
+them without touching the components or module state: it is immutable and hashable, keyed
+by "component.attr" names as in cycle.engineConstants() (e.g. "fan.pressure_ratioFan",
+"split.bypaRatio", "combustor.titemp", "nozzle.nozzleThroat"), and loads from TOML or JSON
+with one table per component:
+
+    [fan]
+    pressure_ratioFan = 4.2
+
+    [combustor]
+    titemp = 1950
+
+runEngine / runEngineBatch(..., config=cfg) evaluate with it. A configBatch holds arrays of
+values instead (one design per entry) and broadcasts against the flight conditions like any
+other runEngineBatch argument, so a whole design study is a single batched call:
+
+    designs = configBatch({"fan.pressure_ratioFan": np.linspace(3, 5, 100000)})
+    res = runEngineBatch(0.8, altitude=10000, config=designs)    # shape (100000,)
+"""
+import hashlib
+import json
+
+import numpy as np
+
+
+# exhaust is built from placeholder zeros that advance() overwrites, so those aren't design constants
+_stateAttributes = {"exhaust.noz_exitV", "exhaust.massflow", "exhaust.fuel_flow", "exhaust.airflow"}
+
+_defaults = None
+
+
+def designConstants():
+    # ("component.attr", value) for every design constant, as classes.py sets it
+    # imported here: cycle imports this module
+    from .cycle import engineConstants
+
+    global _defaults
+    if _defaults is None:
+        _defaults = tuple((name, float(value)) for name, value in engineConstants()
+                          if name not in _stateAttributes)
+    return _defaults
+
+
+def resetDesignConstants():
+    # forget the cached defaults, designConstants() re-reads classes.py on its next call
+    global _defaults
+    _defaults = None
+
+
+def _flatten(tables):
+    # {"fan": {"pressure_ratioFan": 4.2}} or {"fan.pressure_ratioFan": 4.2} -> flat dotted names
+    flat = {}
+    for key, value in tables.items():
+        if isinstance(value, dict):
+            for attr, v in value.items():
+                flat[f"{key}.{attr}"] = v
+        else:
+            flat[key] = value
+    return flat
+
+
+def _nest(flat):
+    # flat dotted names -> {"component": {"attr": value}}
+    tables = {}
+    for name, value in flat.items():
+        component, attr = name.split(".")
+        tables.setdefault(component, {})[attr] = value
+    return tables
+
+
+def _checkNames(names):
+    known = dict(designConstants())
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise KeyError(f"unknown engine parameters: {', '.join(unknown)}")
+
+
+class engineConfig:
+    __slots__ = ("_values", "_hash")
+
+    def __init__(self, values=None, **overrides):
+        # values: {"component.attr": value} or nested {"component": {"attr": value}} overriding the
+        # classes.py defaults; keyword overrides spell the dot as a double underscore
+        # (engineConfig(fan__pressure_ratioFan=4.2))
+        changes = _flatten(dict(values or {}))
+        changes.update((key.replace("__", "."), value) for key, value in overrides.items())
+        _checkNames(changes)
+        merged = tuple((name, float(changes.get(name, default))) for name, default in designConstants())
+        object.__setattr__(self, "_values", merged)
+        object.__setattr__(self, "_hash", hash(merged))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("engineConfig is immutable, use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("engineConfig is immutable, use replace()")
+
+    def __reduce__(self):
+        # pickles as its overrides (sweeps ship configs to worker processes)
+        return (engineConfig, (self.overrides(),))
+
+    def __getitem__(self, name):
+        for key, value in self._values:
+            if key == name:
+                return value
+        raise KeyError(name)
+
+    def __eq__(self, other):
+        return isinstance(other, engineConfig) and self._values == other._values
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"engineConfig({self.overrides()!r})"
+
+    def items(self):
+        return self._values
+
+    def names(self):
+        return tuple(name for name, _ in self._values)
+
+    def overrides(self):
+        # the values that differ from the classes.py defaults
+        return {name: value for (name, value), (_, default) in zip(self._values, designConstants())
+                if value != default}
+
+    def replace(self, values=None, **overrides):
+        # new config with some values changed
+        changes = self.overrides()
+        changes.update(_flatten(dict(values or {})))
+        changes.update((key.replace("__", "."), value) for key, value in overrides.items())
+        return engineConfig(changes)
+
+    def digest(self):
+        # stable across processes and sessions (hash() of floats is too, but not of the tuple layout)
+        return hashlib.sha1(repr(self._values).encode()).hexdigest()
+
+    def toDict(self):
+        # nested {"component": {"attr": value}}, every parameter
+        return _nest(dict(self._values))
+
+    def apply(self, cycle):
+        # set every parameter on the components of a cycle.engineCycle
+        for name, value in self._values:
+            component, attr = name.split(".")
+            setattr(getattr(cycle, component), attr, value)
+
+    @classmethod
+    def load(cls, path):
+        # .toml, anything else is read as JSON; parameters not in the file keep their defaults
+        if str(path).endswith(".toml"):
+            import tomllib
+            with open(path, "rb") as f:
+                return cls(tomllib.load(f))
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path, full=False):
+        # writes the overrides only (full=True: every parameter), as TOML or JSON by extension
+        tables = self.toDict() if full else _nest(self.overrides())
+        if str(path).endswith(".toml"):
+            lines = []
+            for component, values in tables.items():
+                lines.append(f"[{component}]")
+                lines.extend(f"{attr} = {value!r}" for attr, value in values.items())
+                lines.append("")
+            with open(path, "w") as f:
+                f.write("\n".join(lines))
+        else:
+            with open(path, "w") as f:
+                json.dump(tables, f, indent=2)
+
+
+class configBatch:
+    # many designs at once: every parameter given here is an array (all broadcast together to
+    # .shape), everything else comes from base; runEngineBatch broadcasts .shape against the
+    # flight conditions, so mach[:, None] with a batch of shape (n,) gives an (nMach, n) grid
+    __slots__ = ("base", "values", "shape")
+
+    def __init__(self, values, base=None):
+        self.base = engineConfig() if base is None else base
+        values = _flatten(dict(values))
+        _checkNames(values)
+        arrays = [np.asarray(v, dtype=float) for v in values.values()]
+        self.shape = np.broadcast_shapes(*(a.shape for a in arrays)) if arrays else ()
+        self.values = dict(zip(values, arrays))
+
+    @classmethod
+    def fromConfigs(cls, configs):
+        # stack a sequence of engineConfigs; only the parameters that differ between them become arrays
+        configs = list(configs)
+        if not configs:
+            raise ValueError("need at least one engineConfig")
+        table = np.array([[value for _, value in c.items()] for c in configs])
+        varying = np.flatnonzero((table != table[0]).any(axis=0))
+        names = configs[0].names()
+        return cls({names[j]: table[:, j] for j in varying}, base=configs[0])
+
+    def __len__(self):
+        return self.shape[0] if self.shape else 1
+
+    def digest(self):
+        # the base config's digest plus every array, stable across processes
+        h = hashlib.sha1(self.base.digest().encode())
+        for name, values in self.values.items():
+            h.update(name.encode())
+            h.update(repr(values.shape).encode())
+            h.update(np.ascontiguousarray(values, dtype="<f8").tobytes())
+        return h.hexdigest()
+
+    def __getitem__(self, index):
+        # the engineConfig of one design
+        return self.base.replace({name: float(np.broadcast_to(a, self.shape)[index])
+                                  for name, a in self.values.items()})
+
+    def apply(self, cycle, arrays):
+        # base values, then the (already broadcast) arrays on top
+        self.base.apply(cycle)
+        for name, value in zip(self.values, arrays):
+            component, attr = name.split(".")
+            setattr(getattr(cycle, component), attr, value)
@@ -0,0 +1,326 @@
+import threading
+
+import numpy as np
+
+from .atmosphere import isa
+from .classes import (StationState, afterBurner, bypassSplit, combustor, exhaust, fan, highPressureCompressor,
+                      highPressureTurbine, inlet, lowPressureTurbine, mixer, nozzle)
+from .config import configBatch, resetDesignConstants
+from .gas import gasModel
+from .maps import mapModel
+from .throttle import defaultSchedule
+
+
+# every station quantity runEngineBatch hands back, one field per column
+# station numbering: 0 freestream/inlet, 13 fan exit, 3 hpc exit, 4 combustor exit,
+# 45 hpt exit, 5 lpt exit, 6 mixer exit, 7 afterburner exit, 9 nozzle exit
+stationDtype = np.dtype([
+    ("Mach", "f8"),
+    ("Altitude", "f8"),
+    ("P0", "f8"),
+    ("T0", "f8"),
+    ("P_ambient", "f8"),
+    ("Wet", "?"),
+    ("Throttle", "f8"),
+    ("Tt0", "f8"),
+    ("Pt0", "f8"),
+    ("Tt13", "f8"),
+    ("Pt13", "f8"),
+    ("Tt3", "f8"),
+    ("Pt3", "f8"),
+    ("Tt4", "f8"),
+    ("Pt4", "f8"),
+    ("Tt45", "f8"),
+    ("Pt45", "f8"),
+    ("Tt5", "f8"),
+    ("Pt5", "f8"),
+    ("Tt6", "f8"),
+    ("Pt6", "f8"),
+    ("Tt7", "f8"),
+    ("Pt7", "f8"),
+    ("T9", "f8"),
+    ("P9", "f8"),
+    ("Fan Work", "f8"),
+    ("HPC Work", "f8"),
+    ("Core Mass Flow", "f8"),
+    ("Bypass Mass Flow", "f8"),
+    ("Combustor Fuel Flow", "f8"),
+    ("Afterburner Fuel Flow", "f8"),
+    ("Total Fuel Flow", "f8"),
+    ("Total Mass Flow", "f8"),
+    ("Nozzle Exit Size", "f8"),
+    ("Nozzle Exit Velocity", "f8"),
+    ("Air Mass Flow", "f8"),
+    ("Net Thrust", "f8"),
+    ("TSFC", "f8"),
+    ("Specific Thrust", "f8"),
+    ("Thermal Efficiency", "f8"),
+])
+
+
+def runEngine(mach, mode="wet", initialPress=101325, initialTemp=298, P_ambient=101325, altitude=None,
+              throttle=None, config=None, gas=None, maps=None):
+    # single operating point, pushed through the batch path as a length-1 array so the
+    # numbers are bit-for-bit the same as the matching entry of a runEngineBatch sweep (and within
+    # a few ULPs of the original per-point model, whose math.sqrt / float pow round differently)
+    # altitude [m], if given, replaces initialPress/initialTemp/P_ambient with the standard atmosphere
+    # throttle (0 idle, 1 military, 2 max afterburner), if given, replaces mode
+    # config: a config.engineConfig in place of the classes.py design constants
+    # gas: "real" for temperature-dependent gas properties (see runEngineBatch)
+    # maps: "default" or a maps.engineMaps for component performance maps (see runEngineBatch)
+    res = runEngineBatch(np.atleast_1d(mach), initialPress, initialTemp, mode=mode, P_ambient=P_ambient,
+                         altitude=altitude, throttle=throttle, config=config, gas=gas, maps=maps)[0]
+
+    return {
+        "Mach": mach,
+        "Net Thrust": res["Net Thrust"],
+        "TSFC": res["TSFC"],
+        "Specific Thrust": res["Specific Thrust"],
+        "Air Mass Flow": res["Air Mass Flow"],
+    }
+
+
+# flowpath stations 0-9, in the order the cycle fills them
+stationNames = ("inlet", "fan", "core", "bypass", "hpc", "combustor", "hpt", "lpt", "mixer", "afterburner")
+
+
+class engineCycle:
+    # one set of component objects and StationState records, built once and reused for every
+    # evaluation so the hot path doesn't allocate component objects or result dicts
+    __slots__ = ("inlet", "fan", "split", "hpc", "combustor", "hpt", "lpt", "mixer", "afterburner",
+                 "nozzle", "exhaust", "stations")
+
+    def __init__(self, config=None, gas=None, maps=None):
+        # config: a config.engineConfig overriding the design constants the components start with
+        # gas: a gas.gasTables the hot-section components take cp/gamma from, None keeps the constants
+        # maps: a maps.engineMaps, scaled to this cycle's design and attached to fan, HPC and turbines
+        self.inlet = inlet(None, None, None)
+        self.fan = fan(None, None, None)
+        self.split = bypassSplit(None, None, None)
+        self.hpc = highPressureCompressor(None, None, None)
+        self.combustor = combustor(None, None, None)
+        self.hpt = highPressureTurbine(None, None, None, None)
+        self.lpt = lowPressureTurbine(None, None, None, None)
+        self.mixer = mixer(None, None, None, None, None, None)
+        self.afterburner = afterBurner(None, None, None)
+        self.nozzle = nozzle(None, None, None, None, None)
+        self.exhaust = exhaust(0.0, 0.0, 0.0, None, None, None, None)
+        self.stations = tuple(StationState() for _ in stationNames)
+        if config is not None:
+            config.apply(self)
+        for component in (self.fan, self.hpc, self.combustor, self.hpt, self.lpt, self.mixer, self.afterburner,
+                          self.nozzle):
+            component.gas = gas
+        if maps is not None:
+            maps.attach(self)
+
+    def run(self, mach, P0, T0, P_ambient, wet, tit=None, afterburnerTemp=None):
+        afterburnerFuelFlow = self.runFlowpath(mach, P0, T0, wet, tit=tit, afterburnerTemp=afterburnerTemp)
+        self.nozzle.advance(self.stations[9], P_ambient, mach)
+        self.exhaust.advance(self.stations[9], self.nozzle, 0)
+        return afterburnerFuelFlow
+
+    def runFlowpath(self, mach, P0, T0, wet, massFlow=None, tit=None, afterburnerTemp=None, turbineWork=None):
+        # inlet through afterburner (stations 0-9), leaving the nozzle to the caller
+        # massFlow overrides the inlet's capture flow (off-design matching sets it from the nozzle)
+        # tit / afterburnerTemp are scheduled part-power temperatures, None runs the design values
+        # turbineWork: (HPT, LPT) shaft power [W] when the spools aren't in balance (transient.py),
+        # None has each turbine deliver exactly its compressor's work
+        s0, s1, s2, s3, s4, s5, s6, s7, s8, s9 = self.stations
+
+        self.inlet.advance(mach, P0, T0, s0)
+        if massFlow is not None:
+            s0.massFlow = massFlow
+        self.fan.advance(s0, s1)
+        self.split.advance(s1, s2, s3)
+        self.hpc.advance(s2, s4)
+        self.combustor.advance(s4, s5, tit)
+        self.hpt.advance(s5, s4.work if turbineWork is None else turbineWork[0], s6)
+        self.lpt.advance(s6, s1.work if turbineWork is None else turbineWork[1], s7)
+        self.mixer.advance(s7, s3, s8)
+
+        return self.runAfterburner(wet, afterburnerTemp)
+
+    def runAfterburner(self, wet, afterburnerTemp=None):
+        # station 8 -> 9, returning the afterburner fuel flow: only lit on the wet points, dry
+        # points just carry the mixed stream through
+        s8, s9 = self.stations[8:]
+        if wet.all():
+            self.afterburner.advance(s8, s9, afterburnerTemp)
+            afterburnerFuelFlow = self.afterburner.mfuel
+        elif wet.any():
+            self.afterburner.advance(s8, s9, afterburnerTemp)
+            s9.Tt = np.where(wet, s9.Tt, s8.Tt)
+            s9.Pt = np.where(wet, s9.Pt, s8.Pt)
+            s9.massFlow = np.where(wet, s9.massFlow, s8.massFlow)
+            s9.fuelFlow = np.where(wet, s9.fuelFlow, s8.fuelFlow)
+            afterburnerFuelFlow = np.where(wet, self.afterburner.mfuel, 0.0)
+        else:  # all dry
+            s9.Tt = s8.Tt
+            s9.Pt = s8.Pt
+            s9.massFlow = s8.massFlow
+            s9.fuelFlow = s8.fuelFlow
+            afterburnerFuelFlow = 0.0
+        s9.work = 0.0
+        return afterburnerFuelFlow
+
+
+def engineConstants():
+    # every numeric design constant the components set in __init__, as ("component.attr", value)
+    # pairs; a fresh cycle is built each time so edits to classes.py (or monkeypatches) show up
+    cycle = engineCycle()
+    constants = []
+    for name in engineCycle.__slots__[:-1]:
+        component = getattr(cycle, name)
+        for attr in type(component).__slots__:
+            value = getattr(component, attr, None)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                constants.append((f"{name}.{attr}", value))
+    return tuple(constants)
+
+
+_local = threading.local()
+
+
+# engineConfigs each thread keeps a built cycle for (oldest dropped first)
+cycleCacheSize = 16
+
+# bumped by invalidateCycles; a thread whose cycles were built under an older value rebuilds them
+_generation = 0
+
+
+def invalidateCycles():
+    # a component __init__ changed (classes.py edited or monkeypatched): every thread's built cycles
+    # and config's cached design constants carry the old values, so drop them
+    global _generation
+    _generation += 1
+    resetDesignConstants()
+
+
+def currentCycle(config=None, gas=None, maps=None):
+    # one reusable engineCycle per thread, engineConfig (None: the classes.py constants), gas model
+    # and component maps
+    cycles = getattr(_local, "cycles", None)
+    if cycles is None or _local.generation != _generation:
+        cycles = _local.cycles = {}
+        _local.generation = _generation
+    key = config if gas is None and maps is None else (config, gas, maps)
+    cycle = cycles.get(key)
+    if cycle is None:
+        if len(cycles) >= cycleCacheSize:
+            del cycles[next(iter(cycles))]
+        cycle = cycles[key] = engineCycle(config, gas, maps)
+    return cycle
+
+
+def flightConditions(P0, T0, P_ambient, altitude):
+    # freestream static pressure/temperature and nozzle back pressure; an altitude [m] overrides
+    # all three with the standard atmosphere (the nozzle exhausts to the freestream static pressure)
+    if altitude is None:
+        return P0, T0, P_ambient, np.nan
+    T0, P0 = isa(altitude)
+    return P0, T0, P0, altitude
+
+
+def throttleConditions(cycle, mode, throttle, schedule):
+    # (afterburner lit, throttle, TIT, afterburner temperature); without a throttle the mode picks
+    # the design temperatures directly (dry = throttle 1, wet = throttle 2)
+    if throttle is None:
+        wet = mode == "wet"
+        return wet, np.where(wet, 2.0, 1.0), None, None
+    tit, afterburnerTemp, wet = (schedule or defaultSchedule).temperatures(throttle, cycle.combustor,
+                                                                            cycle.afterburner)
+    return wet, throttle, tit, afterburnerTemp
+
+
+def runEngineBatch(mach, P0=101325, T0=298, mode="wet", P_ambient=101325, altitude=None, throttle=None,
+                   schedule=None, config=None, gas=None, maps=None):
+    # whole sweep in one pass: every argument may be a scalar or an array, they get broadcast
+    # together and pushed through each component once (not per point)
+    # mode is "wet"/"dry" or an array of them; throttle (scalar or array, see throttle.py) replaces it,
+    # with schedule a throttle.throttleSchedule (default: throttle.defaultSchedule)
+    # config: a config.engineConfig, or a config.configBatch whose arrays broadcast with the rest
+    # gas: None/"ideal" for constant gamma and cp, "real" (or a gas.gasTables) for properties that vary
+    # with temperature and fuel-air ratio through fan, compressor, burners, turbines, mixer and nozzle
+    # maps: None for fixed pressure ratios and efficiencies, "default" (or a maps.engineMaps) to take
+    # them from fan, HPC and turbine maps scaled to the design point (see maps.py)
+    P0, T0, P_ambient, altitude = flightConditions(P0, T0, P_ambient, altitude)
+    gas = gasModel(gas)
+    maps = mapModel(maps)
+    batch = isinstance(config, configBatch)
+    if batch and maps is not None:
+        raise ValueError("component maps are scaled to one design point: use an engineConfig, not a configBatch")
+    mach, P0, T0, P_ambient, altitude, mode, throttleIn, *designs = np.broadcast_arrays(
+        np.asarray(mach, dtype=float), np.asarray(P0, dtype=float), np.asarray(T0, dtype=float),
+        np.asarray(P_ambient, dtype=float), np.asarray(altitude, dtype=float), np.asarray(mode),
+        np.asarray(np.nan if throttle is None else throttle, dtype=float), *(config.values.values() if batch else ()))
+
+    if batch:
+        # array-valued constants only fit this call's shape, so they get a cycle of their own
+        cycle = engineCycle(gas=gas)
+        config.apply(cycle, designs)
+    else:
+        cycle = currentCycle(config, gas, maps)
+    wet, throttle, tit, afterburnerTemp = throttleConditions(cycle, mode, None if throttle is None else throttleIn,
+                                                             schedule)
+    # Mach 0 has no inlet flow, so TSFC and specific thrust come out as nan there
+    with np.errstate(divide="ignore", invalid="ignore"):
+        afterburnerFuelFlow = cycle.run(mach, P0, T0, P_ambient, wet, tit, afterburnerTemp)
+
+    out = np.empty(mach.shape, dtype=stationDtype)
+    out["Mach"] = mach
+    out["Altitude"] = altitude
+    out["P0"] = P0
+    out["T0"] = T0
+    out["P_ambient"] = P_ambient
+    out["Wet"] = wet
+    out["Throttle"] = throttle
+    recordStations(cycle, afterburnerFuelFlow, out)
+    return out
+
+
+def recordStations(cycle, afterburnerFuelFlow, out, components=None):
+    # copy the station/performance results of the last cycle.run into a stationDtype array;
+    # components: only the fields these engineCycle components fill (incremental.py), None for all
+    s0, s1, s2, s3, s4, s5, s6, s7, s8, s9 = cycle.stations
+    noz = cycle.nozzle
+    exh = cycle.exhaust
+
+    fields = (
+        ("inlet", "Tt0", s0.Tt),
+        ("inlet", "Pt0", s0.Pt),
+        ("fan", "Tt13", s1.Tt),
+        ("fan", "Pt13", s1.Pt),
+        ("hpc", "Tt3", s4.Tt),
+        ("hpc", "Pt3", s4.Pt),
+        ("combustor", "Tt4", s5.Tt),
+        ("combustor", "Pt4", s5.Pt),
+        ("hpt", "Tt45", s6.Tt),
+        ("hpt", "Pt45", s6.Pt),
+        ("lpt", "Tt5", s7.Tt),
+        ("lpt", "Pt5", s7.Pt),
+        ("mixer", "Tt6", s8.Tt),
+        ("mixer", "Pt6", s8.Pt),
+        ("afterburner", "Tt7", s9.Tt),
+        ("afterburner", "Pt7", s9.Pt),
+        ("nozzle", "T9", noz.tempNozzle),
+        ("nozzle", "P9", noz.pressNozzle),
+        ("fan", "Fan Work", s1.work),
+        ("hpc", "HPC Work", s4.work),
+        ("split", "Core Mass Flow", s2.massFlow),
+        ("split", "Bypass Mass Flow", s3.massFlow),
+        ("combustor", "Combustor Fuel Flow", s5.fuelFlow),
+        ("afterburner", "Afterburner Fuel Flow", afterburnerFuelFlow),
+        ("afterburner", "Total Fuel Flow", s9.fuelFlow),
+        ("afterburner", "Total Mass Flow", s9.massFlow),
+        ("nozzle", "Nozzle Exit Size", noz.nozzleExit),
+        ("nozzle", "Nozzle Exit Velocity", noz.nozzleVelocity),
+        ("exhaust", "Air Mass Flow", exh.airflow),
+        ("exhaust", "Net Thrust", exh.thrust),
+        ("exhaust", "TSFC", exh.tSFC),
+        ("exhaust", "Specific Thrust", exh.specThrust),
+        ("exhaust", "Thermal Efficiency", exh.thermEfficiency),
+    )
+    for component, name, value in fields:
+        if components is None or component in components:
+            out[name] = value
@@ -0,0 +1,296 @@
+"""
+Precomputed engine performance decks.
+
+buildDeck evaluates the cycle over a (mode, Mach, altitude, throttle) grid once and writes the
+chosen result fields to a single binary file; performanceDeck maps that file with np.memmap
+(read-only, zero-copy, so any number of processes share the same pages) and answers queries
+by vectorized multilinear or cubic (Catmull-Rom) interpolation. Every deck carries error
+bounds for both methods, measured against direct evaluation at random points when it is built
+(deck.errors); cubic wins on the smooth fields but rings at kinks such as the tropopause.
+
+The deck is two sub-tables, dry (throttle 0..1) and afterburning (throttle 1..2), each over
+the same throttle positions within its range, so interpolation never straddles the jump at
+afterburner light-off. A query at throttle t reads the dry table for t <= 1 and the wet one
+above it (mode="dry"/"wet" without a throttle means throttle 1 / 2, as in runEngineBatch).
+
+File layout: 8-byte magic, 8-byte little-endian header length, JSON header (axes, fields,
+dtype, component constants hash, throttle schedule with any breakpoint tables, engine config
+overrides, error bounds), zero padding up to a 4096-byte boundary, then the C-ordered table of
+shape (2, mach, altitude, throttle, field).
+"""
+import json
+import struct
+
+import numpy as np
+
+from .config import engineConfig
+from .throttle import throttleSchedule
+
+magic = b"TJDECK1\0"
+alignment = 4096
+
+deckFields = ("Net Thrust", "TSFC", "Specific Thrust", "Air Mass Flow", "Total Fuel Flow",
+              "Tt3", "Tt4", "Tt45", "Tt5", "Tt7", "T9")
+
+modes = ("dry", "wet")
+
+
+def _headerSize(header):
+    # JSON header padded so the table starts on an alignment boundary, with room to grow
+    # (the error bounds are filled in after the table has been written)
+    text = json.dumps(header).encode()
+    spare = 1024 + 512 * len(header["fields"])
+    return -(-(16 + len(text) + spare) // alignment) * alignment
+
+
+def _writeHeader(f, header, size):
+    text = json.dumps(header).encode()
+    if 16 + len(text) > size:
+        raise ValueError("deck header outgrew its reserved space")
+    f.seek(0)
+    f.write(magic + struct.pack("<Q", len(text)) + text)
+    f.write(b"\0" * (size - 16 - len(text)))
+
+
+def _readHeader(path):
+    with open(path, "rb") as f:
+        if f.read(8) != magic:
+            raise ValueError(f"{path} is not a performance deck")
+        (length,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(length))
+
+
+def _scheduleHeader(schedule):
+    # every setting of a throttle.throttleSchedule, breakpoint tables included, as plain JSON
+    if schedule is None:
+        return None
+    return {"idleTIT": schedule.idleTIT, "litTemp": schedule.litTemp,
+            "tit": None if schedule.tit is None else schedule.tit.tolist(),
+            "afterburner": None if schedule.afterburner is None else schedule.afterburner.tolist()}
+
+
+def buildDeck(path, mach=np.linspace(0.05, 2.25, 45), altitude=np.linspace(0, 18000, 37),
+              throttle=np.linspace(0, 1, 11), fields=deckFields, dtype="f8", workers=1, chunkSize=50000,
+              schedule=None, validate=2000, config=None):
+    # mach, altitude: ascending grid axes (altitude within the ISA range)
+    # throttle: ascending positions in [0, 1] within each of the dry (0..1) and afterburning (1..2) ranges
+    # dtype: "f8", or "f4" for a half-size deck
+    # validate: random points checked against direct evaluation, stored as the deck's error bounds
+    # config: a config.engineConfig to tabulate instead of the classes.py design (kept in the header)
+    from .cache import constantsHash
+    from .cycle import stationDtype
+    from .sweep import iterSweep
+
+    axes = {"mach": np.asarray(mach, dtype=float), "altitude": np.asarray(altitude, dtype=float),
+            "throttle": np.asarray(throttle, dtype=float)}
+    for name, values in axes.items():
+        if values.ndim != 1 or len(values) < 2 or np.any(np.diff(values) <= 0):
+            raise ValueError(f"{name} axis needs at least two strictly increasing values")
+    if axes["throttle"][0] < 0 or axes["throttle"][-1] > 1:
+        raise ValueError("throttle axis positions must lie in [0, 1]")
+    fields = tuple(fields)
+    unknown = [name for name in fields if name not in stationDtype.names]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+
+    shape = (len(modes), len(axes["mach"]), len(axes["altitude"]), len(axes["throttle"]), len(fields))
+    header = {
+        "version": 1,
+        "shape": shape,
+        "dtype": np.dtype(dtype).str,
+        "fields": fields,
+        "modes": modes,
+        "axes": {name: values.tolist() for name, values in axes.items()},
+        "constants": constantsHash(),
+        "schedule": _scheduleHeader(schedule),
+        "config": None if config is None else config.overrides(),
+        "errors": None,
+        "offset": 0,
+    }
+    size = _headerSize(header)
+    header["offset"] = size
+    with open(path, "wb") as f:
+        _writeHeader(f, header, size)
+        f.truncate(size + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+    table = np.memmap(path, dtype=dtype, mode="r+", offset=size, shape=shape)
+    for m, mode in enumerate(modes):
+        # the afterburning table starts just past throttle 1, so its first node is lit
+        throttleValues = axes["throttle"] + m
+        if mode == "wet":
+            throttleValues[0] = max(throttleValues[0], np.nextafter(1.0, 2.0))
+        grid = {"mach": axes["mach"], "altitude": axes["altitude"], "throttle": throttleValues}
+        flat = table[m].reshape(-1, len(fields))
+        for start, stop, res in iterSweep(grid, workers=workers, chunkSize=chunkSize, schedule=schedule,
+                                           config=config):
+            for j, name in enumerate(fields):
+                flat[start:stop, j] = res[name]
+    table.flush()
+    del table
+
+    deck = performanceDeck(path)
+    if validate:
+        header["errors"] = {method: deck.errorBounds(validate, method=method, schedule=schedule, config=config)
+                            for method in ("linear", "cubic")}
+        with open(path, "r+b") as f:
+            _writeHeader(f, header, size)
+        deck = performanceDeck(path)
+    return deck
+
+
+def _interval(axis, x):
+    # (index of the interval holding each x, fractional position within it)
+    step = axis[-1] - axis[-2]
+    if np.allclose(np.diff(axis), step, rtol=1e-12, atol=0):
+        # uniform axis: straight arithmetic instead of a binary search
+        t = x - axis[0]
+        t *= 1 / step
+        i = np.minimum(t.astype(np.intp), len(axis) - 2)
+        t -= i
+        return i, t
+    i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+def _linearWeights(axis, x):
+    # (nodes, weights), each stacked (2, n)
+    i, t = _interval(axis, x)
+    return np.stack((i, i + 1)), np.stack((1 - t, t))
+
+
+def _cubicWeights(axis, x):
+    # (nodes, weights), each stacked (4, n): Catmull-Rom in index space, exact up to quadratics on a
+    # uniform axis; past either end a quadratically extrapolated ghost node keeps that order
+    last = len(axis) - 1
+    if last < 2:
+        return _linearWeights(axis, x)
+    i, t = _interval(axis, x)
+    t2 = t * t
+    t3 = t2 * t
+    nodes = np.stack((np.maximum(i - 1, 0), i, i + 1, np.minimum(i + 2, last)))
+    w = np.stack((0.5 * (-t3 + 2 * t2 - t), 0.5 * (3 * t3 - 5 * t2 + 2), 0.5 * (-3 * t3 + 4 * t2 + t), 0.5 * (t3 - t2)))
+    # ghost value v[-1] = 3 v[0] - 3 v[1] + v[2] (likewise past the top), folded into the real nodes' weights
+    low = i == 0
+    w[1, low] += 3 * w[0, low]
+    w[2, low] -= 3 * w[0, low]
+    w[3, low] += w[0, low]
+    w[0, low] = 0.0
+    high = i + 1 == last
+    w[2, high] += 3 * w[3, high]
+    w[1, high] -= 3 * w[3, high]
+    w[0, high] += w[3, high]
+    w[3, high] = 0.0
+    return nodes, w
+
+
+class performanceDeck:
+    blockSize = 16384  # query points per gather
+
+    def __init__(self, path):
+        header = _readHeader(path)
+        self.path = path
+        self.header = header
+        self.fields = tuple(header["fields"])
+        self.axes = {name: np.asarray(values) for name, values in header["axes"].items()}
+        self.errors = header["errors"]
+        # engineConfig the deck was built with, None for the classes.py design
+        self.config = engineConfig(header["config"]) if header.get("config") else None
+        # throttleSchedule it was built with, None for throttle.defaultSchedule
+        self.schedule = throttleSchedule(**header["schedule"]) if header.get("schedule") else None
+        self.table = np.memmap(path, dtype=np.dtype(header["dtype"]), mode="r", offset=header["offset"],
+                               shape=tuple(header["shape"]))
+        self._flat = self.table.reshape(-1, len(self.fields))
+
+    @property
+    def stale(self):
+        # True once the component constants in classes.py no longer match the ones the deck was built with
+        from .cache import constantsHash
+        return constantsHash() != self.header["constants"]
+
+    def _checkRange(self, name, x):
+        axis = self.axes[name]
+        if x.size and (x.min() < axis[0] or x.max() > axis[-1]):
+            raise ValueError(f"{name} outside the deck range [{axis[0]:g}, {axis[-1]:g}]")
+
+    def query(self, mach, altitude, throttle=None, mode="wet", method="linear", fields=None):
+        # interpolated results at every (mach, altitude, throttle) point, broadcast together;
+        # a structured array with one float field per deck field (or the requested subset)
+        weightsFor = {"linear": _linearWeights, "cubic": _cubicWeights}[method]
+        if throttle is None:
+            throttle = np.where(np.asarray(mode) == "wet", 2.0, 1.0)
+        mach, altitude, throttle = np.broadcast_arrays(np.asarray(mach, dtype=float),
+                                                       np.asarray(altitude, dtype=float),
+                                                       np.asarray(throttle, dtype=float))
+        shape = mach.shape
+        mach, altitude, throttle = mach.ravel(), altitude.ravel(), throttle.ravel()
+        if throttle.size and (throttle.min() < 0 or throttle.max() > 2):
+            raise ValueError("throttle must be between 0 (idle) and 2 (max afterburner)")
+        wet = throttle > 1
+        position = throttle - wet
+        self._checkRange("mach", mach)
+        self._checkRange("altitude", altitude)
+        self._checkRange("throttle", position)
+
+        columns = None if fields is None else [self.fields.index(name) for name in fields]
+        names = self.fields if fields is None else tuple(fields)
+        _, nMach, nAlt, nThrottle, _ = self.table.shape
+        base = wet.astype(np.intp) * (nMach * nAlt * nThrottle)
+        axes = self.axes
+
+        # blocks of points, each corner of each point gathered in a single fancy index
+        result = np.empty((len(mach), len(names)))
+        for start in range(0, len(mach), self.blockSize):
+            block = slice(start, start + self.blockSize)
+            machNodes, machWeights = weightsFor(axes["mach"], mach[block])
+            altNodes, altWeights = weightsFor(axes["altitude"], altitude[block])
+            throttleNodes, throttleWeights = weightsFor(axes["throttle"], position[block])
+            nodes = base[block] + (machNodes[:, None, None] * nAlt + altNodes[None, :, None]) * nThrottle \
+                + throttleNodes[None, None, :]
+            w = machWeights[:, None, None] * altWeights[None, :, None] * throttleWeights[None, None, :]
+            nodes = nodes.reshape(-1, nodes.shape[-1])
+            w = w.reshape(nodes.shape)
+
+            values = self._flat.take(nodes, axis=0)
+            if columns is not None:
+                values = values[..., columns]
+            values = values.astype(float, copy=False)
+            # nan at a node the point doesn't actually use (zero weight) mustn't leak in
+            values[w == 0] = 0.0
+            result[block] = np.einsum("kn,knf->nf", w, values)
+
+        out = np.empty(len(mach), dtype=np.dtype([(name, "f8") for name in names]))
+        for j, name in enumerate(names):
+            out[name] = result[:, j]
+        return out.reshape(shape)
+
+    def errorBounds(self, samples=2000, method="linear", seed=0, schedule=None, config=None):
+        # interpolation error at random points inside the deck against direct runEngineBatch;
+        # per field: largest absolute and relative error and the 99th-percentile relative error
+        # (schedule and config default to the ones the deck was built with)
+        from .cycle import runEngineBatch
+
+        rng = np.random.default_rng(seed)
+        mach = rng.uniform(self.axes["mach"][0], self.axes["mach"][-1], samples)
+        altitude = rng.uniform(self.axes["altitude"][0], self.axes["altitude"][-1], samples)
+        # a position inside the throttle axis, in the dry or the afterburning range
+        throttle = rng.uniform(self.axes["throttle"][0], self.axes["throttle"][-1], samples) + rng.integers(0, 2, samples)
+        direct = runEngineBatch(mach, altitude=altitude, throttle=throttle,
+                                schedule=self.schedule if schedule is None else schedule,
+                                config=self.config if config is None else config)
+        approx = self.query(mach, altitude, throttle, method=method)
+
+        bounds = {}
+        for name in self.fields:
+            d, a = direct[name], approx[name]
+            both = np.isfinite(d) & np.isfinite(a)
+            absErr = np.abs(a[both] - d[both])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relErr = absErr / np.abs(d[both])
+            relErr = relErr[np.isfinite(relErr)]
+            bounds[name] = {
+                "maxAbs": float(absErr.max()) if absErr.size else 0.0,
+                "maxRel": float(relErr.max()) if relErr.size else 0.0,
+                "p99Rel": float(np.percentile(relErr, 99)) if relErr.size else 0.0,
+                "nanMismatch": int(np.count_nonzero(np.isfinite(d) != np.isfinite(a))),
+            }
+        return bounds
@@ -0,0 +1,343 @@
+"""
+Variable gas properties.
+
+The components assume gamma = 1.4 and cp = 1004.5 J/(kg K) everywhere, which is cold air;
+through the combustor (1922 K) and afterburner (2450 K) cp is 20-30% higher. gasTables gives
+cp, gamma, R, enthalpy and the entropy function phi(T) = integral cp/T dT of air and of
+kerosene (C12H23) combustion products as functions of temperature and fuel-air ratio far
+(kg fuel per kg air):
+
+    x(T, far) = (xAir(T) + far * xFuel(T)) / (1 + far)       per kg of mixture
+
+xFuel is the change one kg of fuel burned to CO2 and H2O makes to the mixture (lean; rich
+mixtures just extrapolate). The species data are the NASA 7-coefficient polynomials (no
+dissociation). Every property is a linear lookup in a 1 K table (one gather per call, for
+arrays of any shape), and the inverses the cycle needs, T from h and T from phi, start from
+cached inverse tables on a (far, value) grid and finish with exact steps on the piecewise-linear
+table (one for air, two for combustion products), so they cost a few lookups rather than an
+iterative solve. Internally everything is per kg of air, so no division by 1 + far sits inside
+the lookups.
+
+runEngineBatch(..., gas="real") runs the cycle with them (see engineCycle); gas=None keeps the
+constant-property model.
+"""
+import hashlib
+
+import numpy as np
+
+
+universalGasConstant = 8314.462618  # J/(kmol K)
+
+# cp/R = a1 + a2 T + a3 T^2 + a4 T^3 + a5 T^4, low range below 1000 K, high range above
+_nasaCoefficients = {
+    "N2": (28.0134, (3.298677, 1.4082404e-3, -3.963222e-6, 5.641515e-9, -2.444854e-12),
+           (2.92664, 1.4879768e-3, -5.68476e-7, 1.0097038e-10, -6.753351e-15)),
+    "O2": (31.9988, (3.212936, 1.1274864e-3, -5.75615e-7, 1.3138773e-9, -8.768554e-13),
+           (3.697578, 6.135197e-4, -1.258842e-7, 1.775281e-11, -1.1364354e-15)),
+    "Ar": (39.948, (2.5, 0.0, 0.0, 0.0, 0.0), (2.5, 0.0, 0.0, 0.0, 0.0)),
+    "CO2": (44.0095, (2.275725, 9.922072e-3, -1.0409113e-5, 6.866686e-9, -2.11728e-12),
+            (4.453623, 3.140168e-3, -1.278411e-6, 2.393996e-10, -1.6690333e-14)),
+    "H2O": (18.01528, (3.386842, 3.474982e-3, -6.354696e-6, 6.968581e-9, -2.506588e-12),
+            (2.672145, 3.056293e-3, -8.73026e-7, 1.2009964e-10, -6.391618e-15)),
+}
+
+# dry air by mole
+_air = {"N2": 0.78084, "O2": 0.209476, "Ar": 0.009365, "CO2": 0.000319}
+
+# C12H23 + 17.75 O2 -> 12 CO2 + 11.5 H2O, in kmol per kg of fuel
+_fuelMolarMass = 12 * 12.011 + 23 * 1.008
+_fuel = {"CO2": 12 / _fuelMolarMass, "H2O": 11.5 / _fuelMolarMass, "O2": -17.75 / _fuelMolarMass}
+
+
+def speciesCp(name, T):
+    # cp [J/(kmol K)] of one species
+    _, low, high = _nasaCoefficients[name]
+    T = np.asarray(T, dtype=float)
+    a = np.where(T[..., None] < 1000.0, low, high)
+    return universalGasConstant * ((((a[..., 4] * T + a[..., 3]) * T + a[..., 2]) * T + a[..., 1]) * T + a[..., 0])
+
+
+def _mixtureCp(T):
+    # (cp of 1 kg air, cp change per kg fuel burned) [J/(kg K)]
+    airMass = sum(x * _nasaCoefficients[s][0] for s, x in _air.items())
+    cpAir = sum(x * speciesCp(s, T) for s, x in _air.items()) / airMass
+    cpFuel = sum(n * speciesCp(s, T) for s, n in _fuel.items())
+    return cpAir, cpFuel
+
+
+class gasTables:
+    # property tables from Tmin to Tmax every step K; each property keeps four flat columns, the
+    # (air, fuel) values at the nodes and their increments to the next node, so a lookup is an
+    # index computation, a take() per column and a multiply-add
+    __slots__ = ("Tmin", "step", "size", "cp", "enthalpy", "phi", "R", "_inverse", "_digest")
+
+    def __init__(self, Tmin=150.0, Tmax=3000.0, step=1.0, Tref=298.15):
+        self.Tmin = Tmin
+        self.step = step
+        self.size = int(round((Tmax - Tmin) / step)) + 1
+        T = Tmin + step * np.arange(self.size)
+        # h and phi are integrated on a 10x finer grid (trapezoid), both zero at Tref
+        fine = Tmin + step / 10 * np.arange(10 * (self.size - 1) + 1)
+        cpFine = np.stack(_mixtureCp(fine), axis=-1)
+        h = np.concatenate([[[0.0, 0.0]], np.cumsum(0.5 * (cpFine[1:] + cpFine[:-1]) * (step / 10), axis=0)])
+        phi = np.concatenate([[[0.0, 0.0]], np.cumsum(0.5 * (cpFine[1:] / fine[1:, None] + cpFine[:-1] / fine[:-1, None])
+                                                       * (step / 10), axis=0)])
+        h = h[::10] - np.array([np.interp(Tref, T, h[::10, k]) for k in range(2)])
+        phi = phi[::10] - np.array([np.interp(Tref, T, phi[::10, k]) for k in range(2)])
+        self.cp = self._columns(np.stack(_mixtureCp(T), axis=-1))
+        self.enthalpy = self._columns(h)
+        self.phi = self._columns(phi)
+        airMass = sum(x * _nasaCoefficients[s][0] for s, x in _air.items())
+        self.R = (universalGasConstant / airMass, universalGasConstant * sum(_fuel.values()))
+        self._inverse = {}
+        self._digest = None
+
+    def digest(self):
+        # content hash of the tables, stable across processes (the operating point cache keys on it);
+        # computed once, the tables aren't meant to change after construction
+        if self._digest is None:
+            h = hashlib.sha1(repr((self.Tmin, self.step, self.size, self.R)).encode())
+            for column in self.cp + self.enthalpy + self.phi:
+                h.update(np.ascontiguousarray(column, dtype="<f8").tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def _columns(self, values):
+        # (air, fuel, air increment, fuel increment), the last node repeating the last increment
+        slopes = np.diff(values, axis=0)
+        slopes = np.concatenate([slopes, slopes[-1:]])
+        return (values[:, 0].copy(), values[:, 1].copy(), slopes[:, 0].copy(), slopes[:, 1].copy())
+
+    def _index(self, T):
+        # (node, weight) of T; the node is clipped after the integer cast, so nan stays nan (in the
+        # weight) and T outside the table extrapolates linearly from the end segments
+        x = (np.asarray(T, dtype=float) - self.Tmin) * (1.0 / self.step)
+        i = np.minimum(np.maximum(x.astype(np.intp), 0), self.size - 2)
+        return i, x - i
+
+    @staticmethod
+    def _mixture(far):
+        # far as the lookups take it: None for air alone (only the air columns are read), else an array
+        return None if np.ndim(far) == 0 and far == 0 else np.asarray(far, dtype=float)
+
+    def _perAir(self, table, i, w, far):
+        # property per kg of air at (node, weight), air + far * fuel, far from _mixture; the
+        # private methods work per kg air so that no division by 1 + far sits inside the lookups
+        air = table[0].take(i) + w * table[2].take(i)
+        if far is None:
+            return air
+        return air + far * (table[1].take(i) + w * table[3].take(i))
+
+    def _at(self, table, i, w, far):
+        # property per kg mixture at (node, weight)
+        far = self._mixture(far)
+        if far is None:
+            return self._perAir(table, i, w, None)
+        return self._perAir(table, i, w, far) / (1 + far)
+
+    def _airGasConstant(self, far):
+        # R per kg air, (1 + far) times gasConstant(far)
+        return self.R[0] if far is None else self.R[0] + far * self.R[1]
+
+    def specificHeat(self, T, far=0.0):
+        # cp [J/(kg K)]
+        return self._at(self.cp, *self._index(T), far)
+
+    def gasConstant(self, far=0.0):
+        # R [J/(kg K)]
+        return (self.R[0] + far * self.R[1]) / (1 + far)
+
+    def gamma(self, T, far=0.0):
+        cp = self.specificHeat(T, far)
+        return cp / (cp - self.gasConstant(far))
+
+    def enthalpyAt(self, T, far=0.0):
+        # sensible enthalpy [J/kg] relative to 298.15 K
+        return self._at(self.enthalpy, *self._index(T), far)
+
+    def entropyFunction(self, T, far=0.0):
+        # phi(T) [J/(kg K)]; isentropic: phi(T2) - phi(T1) = R ln(P2 / P1)
+        return self._at(self.phi, *self._index(T), far)
+
+    def _inverseTable(self, name):
+        # node coordinate (T - Tmin) / step on a uniform (far, value per kg air) grid, far 0-0.1 every
+        # 0.005, flattened row by row, with its increment to the next value; built once per property
+        inverse = self._inverse.get(name)
+        if inverse is None:
+            air, fuel = getattr(self, name)[:2]
+            fars = np.linspace(0.0, 0.1, 21)
+            nodes = air[None, :] + fars[:, None] * fuel[None, :]
+            low, high = nodes[:, 0].min(), nodes[:, -1].max()
+            values = np.linspace(low, high, 4 * self.size)
+            grid = np.stack([np.interp(values, row, np.arange(self.size, dtype=float)) for row in nodes])
+            slope = np.diff(grid, axis=1)
+            slope = np.concatenate([slope, slope[:, -1:]], axis=1)
+            inverse = self._inverse[name] = (grid.ravel(), slope.ravel(), grid.shape[1], len(fars), low,
+                                             (len(values) - 1) / (high - low), (len(fars) - 1) / 0.1)
+        return inverse
+
+    def _guess(self, name, value, far):
+        # node coordinate from the cached inverse table, bilinear in (far, value per kg air); values
+        # and far off the grid extrapolate from its edges, the steps in _solve settle them
+        grid, slope, width, rows, low, scale, farScale = self._inverseTable(name)
+        y = (value - low) * scale
+        j = np.minimum(np.maximum(y.astype(np.intp), 0), width - 2)
+        v = y - j
+        if far is None:
+            return grid.take(j) + v * slope.take(j)
+        z = far * farScale
+        k = np.minimum(np.maximum(z.astype(np.intp), 0), rows - 2)
+        j = j + k * width
+        below = grid.take(j) + v * slope.take(j)
+        j = j + width
+        return below + (z - k) * (grid.take(j) + v * slope.take(j) - below)
+
+    def _solve(self, table, value, far, x):
+        # (node, weight) at which the table property per kg air equals value, from a guess node
+        # coordinate x: steps along the table's own segments, exact once the guess is within a segment
+        # of the answer; the air guess is within 1e-4 K so one step does, mixtures (0.3 K) take two.
+        # Callers read other properties at the answer from the node and weight
+        for _ in range(1 if far is None else 2):
+            i = np.minimum(np.maximum(x.astype(np.intp), 0), self.size - 2)
+            if far is None:
+                r = (value - table[0].take(i)) / table[2].take(i)
+            else:
+                r = (value - table[0].take(i) - far * table[1].take(i)) / (table[2].take(i) + far * table[3].take(i))
+            x = i + r
+        return i, r
+
+    def _invert(self, name, value, far):
+        # (node, weight) of the temperature at which property name per kg air equals value
+        return self._solve(getattr(self, name), value, far, self._guess(name, value, far))
+
+    def _temperature(self, i, w):
+        return self.Tmin + self.step * (i + w)
+
+    def temperature(self, h, far=0.0):
+        # T [K] from sensible enthalpy h [J/kg]
+        far = self._mixture(far)
+        h = np.asarray(h, dtype=float)
+        return self._temperature(*self._invert("enthalpy", h if far is None else h * (1 + far), far))
+
+    def isentropicTemperature(self, T, pressureRatio, far=0.0):
+        # temperature after an isentropic pressure change by pressureRatio from T
+        far = self._mixture(far)
+        phi = self._perAir(self.phi, *self._index(T), far) + self._airGasConstant(far) * np.log(pressureRatio)
+        return self._temperature(*self._invert("phi", phi, far))
+
+    def pressureRatio(self, T1, T2, far=0.0):
+        # P2 / P1 of an isentropic change from T1 to T2
+        return np.exp((self.entropyFunction(T2, far) - self.entropyFunction(T1, far)) / self.gasConstant(far))
+
+    def compress(self, T, pressureRatio, efficiency, far=0.0):
+        # (exit T, enthalpy rise) of a compression by pressureRatio at isentropic efficiency
+        far = self._mixture(far)
+        i, w = self._index(T)
+        hIn = self._perAir(self.enthalpy, i, w, far)
+        phi = self._perAir(self.phi, i, w, far) + self._airGasConstant(far) * np.log(pressureRatio)
+        deltaH = (self._perAir(self.enthalpy, *self._invert("phi", phi, far), far) - hIn) / efficiency
+        out = self._temperature(*self._invert("enthalpy", hIn + deltaH, far))
+        return out, (deltaH if far is None else deltaH / (1 + far))
+
+    def expand(self, T, deltaH, far=0.0):
+        # (exit T, exit / inlet pressure) of an expansion that takes deltaH [J/kg] out of the stream,
+        # the pressure from the entropy function (no losses beyond what deltaH already carries)
+        far = self._mixture(far)
+        i, w = self._index(T)
+        hOut = self._perAir(self.enthalpy, i, w, far) - (deltaH if far is None else deltaH * (1 + far))
+        phiIn = self._perAir(self.phi, i, w, far)
+        i, w = self._invert("enthalpy", hOut, far)
+        return self._temperature(i, w), np.exp((self._perAir(self.phi, i, w, far) - phiIn) / self._airGasConstant(far))
+
+    def burnerFuelAirRatio(self, Tin, Tout, farIn, heat):
+        # fuel per kg air to heat a stream at farIn from Tin to Tout, heat = efficiency * FHV [J/kg];
+        # energy per kg air: hAir(Tout) + (farIn + f) hFuel(Tout) = hAir(Tin) + farIn hFuel(Tin) + f heat
+        air, fuel, dAir, dFuel = self.enthalpy
+        i, w = self._index(Tout)
+        airOut, fuelOut = air.take(i) + w * dAir.take(i), fuel.take(i) + w * dFuel.take(i)
+        i, w = self._index(Tin)
+        rise = airOut - (air.take(i) + w * dAir.take(i))
+        if self._mixture(farIn) is not None:
+            rise = rise + farIn * (fuelOut - (fuel.take(i) + w * dFuel.take(i)))
+        return rise / (heat - fuelOut)
+
+    def staticState(self, Tt, mach, far=0.0, iterations=2):
+        # (static T, P / Pt, velocity) at Mach number mach from stagnation Tt:
+        # h(Tt) = h(T) + mach^2 gamma(T) R T / 2, by Newton from the constant-gamma answer; solved per
+        # kg air (cp, h and R all scaled by 1 + far, gamma unchanged)
+        far = self._mixture(far)
+        R = self._airGasConstant(far)
+        half = 0.5 * R * np.asarray(mach, dtype=float) ** 2
+        i, w = self._index(Tt)
+        ht = self._perAir(self.enthalpy, i, w, far)
+        phiT = self._perAir(self.phi, i, w, far)
+        cp = self._perAir(self.cp, i, w, far)
+        T = Tt / (1 + half / (cp - R))
+        # d/dT of the kinetic term m^2 gamma R T / 2, gamma varying through cp: cp's slope is the
+        # table increment over step K
+        curvature = half * (R / self.step)
+        air, fuel, dAir, dFuel = self.cp
+        for _ in range(iterations):
+            i, w = self._index(T)
+            dcp = dAir.take(i)
+            cp = air.take(i) + w * dcp
+            if far is not None:
+                slope = dFuel.take(i)
+                cp = cp + far * (fuel.take(i) + w * slope)
+                dcp = dcp + far * slope
+            excess = cp - R
+            kinetic = half * (cp / excess)
+            dKinetic = kinetic - curvature * T * dcp / (excess * excess)
+            T = T + (ht - self._perAir(self.enthalpy, i, w, far) - kinetic * T) / (cp + dKinetic)
+        i, w = self._index(T)
+        # velocity from the energy balance, consistent with T to the last digit
+        rise = np.maximum(ht - self._perAir(self.enthalpy, i, w, far), 0.0)
+        return (T, np.exp((self._perAir(self.phi, i, w, far) - phiT) / R),
+                np.sqrt(2 * rise if far is None else 2 * rise / (1 + far)))
+
+    def throatFlow(self, Tt, far=0.0):
+        # choked flow per unit throat area, (P* / Pt) V* / T* [1/s], so that the mass flow is
+        # Pt A* throatFlow / R; the Mach 1 state depends on Tt and far alone, so it comes from a
+        # cached (far, Tt) table of sqrt(Tt) times it (nearly constant, 1.5e-5 from staticState)
+        table = self._inverse.get("throat")
+        if table is None:
+            nodes = np.arange(self.Tmin, self.Tmin + self.step * (self.size - 1) + 10.0, 10.0)
+            fars = np.linspace(0.0, 0.1, 21)
+            T, ratio, V = self.staticState(nodes[None, :], 1.0, fars[:, None], iterations=6)
+            grid = ratio * V / T * np.sqrt(nodes)
+            table = self._inverse["throat"] = (grid.ravel(), grid.shape[1], len(fars))
+        grid, width, rows = table
+        Tt = np.asarray(Tt, dtype=float)
+        x = (Tt - self.Tmin) * 0.1
+        i = np.minimum(np.maximum(x.astype(np.intp), 0), width - 2)
+        w = x - i
+        z = np.asarray(far, dtype=float) * ((rows - 1) / 0.1)
+        k = np.minimum(np.maximum(z.astype(np.intp), 0), rows - 2)
+        u = z - k
+        i = i + k * width
+        below, above = grid.take(i), grid.take(i + width)
+        flow = (below + w * (grid.take(i + 1) - below)) * (1 - u) + (above + w * (grid.take(i + width + 1) - above)) * u
+        return flow / np.sqrt(Tt)
+
+
+
+_tables = None
+
+
+def variableGas():
+    # the shared gasTables, built on first use
+    global _tables
+    if _tables is None:
+        _tables = gasTables()
+    return _tables
+
+
+def gasModel(gas):
+    # gas argument of runEngineBatch -> gasTables or None (constant gamma and cp)
+    if gas is None or gas == "ideal":
+        return None
+    if gas == "real":
+        return variableGas()
+    if isinstance(gas, gasTables):
+        return gas
+    raise ValueError(f"unknown gas model {gas!r} (None/'ideal', 'real' or a gas.gasTables)")
@@ -0,0 +1,229 @@
+"""
+Incremental re-evaluation of one engine over repeated calls.
+
+An incrementalCycle keeps its own engineCycle and treats the flowpath as a dependency graph
+(cycleGraph): every component reads the stations of the components upstream of it and some of
+the flight inputs, and its outputs (the StationState records it fills and the results it keeps
+on itself) stay on the cycle between calls. evaluate() compares the flight inputs and every
+design constant with the previous call and re-runs only the components whose inputs or
+constants changed and everything downstream of them; the others are reused as they are.
+
+    inc = incrementalCycle()
+    res = inc.evaluate(mach, altitude=10000.0, mode="wet")
+    inc.set("afterburner.afterburnertemp", 2100.0)     # or inc.cycle.afterburner.afterburnertemp = ...
+    res = inc.evaluate(mach, altitude=10000.0, mode="wet")
+    inc.lastRun["mixer"]         # "reused"
+    inc.lastRun["afterburner"]   # "afterburner.afterburnertemp changed"
+    print(inc.report())
+
+A new afterburner temperature re-runs afterburner, nozzle and exhaust and reuses inlet through
+mixer; a new back pressure only re-runs nozzle and exhaust. Results are bit-for-bit what
+runEngineBatch gives for the same inputs and design.
+
+With component maps (maps="default"), the maps are scaled to the design the cycle had when they
+were attached, from the stations inlet through LPT. A change to a design constant of any of those
+components rescales them (maps.engineMaps.attach) and re-runs the whole flowpath; changes from the
+mixer on stay incremental.
+"""
+import numpy as np
+
+from .config import configBatch, designConstants
+from .cycle import engineCycle, flightConditions, recordStations, stationDtype, throttleConditions
+from .gas import gasModel
+from .maps import mapModel
+
+
+# (component, components whose outputs it reads, evaluate() arguments it depends on), in flowpath
+# order; P0 / T0 / P_ambient are the ones an altitude has been turned into
+cycleGraph = (
+    ("inlet", (), ("mach", "P0", "T0")),
+    ("fan", ("inlet",), ()),
+    ("split", ("fan",), ()),
+    ("hpc", ("split",), ()),
+    ("combustor", ("hpc",), ("throttle", "schedule")),     # part-power TIT
+    ("hpt", ("combustor", "hpc"), ()),          # HPC work
+    ("lpt", ("hpt", "fan"), ()),                # fan work
+    ("mixer", ("lpt", "split"), ()),            # bypass stream
+    ("afterburner", ("mixer",), ("mode", "throttle", "schedule")),
+    ("nozzle", ("afterburner",), ("P_ambient", "mach")),
+    ("exhaust", ("nozzle", "afterburner"), ()),
+)
+
+# components whose design constants set the stations maps.engineMaps.attach scales the maps to
+mapScaled = ("inlet", "fan", "split", "hpc", "combustor", "hpt", "lpt")
+
+
+# stationDtype fields that record the flight inputs: (field, value, arguments it depends on)
+recordedInputs = (("Mach", "mach", ("mach",)), ("Altitude", "altitude", ("altitude",)), ("P0", "P0", ("P0",)),
+                  ("T0", "T0", ("T0",)), ("P_ambient", "P_ambient", ("P_ambient",)),
+                  ("Wet", "wet", ("mode", "throttle", "schedule")), ("Throttle", "throttle", ("mode", "throttle")))
+
+
+def _copy(results):
+    # byte copy of a stationDtype array: copying the structured array itself goes field by field
+    flat = results.reshape(-1)
+    return flat.view(np.uint8).copy().view(stationDtype).reshape(results.shape)
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    if a is None or b is None or np.shape(a) != np.shape(b):
+        return False
+    a = np.asarray(a)
+    return bool(np.array_equal(a, b, equal_nan=a.dtype.kind in "fc"))
+
+
+class incrementalCycle:
+    def __init__(self, config=None, gas=None, maps=None):
+        # config / gas / maps as for runEngineBatch (an engineConfig, not a configBatch); the
+        # design constants can then be changed with set() or directly on self.cycle
+        if isinstance(config, configBatch):
+            raise ValueError("incrementalCycle evaluates one design: use an engineConfig, not a configBatch")
+        self.maps = mapModel(maps)
+        self.cycle = engineCycle(config, gasModel(gas), self.maps)
+        self.constants = {}
+        for name, _ in designConstants():
+            component, attr = name.split(".")
+            self.constants.setdefault(component, []).append(attr)
+        # the design the maps were scaled to, see evaluate()
+        self.mapDesign = None if self.maps is None else self._mapDesign(self._designs())
+        self.inputs = None
+        self.shape = None
+        self.designs = None
+        self.results = None
+        self.afterburnerFuelFlow = None
+        self.forced = set()
+        self.evaluations = 0
+        self.stats = {name: {"runs": 0, "reused": 0} for name, _, _ in cycleGraph}
+        self.lastRun = {}
+
+        c = self.cycle
+        s0, s1, s2, s3, s4, s5, s6, s7, s8, s9 = c.stations
+        self._steps = {
+            "inlet": lambda i: c.inlet.advance(i["mach"], i["P0"], i["T0"], s0),
+            "fan": lambda i: c.fan.advance(s0, s1),
+            "split": lambda i: c.split.advance(s1, s2, s3),
+            "hpc": lambda i: c.hpc.advance(s2, s4),
+            "combustor": lambda i: c.combustor.advance(s4, s5, i["tit"]),
+            "hpt": lambda i: c.hpt.advance(s5, s4.work, s6),
+            "lpt": lambda i: c.lpt.advance(s6, s1.work, s7),
+            "mixer": lambda i: c.mixer.advance(s7, s3, s8),
+            "afterburner": lambda i: setattr(self, "afterburnerFuelFlow",
+                                             c.runAfterburner(i["wet"], i["afterburnerTemp"])),
+            "nozzle": lambda i: c.nozzle.advance(s9, i["P_ambient"], i["mach"]),
+            "exhaust": lambda i: c.exhaust.advance(s9, c.nozzle, 0),
+        }
+
+    def set(self, name, value):
+        # change one design constant ("component.attr", as in config.designConstants())
+        component, _, attr = name.partition(".")
+        if attr not in self.constants.get(component, ()):
+            raise KeyError(f"unknown engine parameter: {name}")
+        setattr(getattr(self.cycle, component), attr, value)
+
+    def _designs(self):
+        return {component: tuple(getattr(getattr(self.cycle, component), attr) for attr in attrs)
+                for component, attrs in self.constants.items()}
+
+    def _mapDesign(self, designs):
+        return {component: designs[component] for component in mapScaled if component in designs}
+
+    def _rescaleMaps(self, designs):
+        # True if the maps had to be scaled to a new design (which overwrites every station)
+        scaled = self._mapDesign(designs)
+        if all(_same(new, old) for component, values in scaled.items()
+               for new, old in zip(values, self.mapDesign[component])):
+            return False
+        if any(np.ndim(value) for values in scaled.values() for value in values):
+            raise ValueError("component maps are scaled to one design point: give the constants of "
+                             f"{', '.join(mapScaled)} scalar values")
+        self.maps.attach(self.cycle)
+        self.mapDesign = scaled
+        return True
+
+    def evaluate(self, mach, P0=101325, T0=298, mode="wet", P_ambient=101325, altitude=None, throttle=None,
+                 schedule=None):
+        # stationDtype results as runEngineBatch(...) with this cycle's design, re-running only
+        # what the changes since the previous call reach
+        P0, T0, P_ambient, altitude = flightConditions(P0, T0, P_ambient, altitude)
+        # compared before broadcasting, so unchanged scalars cost nothing to check
+        arguments = {"mach": np.asarray(mach, dtype=float), "P0": np.asarray(P0, dtype=float),
+                     "T0": np.asarray(T0, dtype=float), "P_ambient": np.asarray(P_ambient, dtype=float),
+                     "altitude": np.asarray(altitude, dtype=float), "mode": np.asarray(mode),
+                     "throttle": None if throttle is None else np.asarray(throttle, dtype=float), "schedule": schedule}
+        mach, P0, T0, P_ambient, altitude, mode, throttleIn = np.broadcast_arrays(
+            np.asarray(mach, dtype=float), np.asarray(P0, dtype=float), np.asarray(T0, dtype=float),
+            np.asarray(P_ambient, dtype=float), np.asarray(altitude, dtype=float), np.asarray(mode),
+            np.asarray(np.nan if throttle is None else throttle, dtype=float))
+        wet, throttleOut, tit, afterburnerTemp = throttleConditions(
+            self.cycle, mode, None if throttle is None else throttleIn, schedule)
+        inputs = {"mach": mach, "P0": P0, "T0": T0, "P_ambient": P_ambient, "altitude": altitude, "wet": wet,
+                  "throttle": throttleOut, "tit": tit, "afterburnerTemp": afterburnerTemp}
+        designs = self._designs()
+        rescaled = self.maps is not None and self._rescaleMaps(designs)
+
+        # what changed since the last call, then everything downstream of it
+        first = self.inputs is None or self.shape != mach.shape or rescaled
+        changedInputs = set() if first else {key for key, value in arguments.items()
+                                             if not _same(value, self.inputs[key])}
+        reasons = {}
+        for name, upstream, reads in cycleGraph:
+            if first:
+                reasons[name] = ("first evaluation" if self.inputs is None else
+                                 "maps rescaled to the new design" if rescaled else "new batch shape")
+                continue
+            changed = [key for key in reads if key in changedInputs]
+            changed += [f"{name}.{attr}" for attr, new, old in zip(self.constants.get(name, ()), designs[name],
+                                                                    self.designs[name]) if not _same(new, old)]
+            stale = [component for component in upstream if component in reasons]
+            if name in self.forced:
+                reasons[name] = "invalidated"
+            elif changed:
+                reasons[name] = ", ".join(changed) + " changed"
+            elif stale:
+                reasons[name] = f"downstream of {', '.join(stale)}"
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name, _, _ in cycleGraph:
+                if name in reasons:
+                    self._steps[name](inputs)
+                    self.stats[name]["runs"] += 1
+                else:
+                    self.stats[name]["reused"] += 1
+        self.forced.clear()
+        self.lastRun = {name: reasons.get(name, "reused") for name, _, _ in cycleGraph}
+        self.evaluations += 1
+        # kept as copies: callers may reuse and overwrite their input arrays
+        self.inputs = {key: np.array(value) if isinstance(value, np.ndarray) else value
+                       for key, value in arguments.items()}
+        self.shape = mach.shape
+        self.designs = {component: tuple(np.array(v) if isinstance(v, np.ndarray) else v for v in values)
+                        for component, values in designs.items()}
+
+        # self.results keeps the last results: only the fields of the components that ran (and of
+        # the inputs that changed) are written into it, and the caller gets a byte copy, which costs
+        # less than writing the reused fields one by one into the strided record
+        if first:
+            self.results = np.empty(mach.shape, dtype=stationDtype)
+        for field, key, dependsOn in recordedInputs:
+            if first or changedInputs.intersection(dependsOn):
+                self.results[field] = inputs[key]
+        recordStations(self.cycle, self.afterburnerFuelFlow, self.results, None if first else reasons)
+        return _copy(self.results)
+
+    def invalidate(self, component=None):
+        # force component (None: the whole flowpath) and everything downstream to re-run next time
+        if component is None:
+            self.inputs = None
+        elif component not in self.stats:
+            raise KeyError(f"unknown component: {component}")
+        else:
+            self.forced.add(component)
+
+    def report(self):
+        lines = [f"{self.evaluations} evaluations", "  component      runs   reused   last call"]
+        for name, _, _ in cycleGraph:
+            s = self.stats[name]
+            lines.append(f"  {name:12s} {s['runs']:6d}   {s['reused']:6d}   {self.lastRun.get(name, '-')}")
+        return "\n".join(lines)
@@ -0,0 +1,374 @@
+"""
+Component performance maps.
+
+The fan and HPC run at fixed pressure ratios and efficiencies and the turbines at fixed
+efficiencies. A componentMap holds what a real map does instead: corrected flow, pressure
+ratio and efficiency tabulated on speed lines (corrected speed) against beta lines, an
+auxiliary coordinate running along each speed line from choke (beta 0) to surge (beta 1), so
+every operating point has unique map coordinates even where a speed line is vertical or
+horizontal in flow / pressure ratio. Maps load from JSON or NPZ:
+
+    {"speed": [0.5, ..., 1.1], "beta": [0, ..., 1],
+     "flow": [[...], ...], "pressureRatio": [[...], ...], "efficiency": [[...], ...],
+     "design": [1.0, 0.5]}                  # (speed, beta) of the cycle design point
+
+Interpolation is bicubic (C1, Hermite with finite-difference slopes) or bilinear, and the
+polynomial coefficients of every cell are computed once when the map is built, so a lookup is
+locating the cell, gathering its coefficients and a Horner evaluation, for arrays of any size
+(processed in cache-sized chunks). solveBeta and solveSpeed invert a map along a speed line or a
+beta line (where the flow, or the pressure ratio, takes a given value), which is how the cycle
+places itself on a map.
+
+engineMaps groups the fan, HPC, HPT and LPT maps; runEngineBatch(..., maps="default") or
+maps=engineMaps(...) runs the cycle on them (see engineCycle). Each map is scaled so that its
+design point reproduces the cycle's own design at designMach / designAltitude. The inlet sets
+the airflow in this cycle, so away from the design point each compressor stays on its design
+beta line (its working line) at the corrected speed that passes the corrected flow it is
+given, and takes pressure ratio and efficiency from there; each turbine runs at its spool's
+mechanical speed and takes its efficiency from its map at that corrected speed and the
+expansion ratio the shaft work needs.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from .atmosphere import isa
+
+# sea level standard conditions corrected flow and speed are referred to
+referenceTemp = 288.15
+referencePress = 101325.0
+
+mapTables = ("flow", "pressureRatio", "efficiency")
+
+# points per chunk of a lookup: the gathered coefficients of a chunk stay in cache
+chunkSize = 8192
+
+
+def _axis(values):
+    # (nodes, uniform spacing or 0, inverse cell widths) of a strictly increasing axis
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 1 or len(values) < 2 or np.any(np.diff(values) <= 0):
+        raise ValueError("map axes must be strictly increasing with at least two nodes")
+    width = np.diff(values)
+    uniform = width[0] if np.allclose(width, width[0], rtol=1e-12, atol=0) else 0.0
+    return values, uniform, 1 / width
+
+
+def _slopes(table, axis, dim):
+    # d(table)/d(axis) at the nodes along dim: central differences weighted for uneven spacing,
+    # one-sided at the ends
+    t = np.moveaxis(table, dim, 0)
+    h = np.diff(axis).reshape((-1,) + (1,) * (t.ndim - 1))
+    d = np.diff(t, axis=0) / h
+    out = np.empty_like(t)
+    out[0], out[-1] = d[0], d[-1]
+    out[1:-1] = (h[1:] * d[:-1] + h[:-1] * d[1:]) / (h[:-1] + h[1:])
+    return np.moveaxis(out, 0, dim)
+
+
+# bicubic Hermite: p(u, v) = sum a_ij u^i v^j with a = M F M^T over the corner values and slopes
+_hermite = np.array([[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [-3.0, 3.0, -2.0, -1.0], [2.0, -2.0, 1.0, 1.0]])
+
+
+def _cellCoefficients(speed, beta, table, order):
+    # (order, order, cells) polynomial coefficients a_ij of every cell in local (u, v) in [0, 1]^2,
+    # cells numbered speed-major
+    f = table
+    f00, f10, f01, f11 = f[:-1, :-1], f[1:, :-1], f[:-1, 1:], f[1:, 1:]
+    if order == "linear":
+        a = np.stack([np.stack([f00, f01 - f00]), np.stack([f10 - f00, f11 - f10 - f01 + f00])])
+        return a.reshape(2, 2, -1)
+    du = np.diff(speed)[:, None]
+    dv = np.diff(beta)[None, :]
+    fu = _slopes(f, speed, 0)
+    fv = _slopes(f, beta, 1)
+    fuv = _slopes(fu, beta, 1)
+    # slopes in local coordinates: times the cell widths
+    corners = lambda g: (g[:-1, :-1], g[:-1, 1:], g[1:, :-1], g[1:, 1:])
+    u00, u01, u10, u11 = (c * du for c in corners(fu))
+    v00, v01, v10, v11 = (c * dv for c in corners(fv))
+    x00, x01, x10, x11 = (c * du * dv for c in corners(fuv))
+    F = np.array([[f00, f01, v00, v01], [f10, f11, v10, v11], [u00, u01, x00, x01], [u10, u11, x10, x11]])
+    a = np.einsum("ik,kl...,jl->ij...", _hermite, F, _hermite)
+    return np.ascontiguousarray(a.reshape(4, 4, -1))
+
+
+class componentMap:
+    # speed lines x beta lines of corrected flow [kg/s], pressure ratio and efficiency, with the
+    # interpolation coefficients of every cell precomputed
+    __slots__ = ("speed", "beta", "tables", "design", "order", "designValues", "_speedAxis", "_betaAxis",
+                 "_coefficients", "_digest")
+
+    def __init__(self, speed, beta, flow, pressureRatio, efficiency, design=(1.0, 0.5), order="cubic"):
+        # design: (speed, beta) of the point the cycle's design constants describe
+        if order not in ("cubic", "linear"):
+            raise ValueError(f"unknown interpolation {order!r} (use 'cubic' or 'linear')")
+        self._speedAxis = _axis(speed)
+        self._betaAxis = _axis(beta)
+        self.speed, self.beta = self._speedAxis[0], self._betaAxis[0]
+        shape = (len(self.speed), len(self.beta))
+        self.tables = {}
+        for name, table in zip(mapTables, (flow, pressureRatio, efficiency)):
+            table = np.asarray(table, dtype=float)
+            if table.shape != shape:
+                raise ValueError(f"map table {name} is {table.shape}, expected (speed lines, beta lines) = {shape}")
+            self.tables[name] = table
+        self.design = tuple(float(x) for x in design)
+        self.order = order
+        self._coefficients = {name: _cellCoefficients(self.speed, self.beta, table, order)
+                              for name, table in self.tables.items()}
+        self.designValues = tuple(float(v) for v in self.lookup(*self.design))
+        self._digest = None
+
+    def digest(self):
+        # content hash of the axes and tables, stable across processes; computed once
+        if self._digest is None:
+            h = hashlib.sha1(repr((self.design, self.order)).encode())
+            for array in (self.speed, self.beta, *(self.tables[name] for name in mapTables)):
+                h.update(np.ascontiguousarray(array, dtype="<f8").tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    @classmethod
+    def load(cls, path, order="cubic"):
+        # map from .json (lists as in the module docstring) or .npz (same names)
+        if str(path).endswith(".npz"):
+            with np.load(path) as data:
+                values = {name: data[name] for name in data.files}
+        else:
+            with open(path) as f:
+                values = json.load(f)
+        return cls(values["speed"], values["beta"], *(values[name] for name in mapTables),
+                   design=values.get("design", (1.0, 0.5)), order=order)
+
+    def save(self, path):
+        values = {"speed": self.speed, "beta": self.beta, **self.tables, "design": np.array(self.design)}
+        if str(path).endswith(".npz"):
+            np.savez(path, **values)
+        else:
+            with open(path, "w") as f:
+                json.dump({name: np.asarray(v).tolist() for name, v in values.items()}, f)
+
+    def scaled(self, flow=None, pressureRatio=None, efficiency=None):
+        # copy with the speed axis relative to the design speed and the tables scaled so that the
+        # design point has these values (pressure ratio through PR - 1)
+        designFlow, designPR, designEfficiency = self.designValues
+        tables = dict(self.tables)
+        if flow is not None:
+            tables["flow"] = tables["flow"] * (flow / designFlow)
+        if pressureRatio is not None:
+            tables["pressureRatio"] = 1 + (tables["pressureRatio"] - 1) * ((pressureRatio - 1) / (designPR - 1))
+        if efficiency is not None:
+            tables["efficiency"] = tables["efficiency"] * (efficiency / designEfficiency)
+        return componentMap(self.speed / self.design[0], self.beta, *(tables[name] for name in mapTables),
+                            design=(1.0, self.design[1]), order=self.order)
+
+    @staticmethod
+    def _locate(axis, q):
+        # (cell, local coordinate) of q on an axis; outside it the end cells extrapolate
+        nodes, uniform, inverse = axis
+        if uniform:
+            x = (q - nodes[0]) * (1 / uniform)
+            cell = np.clip(x.astype(np.intp), 0, len(nodes) - 2)
+            return cell, x - cell
+        cell = np.clip(np.searchsorted(nodes, q, side="right") - 1, 0, len(nodes) - 2)
+        return cell, (q - nodes.take(cell)) * inverse.take(cell)
+
+    def _cells(self, speed, beta):
+        i, u = self._locate(self._speedAxis, speed)
+        j, v = self._locate(self._betaAxis, beta)
+        return i * (len(self.beta) - 1) + j, u, v
+
+    @staticmethod
+    def _horner(a, cell, u, v, derivative=False):
+        # sum a_ij u^i v^j (and its d/dv) at the cells
+        order = a.shape[0]
+        value = slope = None
+        for i in range(order - 1, -1, -1):
+            row = a[i, order - 1].take(cell)
+            rowSlope = (order - 1) * row if derivative else None
+            for j in range(order - 2, -1, -1):
+                c = a[i, j].take(cell)
+                if derivative and j > 0:
+                    rowSlope = rowSlope * v + j * c
+                row = row * v + c
+            value = row if value is None else value * u + row
+            if derivative:
+                slope = rowSlope if slope is None else slope * u + rowSlope
+        return (value, slope) if derivative else value
+
+    def lookup(self, speed, beta, tables=mapTables):
+        # map values at (corrected speed, beta), arrays of any (broadcast) shape: a tuple in the
+        # order of tables
+        speed, beta = np.broadcast_arrays(np.asarray(speed, dtype=float), np.asarray(beta, dtype=float))
+        shape = speed.shape
+        speed, beta = speed.ravel(), beta.ravel()
+        n = len(speed)
+        if n <= chunkSize:
+            cell, u, v = self._cells(speed, beta)
+            return tuple(self._horner(self._coefficients[name], cell, u, v).reshape(shape) for name in tables)
+        out = [np.empty(n) for _ in tables]
+        for start in range(0, n, chunkSize):
+            stop = min(start + chunkSize, n)
+            cell, u, v = self._cells(speed[start:stop], beta[start:stop])
+            for values, name in zip(out, tables):
+                values[start:stop] = self._horner(self._coefficients[name], cell, u, v)
+        return tuple(values.reshape(shape) for values in out)
+
+    def solveBeta(self, speed, value, table="flow", iterations=3):
+        # beta at which table (monotonic along each speed line) equals value at this corrected
+        # speed, clipped to the map (0 at choke, 1 at surge)
+        return self._invert(speed, value, table, iterations, False)
+
+    def solveSpeed(self, beta, value, table="flow", iterations=3):
+        # corrected speed at which table (monotonic across the speed lines) equals value on this
+        # beta line, clipped to the map's speed range
+        return self._invert(beta, value, table, iterations, True)
+
+    def _invert(self, fixed, value, table, iterations, alongSpeed):
+        fixed, value = np.broadcast_arrays(np.asarray(fixed, dtype=float), np.asarray(value, dtype=float))
+        shape = fixed.shape
+        fixed, value = fixed.ravel(), value.ravel()
+        out = np.empty(len(fixed))
+        for start in range(0, len(fixed), chunkSize):
+            stop = min(start + chunkSize, len(fixed))
+            out[start:stop] = self._invertChunk(fixed[start:stop], value[start:stop], table, iterations, alongSpeed)
+        return out.reshape(shape)
+
+    def _invertChunk(self, fixed, value, table, iterations, alongSpeed):
+        # the table along the line through the nodes, interpolated linearly between the two node
+        # lines either side of fixed, brackets value and gives the start; Newton on the interpolant
+        # (derivative of the Horner evaluation along the line) refines it
+        nodes = self.tables[table]
+        a = self._coefficients[table]
+        fixedAxis, lineAxis = self._speedAxis, self._betaAxis
+        if alongSpeed:
+            nodes, a = nodes.T, a.transpose(1, 0, 2)
+            fixedAxis, lineAxis = lineAxis, fixedAxis
+        line = lineAxis[0]
+        i, u = self._locate(fixedAxis, fixed)
+        flat, stride = np.ascontiguousarray(nodes).ravel(), nodes.shape[1]
+        lower = i * stride
+        upper = lower + stride
+        at = lambda k: (lambda a: a + u * (flat.take(upper + k) - a))(flat.take(lower + k))
+        # rising or falling along the line, taken from the map as a whole
+        sign = 1.0 if nodes[:, -1].sum() >= nodes[:, 0].sum() else -1.0
+        target = sign * value
+        # bisection over the node lines: the last one at or below value (0 if none)
+        j = np.zeros(len(fixed), dtype=np.intp)
+        step = 1 << (len(line) - 2).bit_length()
+        while step:
+            k = np.minimum(j + step, len(line) - 2)
+            j = np.where(sign * at(k) <= target, k, j)
+            step >>= 1
+        lo, hi = at(j), at(j + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = np.clip(np.where(hi != lo, (value - lo) / (hi - lo), 0.0), 0.0, 1.0)
+        x = line[j] + w * (line[j + 1] - line[j])
+        betaCells = len(self.beta) - 1
+        for _ in range(iterations):
+            j, v = self._locate(lineAxis, x)
+            cell = j * betaCells + i if alongSpeed else i * betaCells + j
+            f, slope = self._horner(a, cell, u, v, derivative=True)
+            slope = slope * lineAxis[2].take(j)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = np.where(slope != 0, (value - f) / slope, 0.0)
+            x = np.clip(x + step, line[0], line[-1])
+        return x
+
+def correctedFlow(massFlow, Tt, Pt):
+    # W sqrt(Tt / Tref) / (Pt / Pref)
+    return massFlow * np.sqrt(Tt / referenceTemp) / (Pt / referencePress)
+
+
+def compressorMap(designPressureRatio, designEfficiency, designFlow=1.0, speeds=np.linspace(0.5, 1.1, 13),
+                  betas=np.linspace(0.0, 1.0, 21), order="cubic"):
+    # generic compressor map, design point at speed 1 / beta 0.5: pressure rise ~ N^2.2, flow ~ N^1.1
+    # falling towards surge, and an efficiency island around the design speed, slightly surge-side
+    N, b = np.meshgrid(speeds, betas, indexing="ij")
+    flowShape = (1.06 - 0.12 * b ** 1.5) / (1.06 - 0.12 * 0.5 ** 1.5)
+    flow = designFlow * N ** 1.1 * flowShape * (1 + 0.03 * (1 - N) * (b - 0.5))
+    pressureRatio = 1 + (designPressureRatio - 1) * N ** 2.2 * (0.8 + 0.4 * b)
+    efficiency = designEfficiency * (1 - 0.45 * (N - 1) ** 2 - 0.3 * (b - 0.55) ** 2) / (1 - 0.3 * 0.05 ** 2)
+    return componentMap(speeds, betas, flow, pressureRatio, efficiency, design=(1.0, 0.5), order=order)
+
+
+def turbineMap(designPressureRatio, designEfficiency, designFlow=1.0, speeds=np.linspace(0.6, 1.2, 13),
+               betas=np.linspace(0.0, 1.0, 21), order="cubic"):
+    # generic turbine map, design point at speed 1 / beta 0.5: expansion ratio rising with beta,
+    # flow choking towards high ratios, efficiency falling off away from the design speed and
+    # loading (velocity ratio)
+    N, b = np.meshgrid(speeds, betas, indexing="ij")
+    pressureRatio = 1 + (designPressureRatio - 1) * (0.4 + 1.2 * b)
+    ratio = (pressureRatio - 1) / (designPressureRatio - 1)
+    flow = designFlow * (1 - 0.06 * np.exp(-4 * ratio)) / (1 - 0.06 * np.exp(-4.0)) * (1 - 0.02 * (N - 1))
+    loading = ratio / N ** 2
+    efficiency = designEfficiency * (1 - 0.25 * (N - 1) ** 2 - 0.12 * (loading - 1) ** 2)
+    return componentMap(speeds, betas, flow, pressureRatio, efficiency, design=(1.0, 0.5), order=order)
+
+
+class engineMaps:
+    # fan, HPC, HPT and LPT maps (None: that component keeps its constants) and the flight
+    # condition the cycle's design constants are taken to describe, where the maps get scaled
+    __slots__ = ("fan", "hpc", "hpt", "lpt", "designMach", "designAltitude")
+
+    def __init__(self, fan=None, hpc=None, hpt=None, lpt=None, designMach=0.9, designAltitude=10000.0):
+        self.fan, self.hpc, self.hpt, self.lpt = fan, hpc, hpt, lpt
+        self.designMach = designMach
+        self.designAltitude = designAltitude
+
+    @classmethod
+    def default(cls, order="cubic"):
+        # the generic maps, their absolute values set when a cycle scales them
+        return cls(compressorMap(4.0, 0.9, order=order), compressorMap(8.75, 0.9, order=order),
+                   turbineMap(3.0, 0.9, order=order), turbineMap(2.0, 0.9, order=order))
+
+    def digest(self):
+        # content hash of the maps and the design condition (the operating point cache keys on it)
+        parts = [None if m is None else m.digest() for m in (self.fan, self.hpc, self.hpt, self.lpt)]
+        return hashlib.sha1(repr((parts, self.designMach, self.designAltitude)).encode()).hexdigest()
+
+    def attach(self, cycle):
+        # scale every map to cycle's design (run without maps at the design flight condition) and
+        # hand it to its component with the inlet temperature that defines its corrected speed;
+        # maps already on the cycle come off first, so attaching again rescales to a changed design
+        for component in (cycle.fan, cycle.hpc, cycle.hpt, cycle.lpt):
+            component.map = None
+        T0, P0 = isa(self.designAltitude)
+        mach = np.array([self.designMach])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cycle.runFlowpath(mach, np.array([P0]), np.array([T0]), np.zeros(1, dtype=bool))
+        s0, s1, s2, s3, s4, s5, s6, s7 = cycle.stations[:8]
+        # design-point values (a station may hold a scalar, e.g. the combustor's fixed exit temperature)
+        value = lambda x: float(np.ravel(x)[0])
+        fan, hpc, hpt, lpt = cycle.fan, cycle.hpc, cycle.hpt, cycle.lpt
+        if self.fan is not None:
+            fan.map = self.fan.scaled(value(correctedFlow(s0.massFlow, s0.Tt, s0.Pt)), fan.pressure_ratioFan,
+                                      fan.efficiencyFan)
+            fan.mapTemp = value(s0.Tt)
+        if self.hpc is not None:
+            hpc.map = self.hpc.scaled(value(correctedFlow(s2.massFlow, s2.Tt, s2.Pt)), hpc.hpcPressRatio,
+                                      hpc.hpcEfficiency)
+            hpc.mapTemp = value(s2.Tt)
+        for component, inState, outState, mapped, shaft in ((hpt, s5, s6, self.hpt, hpc), (lpt, s6, s7, self.lpt, fan)):
+            if mapped is not None:
+                component.shaft = shaft if shaft.map is not None else None
+                component.map = mapped.scaled(value(correctedFlow(inState.massFlow, inState.Tt, inState.Pt)),
+                                              value(inState.Pt / outState.Pt), component.efficiency)
+                component.mapTemp = value(inState.Tt)
+
+
+_default = None
+
+
+def mapModel(maps):
+    # maps argument of runEngineBatch -> engineMaps or None (fixed pressure ratios and efficiencies)
+    global _default
+    if maps is None or isinstance(maps, engineMaps):
+        return maps
+    if maps == "default":
+        if _default is None:
+            _default = engineMaps.default()
+        return _default
+    raise ValueError(f"unknown maps {maps!r} (None, 'default' or a maps.engineMaps)")
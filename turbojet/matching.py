@@ -0,0 +1,213 @@
+"""
+Off-design inlet/nozzle matching.
+
+runEngine takes the engine flow from the inlet capture area and expands the nozzle to the
+flight Mach, so mass flow and nozzle expansion are never coupled. matchOffDesign closes them:
+for every operating point it solves for
+
+    x = (air mass flow, nozzle exit Mach, nozzle exit area)
+
+so that
+    - the flow leaving the afterburner passes through the nozzle exit (continuity),
+    - the exit area agrees with the exit Mach for the fixed nozzleThroat (area-Mach relation,
+      convergent-only exit for subsonic jets),
+    - the jet is expanded to ambient unless the exit area has hit nozzleExitMax (pressure balance).
+
+Newton iterations use a finite-difference Jacobian evaluated as one batched cycle call per
+iteration (the point and its three perturbations are stacked together). The cold guess is an
+ideally expanded jet through a choked throat, which already is the solution wherever the exit
+area stays inside its limits (the default design at sea level, part throttle): those points
+converge with no iterations. Where the exit area is pinned at nozzleExitMax the jet leaves
+underexpanded and Newton has to find the flow and exit Mach. One batched residual evaluation
+sorts the points out; of the rest, a handful spread along the sweep start from the cold guess,
+then every other point adds the correction its converged neighbours needed on top of their own
+cold guess. On a Mach line running into the area limit that takes less than half the Newton
+iterations of cold starts, in two Newton passes rather than one per refinement level.
+"""
+import numpy as np
+
+from .cycle import engineCycle, flightConditions, recordStations, stationDtype, throttleConditions
+
+
+matchDtype = np.dtype(stationDtype.descr + [
+    ("Exit Mach", "f8"),
+    ("Inlet Capture Ratio", "f8"),
+    ("Iterations", "i4"),
+    ("Residual", "f8"),
+    ("Converged", "?"),
+])
+
+
+def _residuals(cycle, x, mach, P0, T0, P_ambient, wet, tit, afterburnerTemp):
+    massFlow, exitMach, exitArea = x[:, 0], x[:, 1], x[:, 2]
+    cycle.runFlowpath(mach, P0, T0, wet, massFlow=massFlow, tit=tit, afterburnerTemp=afterburnerTemp)
+    s9 = cycle.stations[9]
+    noz = cycle.nozzle
+    noz.advance(s9, P_ambient, exitMach)
+
+    throat = noz.nozzleThroat
+    geometricArea = np.where(exitMach >= 1, noz.nozzleExit, throat)
+
+    r = np.empty_like(x)
+    r[:, 0] = 1 - noz.exitMassFlow(exitArea) / s9.massFlow
+    r[:, 1] = (exitArea - geometricArea) / throat
+    r[:, 2] = np.minimum((noz.pressNozzle - P_ambient) / P_ambient, (noz.nozzleExitMax - exitArea) / throat)
+    return r
+
+
+def _coldGuess(cycle, mach, P0, T0, P_ambient, wet, tit, afterburnerTemp):
+    # ideally expanded jet through a choked throat, ignoring the area limit
+    n = len(mach)
+    cycle.runFlowpath(mach, P0, T0, wet, massFlow=np.ones(n), tit=tit, afterburnerTemp=afterburnerTemp)
+    s9 = cycle.stations[9]
+    noz = cycle.nozzle
+    g = noz.gamma
+    flowPerAir = s9.massFlow  # (air + fuel) per unit air
+
+    pressRatio = np.maximum(s9.Pt / P_ambient, 1.0 + 1e-6)
+    exitMach = np.sqrt(2 / (g - 1) * (pressRatio ** ((g - 1) / g) - 1))
+    noz.advance(s9, P_ambient, np.maximum(exitMach, 1.0))
+    noz.desiredMach = np.minimum(exitMach, 1.0)
+    throatFlow = noz.exitMassFlow(noz.nozzleThroat)
+    exitArea = np.where(exitMach >= 1, np.clip(noz.nozzleExit, noz.nozzleThroat, noz.nozzleExitMax), noz.nozzleThroat)
+
+    return np.column_stack([throatFlow / flowPerAir, exitMach, exitArea])
+
+
+def _newton(cycle, x, mach, P0, T0, P_ambient, wet, tit, afterburnerTemp, tol, maxIter):
+    n = len(x)
+    x = x.copy()
+    iterations = np.zeros(n, dtype=np.int32)
+    residual = np.full(n, np.inf)
+    converged = np.zeros(n, dtype=bool)
+    throat = cycle.nozzle.nozzleThroat
+    exitMax = cycle.nozzle.nozzleExitMax
+
+    active = np.arange(n)
+    for _ in range(maxIter + 1):
+        xa = x[active]
+        na = len(active)
+        args = (mach[active], P0[active], T0[active], P_ambient[active], wet[active], tit[active],
+                afterburnerTemp[active])
+
+        # point plus one perturbation per unknown, all in one cycle evaluation
+        h = 1e-7 * np.maximum(np.abs(xa), 1.0)
+        stacked = np.tile(xa, (4, 1))
+        for j in range(3):
+            stacked[(j + 1) * na:(j + 2) * na, j] += h[:, j]
+        r = _residuals(cycle, stacked, *(np.tile(a, 4) for a in args))
+        r0 = r[:na]
+
+        norm = np.max(np.abs(r0), axis=1)
+        residual[active] = norm
+        done = norm < tol
+        converged[active[done]] = True
+        keep = ~done & np.isfinite(norm)
+        if not keep.any() or iterations[active].max() >= maxIter:
+            break
+
+        J = np.empty((na, 3, 3))
+        for j in range(3):
+            J[:, :, j] = (r[(j + 1) * na:(j + 2) * na] - r0) / h[:, j:j + 1]
+
+        J = J[keep]
+        with np.errstate(all="ignore"):
+            try:
+                step = np.linalg.solve(J, -r0[keep][:, :, None])[:, :, 0]
+            except np.linalg.LinAlgError:
+                step = np.stack([np.linalg.lstsq(Jk, -rk, rcond=None)[0] for Jk, rk in zip(J, r0[keep])])
+
+        # keep steps physical: bounded Mach change, area between throat and exit max
+        step[:, 1] = np.clip(step[:, 1], -0.5, 0.5)
+        xk = xa[keep] + step
+        xk[:, 0] = np.maximum(xk[:, 0], 0.1 * xa[keep, 0])
+        xk[:, 1] = np.maximum(xk[:, 1], 0.05)
+        xk[:, 2] = np.clip(xk[:, 2], throat, exitMax)
+
+        active = active[keep]
+        x[active] = xk
+        iterations[active] += 1
+
+    return x, iterations, residual, converged
+
+
+def matchOffDesign(mach, P0=101325, T0=298, mode="wet", P_ambient=101325, altitude=None, throttle=None,
+                   schedule=None, tol=1e-9, maxIter=50, warmStart=True, coarsePoints=16, config=None):
+    # matched operating points along a sweep, returned as a matchDtype array shaped like the inputs
+    # points are solved in flat (C) order, so neighbours in that order warm-start each other
+    # config: a config.engineConfig (one design; the Newton iterations subset points, not designs)
+    P0, T0, P_ambient, altitude = flightConditions(P0, T0, P_ambient, altitude)
+    mach, P0, T0, P_ambient, altitude, mode, throttleIn = np.broadcast_arrays(
+        np.asarray(mach, dtype=float), np.asarray(P0, dtype=float), np.asarray(T0, dtype=float),
+        np.asarray(P_ambient, dtype=float), np.asarray(altitude, dtype=float), np.asarray(mode),
+        np.asarray(np.nan if throttle is None else throttle, dtype=float))
+    shape = mach.shape
+    mach, P0, T0, P_ambient, altitude, mode, throttleIn = (a.ravel() for a in (mach, P0, T0, P_ambient, altitude,
+                                                                               mode, throttleIn))
+    n = len(mach)
+
+    cycle = engineCycle(config)
+    wet, throttle, tit, afterburnerTemp = throttleConditions(cycle, mode, None if throttle is None else throttleIn,
+                                                             schedule)
+    # the Newton iterations index into these, so the design temperatures are spelled out per point
+    if tit is None:
+        tit = np.full(n, float(cycle.combustor.titemp))
+        afterburnerTemp = np.full(n, float(cycle.afterburner.afterburnertemp))
+    x = np.full((n, 3), np.nan)
+    iterations = np.zeros(n, dtype=np.int32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cold = _coldGuess(cycle, mach, P0, T0, P_ambient, wet, tit, afterburnerTemp)
+        # points whose cold guess already closes the residuals (exit area within its limits) are done
+        # in one batched evaluation, only the rest need Newton
+        residual = np.max(np.abs(_residuals(cycle, cold, mach, P0, T0, P_ambient, wet, tit, afterburnerTemp)),
+                          axis=1)
+        converged = residual < tol
+        x[converged] = cold[converged]
+        pending = np.flatnonzero(~converged)
+        # coarse points first from the cold guess, then every other point warm-started from them
+        if warmStart and len(pending) > coarsePoints:
+            coarse = np.zeros(len(pending), dtype=bool)
+            coarse[np.linspace(0, len(pending) - 1, coarsePoints).round().astype(int)] = True
+            passes = (pending[coarse], pending[~coarse])
+        else:
+            passes = (pending,)
+        for idx in passes:
+            if not len(idx):
+                continue
+            args = (mach[idx], P0[idx], T0[idx], P_ambient[idx], wet[idx], tit[idx], afterburnerTemp[idx])
+
+            # warm start: carry over how far the converged neighbours ended up from their own cold guess
+            known = np.flatnonzero(converged)
+            guess = cold[idx]
+            if warmStart and len(known):
+                offset = x[known] - cold[known]
+                guess = guess + np.column_stack([np.interp(idx, known, offset[:, j]) for j in range(3)])
+
+            x[idx], iterations[idx], residual[idx], converged[idx] = _newton(cycle, guess, *args, tol, maxIter)
+
+        # final pass at the converged unknowns to fill in every station
+        afterburnerFuelFlow = cycle.runFlowpath(mach, P0, T0, wet, massFlow=x[:, 0], tit=tit,
+                                                afterburnerTemp=afterburnerTemp)
+        capture = cycle.inlet.mass_flow
+        noz = cycle.nozzle
+        noz.advance(cycle.stations[9], P_ambient, x[:, 1])
+        noz.nozzleExit = x[:, 2]
+        cycle.exhaust.advance(cycle.stations[9], noz, 0)
+
+        out = np.empty(n, dtype=matchDtype)
+        out["Mach"] = mach
+        out["Altitude"] = altitude
+        out["P0"] = P0
+        out["T0"] = T0
+        out["P_ambient"] = P_ambient
+        out["Wet"] = wet
+        out["Throttle"] = throttle
+        recordStations(cycle, afterburnerFuelFlow, out)
+        out["Exit Mach"] = x[:, 1]
+        # Mach 0 captures no flow, so the ratio is undefined there
+        out["Inlet Capture Ratio"] = np.where(capture > 0, x[:, 0] / capture, np.nan)
+    out["Iterations"] = iterations
+    out["Residual"] = residual
+    out["Converged"] = converged
+    return out.reshape(shape)
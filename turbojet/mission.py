@@ -0,0 +1,281 @@
+"""
+Mission fuel burn.
+
+A mission is a list of missionSegments: stretches of flight sampled at a series of times, each
+sample with a Mach number, an altitude, the thrust the aircraft needs and whether the
+afterburner may be used (mode "dry": throttle 0..1, "wet": afterburner lit, throttle 1..2).
+flyMission finds the throttle giving the required thrust at every sample and integrates the
+fuel flow over time (trapezoidal rule) into fuel burned and aircraft weight:
+
+    climb = missionSegment(240, mach=(0.5, 0.9), altitude=(1000, 10000), thrust=(340e3, 160e3))
+    cruise = missionSegment(1800, mach=1.5, altitude=12000, thrust=200e3, steps=30)
+    combat = missionSegment(120, mach=1.2, altitude=9000, thrust=340e3, mode="wet")
+    out = flyMission([climb, cruise, combat], weight=29000, fuel=8200, engines=2)
+    out["fuelBurned"], out["stations"]["Throttle"], out["segments"][1]["fuelBurned"]
+
+Mach, altitude and thrust are each one value (held), a (start, end) pair (linear in time) or
+one value per sample; thrust may also be a function of (weight, mach, altitude), e.g. the drag
+at the weight reached, which flyMission iterates until the weights settle.
+missionSegment.history takes a time history (sample times and the values at them) in place
+of a duration and a step count.
+
+The throttle solves are batched: solveThrottle brackets every sample's throttle in its mode's
+range and closes in with regula falsi (Illinois) steps, each one runEngineBatch call over all
+the samples still unconverged. flyMissions solves any number of missions together the same
+way, so a fleet study costs a few dozen batched evaluations rather than a solve per sample.
+"""
+import time
+
+import numpy as np
+
+from .cycle import runEngineBatch, stationDtype
+
+
+# per-sample outcome of the throttle solve (the "Status" field)
+statusNames = ("met", "short", "idle", "failed")
+# met: thrust within rtol of the requirement
+# short: more thrust needed than the mode gives, flown at its top setting (1 dry, 2 wet)
+# idle: less needed than its lowest setting gives (idle dry, light-off wet), flown there
+# failed: no cycle solution even at the top setting, or no convergence in maxIterations
+
+# stations are per engine; required thrust, fuel burned and weight are for the whole aircraft
+missionDtype = np.dtype([("Time", "f8"), ("Segment", "i4"), ("Status", "i1"), ("Required Thrust", "f8"),
+                         ("Fuel Burned", "f8"), ("Weight", "f8")] + stationDtype.descr)
+
+
+def _rows(a):
+    # (records, bytes) uint8 view of a flat structured array: whole records copy at once this way,
+    # where assigning the structured array itself goes field by field
+    return a.view(np.uint8).reshape(len(a), a.dtype.itemsize)
+
+
+def _profile(value, times, name):
+    # one value per sample time from a constant, (start, end) or per-sample values
+    if callable(value):
+        return value
+    v = np.asarray(value, dtype=float)
+    if v.ndim == 0:
+        return np.full(len(times), float(v))
+    if v.shape == (len(times),):
+        return v.copy()
+    if v.shape == (2,):
+        return np.interp(times, (times[0], times[-1]), v)
+    raise ValueError(f"{name}: give one value, a (start, end) pair or one value per sample ({len(times)})")
+
+
+class missionSegment:
+    def __init__(self, duration, mach, altitude, thrust, mode="dry", steps=20, name=None):
+        # duration [s], sampled at steps + 1 evenly spaced times including both ends
+        # mach, altitude [m], thrust [N, whole aircraft]: see the module docstring
+        # mode: "dry" or "wet", or one of them per sample
+        if not duration > 0 or int(steps) < 1:
+            raise ValueError("a segment needs a positive duration and at least one step")
+        self._set(np.linspace(0.0, float(duration), int(steps) + 1), mach, altitude, thrust, mode, name)
+
+    @classmethod
+    def history(cls, times, mach, altitude, thrust, mode="dry", name=None):
+        # a segment from a time history: increasing sample times [s] and the values at them
+        times = np.asarray(times, dtype=float)
+        if times.ndim != 1 or len(times) < 2 or np.any(np.diff(times) <= 0):
+            raise ValueError("times must be an increasing sequence of at least two sample times")
+        segment = cls.__new__(cls)
+        segment._set(times - times[0], mach, altitude, thrust, mode, name)
+        return segment
+
+    def _set(self, times, mach, altitude, thrust, mode, name):
+        self.times = times
+        self.duration = float(times[-1])
+        self.mach = _profile(mach, times, "mach")
+        self.altitude = _profile(altitude, times, "altitude")
+        if callable(self.mach) or callable(self.altitude):
+            raise ValueError("only thrust may be given as a function")
+        self.thrust = _profile(thrust, times, "thrust")
+        mode = np.asarray(mode)
+        if not ((mode == "dry") | (mode == "wet")).all():
+            raise ValueError("mode must be 'dry' or 'wet'")
+        self.wet = np.broadcast_to(mode == "wet", times.shape)
+        self.name = name
+
+    def __len__(self):
+        return len(self.times)
+
+
+def solveThrottle(thrust, mach, altitude, mode="dry", rtol=1e-6, maxIterations=40, schedule=None, config=None,
+                  gas=None, maps=None):
+    # throttle giving net thrust `thrust` [N, per engine] at each (mach, altitude), in mode's range
+    # (0..1 dry, just above 1..2 wet; thrust rises with throttle within each range), all arguments
+    # broadcasting together; schedule / config / gas / maps as for runEngineBatch
+    # returns (stationDtype results at the throttle found, status (statusNames indices), iterations)
+    thrust, mach, altitude, mode = np.broadcast_arrays(np.asarray(thrust, dtype=float), np.asarray(mach, dtype=float),
+                                                       np.asarray(altitude, dtype=float), np.asarray(mode))
+    shape = thrust.shape
+    thrust, mach, altitude = (np.ascontiguousarray(a).ravel() for a in (thrust, mach, altitude))
+    wet = np.ravel(mode) == "wet"
+    n = len(thrust)
+
+    def evaluate(idx, t):
+        return runEngineBatch(mach[idx], altitude=altitude[idx], throttle=t, schedule=schedule, config=config,
+                              gas=gas, maps=maps)
+
+    # both ends of every range in one call; throttle exactly 1 is dry, so wet starts just above it
+    lo = np.where(wet, np.nextafter(1.0, 2.0), 0.0)
+    hi = np.where(wet, 2.0, 1.0)
+    ends = evaluate(np.tile(np.arange(n), 2), np.concatenate([lo, hi]))
+    fLo = ends["Net Thrust"][:n] - thrust
+    fHi = ends["Net Thrust"][n:] - thrust
+
+    status = np.zeros(n, dtype=np.int8)
+    status[fHi < 0] = statusNames.index("short")
+    status[fLo > 0] = statusNames.index("idle")
+    status[np.isnan(fHi)] = statusNames.index("failed")
+    out = ends[n:].copy()
+    rows, endRows = _rows(out), _rows(ends)
+    idle = status == statusNames.index("idle")
+    rows[idle] = endRows[:n][idle]
+
+    # regula falsi inside the brackets; a nan end (turbine short of work at low throttle) counts
+    # as too little thrust and falls back to bisection. Illinois: an end kept twice running has
+    # its residual halved, so the other end can't stall
+    done = np.abs(fLo) <= rtol * np.abs(thrust)
+    rows[done] = endRows[:n][done]
+    active = (status == 0) & ~done & ~(np.abs(fHi) <= rtol * np.abs(thrust))
+    kept = np.zeros(n, dtype=np.int8)    # -1: lo moved last, 1: hi moved last
+    iterations = 0
+    while active.any():
+        if iterations == maxIterations:
+            status[active] = statusNames.index("failed")
+            break
+        iterations += 1
+        idx = np.flatnonzero(active)
+        a, b, fa, fb = lo[idx], hi[idx], fLo[idx], fHi[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = b - fb * (b - a) / (fb - fa)
+        t = np.where((t > a) & (t < b), t, 0.5 * (a + b))
+        res = evaluate(idx, t)
+        rows[idx] = _rows(res)
+        f = res["Net Thrust"] - thrust[idx]
+        below = ~(f > 0)
+        lo[idx] = np.where(below, t, a)
+        fLo[idx] = np.where(below, f, np.where(kept[idx] == 1, 0.5 * fa, fa))
+        hi[idx] = np.where(below, b, t)
+        fHi[idx] = np.where(below, np.where(kept[idx] == -1, 0.5 * fb, fb), f)
+        kept[idx] = np.where(below, -1, 1)
+        converged = (np.abs(f) <= rtol * np.abs(thrust[idx])) | (hi[idx] - lo[idx] <= 1e-12)
+        active[idx[converged]] = False
+    return out.reshape(shape), status.reshape(shape), iterations
+
+
+def flyMissions(missions, weight, fuel=None, engines=1, rtol=1e-6, maxIterations=40, weightTol=0.1, maxPasses=8,
+                schedule=None, config=None, gas=None, maps=None):
+    # fly many missions (each a list of missionSegments) with every throttle solve batched across
+    # all of them; weight [kg] at the start and fuel [kg] aboard, one value or one per mission
+    # engines: thrust is shared equally between them and fuel flows add up
+    # weightTol [kg] / maxPasses: convergence of missions whose thrust depends on weight
+    # returns a dict: "missions" (one flyMission result each), "samples", "evaluations"
+    # (runEngineBatch calls), "passes", "seconds"
+    start = time.perf_counter()
+    missions = [list(segments) for segments in missions]
+    if not missions or not all(missions):
+        raise ValueError("every mission needs at least one segment")
+    m = len(missions)
+    weight = np.broadcast_to(np.asarray(weight, dtype=float), (m,))
+    fuel = None if fuel is None else np.broadcast_to(np.asarray(fuel, dtype=float), (m,))
+
+    # every sample of every mission in one flat batch
+    segments = [segment for segments in missions for segment in segments]
+    counts = np.array([len(segment) for segment in segments])
+    perMission = np.array([sum(len(segment) for segment in segments) for segments in missions])
+    n = int(counts.sum())
+    offsets = np.cumsum([0.0] + [s.duration for s in segments])[:-1]
+    missionStart = np.repeat(np.concatenate([[0.0], np.cumsum([sum(s.duration for s in segments)
+                                                               for segments in missions])[:-1]]), perMission)
+    out = np.zeros(n, dtype=missionDtype)
+    out["Time"] = np.concatenate([s.times for s in segments]) + np.repeat(offsets, counts) - missionStart
+    out["Segment"] = np.concatenate([np.arange(len(segments)) for segments in missions]).repeat(counts)
+    mach = np.concatenate([s.mach for s in segments])
+    altitude = np.concatenate([s.altitude for s in segments])
+    mode = np.where(np.concatenate([s.wet for s in segments]), "wet", "dry")
+    missionIndex = np.repeat(np.arange(m), perMission)
+    first = np.concatenate([[0], np.cumsum(perMission)[:-1]])
+
+    # thrust per sample: fixed values now, functions of weight filled in each pass
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    functions = [(slice(bounds[i], bounds[i + 1]), s.thrust) for i, s in enumerate(segments) if callable(s.thrust)]
+    required = np.full(n, np.nan)
+    for i, s in enumerate(segments):
+        if not callable(s.thrust):
+            required[bounds[i]:bounds[i + 1]] = s.thrust
+    weights = weight[missionIndex].copy()
+    dt = np.diff(out["Time"])
+    dt[first[1:] - 1] = 0.0        # no flow integrated across from one mission to the next
+
+    todo = np.arange(n)
+    evaluations = passes = 0
+    stations = np.empty(n, dtype=stationDtype)
+    status = np.zeros(n, dtype=np.int8)
+    while True:
+        passes += 1
+        for where, fn in functions:
+            required[where] = fn(weights[where], mach[where], altitude[where])
+        res, st, iterations = solveThrottle(required[todo] / engines, mach[todo], altitude[todo], mode[todo], rtol,
+                                            maxIterations, schedule, config, gas, maps)
+        _rows(stations)[todo] = _rows(res.ravel())
+        status[todo] = st
+        evaluations += iterations + 1
+
+        # trapezoidal fuel burn; a failed sample leaves the rest of its mission nan
+        flow = stations["Total Fuel Flow"] * engines
+        step = 0.5 * (flow[1:] + flow[:-1]) * dt
+        bad = np.isnan(step)
+        burned = np.concatenate([[0.0], np.cumsum(np.where(bad, 0.0, step))])
+        lost = np.concatenate([[0], np.cumsum(bad)])
+        burned -= burned[first][missionIndex]
+        burned[(lost - lost[first][missionIndex]) > 0] = np.nan
+        newWeights = weight[missionIndex] - burned
+        change = np.abs(newWeights - weights)
+        weights = newWeights
+        if not functions or passes == maxPasses or not change[np.isfinite(change)].max(initial=0.0) > weightTol:
+            break
+        todo = np.concatenate([np.arange(n)[where] for where, _ in functions])
+
+    _rows(out)[:, missionDtype.fields["Mach"][1]:] = _rows(stations)
+    out["Status"] = status
+    out["Required Thrust"] = required
+    out["Fuel Burned"] = burned
+    out["Weight"] = weights
+
+    results = []
+    g = 0
+    for i, segments in enumerate(missions):
+        stationsOut = out[first[i]:first[i] + perMission[i]]
+        summary = []
+        for segment in segments:
+            rows = out[bounds[g]:bounds[g + 1]]
+            throttle = rows["Throttle"][np.isfinite(rows["Throttle"])]
+            summary.append({"name": segment.name, "duration": segment.duration,
+                            "fuelBurned": float(rows["Fuel Burned"][-1] - rows["Fuel Burned"][0]),
+                            "startWeight": float(rows["Weight"][0]), "endWeight": float(rows["Weight"][-1]),
+                            "maxThrottle": float(throttle.max()) if throttle.size else np.nan,
+                            **{name: int(np.count_nonzero(rows["Status"] == j))
+                               for j, name in enumerate(statusNames) if name != "met"}})
+            g += 1
+        burnedTotal = float(stationsOut["Fuel Burned"][-1])
+        results.append({"stations": stationsOut, "segments": summary, "duration": float(stationsOut["Time"][-1]),
+                        "fuelBurned": burnedTotal, "finalWeight": float(stationsOut["Weight"][-1]),
+                        "fuelRemaining": None if fuel is None else float(fuel[i] - burnedTotal),
+                        **{name: int(np.count_nonzero(stationsOut["Status"] == j))
+                           for j, name in enumerate(statusNames) if name != "met"}})
+    return {"missions": results, "samples": n, "evaluations": evaluations, "passes": passes,
+            "seconds": time.perf_counter() - start}
+
+
+def flyMission(segments, weight, fuel=None, engines=1, **options):
+    # one mission: flyMissions' result for it, plus its "evaluations", "passes" and "seconds"
+    # "stations" (missionDtype, every sample in time order; a segment's first sample repeats the
+    # previous one's last time), "segments" (per-segment fuel, weights, max throttle and counts of
+    # samples not met), "fuelBurned", "finalWeight", "fuelRemaining" (None without fuel) and the
+    # counts of "short", "idle" and "failed" samples
+    fleet = flyMissions([segments], weight, fuel, engines, **options)
+    result = fleet["missions"][0]
+    result.update({key: fleet[key] for key in ("evaluations", "passes", "seconds")})
+    return result
@@ -0,0 +1,522 @@
+"""
+Design-space optimization of the cycle.
+
+optimizeDesign searches a few component design constants (by default fan and HPC pressure
+ratio, bypass ratio and TIT, see designVariables) for the minimum of one result field (TSFC)
+subject to bounds on others (a required net thrust) at one flight condition:
+
+    result = optimizeDesign(requiredThrust=90e3, mach=0.9, altitude=10000, mode="dry")
+    print(optimizationReport(result))
+
+Two solvers, both working on the variables scaled to [0, 1]:
+
+    "gradient"   augmented Lagrangian around a projected quasi-Newton (BFGS) inner solver;
+                 gradients come from forward-mode sensitivities (sensitivity.py) and a few
+                 starts run side by side, each line search trying all its step lengths at once
+    "evolution"  differential evolution (rand/1/bin with dithered F, feasibility rules for the
+                 constraints), one batch per generation, optionally polished by "gradient"
+
+Every candidate set goes through a designEvaluator: the designs become one config.configBatch
+and one runEngineBatch call (spread over worker processes when asked), and designs already
+seen are served from its cache. gridSearch is the brute-force reference the solvers are
+measured against in benchmarks/bench_optimize.py.
+"""
+import time
+
+import numpy as np
+
+from .config import configBatch, engineConfig
+
+
+# default search space: "component.attr" -> (lower, upper)
+designVariables = {
+    "fan.pressure_ratioFan": (3.0, 5.0),
+    "hpc.hpcPressRatio": (6.0, 11.0),
+    "split.bypaRatio": (0.25, 0.8),
+    "combustor.titemp": (1700.0, 2000.0),
+}
+
+# result fields sensitivities() can differentiate, i.e. what the gradient solver can use
+gradientFields = ("Net Thrust", "TSFC", "Specific Thrust", "Thermal Efficiency", "Air Mass Flow")
+
+# runEngineBatch keywords sensitivities() takes as well
+_flightKeywords = ("mach", "P0", "T0", "mode", "P_ambient", "altitude")
+
+
+def _evaluateChunk(names, values, base, fields, conditions):
+    # worker side: one runEngineBatch call over a block of designs
+    from .cycle import runEngineBatch
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = runEngineBatch(**conditions, config=configBatch(dict(zip(names, values.T)), base=base))
+    return np.column_stack([np.broadcast_to(res[name], len(values)) for name in fields])
+
+
+class designEvaluator:
+    # result fields of designs given as points u in the unit box, batched and cached
+    def __init__(self, variables, fields, conditions, base=None, workers=1, chunkSize=20000, digits=12):
+        # variables: "component.attr" -> (lower, upper); fields: result fields to return
+        # conditions: runEngineBatch keywords of the flight condition (scalars)
+        # workers: processes for large batches (1 = in process); digits: decimals u is rounded to,
+        # so designs that agree to that many digits share a cache entry
+        self.names = tuple(variables)
+        self.lower, self.upper = np.array([variables[name] for name in self.names], dtype=float).T
+        self.fields = tuple(fields)
+        self.conditions = dict(conditions)
+        self.base = base
+        self.workers = workers
+        self.chunkSize = chunkSize
+        self.digits = digits
+        self.cache = {}
+        self.counters = {"evaluations": 0, "gradientEvaluations": 0, "cacheHits": 0, "batches": 0}
+        self._pool = None
+
+    def designs(self, u):
+        return self.lower + np.asarray(u) * (self.upper - self.lower)
+
+    def __call__(self, u, remember=True):
+        # (n, len(fields)) values at the n rows of u; remember=False skips the cache both ways
+        # (designs that can't repeat, like a grid)
+        u = np.round(np.atleast_2d(np.asarray(u, dtype=float)), self.digits) + 0.0
+        if not remember:
+            self.counters["evaluations"] += len(u)
+            self.counters["batches"] += 1
+            return self._evaluate(self.designs(u))
+        out = np.empty((len(u), len(self.fields)))
+        missing = {}
+        for i, row in enumerate(u):
+            key = row.tobytes()
+            hit = self.cache.get(key)
+            if hit is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                out[i] = hit
+        self.counters["cacheHits"] += len(u) - len(missing)
+        if missing:
+            rows = u[[index[0] for index in missing.values()]]
+            values = self._evaluate(self.designs(rows))
+            for (key, index), value in zip(missing.items(), values):
+                self.cache[key] = value
+                out[index] = value
+            self.counters["evaluations"] += len(rows)
+            self.counters["batches"] += 1
+        return out
+
+    def _evaluate(self, designs):
+        args = (self.names, self.base, self.fields, self.conditions)
+        if self.workers == 1 or len(designs) <= self.chunkSize:
+            return _evaluateChunk(self.names, designs, *args[1:])
+        if self._pool is None:
+            # imported here: concurrent.futures costs more to import than the cycle itself
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self._pool.submit(_evaluateChunk, self.names, designs[start:start + self.chunkSize], *args[1:])
+                   for start in range(0, len(designs), self.chunkSize)]
+        return np.concatenate([future.result() for future in futures])
+
+    def gradient(self, u):
+        # (values (n, F), d values / d u (n, F, D)) by forward mode, one dual pass over all rows
+        from .sensitivity import sensitivities
+
+        unknown = set(self.conditions) - set(_flightKeywords)
+        if unknown:
+            raise ValueError(f"gradients don't support {', '.join(sorted(unknown))} (use mode, not throttle)")
+        u = np.round(np.atleast_2d(np.asarray(u, dtype=float)), self.digits) + 0.0
+        batch = configBatch(dict(zip(self.names, self.designs(u).T)), base=self.base)
+        flight = {name: self.conditions.get(name, default) for name, default in
+                  (("mach", 0.0), ("P0", 101325), ("T0", 298), ("mode", "wet"), ("P_ambient", 101325),
+                   ("altitude", None))}
+        res, jacobian, _ = sensitivities(**flight, parameters=self.names, outputs=self.fields, config=batch)
+        values = np.column_stack([np.broadcast_to(res[name], len(u)) for name in self.fields])
+        jacobian = np.broadcast_to(jacobian, (len(u),) + jacobian.shape[-2:]) * (self.upper - self.lower)
+        for row, value in zip(u, values):
+            self.cache.setdefault(row.tobytes(), value)
+        self.counters["gradientEvaluations"] += len(u)
+        return values, jacobian
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class _problem:
+    # objective and constraints in the scaled form the solvers see: f to minimize (relative to a
+    # reference value) and c >= 0 for every constraint bound (relative margins)
+    def __init__(self, evaluator, objective, constraints, maximize):
+        self.evaluator = evaluator
+        self.objective = objective
+        self.sign = -1.0 if maximize else 1.0
+        # (field column, bound, +1 lower / -1 upper)
+        self.bounds = []
+        for name, (lower, upper) in constraints.items():
+            column = evaluator.fields.index(name)
+            if lower is not None:
+                self.bounds.append((column, float(lower), 1.0))
+            if upper is not None:
+                self.bounds.append((column, float(upper), -1.0))
+        self.column = evaluator.fields.index(objective)
+        self.scale = 1.0
+
+    def _scaled(self, values):
+        f = self.sign * values[:, self.column] / self.scale
+        c = np.empty((len(values), len(self.bounds)))
+        for k, (column, bound, side) in enumerate(self.bounds):
+            c[:, k] = side * (values[:, column] - bound) / (abs(bound) or 1.0)
+        # a design the cycle can't run (nan) counts as infinitely infeasible
+        bad = ~np.isfinite(f) | ~np.isfinite(c).all(axis=1)
+        f[bad] = np.nan
+        c[bad] = -np.inf
+        return f, c
+
+    def __call__(self, u):
+        return self._scaled(self.evaluator(u))
+
+    def gradient(self, u):
+        values, jacobian = self.evaluator.gradient(u)
+        f, c = self._scaled(values)
+        df = self.sign * jacobian[:, self.column] / self.scale
+        dc = np.stack([side * jacobian[:, column] / (abs(bound) or 1.0) for column, bound, side in self.bounds],
+                      axis=1) if self.bounds else np.zeros((len(u), 0, jacobian.shape[-1]))
+        return f, c, df, dc
+
+
+def _violation(c):
+    return np.maximum(-c, 0.0).sum(axis=1) if c.shape[1] else np.zeros(len(c))
+
+
+def _better(f1, v1, f2, v2, tol):
+    # feasibility rules: feasible beats infeasible, two infeasible compare violation, two feasible f
+    feasible1, feasible2 = v1 <= tol, v2 <= tol
+    return np.where(feasible1 & feasible2, f1 <= f2,
+                    np.where(feasible1 | feasible2, feasible1, v1 <= v2)) & ~np.isnan(v1)
+
+
+def _kkt(u, c, df, dc, tol):
+    # (multipliers, stationarity residual) per start: least-squares multipliers of the nearly active
+    # constraints over the variables off their bounds, then the largest projected gradient of the
+    # Lagrangian with them (zero at a KKT point)
+    starts, m = c.shape
+    lam = np.zeros((starts, m))
+    for s in range(starts):
+        near = c[s] <= 10 * tol
+        free = (u[s] > 0) & (u[s] < 1)
+        if near.any() and free.any():
+            solution = np.linalg.lstsq(dc[s][near][:, free].T, df[s][free], rcond=None)[0]
+            lam[s, near] = np.maximum(solution, 0.0)
+    grad = df - np.einsum("sk,skn->sn", lam, dc)
+    return lam, np.abs(np.clip(u - grad, 0, 1) - u).max(axis=1)
+
+
+def _augmentedLagrangian(problem, u0, tol, maxOuter, maxInner, lineSteps):
+    # minimize f subject to c >= 0 and 0 <= u <= 1 from each row of u0 at once
+    # returns (u, multipliers, outer iterations, converged, stalled) per start; stalled: feasible and no
+    # longer moving without meeting the KKT conditions (the mixer's min() puts kinks in the cycle)
+    starts, n = u0.shape
+    m = len(problem.bounds)
+    u = u0.copy()
+    lam = np.zeros((starts, m))
+    mu = np.full(starts, 10.0)
+    converged = np.zeros(starts, dtype=bool)
+    stalled = np.zeros(starts, dtype=bool)
+    steps = 0.5 ** np.arange(lineSteps)
+    previous = np.full(starts, np.inf)
+
+    def merit(f, c, lam, mu):
+        shifted = np.maximum(lam - mu[:, None] * c, 0.0)
+        return f + ((shifted ** 2 - lam ** 2).sum(axis=1)) / (2 * mu)
+
+    # inverse Hessian estimates, carried from one outer iteration to the next
+    H = np.repeat(np.eye(n)[None], starts, axis=0)
+    fresh = np.ones(starts, dtype=bool)  # no curvature pair yet: steepest descent, capped
+    outer = 0
+    for outer in range(1, maxOuter + 1):
+        active = np.flatnonzero(~converged & ~stalled)
+        before = u.copy()
+        last = {}
+        for _ in range(maxInner):
+            if not len(active):
+                break
+            f, c, df, dc = problem.gradient(u[active])
+            shifted = np.maximum(lam[active] - mu[active, None] * c, 0.0)
+            phi = merit(f, c, lam[active], mu[active])
+            grad = df - np.einsum("sk,skn->sn", shifted, dc)
+
+            # quasi-Newton update from the previous accepted step
+            for a, s in enumerate(active):
+                if s in last:
+                    step, oldGrad = last.pop(s)
+                    y = grad[a] - oldGrad
+                    sy = step @ y
+                    if sy > 1e-12 * np.linalg.norm(step) * np.linalg.norm(y):
+                        if fresh[s]:
+                            H[s] = np.eye(n) * sy / (y @ y)
+                            fresh[s] = False
+                        rho = 1.0 / sy
+                        V = np.eye(n) - rho * np.outer(step, y)
+                        H[s] = V @ H[s] @ V.T + rho * np.outer(step, step)
+
+            # bound-aware direction: variables pinned at a bound the gradient pushes against stay fixed
+            pinned = ((u[active] <= 0) & (grad > 0)) | ((u[active] >= 1) & (grad < 0))
+            projected = np.clip(u[active] - grad, 0, 1) - u[active]
+            done = np.abs(projected).max(axis=1) <= tol
+            direction = np.zeros_like(grad)
+            for a, s in enumerate(active):
+                free = ~pinned[a]
+                d = np.zeros(n)
+                d[free] = -H[s][np.ix_(free, free)] @ grad[a, free]
+                if d @ grad[a] >= 0:
+                    H[s] = np.eye(n)
+                    fresh[s] = True
+                    d = -grad[a] * ~pinned[a]
+                if fresh[s]:
+                    d *= min(1.0, 0.1 / max(np.abs(d).max(), 1e-300))
+                direction[a] = d
+
+            # every step length of every start in one batch
+            trial = np.clip(u[active, None, :] + steps[None, :, None] * direction[:, None, :], 0, 1)
+            ft, ct = problem(trial.reshape(-1, n))
+            phiT = merit(ft, ct, np.repeat(lam[active], lineSteps, axis=0),
+                         np.repeat(mu[active], lineSteps)).reshape(len(active), lineSteps)
+            decrease = np.einsum("sn,sln->sl", grad, trial - u[active, None, :])
+            ok = phiT <= phi[:, None] + 1e-4 * decrease
+            accepted = ok.any(axis=1) & ~done
+            first = ok.argmax(axis=1)
+            keep = []
+            for a, s in enumerate(active):
+                if accepted[a]:
+                    new = trial[a, first[a]]
+                    if np.abs(new - u[s]).max() <= 1e-14:
+                        continue
+                    last[s] = (new - u[s], grad[a])
+                    u[s] = new
+                    keep.append(s)
+            active = np.array(keep, dtype=int)
+
+        # multipliers and penalty
+        f, c = problem(u)
+        violation = _violation(c)
+        finishedBefore = converged | stalled
+        lam = np.where(finishedBefore[:, None], lam, np.maximum(lam - mu[:, None] * c, 0.0))
+        _, _, df, dc = problem.gradient(u)
+        estimate, residual = _kkt(u, c, df, dc, tol)
+        finished = (violation <= tol) & (residual <= 10 * tol) & ~finishedBefore
+        lam[finished] = estimate[finished]
+        converged |= finished
+        stalled |= (violation <= tol) & (np.abs(u - before).max(axis=1) <= tol) & ~converged & ~finishedBefore
+        slow = (violation > tol) & (violation > 0.25 * previous)
+        mu = np.where(slow & ~converged, mu * 10, mu)
+        previous = violation
+        if (converged | stalled).all():
+            break
+    return u, lam, outer, converged, stalled
+
+
+def _differentialEvolution(problem, rng, tol, popSize, maxGenerations, mutation, crossover, spread):
+    # rand/1/bin over the unit box; returns (population, f, violation, generations, converged)
+    n = len(problem.evaluator.names)
+    size = popSize * n
+    # Latin hypercube start
+    u = (rng.permuted(np.tile(np.arange(size), (n, 1)), axis=1).T + rng.random((size, n))) / size
+    f, c = problem(u)
+    v = _violation(c)
+    v[np.isnan(f)] = np.inf
+
+    generation = 0
+    converged = False
+    for generation in range(1, maxGenerations + 1):
+        # three distinct partners other than the target for every member
+        order = np.argsort(rng.random((size, size)) + np.eye(size), axis=1)[:, :3]
+        F = rng.uniform(*mutation)
+        mutant = u[order[:, 0]] + F * (u[order[:, 1]] - u[order[:, 2]])
+        # out of the box: halfway back towards the parent
+        mutant = np.where(mutant < 0, u / 2, np.where(mutant > 1, (u + 1) / 2, mutant))
+        cross = rng.random((size, n)) < crossover
+        cross[np.arange(size), rng.integers(0, n, size)] = True
+        trial = np.where(cross, mutant, u)
+
+        ft, ct = problem(trial)
+        vt = _violation(ct)
+        vt[np.isnan(ft)] = np.inf
+        win = _better(ft, vt, f, v, tol)
+        u[win], f[win], v[win] = trial[win], ft[win], vt[win]
+
+        # settled once every member is feasible and their objectives agree to `spread`
+        if np.all(v <= tol) and np.std(f) <= spread * np.abs(np.mean(f)):
+            converged = True
+            break
+    return u, f, v, generation, converged
+
+
+def _constraintReport(problem, values, lam, tol):
+    report = []
+    for k, (column, bound, side) in enumerate(problem.bounds):
+        value = float(values[column])
+        margin = side * (value - bound) / (abs(bound) or 1.0)
+        multiplier = None if lam is None else float(lam[k])
+        report.append({"field": problem.evaluator.fields[column], "kind": "lower" if side > 0 else "upper",
+                       "bound": bound, "value": value, "margin": margin,
+                       "active": bool(abs(margin) <= 10 * tol or (multiplier or 0.0) > 0), "multiplier": multiplier})
+    return report
+
+
+def optimizeDesign(requiredThrust=None, variables=designVariables, objective="TSFC", constraints=None,
+                   method="gradient", maximize=False, base=None, tol=1e-6, starts=4, maxOuter=30, maxInner=60,
+                   lineSteps=12, popSize=15, maxGenerations=300, mutation=(0.5, 1.0), crossover=0.7, spread=1e-5,
+                   polish=True, seed=0, workers=1, **conditions):
+    # best design for `objective` at one flight condition
+    # requiredThrust: net thrust floor [N], shorthand for constraints={"Net Thrust": (requiredThrust, None)}
+    # constraints: result field -> (lower, upper), None for an open side
+    # method: "gradient" or "evolution"; base: config.engineConfig for everything not searched
+    # tol: constraint feasibility and KKT tolerance (scaled); spread: relative objective spread the
+    # evolution population stops at, polish (gradient solver from its best member) refines from there
+    # conditions: runEngineBatch flight keywords (mach, altitude or P0/T0/P_ambient, mode; "evolution"
+    # also takes throttle / schedule), scalars
+    # returns a dict: design values, config, objective, outputs, constraint and bound activity,
+    # converged, evaluations (cycle evaluations, gradient evaluations, cache hits) and seconds
+    t0 = time.perf_counter()
+    constraints = dict(constraints or {})
+    if requiredThrust is not None:
+        constraints["Net Thrust"] = (requiredThrust, None)
+    fields = tuple(dict.fromkeys((objective,) + tuple(constraints)))
+    evaluator = designEvaluator(variables, fields, conditions, base=base, workers=workers)
+    problem = _problem(evaluator, objective, constraints, maximize)
+    rng = np.random.default_rng(seed)
+    n = len(evaluator.names)
+
+    try:
+        # reference scale for the objective, from the middle of the box
+        reference = evaluator(np.full((1, n), 0.5))[0, problem.column]
+        problem.scale = abs(reference) if np.isfinite(reference) and reference != 0 else 1.0
+
+        if method == "gradient":
+            # starts: the best few of a random sample, by the feasibility rules
+            sample = rng.random((16 * starts, n))
+            f, c = problem(sample)
+            v = _violation(c)
+            v[np.isnan(f)] = np.inf
+            order = np.lexsort((f, np.where(v <= tol, 0.0, v)))
+            u, lam, iterations, converged, stalled = _augmentedLagrangian(problem, sample[order[:starts]], tol,
+                                                                          maxOuter, maxInner, lineSteps)
+            info = {"outerIterations": iterations}
+        elif method == "evolution":
+            u, f, v, generations, done = _differentialEvolution(problem, rng, tol, popSize, maxGenerations, mutation,
+                                                                crossover, spread)
+            converged = np.full(len(u), done)
+            stalled = np.zeros(len(u), dtype=bool)
+            info = {"generations": generations, "polished": False}
+            lam = None
+            if polish and set(fields) <= set(gradientFields) and set(conditions) <= set(_flightKeywords):
+                best = np.lexsort((f, np.where(v <= tol, 0.0, v)))[:1]
+                up, lamP, _, convergedP, stalledP = _augmentedLagrangian(problem, u[best], tol, maxOuter, maxInner,
+                                                                          lineSteps)
+                fp, cp = problem(up)
+                if convergedP[0] or _better(fp, _violation(cp), f[best], v[best], tol)[0]:
+                    u, lam, converged, stalled = up, lamP, convergedP, stalledP
+                    info["polished"] = True
+        else:
+            raise ValueError(f"unknown method {method!r} (use 'gradient' or 'evolution')")
+
+        f, c = problem(u)
+        v = _violation(c)
+        v[np.isnan(f)] = np.inf
+        best = np.lexsort((f, np.where(v <= tol, 0.0, v)))[0]
+        values = evaluator(u[best:best + 1])[0]
+    finally:
+        evaluator.close()
+
+    design = dict(zip(evaluator.names, evaluator.designs(u[best]).tolist()))
+    config = (base or engineConfig()).replace(design)
+    atBound = {name: ("lower" if ub <= 1e-9 else "upper" if ub >= 1 - 1e-9 else None)
+               for name, ub in zip(evaluator.names, u[best])}
+    result = {
+        "method": method,
+        "design": design,
+        "config": config,
+        "objective": float(values[problem.column]),
+        "outputs": {name: float(value) for name, value in zip(fields, values)},
+        "feasible": bool(v[best] <= tol),
+        "converged": bool(converged[best]),
+        "stalled": bool(stalled[best]),
+        "constraints": _constraintReport(problem, values, None if lam is None else lam[best], tol),
+        "variableBounds": atBound,
+        "evaluations": evaluator.counters["evaluations"],
+        "gradientEvaluations": evaluator.counters["gradientEvaluations"],
+        "cacheHits": evaluator.counters["cacheHits"],
+        "batches": evaluator.counters["batches"],
+        "seconds": time.perf_counter() - t0,
+    }
+    result.update(info)
+    return result
+
+
+def gridSearch(points=9, requiredThrust=None, variables=designVariables, objective="TSFC", constraints=None,
+               maximize=False, base=None, tol=1e-6, chunkSize=200000, workers=1, **conditions):
+    # brute force: every design on a points^n grid over the variable bounds, best feasible one
+    # (same result dict as optimizeDesign, without multipliers)
+    t0 = time.perf_counter()
+    constraints = dict(constraints or {})
+    if requiredThrust is not None:
+        constraints["Net Thrust"] = (requiredThrust, None)
+    fields = tuple(dict.fromkeys((objective,) + tuple(constraints)))
+    evaluator = designEvaluator(variables, fields, conditions, base=base, workers=workers, chunkSize=chunkSize)
+    problem = _problem(evaluator, objective, constraints, maximize)
+    n = len(evaluator.names)
+    axis = np.linspace(0, 1, points)
+    total = points ** n
+
+    bestU, bestF, bestV = None, np.inf, np.inf
+    try:
+        for start in range(0, total, chunkSize):
+            index = np.unravel_index(np.arange(start, min(start + chunkSize, total)), (points,) * n)
+            u = np.column_stack([axis[i] for i in index])
+            f, c = problem._scaled(evaluator(u, remember=False))
+            v = _violation(c)
+            v[np.isnan(f)] = np.inf
+            k = np.lexsort((f, np.where(v <= tol, 0.0, v)))[0]
+            if bestU is None or _better(f[k:k + 1], v[k:k + 1], np.array([bestF]), np.array([bestV]), tol)[0]:
+                bestU, bestF, bestV = u[k], f[k], v[k]
+        values = evaluator(bestU[None])[0]
+    finally:
+        evaluator.close()
+
+    design = dict(zip(evaluator.names, evaluator.designs(bestU).tolist()))
+    return {
+        "method": "grid",
+        "design": design,
+        "config": (base or engineConfig()).replace(design),
+        "objective": float(values[problem.column]),
+        "outputs": {name: float(value) for name, value in zip(fields, values)},
+        "feasible": bool(bestV <= tol),
+        "converged": True,
+        "stalled": False,
+        "constraints": _constraintReport(problem, values, None, tol),
+        "variableBounds": {name: ("lower" if ub <= 0 else "upper" if ub >= 1 else None)
+                           for name, ub in zip(evaluator.names, bestU)},
+        "evaluations": evaluator.counters["evaluations"],
+        "gradientEvaluations": 0,
+        "cacheHits": evaluator.counters["cacheHits"],
+        "batches": evaluator.counters["batches"],
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def optimizationReport(result):
+    if result["converged"]:
+        status = "converged"
+    elif result["stalled"]:
+        status = "stalled off a KKT point"
+    else:
+        status = "not converged"
+    lines = [f"{result['method']}: {result['objective']:.6g} "
+             f"({'feasible' if result['feasible'] else 'INFEASIBLE'}, {status}) after "
+             f"{result['evaluations']:,} cycle + {result['gradientEvaluations']:,} gradient evaluations "
+             f"({result['cacheHits']:,} cached) in {result['seconds']:.2f} s"]
+    for name, value in result["design"].items():
+        bound = result["variableBounds"][name]
+        lines.append(f"  {name:24s} {value:12.6g}" + (f"   at {bound} bound" if bound else ""))
+    for c in result["constraints"]:
+        multiplier = "" if c["multiplier"] is None else f", multiplier {c['multiplier']:.3g}"
+        lines.append(f"  {c['field']} {'>=' if c['kind'] == 'lower' else '<='} {c['bound']:g}: {c['value']:.6g} "
+                     f"({'active' if c['active'] else 'inactive'}, margin {c['margin']:.2e}{multiplier})")
+    return "\n".join(lines)
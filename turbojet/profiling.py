@@ -0,0 +1,191 @@
+"""
+Opt-in timing and call-count instrumentation for the cycle pipeline.
+
+    with cycleProfiler() as prof:
+        runEngineBatch(mach)
+    print(prof.report())
+
+While a profiler is enabled, runEngine/runEngineBatch, the engineCycle steps, recordStations
+and every component's __init__, advance() and compute() are swapped for timing wrappers
+(module-level functions are swapped in every module that imported them). disable() puts the
+originals back, so a disabled profiler leaves the hot path exactly as it was.
+
+Per label it records calls, inclusive and self wall time and, with trackAllocations=True,
+net bytes allocated (tracemalloc). Stats are plain dicts, so results from sweep workers can
+be merge()d into one report; trace=True also keeps every call for a Chrome trace file
+(chrome://tracing or https://ui.perfetto.dev).
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from . import classes, cycle
+
+
+componentClasses = (classes.inlet, classes.fan, classes.bypassSplit, classes.highPressureCompressor,
+                    classes.combustor, classes.highPressureTurbine, classes.lowPressureTurbine,
+                    classes.mixer, classes.afterBurner, classes.nozzle, classes.exhaust)
+
+_active = None
+
+
+def _targets():
+    # (owner, attribute, label) for everything the profiler times
+    targets = [(cycle, "runEngine", "runEngine"),
+               (cycle, "runEngineBatch", "runEngineBatch"),
+               (cycle, "recordStations", "recordStations"),
+               (cycle.engineCycle, "__init__", "engineCycle.__init__"),
+               (cycle.engineCycle, "run", "engineCycle.run"),
+               (cycle.engineCycle, "runFlowpath", "engineCycle.runFlowpath"),
+               (cycle.engineCycle, "runAfterburner", "engineCycle.runAfterburner")]
+    for cls in componentClasses:
+        for method in ("__init__", "advance", "compute"):
+            targets.append((cls, method, f"{cls.__name__}.{method}"))
+    return targets
+
+
+class cycleProfiler:
+    def __init__(self, trackAllocations=False, trace=False):
+        self.trackAllocations = trackAllocations
+        self.trace = trace
+        self.records = {}
+        self.events = []
+        self._local = threading.local()
+        self._patched = []
+        self._startedTracemalloc = False
+        self._origin = time.perf_counter()
+
+    # ------------------------------------------------------------------------------------------------
+    # switching on and off
+
+    def enable(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("another cycleProfiler is already enabled")
+        _active = self
+        if self.trackAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracemalloc = True
+
+        for owner, attr, label in _targets():
+            original = owner.__dict__[attr]
+            wrapper = self._wrap(original, label)
+            self._patched.append((owner, attr, original, wrapper))
+            setattr(owner, attr, wrapper)
+
+            # modules that did `from .cycle import runEngineBatch` hold their own reference
+            if owner is cycle:
+                for module in list(sys.modules.values()):
+                    if module is not cycle and getattr(module, attr, None) is original:
+                        setattr(module, attr, wrapper)
+                        self._patched.append((module, attr, original, wrapper))
+        return self
+
+    def disable(self):
+        global _active
+        for owner, attr, original, wrapper in reversed(self._patched):
+            if getattr(owner, attr, None) is wrapper:
+                setattr(owner, attr, original)
+        self._patched = []
+        if self._startedTracemalloc:
+            tracemalloc.stop()
+            self._startedTracemalloc = False
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    # ------------------------------------------------------------------------------------------------
+    # timing
+
+    def _wrap(self, fn, label):
+        prof = self
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            prof._enter(label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof._exit()
+
+        return wrapper
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, label):
+        memory = tracemalloc.get_traced_memory()[0] if self.trackAllocations else 0
+        # [label, start, time spent in children, traced memory at entry]
+        self._stack().append([label, time.perf_counter(), 0.0, memory])
+
+    def _exit(self):
+        end = time.perf_counter()
+        stack = self._stack()
+        label, start, childSeconds, memory = stack.pop()
+        elapsed = end - start
+
+        rec = self.records.get(label)
+        if rec is None:
+            rec = self.records[label] = {"calls": 0, "seconds": 0.0, "selfSeconds": 0.0, "bytes": 0}
+        rec["calls"] += 1
+        rec["seconds"] += elapsed
+        rec["selfSeconds"] += elapsed - childSeconds
+        if self.trackAllocations:
+            rec["bytes"] += tracemalloc.get_traced_memory()[0] - memory
+        if stack:
+            stack[-1][2] += elapsed
+        if self.trace:
+            self.events.append({"name": label, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                                "ts": (start - self._origin) * 1e6, "dur": elapsed * 1e6})
+
+    # ------------------------------------------------------------------------------------------------
+    # results
+
+    def stats(self):
+        return {label: dict(rec) for label, rec in self.records.items()}
+
+    def merge(self, stats, events=()):
+        # fold in stats() (and events) from another profiler, e.g. one per sweep worker
+        for label, other in stats.items():
+            rec = self.records.setdefault(label, {"calls": 0, "seconds": 0.0, "selfSeconds": 0.0, "bytes": 0})
+            for key in rec:
+                rec[key] += other[key]
+        self.events.extend(events)
+
+    def reset(self):
+        self.records = {}
+        self.events = []
+
+    def report(self):
+        rows = sorted(self.records.items(), key=lambda item: item[1]["selfSeconds"], reverse=True)
+        total = sum(rec["selfSeconds"] for _, rec in rows) or 1.0
+        lines = [f"{'label':32s} {'calls':>9s} {'total ms':>11s} {'self ms':>11s} {'self %':>7s} "
+                 f"{'us/call':>9s} {'net bytes':>12s}"]
+        for label, rec in rows:
+            lines.append(f"{label:32s} {rec['calls']:9d} {rec['seconds'] * 1e3:11.3f} {rec['selfSeconds'] * 1e3:11.3f} "
+                         f"{100 * rec['selfSeconds'] / total:7.1f} {rec['seconds'] / rec['calls'] * 1e6:9.2f} "
+                         f"{rec['bytes']:12,d}")
+        return "\n".join(lines)
+
+    def toJSON(self, path=None):
+        text = json.dumps(self.stats(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def writeChromeTrace(self, path):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
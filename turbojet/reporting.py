@@ -0,0 +1,29 @@
+# plots for sweep results; matplotlib is only imported when a plot is actually drawn,
+# so the cycle itself (classes.py, cycle.py) never pays for it
+
+
+def plotPerformance(mach_values, res, show=True, savePrefix=None):
+    # res: runEngineBatch result (or any dict-like with "Net Thrust", "TSFC", "Specific Thrust")
+    # savePrefix: write <prefix>_thrust.png etc. instead of / as well as showing the windows
+    import matplotlib.pyplot as plt
+
+    plots = [
+        ("thrust", res["Net Thrust"], "Net Thrust (N)", "F119 Engine Thrust vs Mach", None),
+        ("tsfc", res["TSFC"], "TSFC (kg fuel / N·s)", "F119 Engine TSFC vs Mach", "orange"),
+        ("specific_thrust", res["Specific Thrust"], "Specific Thrust (N per kg/s air)",
+         "F119 Engine Specific Thrust vs Mach", "green"),
+    ]
+
+    for name, values, ylabel, title, color in plots:
+        plt.figure()
+        plt.plot(mach_values, values, marker='o', color=color)
+        plt.xlabel("Mach Number")
+        plt.ylabel(ylabel)
+        plt.title(title)
+        plt.grid(True)
+        if savePrefix is not None:
+            plt.savefig(f"{savePrefix}_{name}.png")
+        if show:
+            plt.show()
+        else:
+            plt.close()
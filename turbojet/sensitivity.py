@@ -0,0 +1,321 @@
+"""
+Derivatives of the cycle outputs with respect to the component design constants.
+
+sensitivities() runs the cycle once in forward mode: every design constant becomes a dual
+number (value plus a unit derivative along its own parameter axis), the components do their
+usual numpy arithmetic on them, and each result carries d(result)/d(every parameter) for
+every operating point. The value is computed once and the derivatives only cost a few
+multiply-adds per operation, so the whole Jacobian comes out of one pass. method="complex"
+gets the same Jacobian by the complex step instead (one tiled copy of the sweep per
+parameter, Im(result) / h), and finiteDifferences() is the central-difference reference both
+are checked against.
+"""
+import numpy as np
+
+from .config import configBatch, designConstants
+from .cycle import engineCycle, flightConditions
+
+
+sensitivityOutputs = ("Net Thrust", "TSFC", "Specific Thrust")
+
+# cycle output name -> exhaust attribute
+_exhaustOutputs = {"Net Thrust": "thrust", "TSFC": "tSFC", "Specific Thrust": "specThrust",
+                   "Thermal Efficiency": "thermEfficiency", "Air Mass Flow": "airflow"}
+
+
+def _lift(d, ndim):
+    # derivative rows (k, *value shape) reshaped to broadcast against an ndim-dimensional value
+    extra = ndim - (d.ndim - 1)
+    if extra > 0:
+        d = d.reshape(d.shape[:1] + (1,) * extra + d.shape[1:])
+    return d
+
+
+def _combine(ndim, *terms):
+    # sum of (cols, rows) derivative terms over possibly different parameter sets, skipping
+    # terms that are None (identically zero); returns (cols, rows) or (None, None)
+    terms = [(cols, _lift(rows, ndim)) for cols, rows in terms if cols is not None]
+    if not terms:
+        return None, None
+    cols = terms[0][0]
+    if all(c is cols or np.array_equal(c, cols) for c, _ in terms[1:]):
+        total = terms[0][1]
+        for _, rows in terms[1:]:
+            total = total + rows
+        return cols, total
+    cols = np.unique(np.concatenate([c for c, _ in terms]))
+    shape = np.broadcast_shapes(*(rows.shape[1:] for _, rows in terms))
+    # start from the widest term (usually covering every column) and add the others into their rows
+    terms.sort(key=lambda term: -len(term[0]))
+    first, rest = terms[0], terms[1:]
+    if len(first[0]) == len(cols):
+        total = np.array(np.broadcast_to(first[1], (len(cols),) + shape))
+    else:
+        total = np.zeros((len(cols),) + shape)
+        rest = terms
+    for c, rows in rest:
+        pos = np.searchsorted(cols, c)
+        if pos[-1] - pos[0] + 1 == len(pos):
+            total[pos[0]:pos[-1] + 1] += rows
+        else:
+            total[pos] += rows
+    return cols, total
+
+
+def _scaled(x, factor):
+    # derivative term of x times a value-shaped factor
+    cols, rows = x[1], x[2]
+    if cols is None:
+        return None, None
+    return cols, factor * _lift(rows, np.ndim(factor))
+
+
+class dual:
+    # forward-mode number: value v (scalar or array) and its derivatives d with respect to the
+    # parameters listed in cols, stacked along a leading axis (len(cols), *v.shape); cols is None
+    # when v doesn't depend on any parameter. Keeping only the parameters a value actually
+    # depends on means the early stations carry a handful of rows rather than all of them.
+    # Only the numpy operations the components use are implemented; anything else raises TypeError.
+    __slots__ = ("v", "cols", "d")
+
+    def __init__(self, v, cols=None, d=None):
+        self.v = np.asarray(v, dtype=float)
+        self.cols = cols
+        self.d = d
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        rule = _rules.get(ufunc)
+        if method != "__call__" or kwargs or rule is None:
+            return NotImplemented
+        return rule(*(_parts(x) for x in inputs))
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is not np.where or kwargs:
+            return NotImplemented
+        cond, x, y = args
+        x, y = _parts(x), _parts(y)
+        v = np.where(cond, x[0], y[0])
+        if x[1] is None and y[1] is None:
+            return dual(v)
+        # each side's rows, zero where that side isn't picked, then summed over the joint columns
+        cond = np.asarray(cond)
+        cols, d = _combine(v.ndim, (x[1], None if x[1] is None else np.where(cond, _lift(x[2], v.ndim), 0.0)),
+                           (y[1], None if y[1] is None else np.where(cond, 0.0, _lift(y[2], v.ndim))))
+        return dual(v, cols, d)
+
+    __add__ = lambda self, other: np.add(self, other)
+    __radd__ = lambda self, other: np.add(other, self)
+    __sub__ = lambda self, other: np.subtract(self, other)
+    __rsub__ = lambda self, other: np.subtract(other, self)
+    __mul__ = lambda self, other: np.multiply(self, other)
+    __rmul__ = lambda self, other: np.multiply(other, self)
+    __truediv__ = lambda self, other: np.true_divide(self, other)
+    __rtruediv__ = lambda self, other: np.true_divide(other, self)
+    __pow__ = lambda self, other: np.power(self, other)
+    __rpow__ = lambda self, other: np.power(other, self)
+    __neg__ = lambda self: np.negative(self)
+    __lt__ = lambda self, other: np.less(self, other)
+    __le__ = lambda self, other: np.less_equal(self, other)
+    __gt__ = lambda self, other: np.greater(self, other)
+    __ge__ = lambda self, other: np.greater_equal(self, other)
+
+
+def _parts(x):
+    if isinstance(x, dual):
+        return x.v, x.cols, x.d
+    return np.asarray(x), None, None
+
+
+def _add(a, b):
+    v = a[0] + b[0]
+    return dual(v, *_combine(v.ndim, a[1:], b[1:]))
+
+
+def _subtract(a, b):
+    v = a[0] - b[0]
+    return dual(v, *_combine(v.ndim, a[1:], (b[1], None if b[1] is None else -b[2])))
+
+
+def _multiply(a, b):
+    v = a[0] * b[0]
+    return dual(v, *_combine(v.ndim, _scaled(a, b[0]), _scaled(b, a[0])))
+
+
+def _divide(a, b):
+    v = a[0] / b[0]
+    inv = 1 / b[0]
+    return dual(v, *_combine(v.ndim, _scaled(a, inv), _scaled(b, -v * inv)))
+
+
+def _power(a, b):
+    v = a[0] ** b[0]
+    return dual(v, *_combine(v.ndim, _scaled(a, b[0] * a[0] ** (b[0] - 1)) if a[1] is not None else (None, None),
+                             _scaled(b, v * np.log(a[0])) if b[1] is not None else (None, None)))
+
+
+def _sqrt(a):
+    v = np.sqrt(a[0])
+    return dual(v, *_scaled(a, 0.5 / v))
+
+
+def _negative(a):
+    return dual(-a[0], a[1], None if a[1] is None else -a[2])
+
+
+def _minimum(a, b):
+    return np.where(a[0] <= b[0], dual(*a), dual(*b))
+
+
+def _maximum(a, b):
+    return np.where(a[0] >= b[0], dual(*a), dual(*b))
+
+
+def _compare(op):
+    return lambda a, b: op(a[0], b[0])
+
+
+_rules = {np.add: _add, np.subtract: _subtract, np.multiply: _multiply, np.true_divide: _divide,
+          np.power: _power, np.sqrt: _sqrt, np.negative: _negative, np.minimum: _minimum, np.maximum: _maximum,
+          np.less: _compare(np.less), np.less_equal: _compare(np.less_equal),
+          np.greater: _compare(np.greater), np.greater_equal: _compare(np.greater_equal)}
+
+
+def designParameters():
+    # every differentiable component constant, as "component.attr" names (e.g. "fan.pressure_ratioFan")
+    return tuple(name for name, _ in designConstants())
+
+
+def _inputs(mach, P0, T0, mode, P_ambient, altitude, *designs):
+    P0, T0, P_ambient, _ = flightConditions(P0, T0, P_ambient, altitude)
+    mach, P0, T0, P_ambient, mode, *designs = np.broadcast_arrays(
+        np.asarray(mach, dtype=float), np.asarray(P0, dtype=float), np.asarray(T0, dtype=float),
+        np.asarray(P_ambient, dtype=float), np.asarray(mode), *designs)
+    return mach, P0, T0, P_ambient, mode == "wet", designs
+
+
+def sensitivities(mach, P0=101325, T0=298, mode="wet", P_ambient=101325, altitude=None, parameters=None,
+                  outputs=sensitivityOutputs, method="dual", step=1e-30, chunkSize=4096, config=None):
+    # (values, jacobian, parameters): values is a structured array of the outputs shaped like the
+    # broadcast inputs, jacobian[..., k, j] = d outputs[k] / d parameters[j]
+    # method: "dual" (forward mode) or "complex" (complex step with imaginary step `step`)
+    # config: a config.engineConfig, the design the derivatives are taken at (default: classes.py),
+    # or a config.configBatch broadcasting against the flight conditions (one design per point)
+    parameters = designParameters() if parameters is None else tuple(parameters)
+    batch = isinstance(config, configBatch)
+    mach, P0, T0, P_ambient, wet, designs = _inputs(mach, P0, T0, mode, P_ambient, altitude,
+                                                    *(config.values.values() if batch else ()))
+    shape = mach.shape
+    mach, P0, T0, P_ambient, wet = (a.ravel() for a in (mach, P0, T0, P_ambient, wet))
+    # per-point design values of a configBatch, set chunk by chunk
+    designs = dict(zip(config.values, (a.ravel() for a in designs))) if batch else {}
+    n, nParams = len(mach), len(parameters)
+
+    cycle = engineCycle(config.base if batch else config)
+    targets = []
+    for name in parameters:
+        component, attr = name.split(".")
+        component = getattr(cycle, component)
+        targets.append((component, attr, designs[name] if name in designs else float(getattr(component, attr))))
+    fixed = [(getattr(cycle, name.split(".")[0]), name.split(".")[1], values) for name, values in designs.items()
+             if name not in parameters]
+    if method == "dual":
+        # parameter j: its design value with derivative e_j (per-point values are set per chunk)
+        for j, (component, attr, value) in enumerate(targets):
+            if not np.ndim(value):
+                setattr(component, attr, dual(value, np.array([j]), np.ones(1)))
+    elif method == "complex":
+        chunkSize = max(1, chunkSize // nParams)
+    else:
+        raise ValueError(f"unknown method {method!r} (use 'dual' or 'complex')")
+
+    values = np.empty(n, dtype=np.dtype([(name, "f8") for name in outputs]))
+    jacobian = np.empty((n, len(outputs), nParams))
+    for start in range(0, n, chunkSize):
+        stop = min(start + chunkSize, n)
+        m = stop - start
+        for component, attr, value in fixed:
+            setattr(component, attr, value[start:stop])
+        if method == "dual":
+            for j, (component, attr, value) in enumerate(targets):
+                if np.ndim(value):
+                    setattr(component, attr, dual(value[start:stop], np.array([j]), np.ones(1)))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cycle.run(mach[start:stop], P0[start:stop], T0[start:stop], P_ambient[start:stop], wet[start:stop])
+            for k, name in enumerate(outputs):
+                result = getattr(cycle.exhaust, _exhaustOutputs[name])
+                values[name][start:stop] = result.v
+                d = np.zeros((nParams, m))
+                if result.cols is not None:
+                    d[result.cols] = _lift(result.d, 1)
+                jacobian[start:stop, k, :] = d.T
+        else:
+            # block j of the tiled points is the one where parameter j carries the imaginary step
+            for j, (component, attr, value) in enumerate(targets):
+                if np.ndim(value):
+                    perturbed = np.tile(value[start:stop], nParams).astype(complex)
+                else:
+                    perturbed = np.full(nParams * m, value, dtype=complex)
+                perturbed[j * m:(j + 1) * m] += 1j * step
+                setattr(component, attr, perturbed)
+            for component, attr, value in fixed:
+                setattr(component, attr, np.tile(value[start:stop], nParams))
+            tiled = (np.tile(a[start:stop], nParams) for a in (mach, P0, T0, P_ambient, wet))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cycle.run(*tiled)
+            for k, name in enumerate(outputs):
+                result = getattr(cycle.exhaust, _exhaustOutputs[name]).reshape(nParams, m)
+                values[name][start:stop] = result[0].real
+                jacobian[start:stop, k, :] = (result.imag / step).T
+
+    return values.reshape(shape), jacobian.reshape(shape + (len(outputs), nParams)), parameters
+
+
+def finiteDifferences(mach, P0=101325, T0=298, mode="wet", P_ambient=101325, altitude=None, parameters=None,
+                      outputs=sensitivityOutputs, relStep=1e-6, config=None):
+    # same (values, jacobian, parameters) as sensitivities(), by central differences: two cycle
+    # runs per parameter with that constant nudged by +-relStep (relative); config an engineConfig
+    # or a configBatch, as for sensitivities(). The nudges go on a cycle of this call's own, never
+    # on the shared per-thread one
+    parameters = designParameters() if parameters is None else tuple(parameters)
+    batch = isinstance(config, configBatch)
+    mach, P0, T0, P_ambient, wet, designs = _inputs(mach, P0, T0, mode, P_ambient, altitude,
+                                                    *(config.values.values() if batch else ()))
+    cycle = engineCycle(config.base if batch else config)
+    if batch:
+        config.apply(cycle, designs)
+
+    def run():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cycle.run(mach, P0, T0, P_ambient, wet)
+        return {name: np.array(getattr(cycle.exhaust, _exhaustOutputs[name])) for name in outputs}
+
+    base = run()
+    values = np.empty(mach.shape, dtype=np.dtype([(name, "f8") for name in outputs]))
+    for name in outputs:
+        values[name] = base[name]
+
+    jacobian = np.empty(mach.shape + (len(outputs), len(parameters)))
+    for j, name in enumerate(parameters):
+        component, attr = name.split(".")
+        component = getattr(cycle, component)
+        original = getattr(component, attr)
+        h = relStep * np.maximum(np.abs(original), 1.0)
+        setattr(component, attr, original + h)
+        plus = run()
+        setattr(component, attr, original - h)
+        minus = run()
+        setattr(component, attr, original)
+        for k, output in enumerate(outputs):
+            jacobian[..., k, j] = (plus[output] - minus[output]) / (2 * h)
+    return values, jacobian, parameters
+
+
+def columnDisagreement(a, b):
+    # |a - b| of two jacobians over the largest |a| or |b| in the same (output, parameter) column
+    # across the points, per entry (nan where either is undefined counts as agreement): an entry
+    # that is zero in theory (dTSFC / d inlet.gamma is ~1e-13) is all rounding relative to itself but
+    # not against the derivatives the same output has elsewhere
+    a, b = np.asarray(a).reshape((-1,) + np.shape(a)[-2:]), np.asarray(b).reshape((-1,) + np.shape(b)[-2:])
+    scale = np.nanmax(np.maximum(np.abs(a), np.abs(b)), axis=0, keepdims=True)
+    rel = np.abs(a - b) / np.where(scale > 0, scale, 1)
+    return np.where(np.isfinite(rel), rel, 0.0)
@@ -0,0 +1,246 @@
+"""
+Flight-envelope sweeps over a grid of runEngine inputs, spread across a process pool.
+
+A grid spec is a dict of runEngineBatch keyword -> values, e.g.
+
+    grid = {"mach": np.linspace(0, 2.25, 200), "P0": pressures, "mode": ["dry", "wet"]}
+
+and the sweep is the full cartesian product, in the dict's order (last axis fastest).
+The flattened grid is cut into chunks of chunkSize points; every chunk is evaluated with
+one runEngineBatch call on a worker and written back into its slot, so the result comes
+back in grid order no matter which worker finishes first. With a process pool the results
+live in multiprocessing.shared_memory and every worker writes its chunk there by index, so
+only (start, stop) and timings come back through the pipe and runSweep returns a view of
+the shared block with no copy.
+"""
+import hashlib
+import json
+import itertools
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from .cycle import runEngineBatch, stationDtype
+
+
+def gridShape(grid):
+    return tuple(len(np.atleast_1d(values)) for values in grid.values())
+
+
+def gridPoints(grid, start, stop):
+    # inputs for flat grid indices [start, stop) without ever building the whole grid
+    shape = gridShape(grid)
+    index = np.unravel_index(np.arange(start, stop), shape)
+    return {name: np.atleast_1d(values)[i] for (name, values), i in zip(grid.items(), index)}
+
+
+def _signatureValue(value):
+    # JSON stand-in for a fixed sweep argument that every process derives alike: gas tables, maps,
+    # configs and schedules by their content digest (their repr carries id()), arrays by value
+    if hasattr(value, "digest"):
+        return [type(value).__name__, value.digest()]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return str(value)
+
+
+def gridSignature(grid, fixed, chunkSize):
+    # identifies a sweep so a checkpoint is only ever resumed by the same sweep
+    h = hashlib.sha1()
+    for name, values in grid.items():
+        h.update(name.encode())
+        h.update(np.asarray(values).tobytes())
+    h.update(json.dumps(fixed, sort_keys=True, default=_signatureValue).encode())
+    h.update(str(chunkSize).encode())
+    return h.hexdigest()
+
+
+class _sharedResults:
+    # stationDtype block in shared memory for a sweep's results. Arrays over it hold this object
+    # as their base, so the block stays mapped while any view of the results is alive and is
+    # unmapped with the last one; the name is unlinked as soon as the workers are done with it
+    def __init__(self, total):
+        from multiprocessing import shared_memory
+        self.block = shared_memory.SharedMemory(create=True, size=total * stationDtype.itemsize)
+        address = np.frombuffer(self.block.buf, dtype=np.uint8, count=1).ctypes.data
+        self.__array_interface__ = {"shape": (total,), "typestr": f"|V{stationDtype.itemsize}",
+                                    "descr": stationDtype.descr, "data": (address, False), "version": 3}
+
+
+def _writeShared(name, start, stop, res):
+    # worker side: results for flat indices [start, stop) straight into the parent's block
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray(stop - start, dtype=stationDtype, buffer=block.buf, offset=start * stationDtype.itemsize)
+        out[:] = res
+        del out
+    finally:
+        block.close()
+
+
+def _runChunk(grid, fixed, start, stop, profile=False, shared=None):
+    # worker side: only the grid axes travel to the worker, the points are rebuilt here;
+    # shared: name of the parent's result block to write into instead of returning the results
+    points = gridPoints(grid, start, stop)
+    t0 = time.perf_counter()
+    if profile:
+        from .profiling import cycleProfiler
+        with cycleProfiler() as prof:
+            res = runEngineBatch(**points, **fixed)
+        profileStats = prof.stats()
+    else:
+        res = runEngineBatch(**points, **fixed)
+        profileStats = None
+    if shared is not None:
+        _writeShared(shared, start, stop, res)
+        res = None
+    return start, stop, res, os.getpid(), time.perf_counter() - t0, profileStats
+
+
+class _checkpoint:
+    # results live in an on-disk .npy (memory mapped) next to a small json of finished chunks,
+    # so an interrupted sweep picks up where it stopped
+    def __init__(self, path, signature, total):
+        self.dataPath = path + ".npy"
+        self.statePath = path + ".json"
+        self.signature = signature
+        self.done = set()
+
+        if os.path.exists(self.statePath) and os.path.exists(self.dataPath):
+            with open(self.statePath) as f:
+                state = json.load(f)
+            if state["signature"] == signature:
+                self.done = set(state["done"])
+                self.results = np.lib.format.open_memmap(self.dataPath, mode="r+")
+                return
+
+        self.results = np.lib.format.open_memmap(self.dataPath, mode="w+", dtype=stationDtype, shape=(total,))
+        self.save()
+
+    def save(self):
+        self.results.flush()
+        tmp = self.statePath + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"signature": self.signature, "done": sorted(self.done)}, f)
+        os.replace(tmp, self.statePath)
+
+
+def runSweep(grid, workers=None, chunkSize=10000, checkpoint=None, profile=False, sharedMemory=True, **fixed):
+    # grid: dict of runEngineBatch keyword -> values, swept as a cartesian product
+    # fixed: runEngineBatch keywords held constant over the sweep (e.g. P_ambient=...)
+    # workers: process count (None = os.cpu_count(), 1 = run in this process)
+    # checkpoint: path prefix for resumable sweeps (writes <checkpoint>.npy / <checkpoint>.json)
+    # profile: time every component on the workers, merged into stats["profile"] (a cycleProfiler)
+    # sharedMemory: with workers, have them write into a shared-memory result block (False: send
+    # every chunk's results back through the pool's pipes, e.g. where /dev/shm is too small)
+    # returns (results shaped like the grid, stats)
+    shape = gridShape(grid)
+    total = int(np.prod(shape))
+    chunks = [(start, min(start + chunkSize, total)) for start in range(0, total, chunkSize)]
+
+    if checkpoint is not None:
+        store = _checkpoint(checkpoint, gridSignature(grid, fixed, chunkSize), total)
+        results = store.results
+    else:
+        store = None
+        results = None
+    shared = None
+    if results is None:
+        if workers != 1 and sharedMemory and total:
+            shared = _sharedResults(total)
+            results = np.asarray(shared)
+        else:
+            results = np.empty(total, dtype=stationDtype)
+
+    pending = [c for c in chunks if store is None or c[0] not in store.done]
+    perWorker = {}
+    profiler = None
+    if profile:
+        from .profiling import cycleProfiler
+        profiler = cycleProfiler()
+    t0 = time.perf_counter()
+
+    def collect(start, stop, res, pid, elapsed, profileStats):
+        if res is not None:
+            results[start:stop] = res
+        if profileStats is not None:
+            profiler.merge(profileStats)
+        w = perWorker.setdefault(pid, {"chunks": 0, "points": 0, "seconds": 0.0})
+        w["chunks"] += 1
+        w["points"] += stop - start
+        w["seconds"] += elapsed
+        if store is not None:
+            store.done.add(start)
+            store.save()
+
+    if workers == 1:
+        for start, stop in pending:
+            collect(*_runChunk(grid, fixed, start, stop, profile))
+    else:
+        # imported here: concurrent.futures costs more to import than the cycle itself
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        name = None if shared is None else shared.block.name
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_runChunk, grid, fixed, start, stop, profile, name) for start, stop in pending]
+                for future in as_completed(futures):
+                    collect(*future.result())
+        finally:
+            if shared is not None:
+                shared.block.unlink()
+
+    wall = time.perf_counter() - t0
+    for w in perWorker.values():
+        w["pointsPerSecond"] = w["points"] / w["seconds"] if w["seconds"] > 0 else float("inf")
+
+    evaluated = sum(stop - start for start, stop in pending)
+    stats = {
+        "points": total,
+        "evaluated": evaluated,
+        "resumed": total - evaluated,
+        "chunks": len(chunks),
+        "wallSeconds": wall,
+        "pointsPerSecond": evaluated / wall if wall > 0 else float("inf"),
+        "workers": perWorker,
+        "sharedMemory": shared is not None,
+    }
+    if profiler is not None:
+        stats["profile"] = profiler
+    return results.reshape(shape), stats
+
+
+def workerReport(stats):
+    lines = [f"{stats['evaluated']:,} of {stats['points']:,} points in {stats['wallSeconds']:.2f} s "
+             f"({stats['pointsPerSecond']:,.0f} pts/s, {stats['resumed']:,} resumed from checkpoint)"]
+    for pid, w in sorted(stats["workers"].items()):
+        lines.append(f"  worker {pid}: {w['chunks']} chunks, {w['points']:,} points, "
+                     f"{w['pointsPerSecond']:,.0f} pts/s")
+    return "\n".join(lines)
+
+
+def iterSweep(grid, workers=1, chunkSize=10000, **fixed):
+    # streaming version of runSweep: yields (start, stop, results) chunk by chunk in grid order,
+    # with at most two chunks per worker in flight, so memory stays bounded on any grid size
+    total = int(np.prod(gridShape(grid)))
+    chunks = ((start, min(start + chunkSize, total)) for start in range(0, total, chunkSize))
+
+    if workers == 1:
+        for start, stop in chunks:
+            yield start, stop, runEngineBatch(**gridPoints(grid, start, stop), **fixed)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inFlight = deque(pool.submit(_runChunk, grid, fixed, start, stop)
+                         for start, stop in itertools.islice(chunks, 2 * (workers or os.cpu_count())))
+        while inFlight:
+            start, stop, res = inFlight.popleft().result()[:3]
+            nextChunk = next(chunks, None)
+            if nextChunk is not None:
+                inFlight.append(pool.submit(_runChunk, grid, fixed, *nextChunk))
+            yield start, stop, res
@@ -0,0 +1,83 @@
+"""
+Part-power operation: throttle -> turbine inlet / afterburner temperature schedules, and
+batched power hooks (thrust vs fuel flow over many throttle settings per flight condition).
+
+Throttle runs from 0 (idle) through 1 (military, max dry) to 2 (max afterburner):
+
+    0..1   TIT goes from idleTIT up to the combustor design value, afterburner off
+    1..2   TIT held at its design value, afterburner lit, exit temperature from litTemp up to
+           the afterburner design value (throttle exactly 1 is still dry)
+
+so mode="dry" is throttle 1 and mode="wet" is throttle 2. Both schedules are piecewise linear
+and can be replaced by (throttle, temperature) breakpoint tables. Compressor work in this
+cycle model doesn't depend on throttle, so low settings at high flight Mach can leave the
+turbines short of the work they owe; those points come out nan rather than clipped.
+"""
+import hashlib
+
+import numpy as np
+
+
+class throttleSchedule:
+    def __init__(self, idleTIT=1400.0, litTemp=1500.0, tit=None, afterburner=None):
+        # idleTIT: turbine inlet temperature at throttle 0 [K]
+        # litTemp: afterburner exit temperature just after light-off [K]
+        # tit / afterburner: optional ((throttle, K), ...) breakpoints replacing the default
+        # schedules; the defaults end on the component design values, read when evaluated
+        self.idleTIT = idleTIT
+        self.litTemp = litTemp
+        self.tit = None if tit is None else np.asarray(tit, dtype=float)
+        self.afterburner = None if afterburner is None else np.asarray(afterburner, dtype=float)
+
+    def digest(self):
+        # content hash of the schedule, stable across processes (sweep checkpoints key on it)
+        tables = tuple(None if table is None else table.tolist() for table in (self.tit, self.afterburner))
+        return hashlib.sha1(repr((float(self.idleTIT), float(self.litTemp)) + tables).encode()).hexdigest()
+
+    def temperatures(self, throttle, comb, ab):
+        # (turbine inlet temperature, afterburner exit temperature, afterburner lit) for each
+        # throttle setting; comb / ab are the cycle's combustor and afterBurner (design values)
+        t = np.asarray(throttle, dtype=float)
+        if t.size and (t.min() < 0 or t.max() > 2):
+            raise ValueError("throttle must be between 0 (idle) and 2 (max afterburner)")
+        # the default ramps end on the design values, which are arrays under a config.configBatch
+        if self.tit is None:
+            tit = _ramp(t, 0.0, self.idleTIT, 1.0, comb.titemp)
+        else:
+            tit = np.interp(t, self.tit[:, 0], self.tit[:, 1])
+        if self.afterburner is None:
+            afterburner = _ramp(t, 1.0, self.litTemp, 2.0, ab.afterburnertemp)
+        else:
+            afterburner = np.interp(t, self.afterburner[:, 0], self.afterburner[:, 1])
+        return tit, afterburner, t > 1
+
+
+def _ramp(t, t0, v0, t1, v1):
+    # np.interp between two breakpoints (same arithmetic, so the same bits), with v0 / v1 allowed
+    # to be arrays broadcasting against t
+    slope = (v1 - v0) / (t1 - t0)
+    return np.where(t <= t0, v0, np.where(t >= t1, v1, slope * (t - t0) + v0))
+
+
+defaultSchedule = throttleSchedule()
+
+
+def powerHook(mach, throttle=np.linspace(0, 2, 101), P0=101325, T0=298, P_ambient=101325, altitude=None,
+              schedule=None, config=None):
+    # every throttle setting at every flight condition in one runEngineBatch call
+    # flight conditions (mach, P0, T0, P_ambient, altitude) broadcast together to some shape C;
+    # the result is a stationDtype array of shape C + (len(throttle),), so
+    #     hook = powerHook(mach)
+    #     hook["Net Thrust"][i], hook["Total Fuel Flow"][i]
+    # is the thrust / fuel flow curve at flight condition i (config: a config.engineConfig)
+    from .cycle import runEngineBatch
+
+    throttle = np.asarray(throttle, dtype=float)
+    if altitude is not None:
+        mach, altitude = np.broadcast_arrays(np.asarray(mach, dtype=float), np.asarray(altitude, dtype=float))
+        altitude = altitude[..., None]
+    else:
+        mach, P0, T0, P_ambient = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (mach, P0, T0, P_ambient)))
+        P0, T0, P_ambient = P0[..., None], T0[..., None], P_ambient[..., None]
+    return runEngineBatch(mach[..., None], P0, T0, P_ambient=P_ambient, altitude=altitude, throttle=throttle,
+                          schedule=schedule, config=config)
@@ -0,0 +1,378 @@
+"""
+Transient spool dynamics.
+
+runEngine is steady state: each turbine delivers exactly the work its compressor needs. During
+a throttle slam they don't, and the difference accelerates the spool,
+
+    I w dw/dt = P_turbine - P_compressor          for the LP (fan) and HP (HPC) spools
+
+simulateTransient integrates that for the LP and HP speeds N (fractions of the military-power
+speed) with the gas path quasi-steady at every instant. spoolModel reduces the cycle to the two
+power balances, calibrated on the steady military point (design TIT, N = 1) at each flight
+condition:
+
+    - compressors keep their velocity triangles: enthalpy rise ~ N^2 and flow ~ N, so
+      P_compressor ~ N^3 (the fan flow follows N_LP, the core flow N_HP)
+    - turbines are choked: fixed temperature ratio, so P_turbine ~ (core flow + fuel) * inlet Tt,
+      with the fuel from the combustor's energy balance at the scheduled TIT
+
+Throttle against time is a constant, a callable, or (times, throttles) breakpoints (piecewise
+linear, a repeated time is a step) that may differ per engine; it goes through the throttle.py
+schedules to TIT. Two integrators run whole batches of engines at once:
+
+    - "rk4": classical Runge-Kutta, fixed step, all engines in lockstep
+    - "ros2": second-order Rosenbrock (L-stable, linearly implicit: one 2x2 solve per stage
+      and no Newton iterations) with an embedded error estimate and a step size per engine,
+      for stiff spools (small inertias) and long quasi-steady stretches
+
+Both land exactly on every output time and throttle breakpoint. At the output times the full
+cycle is evaluated in one batched call at the spool speeds reached, with the turbines
+delivering their actual shaft power (cycle.engineCycle.runFlowpath(turbineWork=...)), which
+gives the thrust, fuel flow and station data along the transient.
+"""
+import time
+
+import numpy as np
+
+from .cycle import engineCycle, flightConditions, recordStations, stationDtype
+from .throttle import defaultSchedule
+
+
+# polar moments of inertia [kg m^2] and military-power speeds [rpm] of the (LP, HP) spools,
+# ballpark figures for an engine of this size
+spoolInertia = (12.0, 4.0)
+spoolSpeed = (10500.0, 14500.0)
+
+transientDtype = np.dtype([("Time", "f8"), ("LP Spool Speed", "f8"), ("HP Spool Speed", "f8")]
+                          + stationDtype.descr)
+
+# Rosenbrock ROS2 (Verwer et al. 1999)
+_gamma = 1 + 1 / np.sqrt(2)
+
+
+class spoolModel:
+    # LP and HP power balances of a batch of engines; every coefficient is flat over the engines
+    # and the speeds N are (2, ..., n) arrays, index 0 the LP spool, 1 the HP spool
+    __slots__ = ("Tt2", "riseFan", "riseHPC", "coreFlow", "airFlow", "fuelPerKelvin", "turbine", "compressor",
+                 "inertia")
+
+    def __init__(self, cycle, mach, P0, T0, inertia=spoolInertia, speed=spoolSpeed):
+        # run the military point (design TIT, afterburner off) and read the balances off it
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cycle.runFlowpath(mach, P0, T0, np.zeros(mach.shape, dtype=bool))
+        s0, s1, s2, s3, s4, s5, s6, s7 = cycle.stations[:8]
+        n = mach.shape
+        self.Tt2 = s0.Tt
+        self.riseFan = np.broadcast_to(cycle.fan.deltaH_fan / cycle.fan.specificheat, n)  # K at N = 1
+        self.riseHPC = np.broadcast_to(cycle.hpc.deltaH_HPC / cycle.hpc.specificheat, n)
+        self.coreFlow = s2.massFlow
+        self.airFlow = s0.massFlow
+        self.fuelPerKelvin = cycle.combustor.specificheat / (cycle.combustor.combustFHV
+                                                             * cycle.combustor.combEfficiency)
+        # shaft power per (kg/s * K) of turbine inlet: efficiency * cp * (1 - Tt out / Tt in), the
+        # LPT's inlet being the HPT's exit at the same temperature ratio
+        hptRatio = s6.Tt / s5.Tt
+        self.turbine = np.stack(np.broadcast_arrays(
+            cycle.lpt.efficiency * cycle.lpt.specificheat * (1 - s7.Tt / s6.Tt) * hptRatio,
+            cycle.hpt.efficiency * cycle.hpt.specificheat * (1 - hptRatio)))
+        self.compressor = np.stack(np.broadcast_arrays(s1.work, s4.work))
+        omega = np.asarray(speed, dtype=float) * (2 * np.pi / 60)
+        self.inertia = np.broadcast_to((np.asarray(inertia, dtype=float) * omega ** 2)[:, None], self.turbine.shape)
+
+    def derivative(self, N, tit):
+        # dN/dt of the spool speeds N (2, n) or (2, m, n) at turbine inlet temperature tit
+        turbine, compressor, inertia = self.turbine, self.compressor, self.inertia
+        if N.ndim == 3:
+            turbine, compressor, inertia = turbine[:, None], compressor[:, None], inertia[:, None]
+        square = N * N
+        Tt3 = self.Tt2 + self.riseFan * square[0] + self.riseHPC * square[1]
+        # (core air + fuel) * TIT, what the choked turbines' power scales with
+        flowTIT = self.coreFlow * N[1] * (1 + self.fuelPerKelvin * (tit - Tt3)) * tit
+        return (turbine * flowTIT - compressor * square * N) / (inertia * N)
+
+    def jacobian(self, N, tit):
+        # (dN/dt, d(dN/dt)_i / dN_j as (2, 2, n)) by forward differences, the point and both
+        # perturbations in one call
+        h = 1e-7
+        stacked = np.repeat(N[:, None], 3, axis=1)
+        stacked[0, 1] += h
+        stacked[1, 2] += h
+        F = self.derivative(stacked, tit)
+        f = F[:, 0]
+        return f, (F[:, 1:] - f[:, None]) / h
+
+    def steadyState(self, tit, tol=1e-12, maxIter=50):
+        # speeds where each turbine delivers exactly its compressor's power (Newton from N = 1)
+        N = np.ones(self.turbine.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(maxIter):
+                f, J = self.jacobian(N, tit)
+                step = -_solve(J[0, 0], J[0, 1], J[1, 0], J[1, 1], f)
+                step = np.where(np.isfinite(step), step, 0.0)
+                N = np.maximum(N + step, 0.05)
+                if np.abs(step).max() < tol:
+                    break
+        return N
+
+
+def _solve(a, b, c, d, r):
+    # (a b; c d) x = r for every engine at once, r (2, n)
+    det = a * d - b * c
+    return np.stack([(d * r[0] - b * r[1]) / det, (a * r[1] - c * r[0]) / det])
+
+
+class _throttleInput:
+    # throttle against time for n engines: a constant, (times, throttles) breakpoints with the
+    # throttles (k,) or (k, n), or a callable t -> throttle (t a float, or flat over the engines);
+    # breakpoints are evaluated per segment, [-inf, t0], [t0, t1], ..., [tk, inf], so a step that
+    # ends on a breakpoint still sees the segment it started in
+    def __init__(self, throttle, n, schedule, cycle):
+        self.schedule = schedule or defaultSchedule
+        self.combustor, self.afterburner = cycle.combustor, cycle.afterburner
+        self.function = throttle if callable(throttle) else None
+        self.n = n
+        if self.function is not None:
+            self.times = np.empty(0)
+            return
+        if not isinstance(throttle, (tuple, list)):
+            throttle = ((0.0,), np.asarray(throttle, dtype=float)[None])
+        times, values = (np.asarray(a, dtype=float) for a in throttle)
+        values = np.broadcast_to(values.reshape(len(times), -1), (len(times), n))
+        if times.ndim != 1 or np.any(np.diff(times) < 0):
+            raise ValueError("throttle breakpoint times must be one increasing sequence")
+        if values.min() < 0 or values.max() > 2:
+            raise ValueError("throttle must be between 0 (idle) and 2 (max afterburner)")
+        self.times = times
+        edges = np.concatenate([[-np.inf], times, [np.inf]])
+        levels = np.concatenate([values[:1], values, values[-1:]])
+        span = np.diff(edges)
+        ramp = (span > 0) & np.isfinite(span)
+        self._slope = np.zeros((len(span), n))
+        self._slope[ramp] = np.diff(levels, axis=0)[ramp] / span[ramp, None]
+        self._edges = edges
+        self._start = levels[:-1]
+        self._base = np.where(np.isfinite(edges[:-1]), edges[:-1], 0.0)
+        self._flat = (self._start.ravel(), self._slope.ravel())
+        self._columns = np.arange(n)
+        self._steady = ~self._slope.any(axis=1)
+        self._titLevel = self.schedule.temperatures(self._start, self.combustor, self.afterburner)[0]
+
+    def segment(self, t):
+        # breakpoint segment holding t (scalar or per engine), None for a callable
+        if self.function is not None:
+            return None
+        return np.searchsorted(self._edges, t, side="right") - 1
+
+    def throttle(self, t, segment):
+        # throttle at t inside segment; t and segment scalars or flat over the engines
+        if self.function is not None:
+            return np.broadcast_to(np.asarray(self.function(t), dtype=float), (self.n,))
+        if np.ndim(segment) == 0:
+            return self._start[segment] + self._slope[segment] * (t - self._base[segment])
+        at = segment * self.n + self._columns
+        return self._flat[0].take(at) + self._flat[1].take(at) * (t - self._base.take(segment))
+
+    def constant(self, segment):
+        # whether the throttle stays put over a (scalar) segment
+        return self.function is None and self._steady[segment]
+
+    def tit(self, t, segment):
+        # turbine inlet temperature from the schedule, read from a table on flat segments
+        if self.function is None:
+            if np.ndim(segment) == 0:
+                if self._steady[segment]:
+                    return self._titLevel[segment]
+            elif self._steady.take(segment).all():
+                return self._titLevel.ravel().take(segment * self.n + self._columns)
+        return self.schedule.temperatures(self.throttle(t, segment), self.combustor, self.afterburner)[0]
+
+    def outputs(self, times):
+        # (throttle, TIT, afterburner temperature, lit) at every output time, shaped (n, len(times))
+        throttle = np.stack([self.throttle(t, self.segment(t)) for t in times], axis=1)
+        return (throttle,) + self.schedule.temperatures(throttle, self.combustor, self.afterburner)
+
+
+def _rk4(model, drive, N, times, speeds, step):
+    # fixed-step classical Runge-Kutta, every engine in lockstep; each interval between output
+    # times and breakpoints is cut into equal steps no longer than step
+    stops = np.union1d(times, drive.times[(drive.times > times[0]) & (drive.times < times[-1])])
+    output = np.isin(stops, times)
+    steps = 0
+    speeds[:, :, 0] = N
+    slot = 1
+    for k in range(1, len(stops)):
+        t0, t1 = stops[k - 1], stops[k]
+        count = max(int(np.ceil((t1 - t0) / step - 1e-9)), 1)
+        h = (t1 - t0) / count
+        segment = drive.segment(0.5 * (t0 + t1))
+        fixed = drive.constant(segment)
+        titEnd = drive.tit(t0, segment)
+        for j in range(count):
+            t = t0 + j * h
+            if fixed:
+                titStart = titMid = titEnd
+            else:
+                titStart, titMid, titEnd = titEnd, drive.tit(t + 0.5 * h, segment), drive.tit(t + h, segment)
+            k1 = model.derivative(N, titStart)
+            k2 = model.derivative(N + 0.5 * h * k1, titMid)
+            k3 = model.derivative(N + 0.5 * h * k2, titMid)
+            k4 = model.derivative(N + h * k3, titEnd)
+            N = N + h / 6 * (k1 + 2 * (k2 + k3) + k4)
+        steps += count
+        if output[k]:
+            speeds[:, :, slot] = N
+            slot += 1
+    n = N.shape[1]
+    return np.full(n, steps), np.zeros(n, dtype=np.int64), 4 * steps * n
+
+
+def _ros2(model, drive, N, times, speeds, step, rtol, atol, maxSteps):
+    # second-order Rosenbrock with the linearly implicit Euler solution as the embedded estimate,
+    # one step size per engine; steps land on the throttle breakpoints and the end, the output
+    # times in between are cubic Hermite interpolants of each accepted step (its end slope from
+    # the second stage, accurate to the method's own order); engines that have reached the end
+    # stop moving but stay in the batch
+    n = N.shape[1]
+    stops = np.append(drive.times[(drive.times > times[0]) & (drive.times < times[-1])], times[-1])
+    t = np.full(n, times[0])
+    h = np.full(n, float(step))
+    following = np.zeros(n, dtype=np.intp)
+    pending = np.ones(n, dtype=np.intp)
+    steps = np.zeros(n, dtype=np.int64)
+    rejected = np.zeros(n, dtype=np.int64)
+    evaluations = 0
+    speeds[:, :, 0] = N
+    active = np.ones(n, dtype=bool)
+    while active.any():
+        if steps.max() + rejected.max() > maxSteps:
+            raise RuntimeError(f"transient integration exceeded {maxSteps} steps")
+        target = stops[np.minimum(following, len(stops) - 1)]
+        hit = h >= target - t
+        hStep = np.where(active, np.where(hit, target - t, h), 0.0)
+        segment = drive.segment(t + 0.5 * hStep)
+        f, J = model.jacobian(N, drive.tit(t, segment))
+        g = _gamma * hStep
+        a, b, c, d = 1 - g * J[0, 0], -g * J[0, 1], -g * J[1, 0], 1 - g * J[1, 1]
+        k1 = _solve(a, b, c, d, f)
+        end = model.derivative(N + hStep * k1, drive.tit(t + hStep, segment))
+        k2 = _solve(a, b, c, d, end - 2 * k1)
+        evaluations += 4 * n
+        trial = N + hStep * (1.5 * k1 + 0.5 * k2)
+        error = np.max(np.abs(0.5 * hStep * (k1 + k2)) / (atol + rtol * np.abs(trial)), axis=0)
+        error = np.where(np.isfinite(error), error, np.inf)
+        accept = active & (error <= 1)
+        reached = np.where(hit, target, t + hStep)
+
+        # output times inside the accepted steps, all of them in one flat evaluation
+        done = np.flatnonzero(accept)
+        last = np.searchsorted(times, reached[done], side="right")
+        counts = np.maximum(last - pending[done], 0)
+        total = counts.sum()
+        if total:
+            at = np.repeat(done, counts)
+            k = np.arange(total) + np.repeat(pending[done] - (np.cumsum(counts) - counts), counts)
+            hk = hStep[at]
+            s = (times[k] - t[at]) / hk
+            s2 = s * s
+            speeds[:, at, k] = ((2 * s2 * s - 3 * s2 + 1) * N[:, at] + (s2 * s - 2 * s2 + s) * hk * f[:, at]
+                                + (3 * s2 - 2 * s2 * s) * trial[:, at] + (s2 * s - s2) * hk * end[:, at])
+            pending[done] = np.maximum(last, pending[done])
+
+        N = np.where(accept, trial, N)
+        t = np.where(accept, reached, t)
+        steps += accept
+        rejected += active & ~accept
+        factor = np.clip(0.9 / np.sqrt(np.maximum(error, 1e-12)), 0.2, 4.0)
+        # a step cut short to land on a stop doesn't shrink the next one
+        h = np.where(active, np.where(accept & hit, np.maximum(h, hStep * factor), hStep * factor), h)
+        following += accept & hit
+        active = following < len(stops)
+    return steps, rejected, evaluations
+
+
+def simulateTransient(throttle, times, mach, P0=101325, T0=298, P_ambient=101325, altitude=None, method="rk4",
+                      step=0.02, rtol=1e-4, atol=1e-6, initial=None, inertia=spoolInertia, speed=spoolSpeed,
+                      schedule=None, config=None, maxSteps=1000000):
+    # spool transients of a batch of engines; flight conditions broadcast to a shape S
+    # throttle: constant, (times, throttles) breakpoints with throttles (k,) or (k,) + S, or a callable
+    # t -> throttle (t a float for "rk4", an array flat over the engines for "ros2"; a jump in a callable
+    # is only resolved to a step, breakpoints put it exactly)
+    # times: increasing output times [s]; the run starts at times[0]
+    # method: "rk4" (fixed step) or "ros2" (adaptive, rtol / atol on the speeds, step the first try)
+    # initial: (LP, HP) speeds, (2,) or (2,) + S; None starts in equilibrium at the first throttle
+    # inertia / speed: (LP, HP) spool inertia [kg m^2] and military-power speed [rpm]
+    # returns a dict: "stations" (transientDtype, S + (len(times),)), "time", integrator counts
+    # ("steps" and "rejected" per engine, "evaluations" of the power balance in total), "seconds"
+    # and "realTime" (simulated over wall-clock seconds for the whole batch)
+    start = time.perf_counter()
+    if method not in ("rk4", "ros2"):
+        raise ValueError(f"unknown method {method!r} (use 'rk4' or 'ros2')")
+    times = np.asarray(times, dtype=float)
+    if times.ndim != 1 or len(times) < 2 or np.any(np.diff(times) <= 0):
+        raise ValueError("times must be an increasing sequence of at least two output times")
+    P0, T0, P_ambient, altitude = flightConditions(P0, T0, P_ambient, altitude)
+    mach, P0, T0, P_ambient, altitude = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                                              for a in (mach, P0, T0, P_ambient, altitude)))
+    shape = mach.shape
+    mach, P0, T0, P_ambient, altitude = (a.ravel() for a in (mach, P0, T0, P_ambient, altitude))
+    n = len(mach)
+
+    cycle = engineCycle(config)
+    model = spoolModel(cycle, mach, P0, T0, inertia, speed)
+    drive = _throttleInput(throttle, n, schedule, cycle)
+
+    if initial is None:
+        N = model.steadyState(drive.tit(times[0], drive.segment(times[0])))
+    else:
+        initial = np.asarray(initial, dtype=float)
+        initial = initial.reshape((2,) + (1,) * (len(shape) + 1 - initial.ndim) + initial.shape[1:])
+        N = np.broadcast_to(initial, (2,) + shape).reshape(2, n).copy()
+
+    speeds = np.empty((2, n, len(times)))
+    # an explicit step too long for stiff spools overflows to nan rather than raising
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if method == "rk4":
+            steps, rejected, evaluations = _rk4(model, drive, N, times, speeds, step)
+        else:
+            steps, rejected, evaluations = _ros2(model, drive, N, times, speeds, step, rtol, atol, maxSteps)
+
+        # the gas path at every output time, one batched cycle call
+        throttleOut, tit, afterburnerTemp, wet = drive.outputs(times)
+        N = speeds.reshape(2, -1)
+        flat = (np.repeat(a, len(times)) for a in (mach, P0, T0, P_ambient, altitude))
+        machOut, P0Out, T0Out, ambientOut, altitudeOut = flat
+        tit, afterburnerTemp, wet, throttleOut = (a.ravel() for a in (tit, afterburnerTemp, wet, throttleOut))
+        expand = (np.repeat(a, len(times)) for a in (model.Tt2, model.riseFan, model.riseHPC, model.coreFlow,
+                                                     model.airFlow))
+        Tt2, riseFan, riseHPC, coreFlow, airFlow = expand
+        riseFan, riseHPC = riseFan * N[0] ** 2, riseHPC * N[1] ** 2
+        fan, hpc = cycle.fan, cycle.hpc
+        # pressure ratios that give the N^2 enthalpy rises through the components' own relations
+        fan.pressure_ratioFan = (1 + fan.efficiencyFan * riseFan / Tt2) ** (fan.gamma / (fan.gamma - 1))
+        hpc.hpcPressRatio = (1 + hpc.hpcEfficiency * riseHPC / (Tt2 + riseFan)) ** (hpc.gamma / (hpc.gamma - 1))
+        cycle.split.bypaRatio = airFlow * N[0] / (coreFlow * N[1]) - 1
+        flowTIT = coreFlow * N[1] * (1 + model.fuelPerKelvin * (tit - Tt2 - riseFan - riseHPC)) * tit
+        turbine = np.repeat(model.turbine, len(times), axis=1)
+        afterburnerFuelFlow = cycle.runFlowpath(machOut, P0Out, T0Out, wet, massFlow=airFlow * N[0], tit=tit,
+                                                afterburnerTemp=afterburnerTemp,
+                                                turbineWork=(turbine[1] * flowTIT, turbine[0] * flowTIT))
+        cycle.nozzle.advance(cycle.stations[9], ambientOut, machOut)
+        cycle.exhaust.advance(cycle.stations[9], cycle.nozzle, 0)
+
+        out = np.empty(n * len(times), dtype=transientDtype)
+        out["Time"] = np.tile(times, n)
+        out["LP Spool Speed"] = N[0]
+        out["HP Spool Speed"] = N[1]
+        out["Mach"] = machOut
+        out["Altitude"] = altitudeOut
+        out["P0"] = P0Out
+        out["T0"] = T0Out
+        out["P_ambient"] = ambientOut
+        out["Wet"] = wet
+        out["Throttle"] = throttleOut
+        recordStations(cycle, afterburnerFuelFlow, out)
+
+    seconds = time.perf_counter() - start
+    return {"stations": out.reshape(shape + (len(times),)), "time": times, "method": method,
+            "steps": steps.reshape(shape), "rejected": rejected.reshape(shape), "evaluations": evaluations,
+            "seconds": seconds, "realTime": (times[-1] - times[0]) / seconds}
@@ -0,0 +1,371 @@
+"""
+Uncertainty propagation through the cycle.
+
+Most of the F119 constants in classes.py are estimates (efficiencies, pressure drops,
+afterburner temperature, inlet area). propagateUncertainty draws them from distributions
+(uncertainParameters: a range around each classes.py value), pushes every sample through the
+cycle at one flight condition and returns percentiles of the results plus Sobol sensitivity
+indices (which parameters the spread of each result comes from):
+
+    result = propagateUncertainty(0.9, samples=200000, altitude=10000, mode="dry")
+    print(uncertaintyReport(result))
+
+Samples come from a Sobol sequence (method="sobol", digitally shifted by seed), Latin
+hypercubes (method="lhs", one per batch) or plain random draws (method="random"). The indices
+use the Saltelli design: two independent samples A and B plus, per parameter i, A with column
+i taken from B, so N samples cost N * (parameters + 2) cycle evaluations; indices=False only
+runs A. Samples are generated and evaluated batchSize at a time (each batch is one
+runEngineBatch over a configBatch) and reduced to running sums for the mean, spread and
+indices, and to fixed-size histograms for the percentiles, so memory stays at a few batches
+whatever N is. Batches are independent, so workers > 1 spreads them over processes (at most
+two batches per worker in flight) with the same result as workers=1.
+"""
+import itertools
+import time
+from collections import deque
+
+import numpy as np
+
+from .config import configBatch, engineConfig
+
+
+# "component.attr" -> distribution, as ("uniform", low, high), ("triangular", low, mode, high)
+# or ("normal", mean, sd); the triangular modes are the classes.py values
+uncertainParameters = {
+    "inlet.p_drop": ("triangular", 0.01, 0.02, 0.04),
+    # 0.95-1.05 m diameter around the 1 m approximation
+    "inlet.inletArea": ("triangular", 0.7088, 0.7854, 0.8659),
+    "fan.efficiencyFan": ("triangular", 0.87, 0.91, 0.93),
+    "hpc.hpcEfficiency": ("triangular", 0.87, 0.91, 0.93),
+    "combustor.combEfficiency": ("triangular", 0.93, 0.95, 0.99),
+    # "hangs around 0.04-0.07"
+    "combustor.p_drop": ("triangular", 0.04, 0.05, 0.07),
+    "hpt.efficiency": ("triangular", 0.90, 0.9291, 0.945),
+    "lpt.efficiency": ("triangular", 0.88, 0.9035, 0.93),
+    "mixer.p_drop": ("triangular", 0.005, 0.01, 0.03),
+    "afterburner.afterburnertemp": ("triangular", 2300.0, 2450.0, 2550.0),
+    "afterburner.p_drop": ("triangular", 0.03, 0.05, 0.08),
+    "afterburner.afterburnerEfficiency": ("triangular", 0.90, 0.95, 0.98),
+    "nozzle.nozzleEff": ("triangular", 0.95, 0.97, 0.99),
+}
+
+uncertaintyFields = ("Net Thrust", "TSFC")
+
+defaultPercentiles = (1, 5, 25, 50, 75, 95, 99)
+
+# Sobol direction numbers (Joe & Kuo, new-joe-kuo-6.21201) for dimensions 2-32 as
+# (degree s, polynomial a, initial m_1..m_s); dimension 1 is the van der Corput sequence
+_joeKuo = (
+    (1, 0, (1,)), (2, 1, (1, 3)), (3, 1, (1, 3, 1)), (3, 2, (1, 1, 1)), (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)), (5, 2, (1, 1, 5, 5, 17)), (5, 4, (1, 1, 5, 5, 5)), (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)), (5, 13, (1, 1, 1, 3, 11)), (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)), (6, 13, (1, 1, 1, 15, 21, 21)), (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)), (6, 22, (1, 3, 1, 15, 13, 25)), (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)), (7, 4, (1, 3, 7, 13, 13, 15, 69)), (7, 7, (1, 1, 3, 13, 7, 35, 63)),
+    (7, 8, (1, 3, 5, 9, 1, 25, 53)), (7, 14, (1, 3, 1, 13, 9, 35, 107)), (7, 19, (1, 3, 1, 5, 27, 61, 31)),
+    (7, 21, (1, 1, 5, 11, 19, 41, 61)), (7, 28, (1, 3, 5, 3, 3, 13, 69)), (7, 31, (1, 1, 7, 13, 1, 19, 1)),
+    (7, 32, (1, 3, 7, 5, 13, 19, 59)), (7, 37, (1, 1, 3, 9, 25, 29, 41)), (7, 41, (1, 3, 5, 13, 23, 1, 55)),
+    (7, 42, (1, 3, 7, 3, 13, 59, 17)),
+)
+
+_bits = 32
+
+
+def sobolDirections(dims):
+    # (dims, 32) direction numbers, scaled to 32-bit integers
+    if dims > len(_joeKuo) + 1:
+        raise ValueError(f"the Sobol sequence here has at most {len(_joeKuo) + 1} dimensions")
+    v = np.zeros((dims, _bits), dtype=np.uint64)
+    v[0] = [1 << (_bits - 1 - k) for k in range(_bits)]
+    for j, (s, a, m) in enumerate(_joeKuo[:dims - 1], start=1):
+        row = [m[k] << (_bits - 1 - k) for k in range(s)]
+        for k in range(s, _bits):
+            x = row[k - s] ^ (row[k - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    x ^= row[k - i]
+            row.append(x)
+        v[j] = row
+    return v
+
+
+def sobolPoints(start, stop, directions, shift=None):
+    # points start..stop-1 of the Sobol sequence in [0, 1)^dims, any range without generating
+    # the ones before it (gray-code index); shift: per-dimension integers XORed in (digital
+    # shift, keeps the net structure); each point sits at the centre of its 2^-32 cell so it
+    # is never exactly 0 or 1
+    index = np.arange(start, stop, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    x = np.zeros((len(index), len(directions)), dtype=np.uint64)
+    for b in range(_bits):
+        bit = ((gray >> np.uint64(b)) & np.uint64(1)).astype(bool)
+        x[bit] ^= directions[:, b]
+    if shift is not None:
+        x ^= shift
+    return (x + 0.5) / 2.0**_bits
+
+
+def latinHypercube(n, dims, rng):
+    # one point in each of the n equal slices of every axis, slices paired at random
+    u = rng.random((n, dims))
+    return (rng.permuted(np.tile(np.arange(n), (dims, 1)), axis=1).T + u) / n
+
+
+def _normalQuantile(p):
+    # inverse standard normal CDF (Acklam's rational approximation, relative error < 1.2e-9)
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02,
+         -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01,
+         -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00,
+         4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    p = np.asarray(p, dtype=float)
+    tail = np.minimum(p, 1 - p)
+    q = np.sqrt(-2 * np.log(np.maximum(tail, 1e-300)))
+    x = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+        ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    x = np.where(p < 0.5, x, -x)
+    r = (p - 0.5) ** 2
+    central = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * (p - 0.5) / \
+        (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    return np.where(tail < 0.02425, x, central)
+
+
+def sampleValues(distribution, u):
+    # map uniform u in (0, 1) to the distribution by its inverse CDF
+    kind, *args = distribution
+    if kind == "uniform":
+        low, high = args
+        return low + u * (high - low)
+    if kind == "triangular":
+        low, mode, high = args
+        split = (mode - low) / (high - low)
+        return np.where(u < split, low + np.sqrt(u * (high - low) * (mode - low)),
+                        high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+    if kind == "normal":
+        mean, sd = args
+        return mean + sd * _normalQuantile(u)
+    raise ValueError(f"unknown distribution {kind!r} (uniform, triangular or normal)")
+
+
+def _unitSamples(method, start, stop, dims, seed, directions, shift):
+    # rows start..stop-1 of the sample in [0, 1)^dims; lhs and random draw a batch from a
+    # generator seeded by (seed, start), so every batch is reproducible on its own
+    if method == "sobol":
+        return sobolPoints(start, stop, directions, shift)
+    rng = np.random.default_rng([seed, start])
+    if method == "lhs":
+        return latinHypercube(stop - start, dims, rng)
+    if method == "random":
+        return rng.random((stop - start, dims))
+    raise ValueError(f"unknown sampling method {method!r} (sobol, lhs or random)")
+
+
+def _runBatch(start, stop, parameters, fields, conditions, base, method, seed, directions, shift, indices,
+              reference):
+    # worker side: sample rows start..stop-1, evaluate them and reduce them to running sums
+    from .cycle import runEngineBatch
+
+    names = tuple(parameters)
+    d = len(names)
+    n = stop - start
+    u = _unitSamples(method, start, stop, 2 * d if indices else d, seed, directions, shift)
+    a = np.column_stack([sampleValues(parameters[name], u[:, i]) for i, name in enumerate(names)])
+    if indices:
+        b = np.column_stack([sampleValues(parameters[name], u[:, d + i]) for i, name in enumerate(names)])
+        # A, B, then A with column i from B for every i: (d + 2) * n designs in one call
+        designs = np.tile(a, (d + 2, 1))
+        designs[n:2 * n] = b
+        for i in range(d):
+            designs[(2 + i) * n:(3 + i) * n, i] = b[:, i]
+    else:
+        designs = a
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        res = runEngineBatch(**conditions, config=configBatch(dict(zip(names, designs.T)), base=base))
+        y = np.stack([np.broadcast_to(res[name], len(designs)) for name in fields], axis=-1)
+    # the samples the distribution is taken over (A, and B with indices), for the percentiles
+    kept = y[:2 * n] if indices else y
+    # sums are taken relative to the nominal result, which keeps the variance free of cancellation
+    finite = np.isfinite(kept)
+    shifted = np.where(finite, kept - reference, 0.0)
+    moments = {"n": finite.sum(axis=0), "sum": shifted.sum(axis=0), "square": (shifted ** 2).sum(axis=0)}
+    y = y.reshape(-1, n, len(fields)) - reference
+    sums = {}
+    if indices:
+        yA, yB, yAB = y[0], y[1], y[2:]
+        valid = np.isfinite(y).all(axis=0)
+        yA, yB, yAB = (np.where(valid, v, 0.0) for v in (yA, yB, yAB))
+        first = yB * (yAB - yA)             # Saltelli (2010) first-order terms
+        total = 0.5 * (yA - yAB) ** 2       # Jansen total-effect terms
+        sums = {"n": valid.sum(axis=0), "sum": yA.sum(axis=0) + yB.sum(axis=0),
+                "square": (yA ** 2).sum(axis=0) + (yB ** 2).sum(axis=0),
+                "first": first.sum(axis=1), "firstSquare": (first ** 2).sum(axis=1),
+                "total": total.sum(axis=1), "totalSquare": (total ** 2).sum(axis=1)}
+    return kept, moments, sums
+
+
+class _quantileHistogram:
+    # percentiles of a stream of values in fixed memory: counts over `bins` equal bins covering
+    # the first batch's range (and half of it again either side), doubled by merging neighbouring
+    # bins whenever a later value falls outside; percentiles interpolate within a bin
+    def __init__(self, bins=1 << 16):
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.low = None
+        self.width = None
+
+    def add(self, values):
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        low, high = values.min(), values.max()
+        bins = len(self.counts)
+        if self.low is None:
+            span = high - low if high > low else max(abs(high), 1.0) * 1e-9
+            self.low = low - 0.5 * span
+            self.width = 2 * span / bins
+        while low < self.low or high >= self.low + bins * self.width:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts[:] = 0
+            if low < self.low:
+                self.counts[bins // 2:] = merged
+                self.low -= bins * self.width
+            else:
+                self.counts[:bins // 2] = merged
+            self.width *= 2
+        index = np.minimum(((values - self.low) / self.width).astype(np.int64), bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+
+    def percentiles(self, q):
+        cumulative = np.cumsum(self.counts)
+        n = cumulative[-1]
+        if n == 0:
+            return np.full(len(q), np.nan)
+        # the k-th smallest value sits mid-way through its count, as np.percentile places it
+        rank = np.asarray(q, dtype=float) / 100 * (n - 1) + 0.5
+        i = np.searchsorted(cumulative, rank)
+        before = cumulative[i] - self.counts[i]
+        return self.low + self.width * (i + (rank - before) / self.counts[i])
+
+
+def propagateUncertainty(mach, samples=100000, parameters=None, fields=uncertaintyFields, method="sobol",
+                         indices=True, percentiles=defaultPercentiles, batchSize=4096, workers=1, seed=0,
+                         base=None, **conditions):
+    # mach and conditions (altitude, mode or throttle, P0, T0, ...; scalars) are the flight
+    # condition as runEngineBatch takes it; parameters: "component.attr" -> distribution
+    # (default uncertainParameters); base: engineConfig the other constants come from
+    start = time.perf_counter()
+    parameters = dict(uncertainParameters if parameters is None else parameters)
+    fields = tuple(fields)
+    base = engineConfig() if base is None else base
+    conditions = dict(conditions, mach=mach)
+    d = len(parameters)
+    directions = shift = None
+    if method == "sobol":
+        directions = sobolDirections(2 * d if indices else d)
+        # a random digital shift, so the sequence doesn't start at the corner of the box
+        shift = np.random.default_rng(seed).integers(0, 2**_bits, len(directions), dtype=np.uint64)
+
+    from .cycle import runEngineBatch
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nominal = runEngineBatch(**conditions, config=base)
+    reference = np.array([float(nominal[name]) for name in fields])
+    reference = np.where(np.isfinite(reference), reference, 0.0)
+
+    histograms = [_quantileHistogram() for _ in fields]
+    moments = totals = None
+    batches = [(s, min(s + batchSize, samples)) for s in range(0, samples, batchSize)]
+    args = (parameters, fields, conditions, base, method, seed, directions, shift, indices, reference)
+    if workers == 1:
+        results = (_runBatch(s, e, *args) for s, e in batches)
+    else:
+        # imported here: concurrent.futures costs more to import than the cycle itself
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = _inOrder(pool, batches, args, 2 * workers)
+    try:
+        # merged in batch order, so the sums and histograms (and the result) don't depend on workers
+        for kept, batchMoments, sums in results:
+            for k, histogram in enumerate(histograms):
+                histogram.add(kept[:, k])
+            moments = batchMoments if moments is None else {key: moments[key] + batchMoments[key] for key in moments}
+            if indices:
+                totals = sums if totals is None else {key: totals[key] + sums[key] for key in totals}
+    finally:
+        if workers != 1:
+            pool.shutdown(cancel_futures=True)
+
+    kept = 2 * samples if indices else samples
+    result = {"method": method, "flight": conditions, "samples": samples, "evaluations": samples * (d + 2 if indices
+              else 1), "parameters": parameters, "fields": fields,
+              "nominal": dict(zip(fields, (float(nominal[name]) for name in fields))),
+              "failed": {}, "mean": {}, "std": {}, "percentiles": {}, "sobol": None}
+    for k, name in enumerate(fields):
+        n = int(moments["n"][k]) if moments is not None else 0
+        result["failed"][name] = kept - n
+        if n:
+            mean = moments["sum"][k] / n
+            result["mean"][name] = float(reference[k] + mean)
+            result["std"][name] = float(np.sqrt(max(moments["square"][k] / n - mean ** 2, 0.0)))
+        else:
+            result["mean"][name] = result["std"][name] = np.nan
+        result["percentiles"][name] = dict(zip(percentiles, histograms[k].percentiles(percentiles).tolist()))
+    if indices:
+        result["sobol"] = _sobolIndices(totals, tuple(parameters), fields)
+    result["batches"] = len(batches)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _inOrder(pool, batches, args, inFlight):
+    # batch results in batch order, with at most inFlight batches submitted and not yet collected
+    batches = iter(batches)
+    pending = deque(pool.submit(_runBatch, s, e, *args) for s, e in itertools.islice(batches, inFlight))
+    while pending:
+        result = pending.popleft().result()
+        nextBatch = next(batches, None)
+        if nextBatch is not None:
+            pending.append(pool.submit(_runBatch, *nextBatch, *args))
+        yield result
+
+
+def _sobolIndices(totals, names, fields):
+    # first-order and total indices per field and parameter, with standard errors of the estimates
+    n = np.maximum(totals["n"], 1)
+    mean = totals["sum"] / (2 * n)
+    variance = totals["square"] / (2 * n) - mean ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = totals["first"] / n / variance
+        total = totals["total"] / n / variance
+        firstError = np.sqrt(np.maximum(totals["firstSquare"] / n - (totals["first"] / n) ** 2, 0) / n) / variance
+        totalError = np.sqrt(np.maximum(totals["totalSquare"] / n - (totals["total"] / n) ** 2, 0) / n) / variance
+    out = {}
+    for k, field in enumerate(fields):
+        out[field] = {"first": dict(zip(names, first[:, k].tolist())),
+                      "total": dict(zip(names, total[:, k].tolist())),
+                      "firstError": dict(zip(names, firstError[:, k].tolist())),
+                      "totalError": dict(zip(names, totalError[:, k].tolist())),
+                      "variance": float(variance[k]), "samples": int(totals["n"][k])}
+    return out
+
+
+def uncertaintyReport(result):
+    # plain-text summary of propagateUncertainty()
+    flight = ", ".join(f"{key} {value}" for key, value in result["flight"].items())
+    lines = [f"uncertainty at {flight}: {result['samples']:,} {result['method']} samples over "
+             f"{len(result['parameters'])} parameters, {result['evaluations']:,} evaluations in "
+             f"{result['seconds']:.2f} s"]
+    percentiles = next(iter(result["percentiles"].values()))
+    for name in result["fields"]:
+        lines.append(f"\n{name}: nominal {result['nominal'][name]:.6g}, mean {result['mean'][name]:.6g}, "
+                     f"std {result['std'][name]:.4g} ({result['failed'][name]} samples failed)")
+        lines.append("  " + "  ".join(f"P{p:g} {result['percentiles'][name][p]:.6g}" for p in percentiles))
+        if result["sobol"] is not None:
+            sobol = result["sobol"][name]
+            lines.append("  parameter                            first order         total")
+            for parameter in sorted(sobol["total"], key=lambda p: -np.nan_to_num(sobol["total"][p])):
+                lines.append(f"  {parameter:34s} {sobol['first'][parameter]:7.4f} +- {sobol['firstError'][parameter]:.4f}"
+                             f"  {sobol['total'][parameter]:7.4f} +- {sobol['totalError'][parameter]:.4f}")
+    return "\n".join(lines)